@@ -65,7 +65,7 @@ export default function App() {
         allEventsData,
         sentryIntegrations,
         mailgunIntegrations,
-        mailgunEvents,
+        mailgunEventsForChart,
         loading,
         error,
     } = state;
@@ -211,7 +211,7 @@ export default function App() {
                                 <Overview
                                     allIntegrations={allIntegrations}
                                     allEventsForChart={allEventsForChart}
-                                    mailgunEvents={mailgunEvents || []}
+                                    mailgunEvents={mailgunEventsForChart || []}
                                     issues={sentryIssues}
                                     timeRange={globalTimeRange}
                                     onTimeRangeChange={handleGlobalTimeRangeChange}
@@ -7,11 +7,12 @@
  * and real-time status updates. Integrates with Sentry API for issue management.
  */
 
-import React, { useState, useEffect, useContext } from 'react';
-import { Box, Typography, Table, TableHead, TableRow, TableCell, TableBody, Chip, Button, Dialog, DialogTitle, DialogContent, DialogActions, List, ListItem, ListItemButton, ListItemText, ListItemIcon, Avatar, CircularProgress } from '@mui/material';
+import React, { useState, useContext } from 'react';
+import { Box, Typography, Table, TableHead, TableRow, TableCell, TableBody, Chip, Button, Dialog, DialogTitle, DialogContent, DialogActions, List, ListItem, ListItemButton, ListItemText, ListItemIcon, Avatar, CircularProgress, TextField } from '@mui/material';
 import { Person as PersonIcon, PersonOff as PersonOffIcon } from '@mui/icons-material';
 import CollapsibleSection from './CollapsibleSection';
-import { ignoreIssue, archiveIssue, bookmarkIssue, assignIssue, unassignIssue, fetchSentryMembers } from '../services/api';
+import { ignoreIssue, archiveIssue, bookmarkIssue, assignIssue, unassignIssue } from '../services/api';
+import { useMemberSearch } from '../hooks/useMemberSearch';
 import AppContext from '../context/AppContext';
 import { getConsistentColorForCategory } from '../utils/colorScheme';
 
@@ -19,24 +20,7 @@ export default function ActiveIssuesSection({ issues, onViewDetails, onResolveIs
     const { loadSentryData } = useContext(AppContext);
     const [assignDialogOpen, setAssignDialogOpen] = useState(false);
     const [selectedIssueForAssignment, setSelectedIssueForAssignment] = useState(null);
-    const [sentryMembers, setSentryMembers] = useState([]);
-    const [membersLoading, setMembersLoading] = useState(false);
-
-    useEffect(() => {
-        const loadSentryMembers = async () => {
-            try {
-                setMembersLoading(true);
-                const members = await fetchSentryMembers();
-                setSentryMembers(members);
-            } catch (error) {
-                console.error('Failed to fetch Sentry members:', error);
-            } finally {
-                setMembersLoading(false);
-            }
-        };
-
-        loadSentryMembers();
-    }, []);
+    const { members: sentryMembers, query: memberQuery, setQuery: setMemberQuery, loading: membersLoading } = useMemberSearch();
 
     const getRowColorForIssue = (issue, status) => {
         // Check if this issue should be highlighted from investigation
@@ -463,11 +447,21 @@ export default function ActiveIssuesSection({ issues, onViewDetails, onResolveIs
                 onClose={handleAssignDialogClose}
                 maxWidth="sm"
                 fullWidth
+                slotProps={{ transition: { onExited: () => setMemberQuery('') } }}
             >
                 <DialogTitle>
                     Assign Issue: {selectedIssueForAssignment?.title}
                 </DialogTitle>
                 <DialogContent>
+                    <TextField
+                        autoFocus
+                        fullWidth
+                        size="small"
+                        margin="dense"
+                        placeholder="Search by name, email or username"
+                        value={memberQuery}
+                        onChange={(event) => setMemberQuery(event.target.value)}
+                    />
                     {membersLoading ? (
                         <Box display="flex" justifyContent="center" p={2}>
                             <CircularProgress />
@@ -508,7 +502,7 @@ export default function ActiveIssuesSection({ issues, onViewDetails, onResolveIs
                                 <ListItem>
                                     <ListItemText 
                                         primary="No members found" 
-                                        secondary="Unable to load organization members"
+                                        secondary={memberQuery ? `No members match "${memberQuery}"` : "Unable to load organization members"}
                                     />
                                 </ListItem>
                             )}
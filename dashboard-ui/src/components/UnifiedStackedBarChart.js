@@ -11,17 +11,49 @@ import React, { useMemo, useState, useCallback, useEffect, useContext } from 're
 import {
     Box, Typography, Chip, Card, CardContent, List, ListItem, Divider,
     IconButton, Button, Menu, MenuItem, CircularProgress, FormControl, InputLabel, Select, ListItemText,
-    Dialog, DialogTitle, DialogContent, DialogActions, ListItemButton, ListItemIcon, Avatar
+    Dialog, DialogTitle, DialogContent, DialogActions, ListItemButton, ListItemIcon, Avatar, TextField
 } from '@mui/material';
 import { Close as CloseIcon, MoreVert as MoreVertIcon, Person as PersonIcon, PersonOff as PersonOffIcon, OpenInNew as OpenInNewIcon } from '@mui/icons-material';
 import { BarChart } from '@mui/x-charts/BarChart';
-import { resolveIssue, ignoreIssue, archiveIssue, bookmarkIssue, assignIssue, unassignIssue, fetchSentryMembers } from '../services/api';
+import { bulkUpdateIssues, fetchTimeseries } from '../services/api';
+import { useMemberSearch } from '../hooks/useMemberSearch';
 import AppContext from '../context/AppContext';
 import { SET_ACTIVE_PAGE } from '../context/AppReducer';
 import { generateAppearanceMaps, DEFAULT_FALLBACK_COLOR } from '../utils/colorScheme';
 
 // --- Helper Functions ---
 
+// Chart time ranges served from the backend rollups (/api/timeseries/) and their bucket resolution;
+// other ranges are bucketed from the loaded events
+const TIMESERIES_RESOLUTIONS = { '1d': 'hour', '7d': 'day', '30d': 'day', '90d': 'day' };
+
+// Dense chart rows from a /api/timeseries/ response grouped by category
+const timeseriesToBuckets = (timeseries, prefix, includeType) => {
+    const startTime = Date.parse(timeseries.start);
+    const data = Array.from({ length: timeseries.buckets }, (_, index) => ({ timestamp: new Date(startTime + index * timeseries.step * 1000) }));
+    const types = [];
+    timeseries.series.forEach(({ category, counts }) => {
+        const errorType = category || 'Unknown Error';
+        if (!includeType(errorType)) return;
+        const key = `${prefix}${errorType}`;
+        if (!types.includes(key)) types.push(key);
+        counts.forEach((count, index) => { data[index][key] = (data[index][key] || 0) + count; });
+    });
+    return { data, types, bucketSize: timeseries.step * 1000 };
+};
+
+// Applies one update to the issues of validEvents with a single bulk request and returns
+// Promise.allSettled-style results, one per event
+const settleIssueUpdates = async (validEvents, update) => {
+    const { results } = await bulkUpdateIssues(validEvents.map(event => event.resolveId), update);
+    return validEvents.map(event => {
+        const result = results[String(event.resolveId)];
+        return result?.ok
+            ? { status: 'fulfilled', value: result }
+            : { status: 'rejected', reason: new Error(result?.error || 'Issue was not updated') };
+    });
+};
+
 const createTimeBuckets = (timeRange, allEvents = []) => {
     const now = new Date();
     let startTime, bucketSize;
@@ -115,25 +147,9 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
     const [selectedEventForMenu, setSelectedEventForMenu] = useState(null);
     const [loadingAction, setLoadingAction] = useState(null);
     const [assignDialogOpen, setAssignDialogOpen] = useState(false);
-    const [sentryMembers, setSentryMembers] = useState([]);
-    const [membersLoading, setMembersLoading] = useState(false);
+    const { members: sentryMembers, query: memberQuery, setQuery: setMemberQuery, loading: membersLoading } = useMemberSearch();
     const [confirmationDialog, setConfirmationDialog] = useState({ open: false, action: '', title: '', message: '' });
 
-    useEffect(() => {
-        const loadSentryMembers = async () => {
-            try {
-                setMembersLoading(true);
-                const members = await fetchSentryMembers();
-                setSentryMembers(members);
-            } catch (error) {
-                console.error('Failed to fetch Sentry members:', error);
-            } finally {
-                setMembersLoading(false);
-            }
-        };
-
-        loadSentryMembers();
-    }, []);
     
     if (!data) return null;
     
@@ -261,10 +277,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Resolve each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => resolveIssue(event.resolveId))
-            );
+            // Resolve every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { status: 'resolved' });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -312,10 +326,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Ignore each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => ignoreIssue(event.resolveId))
-            );
+            // Ignore every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { status: 'ignored' });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -363,10 +375,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Archive each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => archiveIssue(event.resolveId))
-            );
+            // Archive every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { status: 'resolved' });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -414,10 +424,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Bookmark each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => bookmarkIssue(event.resolveId))
-            );
+            // Bookmark every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { isBookmarked: true });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -464,10 +472,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Assign each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => assignIssue(event.resolveId, userId))
-            );
+            // Assign every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { assignedTo: userId });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -504,10 +510,8 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
         }
 
         try {
-            // Unassign each event individually to handle partial failures
-            const results = await Promise.allSettled(
-                validEvents.map(event => unassignIssue(event.resolveId))
-            );
+            // Unassign every issue in one bulk request; results are still reported per event
+            const results = await settleIssueUpdates(validEvents, { assignedTo: '' });
             
             const successful = results.filter(result => result.status === 'fulfilled').length;
             const failed = results.filter(result => result.status === 'rejected');
@@ -837,11 +841,21 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
                 onClose={handleAssignDialogClose}
                 maxWidth="sm"
                 fullWidth
+                slotProps={{ transition: { onExited: () => setMemberQuery('') } }}
             >
                 <DialogTitle>
                     Assign All {errorType.toUpperCase()} Issues ({relevantEvents.length} issues)
                 </DialogTitle>
                 <DialogContent>
+                    <TextField
+                        autoFocus
+                        fullWidth
+                        size="small"
+                        margin="dense"
+                        placeholder="Search by name, email or username"
+                        value={memberQuery}
+                        onChange={(event) => setMemberQuery(event.target.value)}
+                    />
                     {membersLoading ? (
                         <Box display="flex" justifyContent="center" p={2}>
                             <CircularProgress />
@@ -882,7 +896,7 @@ const InvestigationPanel = React.memo(({ data, colorMap, onClose }) => {
                                 <ListItem>
                                     <ListItemText 
                                         primary="No members found" 
-                                        secondary="Unable to load organization members"
+                                        secondary={memberQuery ? `No members match "${memberQuery}"` : "Unable to load organization members"}
                                     />
                                 </ListItem>
                             )}
@@ -952,6 +966,23 @@ export default function UnifiedStackedBarChart({
         }
     }, [selectedAPI, selectedErrorTypes, onStateChange]);
 
+    // Pre-aggregated counts for the selected API; null while unavailable (e.g. empty event store),
+    // in which case the loaded events are bucketed in the browser
+    const [timeseries, setTimeseries] = useState(null);
+    useEffect(() => {
+        const resolution = TIMESERIES_RESOLUTIONS[timeRange];
+        if (!showAPIComparison || !resolution) {
+            setTimeseries(null);
+            return undefined;
+        }
+        let cancelled = false;
+        fetchTimeseries({ timeRange, resolution, source: selectedAPI, groupBy: 'category' })
+            .then(data => { if (!cancelled) setTimeseries(data.series.length > 0 ? { ...data, source: selectedAPI } : null); })
+            .catch(() => { if (!cancelled) setTimeseries(null); });
+        return () => { cancelled = true; };
+        // Reloaded events mean new data may have been ingested; the ETag keeps unchanged refetches cheap
+    }, [timeRange, selectedAPI, showAPIComparison, events, mailgunEvents]);
+
     const chartData = useMemo(() => {
         console.log('Chart Data Debug:', {
             sentryEvents: events?.length || 0,
@@ -964,7 +995,24 @@ export default function UnifiedStackedBarChart({
         const allErrorTypes = new Set();
         (events || []).forEach(e => allErrorTypes.add(e.issueCategory || e.type || 'Unknown Error'));
         (mailgunEvents || []).forEach(e => allErrorTypes.add(e.issueCategory || e.category || e.type || 'Unknown Error'));
+        const serverSeries = timeseries && timeseries.source === selectedAPI ? timeseries : null;
+        (serverSeries?.series || []).forEach(({ category }) => allErrorTypes.add(category || 'Unknown Error'));
         const { colorMap, colorOrder } = generateAppearanceMaps(allErrorTypes);
+        const sortByColorOrder = (a, b, prefix) => (colorOrder[b.replace(prefix, '')] || 0) - (colorOrder[a.replace(prefix, '')] || 0);
+
+        if (showAPIComparison && serverSeries) {
+            const prefix = `${selectedAPI}_`;
+            const { data, types, bucketSize } = timeseriesToBuckets(serverSeries, prefix, type => selectedErrorTypes.size === 0 || selectedErrorTypes.has(type));
+            types.sort((a, b) => sortByColorOrder(a, b, prefix));
+            return {
+                data,
+                bucketSize,
+                sentryErrorTypes: selectedAPI === 'sentry' ? types : [],
+                mailgunErrorTypes: selectedAPI === 'mailgun' ? types : [],
+                colorMap,
+            };
+        }
+
         const allCombinedEvents = [...(events || []), ...(mailgunEvents || [])];
         const { buckets, startTime, bucketSize } = createTimeBuckets(timeRange, allCombinedEvents);
 
@@ -996,14 +1044,13 @@ export default function UnifiedStackedBarChart({
             let mailgunErrorTypes = Array.from(allMailgunTypes).filter(type => selectedErrorTypes.size === 0 || selectedErrorTypes.has(type)).map(type => `mailgun_${type}`);
             if (selectedAPI === 'sentry') mailgunErrorTypes = [];
             if (selectedAPI === 'mailgun') sentryErrorTypes = [];
-            const sortByColorOrder = (a, b, prefix) => (colorOrder[b.replace(prefix, '')] || 0) - (colorOrder[a.replace(prefix, '')] || 0);
             sentryErrorTypes.sort((a, b) => sortByColorOrder(a, b, 'sentry_'));
             mailgunErrorTypes.sort((a, b) => sortByColorOrder(a, b, 'mailgun_'));
-            return { data: Array.from(buckets.values()), sentryErrorTypes, mailgunErrorTypes, colorMap };
+            return { data: Array.from(buckets.values()), bucketSize, sentryErrorTypes, mailgunErrorTypes, colorMap };
         } else {
-            return { data: [], sentryErrorTypes: [], mailgunErrorTypes: [], colorMap };
+            return { data: [], bucketSize, sentryErrorTypes: [], mailgunErrorTypes: [], colorMap };
         }
-    }, [events, mailgunEvents, timeRange, showAPIComparison, selectedAPI, selectedErrorTypes]);
+    }, [events, mailgunEvents, timeRange, showAPIComparison, selectedAPI, selectedErrorTypes, timeseries]);
 
     const errorTypeButtons = useMemo(() => {
         const types = new Set();
@@ -1012,8 +1059,9 @@ export default function UnifiedStackedBarChart({
             const errorType = e.issueCategory || (selectedAPI === 'mailgun' ? e.category : e.type) || 'Unknown Error';
             types.add(errorType);
         });
+        if (timeseries?.source === selectedAPI) timeseries.series.forEach(({ category }) => types.add(category || 'Unknown Error'));
         return Array.from(types).sort();
-    }, [events, mailgunEvents, selectedAPI]);
+    }, [events, mailgunEvents, selectedAPI, timeseries]);
 
     const sortedErrorTypeButtons = useMemo(() => {
         const { colorOrder } = generateAppearanceMaps(new Set(errorTypeButtons));
@@ -1024,7 +1072,7 @@ export default function UnifiedStackedBarChart({
         if (!showAPIComparison || dataIndex === undefined || !seriesId) return;
         
         const clickedBucket = chartData.data[dataIndex];
-        const { bucketSize } = createTimeBuckets(timeRange, [...events, ...mailgunEvents]);
+        const { bucketSize } = chartData;
         const bucketStart = clickedBucket.timestamp;
         const bucketEnd = new Date(bucketStart.getTime() + bucketSize);
         const api = seriesId.startsWith('sentry_') ? 'sentry' : 'mailgun';
@@ -1049,7 +1097,7 @@ export default function UnifiedStackedBarChart({
         
         setInvestigationData(newInvestigationData);
         if (onInvestigationChange) onInvestigationChange(newInvestigationData);
-    }, [chartData.data, events, mailgunEvents, onInvestigationChange, showAPIComparison, timeRange]);
+    }, [chartData, events, mailgunEvents, onInvestigationChange, showAPIComparison]);
     
     const handleErrorTypeClick = useCallback((errorType) => {
         // Find all events of this type regardless of time for global investigation
@@ -1129,6 +1177,16 @@ export default function UnifiedStackedBarChart({
         let total = 0;
         
         const sourceEvents = selectedAPI === 'sentry' ? events : mailgunEvents;
+
+        // Totals of the rollups cover the whole range, not just the events loaded in the browser
+        if (timeseries?.source === selectedAPI) {
+            timeseries.series.forEach(({ category, total: count }) => {
+                const errorType = category || 'Unknown Error';
+                counts[errorType] = (counts[errorType] || 0) + count;
+                total += count;
+            });
+            return { errorTypeCounts: counts, totalCount: total };
+        }
         
         sortedErrorTypeButtons.forEach(errorType => {
             const count = sourceEvents?.filter(event => {
@@ -1141,7 +1199,7 @@ export default function UnifiedStackedBarChart({
         });
         
         return { errorTypeCounts: counts, totalCount: total };
-    }, [events, mailgunEvents, selectedAPI, sortedErrorTypeButtons]);
+    }, [events, mailgunEvents, selectedAPI, sortedErrorTypeButtons, timeseries]);
 
     const hasData = chartData.data.length > 0 && (chartData.sentryErrorTypes.length > 0 || chartData.mailgunErrorTypes.length > 0);
 
@@ -38,6 +38,7 @@ export const appReducer = (state, action) => {
                 rawAllEventsData: action.payload.allEventsData,
                 rawAllEventsForChart: action.payload.allEventsForChart,
                 rawMailgunEvents: action.payload.mailgunEvents,
+                rawMailgunEventsForChart: action.payload.mailgunEventsForChart,
                 rawMailgunData: action.payload.mailgunData,
                 // Filtered data (initially same as raw)
                 sentryIssues: action.payload.sentryIssues,
@@ -46,6 +47,7 @@ export const appReducer = (state, action) => {
                 allEventsForChart: action.payload.allEventsForChart,
                 // Mailgun data
                 mailgunEvents: action.payload.mailgunEvents,
+                mailgunEventsForChart: action.payload.mailgunEventsForChart,
                 mailgunIntegrations: action.payload.mailgunIntegrations,
                 mailgunStats: action.payload.mailgunStats,
                 mailgunDomains: action.payload.mailgunDomains,
@@ -93,6 +95,7 @@ export const appReducer = (state, action) => {
                 allEventsData: action.payload.allEventsData,
                 allEventsForChart: action.payload.allEventsForChart,
                 mailgunEvents: action.payload.mailgunEvents || state.mailgunEvents,
+                mailgunEventsForChart: action.payload.mailgunEventsForChart || state.mailgunEventsForChart,
             };
         case SAVE_PAGE_STATE:
             return {
@@ -7,10 +7,10 @@
  * state management throughout the dashboard application.
  */
 
-import React, { useReducer, startTransition, useCallback, useMemo } from 'react';
+import React, { useReducer, startTransition, useCallback, useEffect, useMemo, useRef } from 'react';
 import AppContext from './AppContext';
 import { appReducer, FETCH_DATA_START, FETCH_DATA_SUCCESS, FETCH_DATA_FAILURE, UPDATE_FILTERED_DATA, SET_LIVE_DATA_FILTER, SET_GLOBAL_TIME_RANGE, SAVE_PAGE_STATE, RESTORE_PAGE_STATE } from './AppReducer';
-import { fetchIssues, fetchEventsForIssue, fetchSentryIntegrationStatus, fetchMailgunLogs, fetchMailgunStats, fetchMailgunIntegrationStatus } from '../services/api';
+import { fetchChartEvents, fetchDashboardSnapshot, fetchSentrySync, subscribeToLiveUpdates } from '../services/api';
 import { filterEventsByTimeRange, filterIssuesByTimeRange, createMemoizedFilter } from '../utils/dataFilters';
 
 // Utility function from App.js
@@ -21,6 +21,75 @@ function getTimeOffsetFromNow(timestampStr) {
     return Math.floor((pastDate.getTime() - now.getTime()) / 1000);
 }
 
+// Lightweight chart event with the fields the charts read; title, culprit and shortId reference the issue
+// (if any) for the investigation panel rather than copying the full event
+function chartEvent(id, seconds, source, level, category, issueId, issue) {
+    const dateCreated = new Date(seconds * 1000).toISOString();
+    return {
+        id,
+        issueId,
+        dateCreated,
+        timestamp: dateCreated,
+        level,
+        category,
+        issueCategory: category,
+        source,
+        offsetSeconds: Math.floor(seconds - Date.now() / 1000),
+        title: issue?.title || category,
+        culprit: issue?.culprit,
+        shortId: issue?.shortId,
+        originalIssue: issue,
+    };
+}
+
+// Decode a columnar /api/chart/events/ response (delta-encoded timestamps, dictionary-encoded columns)
+// into chart events by source; issues (Map by id) supplies the issue details of Sentry events
+function decodeChartEvents(data, issues) {
+    const { timestamps, columns, dictionaries } = data;
+    const eventsBySource = { sentry: [], mailgun: [] };
+    let seconds = Math.floor(Date.parse(data.start) / 1000);
+    for (let index = 0; index < timestamps.length; index++) {
+        seconds += timestamps[index];
+        const source = dictionaries.source[columns.source[index]];
+        const issueId = dictionaries.issueId[columns.issueId[index]];
+        if (!eventsBySource[source]) eventsBySource[source] = [];
+        eventsBySource[source].push(chartEvent(
+            `${source}-${index}`,
+            seconds,
+            source,
+            dictionaries.level[columns.level[index]],
+            dictionaries.category[columns.category[index]],
+            issueId,
+            issueId ? issues.get(issueId) : undefined,
+        ));
+    }
+    return eventsBySource;
+}
+
+// Snapshot sections still loaded in full; Sentry issues and events come from the delta sync
+const SNAPSHOT_SECTIONS = ['sentryIntegrations', 'mailgunLogs', 'mailgunStats', 'mailgunIntegrations'];
+
+// Apply a /api/sentry/sync/ delta to the issues (Map by id) and events (by issue id) of earlier syncs
+function applySentryDelta(previous, delta) {
+    const issues = delta.full ? new Map() : new Map(previous.issues);
+    const events = delta.full ? {} : { ...previous.events };
+    delta.issues.forEach(issue => issues.set(issue.id, issue));
+    delta.tombstones.forEach(({ id }) => {
+        issues.delete(id);
+        delete events[id];
+    });
+    Object.entries(delta.events).forEach(([issueId, result]) => {
+        if (result.error) {
+            console.warn(`Failed to fetch events for issue ${issueId}:`, result.error);
+            return;
+        }
+        const known = new Set((events[issueId] || []).map(event => event.eventID || event.id));
+        const added = result.events.filter(event => !known.has(event.eventID || event.id));
+        events[issueId] = [...added, ...(events[issueId] || [])];
+    });
+    return { issues, events };
+}
+
 // Create mock Mailgun data for testing
 function createMockMailgunData() {
     const now = new Date();
@@ -151,6 +220,7 @@ const AppState = ({ children }) => {
         rawAllEventsData: {},
         rawAllEventsForChart: [],
         rawMailgunEvents: [],
+        rawMailgunEventsForChart: [],
         // Filtered data (applied based on timeRange/liveDataFilter)
         sentryIssues: [],
         allEventsData: {},
@@ -160,6 +230,7 @@ const AppState = ({ children }) => {
             { name: 'Mailgun API', category: 'Email Service', status: 'Healthy', responseTime: '85ms', lastSuccess: 'Just now', uptime: '99.98%', issue: null },
         ],
         mailgunEvents: [],
+        mailgunEventsForChart: [],
         mailgunStats: [],
         mailgunDomains: [],
         allIntegrations: [],
@@ -169,67 +240,60 @@ const AppState = ({ children }) => {
     };
 
     const [state, dispatch] = useReducer(appReducer, initialState);
+    const sentrySync = useRef({ token: null, issues: new Map(), events: {} });
     
     // Create memoized filter functions for performance
     const memoizedEventFilter = useMemo(() => createMemoizedFilter(), []);
     const memoizedIssueFilter = useMemo(() => createMemoizedFilter(), []);
 
-    const loadSentryData = useCallback(async () => {
-        startTransition(() => {
-            dispatch({ type: FETCH_DATA_START });
-        });
+    // silent: refresh in the background (live updates) without showing the loading state
+    const loadSentryData = useCallback(async ({ silent = false } = {}) => {
+        if (!silent) {
+            startTransition(() => {
+                dispatch({ type: FETCH_DATA_START });
+            });
+        }
 
         try {
-            // Fetch both Sentry and Mailgun data in parallel
-            const [
-                fetchedIssues, 
-                fetchedSentryIntegrations, 
-                mailgunLogs, 
-                mailgunStats, 
-                mailgunIntegrations
-            ] = await Promise.all([
-                fetchIssues(),
-                fetchSentryIntegrationStatus(),
-                fetchMailgunLogs('30d').catch(err => {
-                    console.warn('Failed to fetch Mailgun logs:', err.message);
-                    return { items: [] };
-                }),
-                fetchMailgunStats('30d').catch(err => {
-                    console.warn('Failed to fetch Mailgun stats:', err.message);
-                    return [];
-                }),
-                fetchMailgunIntegrationStatus().catch(err => {
-                    console.warn('Failed to fetch Mailgun integration status:', err.message);
-                    return [{ name: 'Mailgun API', category: 'Email Service', status: 'Error', responseTime: 'N/A', lastSuccess: 'N/A', uptime: 'N/A', issue: err.message }];
-                })
+            // Sentry issues/events are synced incrementally; the remaining sections come from one snapshot request
+            // Chart events come normalized from the event store; null (e.g. empty store) falls back to the loaded events
+            const [{ sections }, delta, chartEvents] = await Promise.all([
+                fetchDashboardSnapshot('30d', SNAPSHOT_SECTIONS),
+                fetchSentrySync(sentrySync.current.token),
+                fetchChartEvents({ timeRange: '30d' }).then(data => (data.count > 0 ? data : null)).catch(() => null),
             ]);
-
-            // Process Sentry data
-            const eventPromises = fetchedIssues.map(async (issue) => {
-                try {
-                    return await fetchEventsForIssue(issue.id);
-                } catch (error) {
-                    console.warn(`Failed to fetch events for issue ${issue.id}:`, error.message);
-                    return []; // Return empty array for failed fetches
+            const sectionData = (name, fallback) => {
+                if (sections[name].error) {
+                    console.warn(`Failed to fetch ${name}:`, sections[name].error);
+                    return fallback;
                 }
-            });
-            const allEventsByIssue = await Promise.all(eventPromises);
+                return sections[name].data;
+            };
+            const fetchedSentryIntegrations = sectionData('sentryIntegrations', []);
+            const mailgunLogs = sectionData('mailgunLogs', { items: [] });
+            const mailgunStats = sectionData('mailgunStats', []);
+            const mailgunIntegrations = sectionData('mailgunIntegrations', [
+                { name: 'Mailgun API', category: 'Email Service', status: 'Error', responseTime: 'N/A', lastSuccess: 'N/A', uptime: 'N/A', issue: sections.mailgunIntegrations.error }
+            ]);
+
+            // Process Sentry data - apply the delta to the issues and events kept from earlier syncs
+            const { issues, events } = applySentryDelta(sentrySync.current, delta);
+            sentrySync.current = { token: delta.token, issues, events };
+            const fetchedIssues = Array.from(issues.values()).sort((a, b) => (b.lastSeen || '').localeCompare(a.lastSeen || ''));
+            const allEventsByIssue = fetchedIssues.map(issue => events[issue.id] || []);
 
             const eventsDataMap = fetchedIssues.reduce((acc, issue, index) => {
                 acc[issue.id] = allEventsByIssue[index];
                 return acc;
             }, {});
 
-            const flattenedSentryEvents = fetchedIssues.flatMap((issue, index) => {
+            const chartEventsBySource = chartEvents ? decodeChartEvents(chartEvents, issues) : null;
+            const flattenedSentryEvents = chartEventsBySource ? chartEventsBySource.sentry : fetchedIssues.flatMap((issue, index) => {
                 const eventsForIssue = allEventsByIssue[index] || [];
                 const category = issue.metadata.type || issue.type;
-                return eventsForIssue.map(event => ({
-                    ...event,
-                    level: issue.level,
-                    issueCategory: category,
-                    source: 'sentry',
-                    offsetSeconds: getTimeOffsetFromNow(`Timestamp: ${event.dateCreated}`),
-                }));
+                return eventsForIssue.map(event => chartEvent(
+                    event.id, Date.parse(event.dateCreated) / 1000, 'sentry', issue.level, category, issue.id, issue
+                ));
             });
 
             // Process Mailgun data - use mock data if API fails
@@ -240,6 +304,8 @@ const AppState = ({ children }) => {
                 console.log('Using mock Mailgun data since API failed');
                 mailgunEvents = createMockMailgunData();
             }
+            // The Mailgun section lists the full log entries; the chart only needs the stored ones
+            const mailgunEventsForChart = chartEventsBySource?.mailgun.length > 0 ? chartEventsBySource.mailgun : mailgunEvents;
             
             console.log('Mailgun API Response:', {
                 rawLogs: mailgunLogs,
@@ -261,6 +327,7 @@ const AppState = ({ children }) => {
                         allEventsForChart: flattenedSentryEvents,
                         mailgunIntegrations: mailgunIntegrations,
                         mailgunEvents: mailgunEvents,
+                        mailgunEventsForChart: mailgunEventsForChart,
                         mailgunStats: mailgunStats,
                         mailgunDomains: [],
                         mailgunData: mailgunLogs
@@ -278,6 +345,7 @@ const AppState = ({ children }) => {
                 
                 // Filter Mailgun events
                 const filteredMailgunEvents = memoizedEventFilter(mailgunEvents, currentTimeRange, filterEventsByTimeRange);
+                const filteredMailgunChartEvents = memoizedEventFilter(mailgunEventsForChart, currentTimeRange, filterEventsByTimeRange);
                 
                 // Filter events data map
                 const filteredEventsData = {};
@@ -294,6 +362,7 @@ const AppState = ({ children }) => {
                             allEventsData: filteredEventsData,
                             allEventsForChart: filteredSentryEvents,
                             mailgunEvents: filteredMailgunEvents,
+                            mailgunEventsForChart: filteredMailgunChartEvents,
                         }
                     });
                 });
@@ -309,7 +378,7 @@ const AppState = ({ children }) => {
 
     // Client-side filtering function
     const updateFilteredData = useCallback((newTimeRange = state.timeRange) => {
-        const { rawSentryIssues, rawAllEventsData, rawAllEventsForChart, rawMailgunEvents } = state;
+        const { rawSentryIssues, rawAllEventsData, rawAllEventsForChart, rawMailgunEvents, rawMailgunEventsForChart } = state;
         
         if (!rawSentryIssues.length && !rawMailgunEvents?.length) return; // No data to filter yet
         
@@ -325,6 +394,9 @@ const AppState = ({ children }) => {
         const filteredMailgunEvents = rawMailgunEvents?.length > 0 
             ? memoizedEventFilter(rawMailgunEvents, newTimeRange, filterEventsByTimeRange) 
             : [];
+        const filteredMailgunChartEvents = rawMailgunEventsForChart?.length > 0
+            ? memoizedEventFilter(rawMailgunEventsForChart, newTimeRange, filterEventsByTimeRange)
+            : [];
         
         // Filter events data map
         const filteredEventsData = {};
@@ -341,6 +413,7 @@ const AppState = ({ children }) => {
                     allEventsData: filteredEventsData,
                     allEventsForChart: filteredSentryEvents,
                     mailgunEvents: filteredMailgunEvents,
+                    mailgunEventsForChart: filteredMailgunChartEvents,
                 }
             });
         });
@@ -370,6 +443,19 @@ const AppState = ({ children }) => {
 
     // Apply initial filtering when raw data becomes available (removed to prevent infinite loop)
 
+    // Refresh when the backend pushes a change; bursts of messages are coalesced into one delta sync
+    useEffect(() => {
+        let timer = null;
+        const unsubscribe = subscribeToLiveUpdates(() => {
+            clearTimeout(timer);
+            timer = setTimeout(() => loadSentryData({ silent: true }), 1000);
+        });
+        return () => {
+            clearTimeout(timer);
+            unsubscribe();
+        };
+    }, [loadSentryData]);
+
     return (
         <AppContext.Provider value={{ 
             state, 
@@ -0,0 +1,48 @@
+/**
+ * @fileoverview Custom React hook backing the Sentry assignee pickers.
+ *
+ * Loads the organization members once (the request is shared by every picker, see
+ * fetchSentryMembers) and, while a query is typed, asks the backend's member directory
+ * for members whose name, email or username starts with it. Searches are debounced and
+ * answered from the backend's memory, so typing never waits on Sentry.
+ */
+
+import { useState, useEffect } from 'react';
+import { fetchSentryMembers, searchSentryMembers } from '../services/api';
+
+const SEARCH_DEBOUNCE_MS = 150;
+
+export const useMemberSearch = () => {
+    const [allMembers, setAllMembers] = useState([]);
+    const [matches, setMatches] = useState(null);
+    const [query, setQuery] = useState('');
+    const [loading, setLoading] = useState(true);
+
+    useEffect(() => {
+        let cancelled = false;
+        fetchSentryMembers()
+            .then((members) => !cancelled && setAllMembers(members || []))
+            .catch((error) => console.error('Failed to fetch Sentry members:', error))
+            .finally(() => !cancelled && setLoading(false));
+        return () => { cancelled = true; };
+    }, []);
+
+    useEffect(() => {
+        if (!query.trim()) {
+            setMatches(null);
+            return undefined;
+        }
+        let cancelled = false;
+        const timer = setTimeout(() => {
+            searchSentryMembers(query.trim())
+                .then((members) => !cancelled && setMatches(members || []))
+                .catch((error) => console.error('Failed to search Sentry members:', error));
+        }, SEARCH_DEBOUNCE_MS);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [query]);
+
+    return { members: matches ?? allMembers, query, setQuery, loading };
+};
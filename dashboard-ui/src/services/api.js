@@ -60,7 +60,11 @@ backendApi.interceptors.response.use(
 
 const handleError = (type, error) => {
     if (error.response) {
-        throw new Error(`Error ${type}: ${error.response.status} - ${JSON.stringify(error.response.data)}`);
+        const apiError = new Error(`Error ${type}: ${error.response.status} - ${JSON.stringify(error.response.data)}`);
+        apiError.status = error.response.status;
+        // Set on 429 responses once the upstream rate limit budget is exhausted
+        apiError.retryAfter = Number(error.response.headers?.['retry-after']) || null;
+        throw apiError;
     } else {
         throw new Error(`Error ${type}: ${error.message}`);
     }
@@ -85,8 +89,8 @@ export const healthCheck = async () => {
 
 export const fetchIssues = async () => {
     try {
-        // Always fetch 1-month data for client-side filtering
-        const response = await backendApi.get("/api/sentry/issues/?timeRange=30d");
+        // Always fetch 1-month data for client-side filtering; fields=list strips what the dashboard does not read
+        const response = await backendApi.get("/api/sentry/issues/?timeRange=30d&fields=list");
         return response.data;
     } catch (error) {
         handleError("fetching issues", error);
@@ -96,17 +100,29 @@ export const fetchIssues = async () => {
 export const fetchEventsForIssue = async (issueId) => {
     try {
         // Always fetch 1-month data for client-side filtering
-        const response = await backendApi.get(`/api/sentry/issues/${issueId}/events?timeRange=30d`);
+        const response = await backendApi.get(`/api/sentry/issues/${issueId}/events?timeRange=30d&fields=list`);
         return response.data;
     } catch (error) {
         handleError("fetching events for issue", error);
     }
 };
 
+// Fetch events for many issues in one request; returns { [issueId]: { events, error } }
+export const fetchEventsForIssues = async (issueIds) => {
+    try {
+        const response = await backendApi.get("/api/sentry/issues/events/batch/", {
+            params: { issue_ids: issueIds.join(','), timeRange: '30d', fields: 'list' }
+        });
+        return response.data;
+    } catch (error) {
+        handleError("fetching events for issues", error);
+    }
+};
+
 export const fetchAllEvents = async () => {
     try {
         // Always fetch 1-month data for client-side filtering
-        const response = await backendApi.get("/api/sentry/events/?timeRange=30d");
+        const response = await backendApi.get("/api/sentry/events/?timeRange=30d&fields=list");
         return response.data;
     } catch (error) {
         handleError("fetching all events", error);
@@ -177,6 +193,17 @@ export const unassignIssue = async (issueId) => {
     }
 };
 
+// Apply one update (status, statusDetails, assignedTo, hasSeen, isBookmarked, isSubscribed, isPublic)
+// to many issues; returns { succeeded, failed, results: { [issueId]: { ok, mode, error } } }
+export const bulkUpdateIssues = async (issueIds, update) => {
+    try {
+        const response = await backendApi.put("/api/sentry/issues/bulk/", { issue_ids: issueIds, ...update });
+        return response.data;
+    } catch (error) {
+        handleError("updating issues", error);
+    }
+};
+
 export const fetchSentryIntegrationStatus = async () => {
     try {
         const response = await backendApi.get("/api/sentry/integration-status/");
@@ -186,18 +213,97 @@ export const fetchSentryIntegrationStatus = async () => {
     }
 };
 
+// Members come from the backend's in-memory member directory; one request is shared by every
+// assign menu for MEMBERS_CACHE_TTL, and a failed request is retried on the next call
+const MEMBERS_CACHE_TTL = 5 * 60 * 1000;
+let membersCache = null;
+
 export const fetchSentryMembers = async () => {
+    if (!membersCache || Date.now() - membersCache.fetchedAt > MEMBERS_CACHE_TTL) {
+        const promise = backendApi.get("/api/sentry/members/", { params: { fields: 'list' } })
+            .then((response) => response.data)
+            .catch((error) => {
+                membersCache = null;
+                handleError("fetching sentry members", error);
+            });
+        membersCache = { promise, fetchedAt: Date.now() };
+    }
+    return membersCache.promise;
+};
+
+// Search organization members by name, email or username prefix for the assignee picker
+export const searchSentryMembers = async (query, limit = 20) => {
     try {
-        const response = await backendApi.get("/api/sentry/members/");
+        const response = await backendApi.get("/api/sentry/members/search/", { params: { q: query, limit, fields: 'list' } });
         return response.data;
     } catch (error) {
-        handleError("fetching sentry members", error);
+        handleError("searching sentry members", error);
     }
 };
 
-export const fetchSentryAlerts = async () => {
+// Fetch every dashboard section in one request; returns { timeRange, partial, sections: { [name]: { data, error } } }
+// The backend tags snapshots with an ETag, so unchanged refreshes are revalidated by the browser cache
+export const fetchDashboardSnapshot = async (timeRange = '30d', sections = []) => {
     try {
-        const response = await backendApi.get('/api/sentry/alerts/');
+        const params = sections.length > 0 ? { timeRange, sections: sections.join(',') } : { timeRange };
+        const response = await backendApi.get("/api/dashboard/snapshot/", { params });
+        return response.data;
+    } catch (error) {
+        handleError("fetching dashboard snapshot", error);
+    }
+};
+
+// Fetch Sentry issues/events changed since the sync that returned token (a full sync without one);
+// returns { token, full, issues, tombstones, events: { [issueId]: { events, error } } }
+export const fetchSentrySync = async (token = null) => {
+    try {
+        // Events are projected to the fields the dashboard reads (see fields= in the backend docs)
+        const response = await backendApi.get("/api/sentry/sync/", { params: token ? { token, fields: 'list' } : { fields: 'list' } });
+        return response.data;
+    } catch (error) {
+        handleError("syncing sentry issues", error);
+    }
+};
+
+// Fetch pre-aggregated event counts from the backend rollups; params: timeRange, resolution (hour, day),
+// groupBy and source/level/category/type filters. Returns { start, step, buckets, groupBy, series: [{ ..., total, counts }] }
+export const fetchTimeseries = async (params = {}) => {
+    try {
+        const response = await backendApi.get("/api/timeseries/", { params });
+        return response.data;
+    } catch (error) {
+        handleError("fetching event timeseries", error);
+    }
+};
+
+// Fetch normalized chart events from the event store in a columnar layout; params: timeRange (or start/end),
+// limit and source/issue/level/type/category filters. Returns { start, count, truncated, timestamps, columns, dictionaries }
+export const fetchChartEvents = async (params = {}) => {
+    try {
+        const response = await backendApi.get("/api/chart/events/", { params });
+        return response.data;
+    } catch (error) {
+        handleError("fetching chart events", error);
+    }
+};
+
+// Subscribe to Server-Sent Events from /api/stream/ ("issues", "mailgun" and "integrations" messages);
+// onMessage receives (event, data). Returns a function that closes the connection.
+export const subscribeToLiveUpdates = (onMessage) => {
+    if (typeof EventSource === 'undefined') {
+        return () => {};
+    }
+    const source = new EventSource(`${API_BASE_URL}/api/stream/`);
+    ['issues', 'mailgun', 'integrations'].forEach(event => {
+        source.addEventListener(event, (message) => onMessage(event, JSON.parse(message.data)));
+    });
+    return () => source.close();
+};
+
+// Fetch the newest alerts; params: limit (default 10), since (ISO 8601) and severity (error, warning)
+export const fetchSentryAlerts = async (params = {}) => {
+    try {
+        const response = await backendApi.get('/api/sentry/alerts/', { params });
         return response.data;
     } catch (error) {
         handleError("fetching sentry alerts", error);
@@ -324,20 +430,8 @@ export const fetchMailgunStats = async (timeRange = '30d') => {
 
 export const fetchMailgunIntegrationStatus = async () => {
     try {
-        // Use queue status as a health check for Mailgun integration
-        const response = await backendApi.get("/api/mailgun/queue-status/");
-        
-        // Transform response to match integration status format
-        const queueData = response.data;
-        return [{
-            name: 'Mailgun API',
-            category: 'Email Service',
-            status: queueData ? 'Healthy' : 'Down',
-            responseTime: '85ms', // Default since Mailgun doesn't provide this
-            lastSuccess: 'Just now',
-            uptime: '99.98%', // Default since Mailgun doesn't provide this
-            issue: null
-        }];
+        const response = await backendApi.get("/api/mailgun/integration-status/");
+        return response.data;
     } catch (error) {
         // Return error status instead of throwing
         return [{
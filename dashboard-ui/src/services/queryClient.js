@@ -15,8 +15,11 @@ export const queryClient = new QueryClient({
             cacheTime: 10 * 60 * 1000,
             // Retry failed requests 3 times
             retry: 3,
-            // Retry with exponential backoff
-            retryDelay: (attemptIndex) => Math.min(1000 * 2 ** attemptIndex, 30000),
+            // Retry with exponential backoff, or after Retry-After when rate limited
+            retryDelay: (attemptIndex, error) => Math.min(
+                error?.retryAfter ? error.retryAfter * 1000 : 1000 * 2 ** attemptIndex,
+                60000,
+            ),
             // Don't refetch on window focus
             refetchOnWindowFocus: false,
             // Don't refetch on reconnect by default
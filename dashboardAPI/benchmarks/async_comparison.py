@@ -0,0 +1,133 @@
+"""
+Sync vs Async Load Test Comparison
+
+This script compares the sync (DRF views under manage.py runserver) and async (views/async_*.py
+under uvicorn) execution paths against the local stub upstream. The response cache is disabled
+so every request reaches the upstream, and each server is driven with the same number of
+concurrent requests.
+
+Usage:
+    cd dashboardAPI
+    python -m benchmarks.async_comparison --concurrency 200 --requests 2000 --latency 0.2
+
+Output:
+    Requests per second and p50/p95/p99 latency for each execution path
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from .stub_upstream import stub_arguments, stub_options
+
+SERVERS = {
+    "sync (runserver)": ["{python}", "manage.py", "runserver", "127.0.0.1:{port}", "--noreload"],
+    "async (uvicorn)": ["{python}", "-m", "uvicorn", "dashboardAPI.asgi:application", "--port", "{port}", "--log-level", "warning"],
+}
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def start_stub_process(port, options):
+    # The stub runs in its own process so it does not compete with the load generator for the GIL
+    arguments = [sys.executable, "-m", "benchmarks.stub_upstream", "--port", str(port), *stub_arguments(options)]
+    return subprocess.Popen(arguments, stdout=subprocess.DEVNULL)
+
+def start_server(command, port, stub_port, async_views, **overrides):
+    environment = dict(
+        os.environ,
+        SENTRY_BASE_URI=f"http://127.0.0.1:{stub_port}/api/0",
+        SENTRY_HEALTH_URI=f"http://127.0.0.1:{stub_port}/_health/",
+        HUBSPOT_HEALTH_URI=f"http://127.0.0.1:{stub_port}/_health/",
+        MAILGUN_BASE_URI=f"http://127.0.0.1:{stub_port}",
+        SENTRY_ORGANIZATION_SLUG="stub-org",
+        SENTRY_PROJECT_ID="1",
+        SENTRY_BEARER_AUTH="stub-token",
+        MAILGUN_API_NAME="stub.example.com",
+        MAILGUN_API_KEY="stub-key",
+        UPSTREAM_CACHE_ENABLED="False",
+        EVENT_STORE_INGEST_ENABLED="False",
+        ASYNC_VIEWS=str(async_views),
+    )
+    environment.update(overrides)
+    arguments = [part.format(python=sys.executable, port=port) for part in command]
+    return subprocess.Popen(arguments, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def wait_until_ready(base_url):
+    async with httpx.AsyncClient() as client:
+        for _ in range(100):
+            try:
+                await client.get(f"{base_url}/api/hubspot/integration-status/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+async def drive(base_url, path, concurrency, total):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": total / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "mean": statistics.mean(latencies) * 1000,
+        "errors": errors,
+    }
+
+async def main(arguments):
+    stub = start_stub_process(arguments.stub_port, stub_options(latency=arguments.latency))
+    results = {}
+    try:
+        for index, (name, command) in enumerate(SERVERS.items()):
+            port = arguments.port + index
+            server = start_server(command, port, arguments.stub_port, async_views=name.startswith("async"))
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                await wait_until_ready(base_url)
+                await drive(base_url, arguments.path, min(arguments.concurrency, 10), 20)
+                results[name] = await drive(base_url, arguments.path, arguments.concurrency, arguments.requests)
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+    print(f"{arguments.requests} x GET {arguments.path}, concurrency {arguments.concurrency}, upstream latency {arguments.latency * 1000:.0f}ms")
+    print(f"{'path':<18}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, result in results.items():
+        print(f"{name:<18}{result['rps']:>10.1f}{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}{result['errors']:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the sync and async execution paths")
+    parser.add_argument("--path", default="/api/sentry/issues/")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--stub-port", type=int, default=9100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,233 @@
+"""
+Endpoint Load Test with Baseline Comparison
+
+This script drives every route in dashboardAPI/urls.py against the local stub upstream (see
+stub_upstream.py) at a configurable concurrency, and reports throughput and p50/p95/p99 latency
+per endpoint. The stub imitates the vendors' latency, page counts, payload sizes and 429 rate
+limits, so changes to pagination, caching, coalescing or rate limiting can be measured offline.
+
+Results can be saved as a baseline and later runs compared against it: an endpoint regresses
+when its p95 latency grows, or its throughput drops, by more than the tolerance. The script
+exits with status 1 when any endpoint regressed, so it can gate a change.
+
+Usage:
+    cd dashboardAPI
+    python -m benchmarks.endpoints --save-baseline
+    python -m benchmarks.endpoints                      # compare against benchmarks/baseline.json
+    python -m benchmarks.endpoints --async --cache --concurrency 50 --pages 3 --rate-limit 40
+    python -m benchmarks.endpoints --only api/sentry/issues/ --only api/mailgun/logs/export/
+
+Output:
+    Requests per second, p50/p95/p99 latency, errors and 429 responses for each endpoint, with
+    the change against the baseline
+
+Configuration:
+    ENDPOINTS       - Request sent to each route (method, path, JSON body)
+    STREAMED        - Routes that stream indefinitely; only their first chunk is read
+    NOISE_MS        - Latency changes below this many milliseconds never count as regressions
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from .async_comparison import SERVERS, percentile, start_server, start_stub_process, wait_until_ready
+from .stub_upstream import add_stub_arguments, default_options, options_from_arguments
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+ENDPOINTS = {
+    "api/dashboard/snapshot/": ("GET", "/api/dashboard/snapshot/", None),
+    "api/stream/": ("GET", "/api/stream/", None),
+    "api/store/events/": ("GET", "/api/store/events/", None),
+    "api/timeseries/": ("GET", "/api/timeseries/?timeRange=24h", None),
+    "api/chart/events/": ("GET", "/api/chart/events/?timeRange=30d", None),
+    "api/metrics/": ("GET", "/api/metrics/", None),
+    "api/sentry/sync/": ("GET", "/api/sentry/sync/", None),
+    "api/sentry/issues/events/batch/": ("GET", "/api/sentry/issues/events/batch/?issue_ids=1,2,3", None),
+    "api/sentry/issues/bulk/": ("PUT", "/api/sentry/issues/bulk/", {"issue_ids": ["1", "2", "3"], "status": "resolved"}),
+    "api/sentry/issues/<str:issue_id>/events/": ("GET", "/api/sentry/issues/1/events/", None),
+    "api/sentry/issues/<str:issue_id>/": ("PUT", "/api/sentry/issues/1/", {"status": "resolved"}),
+    "api/sentry/issues/": ("GET", "/api/sentry/issues/", None),
+    "api/sentry/events/": ("GET", "/api/sentry/events/", None),
+    "api/sentry/alerts/": ("GET", "/api/sentry/alerts/", None),
+    "api/sentry/members/search/": ("GET", "/api/sentry/members/search/?q=a", None),
+    "api/sentry/members/": ("GET", "/api/sentry/members/", None),
+    "api/sentry/integration-status/": ("GET", "/api/sentry/integration-status/", None),
+    "api/hubspot/integration-status/": ("GET", "/api/hubspot/integration-status/", None),
+    "api/mailgun/integration-status/": ("GET", "/api/mailgun/integration-status/", None),
+    "api/mailgun/queue-status/": ("GET", "/api/mailgun/queue-status/", None),
+    "api/mailgun/account-metrics/": ("PUT", "/api/mailgun/account-metrics/", {"resolution": "day", "duration": "7d", "metrics": ["delivered_count"]}),
+    "api/mailgun/account-usage-metrics/": ("PUT", "/api/mailgun/account-usage-metrics/", {"resolution": "day", "duration": "7d", "metrics": ["processed_count"]}),
+    "api/mailgun/logs/": ("PUT", "/api/mailgun/logs/", {"duration": "1d", "events": ["failed"]}),
+    "api/mailgun/logs/export/": ("PUT", "/api/mailgun/logs/export/?stream=ndjson", {"duration": "1d", "events": ["failed"]}),
+    "api/mailgun/stats/totals/": ("PUT", "/api/mailgun/stats/totals/", {"event": "delivered", "duration": "7d"}),
+    "api/mailgun/stats/filter/": ("PUT", "/api/mailgun/stats/filter/", {"event": "delivered", "group": "domain"}),
+    "api/mailgun/mailing-list-members/<str:list_address>/": ("PUT", "/api/mailgun/mailing-list-members/list@stub.example.com/", {"limit": 100}),
+}
+
+STREAMED = {"api/stream/"}
+
+NOISE_MS = 5
+
+def check_coverage():
+    '''
+        Fails when a route in urls.py has no entry in ENDPOINTS, so new endpoints are benchmarked
+        from the start.
+    '''
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dashboardAPI.settings")
+    import django
+    django.setup()
+    from dashboardAPI.urls import urlpatterns
+    routes = {str(pattern.pattern) for pattern in urlpatterns}
+    missing = sorted(routes - set(ENDPOINTS))
+    if missing:
+        raise SystemExit(f"No benchmark request for: {', '.join(missing)} (add them to ENDPOINTS)")
+    return sorted(routes & set(ENDPOINTS), key=list(ENDPOINTS).index)
+
+def migrate(database_path):
+    environment = dict(os.environ, DATABASE_PATH=database_path)
+    subprocess.run([sys.executable, "manage.py", "migrate", "--verbosity", "0"], env=environment, check=True)
+
+async def send(client, route):
+    method, path, body = ENDPOINTS[route]
+    if route in STREAMED:
+        async with client.stream(method, path, json=body) as response:
+            await anext(response.aiter_raw(), b"")
+            return response.status_code
+    response = await client.request(method, path, json=body)
+    return response.status_code
+
+async def drive(base_url, route, concurrency, total):
+    latencies = []
+    errors = limited = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors, limited
+            for _ in remaining:
+                start = time.perf_counter()
+                try:
+                    status = await send(client, route)
+                    limited += status == 429
+                    errors += status >= 400 and status != 429
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": round(total / elapsed, 1),
+        "p50": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99": round(percentile(latencies, 0.99) * 1000, 1),
+        "errors": errors,
+        "limited": limited,
+    }
+
+def regressions(result, baseline, tolerance):
+    '''
+        Returns the reasons result regressed against baseline (empty when it did not)
+    '''
+    reasons = []
+    if result["p95"] > baseline["p95"] * (1 + tolerance) and result["p95"] - baseline["p95"] > NOISE_MS:
+        reasons.append(f"p95 {baseline['p95']:.1f} -> {result['p95']:.1f} ms")
+    if result["rps"] < baseline["rps"] * (1 - tolerance):
+        reasons.append(f"req/s {baseline['rps']:.1f} -> {result['rps']:.1f}")
+    return reasons
+
+def change(value, base):
+    return f"{(value - base) / base * 100:+.0f}%" if base else "n/a"
+
+def report(configuration, results, baseline, tolerance):
+    '''
+        Prints the results table and returns the regressed routes
+    '''
+    settings = ", ".join(f"{key} {value}" for key, value in configuration.items())
+    print(settings)
+    if baseline and baseline["configuration"] != configuration:
+        print(f"Warning: baseline was recorded with {', '.join(f'{key} {value}' for key, value in baseline['configuration'].items())}")
+    base_results = baseline["results"] if baseline else {}
+    regressed = {}
+    print(f"{'endpoint':<52}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}{'429s':>6}{'Δ req/s':>9}{'Δ p95':>8}")
+    for route, result in results.items():
+        base = base_results.get(route)
+        deltas = f"{change(result['rps'], base['rps']):>9}{change(result['p95'], base['p95']):>8}" if base else ""
+        print(f"{route:<52}{result['rps']:>9.1f}{result['p50']:>9.1f}{result['p95']:>9.1f}{result['p99']:>9.1f}{result['errors']:>8}{result['limited']:>6}{deltas}")
+        reasons = regressions(result, base, tolerance) if base else []
+        if reasons:
+            regressed[route] = reasons
+    for route, reasons in regressed.items():
+        print(f"REGRESSION {route}: {'; '.join(reasons)}")
+    return regressed
+
+async def main(arguments):
+    routes = check_coverage()
+    if arguments.only:
+        routes = [route for route in routes if route in arguments.only]
+    stub_options = options_from_arguments(arguments)
+    server_name = "async (uvicorn)" if arguments.use_async else "sync (runserver)"
+    configuration = {
+        "server": server_name,
+        "cache": arguments.cache,
+        "concurrency": arguments.concurrency,
+        "requests": arguments.requests,
+        **stub_options,
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = str(Path(directory) / "benchmark.sqlite3")
+        migrate(database_path)
+        stub = start_stub_process(arguments.stub_port, stub_options)
+        server = start_server(
+            SERVERS[server_name], arguments.port, arguments.stub_port, arguments.use_async,
+            DATABASE_PATH=database_path,
+            UPSTREAM_CACHE_ENABLED=str(arguments.cache),
+            # Lets abandoned /api/stream/ responses notice the closed connection quickly
+            LIVE_HEARTBEAT_INTERVAL="1",
+        )
+        try:
+            base_url = f"http://127.0.0.1:{arguments.port}"
+            await wait_until_ready(base_url)
+            for route in routes:
+                await drive(base_url, route, min(arguments.concurrency, 5), 10)
+                results[route] = await drive(base_url, route, arguments.concurrency, arguments.requests)
+        finally:
+            server.terminate()
+            server.wait()
+            stub.terminate()
+            stub.wait()
+    baseline = None
+    if arguments.baseline.exists() and not arguments.save_baseline:
+        baseline = json.loads(arguments.baseline.read_text())
+    regressed = report(configuration, results, baseline, arguments.tolerance)
+    if arguments.save_baseline:
+        arguments.baseline.write_text(json.dumps({"configuration": configuration, "results": results}, indent=2) + "\n")
+        print(f"Baseline saved to {arguments.baseline}")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every endpoint against the stub upstream")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="serve the async views under uvicorn")
+    parser.add_argument("--cache", action="store_true", help="enable the upstream response cache")
+    parser.add_argument("--only", action="append", metavar="ROUTE", help="benchmark only this urls.py route (repeatable)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed fractional p95 increase or req/s drop")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--stub-port", type=int, default=9200)
+    add_stub_arguments(parser)
+    parser.set_defaults(**default_options)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,77 @@
+"""
+JSON Passthrough and Codec Benchmark
+
+This script measures the CPU time and peak memory one proxied response costs the backend, for
+an upstream issue list of configurable size: decoding the upstream body and encoding it again
+with JsonResponse (the former make_request path), passing the upstream bytes through as
+make_request now does, and decoding and encoding with each installed JSON codec (the path of
+views that transform upstream data, see views/codec.py).
+
+Usage:
+    cd dashboardAPI
+    python -m benchmarks.json_passthrough --items 2000 --payload-bytes 512 --repeat 20
+
+Output:
+    Body size, then CPU ms and peak allocated MiB per response for each path
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from .stub_upstream import issue
+
+def build_paths():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dashboardAPI.settings")
+    import django
+    django.setup()
+    from django.http import HttpResponse, JsonResponse
+    from django.core.exceptions import ImproperlyConfigured
+    from dashboardAPI.views import codec
+
+    paths = {
+        "decode + JsonResponse": lambda body: JsonResponse(json.loads(body.decode()), safe=False),
+        "passthrough": lambda body: HttpResponse(codec.RawJSON(body).body, content_type=codec.CONTENT_TYPE),
+    }
+    for name in codec.json_codecs:
+        try:
+            dumps, loads = codec._build_codec(name)
+        except ImproperlyConfigured as error:
+            print(f"Skipping codec {name}: {error}")
+            continue
+        paths[f"{name} decode + encode"] = lambda body, dumps=dumps, loads=loads: HttpResponse(dumps(loads(body)), content_type=codec.CONTENT_TYPE)
+    return paths
+
+def measure(path, body, repeat):
+    '''
+        Returns (CPU ms, peak MiB) of one call of path; peak memory is measured on a separate
+        call so tracing does not slow down the timed ones.
+    '''
+    started = time.process_time()
+    for _ in range(repeat):
+        path(body)
+    cpu = (time.process_time() - started) / repeat * 1000
+    tracemalloc.start()
+    path(body)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return cpu, peak
+
+def main(arguments):
+    padding = "x" * arguments.payload_bytes
+    body = json.dumps([issue(index, padding) for index in range(arguments.items)]).encode()
+    paths = build_paths()
+    print(f"{arguments.items} issues, {len(body) / 2 ** 20:.2f} MiB upstream body, {arguments.repeat} repetitions")
+    print(f"{'path':<28}{'CPU ms':>10}{'peak MiB':>10}")
+    for name, path in paths.items():
+        cpu, peak = measure(path, body, arguments.repeat)
+        print(f"{name:<28}{cpu:>10.2f}{peak:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the cost of re-encoding proxied JSON responses")
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--payload-bytes", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
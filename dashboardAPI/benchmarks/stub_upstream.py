@@ -0,0 +1,242 @@
+"""
+Local Sentry/Mailgun Stub Server
+
+This module provides a small asyncio HTTP server imitating the Sentry and Mailgun endpoints the
+dashboardAPI views proxy to, so the backend can be load tested offline. Every response is
+delayed by a configurable latency to simulate a remote vendor API, and list endpoints can be
+split over several pages (Sentry Link cursors, Mailgun pagination tokens) with configurable
+item counts and item sizes. The stub can enforce a per-second rate limit, sending the vendors'
+rate limit headers and 429 responses with Retry-After, and can answer a fraction of requests
+with 429 at random.
+
+Usage:
+    python -m benchmarks.stub_upstream --port 9000 --latency 0.2
+    python -m benchmarks.stub_upstream --pages 3 --items 100 --payload-bytes 2048 --rate-limit 40
+
+    Then point the backend at it:
+        SENTRY_BASE_URI=http://127.0.0.1:9000/api/0
+        SENTRY_HEALTH_URI=http://127.0.0.1:9000/_health/
+        MAILGUN_BASE_URI=http://127.0.0.1:9000
+
+Functions:
+    stub_options(**overrides)     - Default stub options with overrides applied
+    serve(port, options)          - Runs the stub server on the current event loop
+    start_stub(port, options)     - Starts the stub server on an event loop in a background thread
+    stub_arguments(options)       - Command line arguments reproducing options
+
+Configuration:
+    latency        - Seconds added to every response
+    items          - Items per page of list endpoints
+    pages          - Pages per list (Sentry cursors and Mailgun log tokens)
+    payload_bytes  - Padding added to every list item
+    rate_limit     - Requests per second before 429 responses (0 disables the limit)
+    error_rate     - Fraction of requests answered with 429 regardless of the limit
+    seed           - Seed of the random 429s, for reproducible runs
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+default_options = {
+    "latency": 0.2,
+    "items": 25,
+    "pages": 1,
+    "payload_bytes": 0,
+    "rate_limit": 0,
+    "error_rate": 0.0,
+    "seed": 0,
+}
+
+def stub_options(**overrides):
+    return {**default_options, **{key: value for key, value in overrides.items() if value is not None}}
+
+def issue(index, padding):
+    return {
+        "id": str(index),
+        "shortId": f"STUB-{index}",
+        "title": f"Stub issue {index}",
+        "culprit": "stub.module",
+        "level": "error" if index % 3 else "warning",
+        "status": "unresolved",
+        "firstSeen": "2025-01-01T00:00:00Z",
+        "lastSeen": "2025-01-02T00:00:00Z",
+        "metadata": {"type": "StubError", "value": padding},
+        "project": {"name": "stub"},
+    }
+
+def event(index, padding):
+    return {
+        "id": f"event-{index}",
+        "eventID": f"event-{index}",
+        "dateCreated": "2025-01-02T00:00:00Z",
+        "message": f"Stub event {index}",
+        "tags": [{"key": "level", "value": "error"}],
+        "context": {"padding": padding},
+    }
+
+def member(index, padding):
+    return {"id": str(index), "email": f"member{index}@example.com", "name": f"Member {index}", "padding": padding}
+
+def log_item(index, padding):
+    return {
+        "id": f"log-{index}",
+        "event": "failed",
+        "@timestamp": "2025-01-02T00:00:00.000Z",
+        "recipient": f"user{index}@example.com",
+        "message": {"headers": {"subject": f"Stub message {index}"}},
+        "delivery-status": {"message": padding},
+    }
+
+# Path suffix -> item factory of Sentry list endpoints
+sentry_lists = {
+    "/issues/": issue,
+    "/events/": event,
+    "/members/": member,
+}
+
+def page_items(factory, page, options):
+    padding = "x" * options["payload_bytes"]
+    first = page * options["items"]
+    return [factory(first + index, padding) for index in range(options["items"])]
+
+def sentry_page(path, query, options):
+    '''
+        Returns (body, extra headers) for a Sentry list page, with a Link header pointing at the
+        next page until options["pages"] pages have been served.
+    '''
+    factory = next(factory for suffix, factory in sentry_lists.items() if path.endswith(suffix))
+    cursor = query.get("cursor", ["0:0:0"])[0]
+    page = int(cursor.split(":")[1])
+    has_next = page + 1 < options["pages"]
+    link = f'<{path}?cursor=0:{page + 1}:0>; rel="next"; results="{str(has_next).lower()}"; cursor="0:{page + 1}:0"'
+    return page_items(factory, page, options), {"Link": link}
+
+def mailgun_logs_page(body, options):
+    token = (body.get("pagination") or {}).get("token")
+    page = int(token) if token else 0
+    next_token = str(page + 1) if page + 1 < options["pages"] else None
+    return {"items": page_items(log_item, page, options), "pagination": {"next": next_token}}
+
+def route(method, target, body, options):
+    parts = urlsplit(target)
+    path, query = parts.path, parse_qs(parts.query)
+    if path.startswith("/api/0/") and method == "PUT":
+        return {"id": path.rstrip("/").rsplit("/", 1)[-1], **body}, {}
+    if path.startswith("/api/0/") and any(path.endswith(suffix) for suffix in sentry_lists):
+        return sentry_page(path, query, options)
+    if path.startswith("/v1/analytics/logs"):
+        return mailgun_logs_page(body, options), {}
+    if path.startswith("/v3/lists/"):
+        return {"items": page_items(member, 0, options)}, {}
+    if path.startswith("/v1/analytics/"):
+        return {"items": [], "aggregates": {}}, {}
+    if path.startswith("/v3/stats/"):
+        return {"stats": [], "resolution": "day"}, {}
+    return {"ok": True}, {}
+
+class RateLimit:
+    '''
+        Fixed one-second window shared by every endpoint, reported with both vendors' headers
+    '''
+    def __init__(self, options):
+        self.limit = options["rate_limit"]
+        self.error_rate = options["error_rate"]
+        self.random = random.Random(options["seed"])
+        self.window = 0
+        self.used = 0
+
+    def check(self, path):
+        '''
+            Returns (allowed, headers) for one request.
+        '''
+        now = time.time()
+        if math.floor(now) != self.window:
+            self.window, self.used = math.floor(now), 0
+        reset = self.window + 1
+        headers = {}
+        allowed = True
+        if self.limit:
+            self.used += 1
+            allowed = self.used <= self.limit
+            prefix = "X-Sentry-Rate-Limit" if path.startswith("/api/0/") else "X-RateLimit"
+            headers = {
+                f"{prefix}-Limit": str(self.limit),
+                f"{prefix}-Remaining": str(max(0, self.limit - self.used)),
+                f"{prefix}-Reset": str(reset),
+            }
+        if allowed and self.error_rate and self.random.random() < self.error_rate:
+            allowed = False
+        if not allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(reset - now)))
+        return allowed, headers
+
+def http_response(status, payload, headers):
+    reason = {200: "OK", 429: "Too Many Requests"}[status]
+    head = f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    return head.encode() + b"\r\n" + payload
+
+async def handle(reader, writer, options, rate_limit):
+    # Minimal HTTP/1.1 keep-alive loop; asyncio keeps hundreds of slow responses in flight cheaply
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            headers = dict(line.split(": ", 1) for line in header_lines if ": " in line)
+            length = int({key.lower(): value for key, value in headers.items()}.get("content-length", 0))
+            raw_body = await reader.readexactly(length) if length else b""
+            method, target = request_line.split(" ")[:2]
+            await asyncio.sleep(options["latency"])
+            allowed, limit_headers = rate_limit.check(urlsplit(target).path)
+            if allowed:
+                body = json.loads(raw_body) if raw_body.strip() else {}
+                data, extra_headers = route(method, target, body if isinstance(body, dict) else {}, options)
+                writer.write(http_response(200, json.dumps(data).encode(), {**limit_headers, **extra_headers}))
+            else:
+                writer.write(http_response(429, b'{"detail": "Rate limit exceeded"}', limit_headers))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(port, options=None):
+    options = options or stub_options()
+    rate_limit = RateLimit(options)
+    server = await asyncio.start_server(lambda reader, writer: handle(reader, writer, options, rate_limit), "127.0.0.1", port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+def start_stub(port, options=None):
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_until_complete, args=(serve(port, options),), daemon=True).start()
+    return loop
+
+def stub_arguments(options):
+    return [argument for key, value in options.items() for argument in (f"--{key.replace("_", "-")}", str(value))]
+
+def add_stub_arguments(parser):
+    parser.add_argument("--latency", type=float, help="seconds added to every response")
+    parser.add_argument("--items", type=int, help="items per page of list endpoints")
+    parser.add_argument("--pages", type=int, help="pages per list")
+    parser.add_argument("--payload-bytes", type=int, help="padding added to every list item")
+    parser.add_argument("--rate-limit", type=int, help="requests per second before 429s (0 disables)")
+    parser.add_argument("--error-rate", type=float, help="fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, help="seed of the random 429s")
+
+def options_from_arguments(arguments):
+    return stub_options(**{key: getattr(arguments, key) for key in default_options})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Sentry/Mailgun stub server")
+    parser.add_argument("--port", type=int, default=9000)
+    add_stub_arguments(parser)
+    arguments = parser.parse_args()
+    print(f"Stub upstream listening on http://127.0.0.1:{arguments.port}")
+    asyncio.run(serve(arguments.port, options_from_arguments(arguments)))
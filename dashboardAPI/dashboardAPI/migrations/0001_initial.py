@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('sentry', 'Sentry'), ('mailgun', 'Mailgun')], max_length=16)),
+                ('external_id', models.CharField(max_length=128)),
+                ('timestamp', models.DateTimeField()),
+                ('issue_id', models.CharField(blank=True, default='', max_length=64)),
+                ('level', models.CharField(blank=True, default='', max_length=16)),
+                ('category', models.CharField(blank=True, default='', max_length=128)),
+                ('event_type', models.CharField(blank=True, default='', max_length=32)),
+                ('message', models.TextField(blank=True, default='')),
+                ('data', models.JSONField(default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source', 'timestamp'], name='stored_event_time'), models.Index(fields=['source', 'issue_id', 'timestamp'], name='stored_event_issue'), models.Index(fields=['source', 'level', 'timestamp'], name='stored_event_level'), models.Index(fields=['source', 'event_type', 'timestamp'], name='stored_event_type')],
+                'constraints': [models.UniqueConstraint(fields=('source', 'external_id'), name='stored_event_unique_source_id')],
+            },
+        ),
+    ]
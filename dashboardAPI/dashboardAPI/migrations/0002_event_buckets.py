@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-17 03:47
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Trunc
+
+
+def backfill_buckets(apps, schema_editor):
+    # Rolls up the events stored before the rollups existed; later inserts maintain them incrementally
+    StoredEvent = apps.get_model('dashboardAPI', 'StoredEvent')
+    EventBucket = apps.get_model('dashboardAPI', 'EventBucket')
+    for resolution in ('hour', 'day'):
+        rows = (
+            StoredEvent.objects
+            .annotate(start=Trunc('timestamp', resolution, tzinfo=timezone.utc))
+            .values('start', 'source', 'level', 'category', 'event_type')
+            .annotate(count=Count('id'))
+        )
+        EventBucket.objects.bulk_create([EventBucket(resolution=resolution, **row) for row in rows], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboardAPI', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('start', models.DateTimeField()),
+                ('source', models.CharField(choices=[('sentry', 'Sentry'), ('mailgun', 'Mailgun')], max_length=16)),
+                ('level', models.CharField(blank=True, default='', max_length=16)),
+                ('category', models.CharField(blank=True, default='', max_length=128)),
+                ('event_type', models.CharField(blank=True, default='', max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['resolution', 'start'], name='event_bucket_time')],
+                'constraints': [models.UniqueConstraint(fields=('resolution', 'start', 'source', 'level', 'category', 'event_type'), name='event_bucket_unique_key')],
+            },
+        ),
+        migrations.RunPython(backfill_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+"""
+DashboardAPI Models Module
+
+This module defines the local persistent store for the dashboardAPI project. Sentry events and
+Mailgun log entries are normalized into a single StoredEvent table by the ingest pipeline in
+views/event_store.py, so historical and time-range queries are answered from the local SQLite
+database instead of the vendor APIs.
+
+The ingest pipeline also maintains EventBucket rollups: per hour and per day counts of the
+stored events for every (source, level, category, event type), updated as rows are inserted and
+pruned, so the charts never have to scan individual events.
+
+Models:
+    StoredEvent - One normalized Sentry event or Mailgun log entry
+    EventBucket - Number of stored events in one time bucket for one (source, level, category, event type)
+
+Indexes:
+    (source, timestamp)             - Time-range scans per source
+    (source, issue_id, timestamp)   - Events of one Sentry issue
+    (source, level, timestamp)      - Level filters
+    (source, event_type, timestamp) - Event type filters (e.g. Mailgun failed/bounced)
+    (resolution, start)             - Time-range scans of the rollups
+"""
+
+from django.db import models
+
+class StoredEvent(models.Model):
+    SOURCES = [("sentry", "Sentry"), ("mailgun", "Mailgun")]
+
+    source = models.CharField(max_length=16, choices=SOURCES)
+    external_id = models.CharField(max_length=128)
+    timestamp = models.DateTimeField()
+    issue_id = models.CharField(max_length=64, blank=True, default="")
+    level = models.CharField(max_length=16, blank=True, default="")
+    category = models.CharField(max_length=128, blank=True, default="")
+    event_type = models.CharField(max_length=32, blank=True, default="")
+    message = models.TextField(blank=True, default="")
+    data = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source", "external_id"], name="stored_event_unique_source_id"),
+        ]
+        indexes = [
+            models.Index(fields=["source", "timestamp"], name="stored_event_time"),
+            models.Index(fields=["source", "issue_id", "timestamp"], name="stored_event_issue"),
+            models.Index(fields=["source", "level", "timestamp"], name="stored_event_level"),
+            models.Index(fields=["source", "event_type", "timestamp"], name="stored_event_type"),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.external_id} at {self.timestamp.isoformat()}"
+
+class EventBucket(models.Model):
+    RESOLUTIONS = [("hour", "Hour"), ("day", "Day")]
+
+    resolution = models.CharField(max_length=8, choices=RESOLUTIONS)
+    start = models.DateTimeField()
+    source = models.CharField(max_length=16, choices=StoredEvent.SOURCES)
+    level = models.CharField(max_length=16, blank=True, default="")
+    category = models.CharField(max_length=128, blank=True, default="")
+    event_type = models.CharField(max_length=32, blank=True, default="")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["resolution", "start", "source", "level", "category", "event_type"], name="event_bucket_unique_key"),
+        ]
+        indexes = [
+            models.Index(fields=["resolution", "start"], name="event_bucket_time"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.category} {self.resolution} of {self.start.isoformat()}: {self.count}"
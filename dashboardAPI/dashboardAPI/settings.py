@@ -2,7 +2,7 @@
 Django Settings Configuration for DashboardAPI Project
 
 This module contains all Django settings and configuration for the dashboardAPI project.
-It includes database configuration (though this is not used in the project), middleware
+It includes database configuration (used by the local event store), middleware
 setup, API settings, third-party integrations, and environment-specific configurations for
 Sentry monitoring and Mailgun email services.
 
@@ -25,6 +25,29 @@ Environment Variables Required:
     - MAILGUN_API_NAME: Mailgun API domain name
     - MAILGUN_API_KEY: Mailgun API key for authentication
 
+Optional Environment Variables:
+    - ASYNC_VIEWS: Serve the async proxy views (requires an ASGI server)
+    - SENTRY_PROJECTS: Comma separated organization/project pairs the issue, event and alert endpoints fan out to
+    - SENTRY_FANOUT_MAX_WORKERS: Projects queried concurrently per request
+    - DATABASE_PATH: Location of the SQLite database holding the local event store
+    - SENTRY_BASE_URI / MAILGUN_BASE_URI: Upstream API base URIs (e.g. a local stub server)
+    - SENTRY_BULK_MUTATE_CHUNK_SIZE: Issues per Sentry bulk mutate call of /api/sentry/issues/bulk/
+    - MAILGUN_EXPORT_*: Page size and page cap of the streaming /api/mailgun/logs/export/
+    - SENTRY_SYNC_*: Time range and refresh intervals of the incremental issue sync
+    - SENTRY_ALERTS_*: Size and refresh intervals of the /api/sentry/alerts/ feed
+    - UPSTREAM_*: Connection pool, timeout and retry tuning for the upstream HTTP client
+    - JSON_CODEC: JSON codec of the views, "json" (standard library) or "orjson"
+    - RESPONSE_COMPRESSION_*: Switch, size threshold and stream flush size of gzip/brotli response compression
+    - CONDITIONAL_GET_*: Switch and Last-Modified retention of ETag/304 revalidation of GET responses
+    - SERVER_TIMING_ENABLED: Adds Server-Timing headers with per-request upstream and serialization timings
+    - RATE_LIMIT_*: Waits and budget reserves of the vendor rate limit scheduler
+    - HEALTH_*: Interval, timeout and thresholds of the background integration health probes
+    - MEMBER_DIRECTORY_*: Switch, refresh interval and search limit of the in-memory Sentry member directory
+    - LIVE_*: Poll interval, heartbeat and buffer sizes of the /api/stream/ live updates
+    - EVENT_STORE_*: Ingest interval, Mailgun backfill and retention of the local event store
+    - TIMESERIES_MAX_BUCKETS: Upper bound for the number of buckets in one /api/timeseries/ response
+    - CHART_EVENTS_MAX_EVENTS: Upper bound for the number of events in one /api/chart/events/ response
+
 Generated by 'django-admin startproject' using Django 5.2.2.
 
 For more information on this file, see:
@@ -45,11 +68,75 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 env = environ.Env(
     # Set casting and default values
     DEBUG=(bool, False),
+    DATABASE_PATH=(str, str(BASE_DIR / 'db.sqlite3')),
+    ASYNC_VIEWS=(bool, False),
     SENTRY_ORGANIZATION_SLUG=(str, ''),
     SENTRY_PROJECT_ID=(str, ''),
+    SENTRY_PROJECTS=(list, []),
+    SENTRY_FANOUT_MAX_WORKERS=(int, 16),
     SENTRY_BEARER_AUTH=(str, ''),
+    SENTRY_BASE_URI=(str, 'https://sentry.io/api/0'),
+    SENTRY_HEALTH_URI=(str, 'https://sentry.io/_health/'),
+    SENTRY_BATCH_MAX_WORKERS=(int, 8),
+    SENTRY_BATCH_MAX_ISSUES=(int, 250),
+    SENTRY_BULK_MUTATE_CHUNK_SIZE=(int, 100),
+    SENTRY_PAGINATION_MAX_PAGES=(int, 10),
+    SENTRY_PAGINATION_MAX_ITEMS=(int, 5000),
+    SENTRY_SYNC_TIME_RANGE=(str, '30d'),
+    SENTRY_SYNC_MIN_INTERVAL=(float, 15.0),
+    SENTRY_SYNC_RECONCILE_INTERVAL=(float, 300.0),
+    SENTRY_SYNC_TOMBSTONE_TTL=(float, 7 * 24 * 60 * 60),
+    SENTRY_ALERTS_MAX_ALERTS=(int, 100),
+    SENTRY_ALERTS_REFRESH_INTERVAL=(float, 30.0),
+    SENTRY_ALERTS_REBUILD_INTERVAL=(float, 600.0),
     MAILGUN_API_NAME=(str, ''),
     MAILGUN_API_KEY=(str, ''),
+    MAILGUN_BASE_URI=(str, 'https://api.mailgun.net'),
+    MAILGUN_EXPORT_PAGE_SIZE=(int, 100),
+    MAILGUN_EXPORT_MAX_PAGES=(int, 10000),
+    UPSTREAM_POOL_CONNECTIONS=(int, 10),
+    UPSTREAM_POOL_MAXSIZE=(int, 20),
+    UPSTREAM_CONNECT_TIMEOUT=(float, 3.05),
+    UPSTREAM_READ_TIMEOUT=(float, 30.0),
+    UPSTREAM_MAX_RETRIES=(int, 2),
+    UPSTREAM_BACKOFF_FACTOR=(float, 0.3),
+    UPSTREAM_ASYNC_MAX_CONNECTIONS=(int, 200),
+    UPSTREAM_CACHE_ENABLED=(bool, True),
+    UPSTREAM_SINGLEFLIGHT_ENABLED=(bool, True),
+    UPSTREAM_CACHE_RATE_LIMIT_GRACE=(int, 3600),
+    RATE_LIMIT_ENABLED=(bool, True),
+    SERVER_TIMING_ENABLED=(bool, True),
+    JSON_CODEC=(str, "json"),
+    RESPONSE_COMPRESSION_ENABLED=(bool, True),
+    RESPONSE_COMPRESSION_MIN_BYTES=(int, 1024),
+    RESPONSE_COMPRESSION_FLUSH_BYTES=(int, 32768),
+    CONDITIONAL_GET_ENABLED=(bool, True),
+    CONDITIONAL_GET_TTL=(int, 86400),
+    RATE_LIMIT_INTERACTIVE_WAIT=(float, 10.0),
+    RATE_LIMIT_READ_WAIT=(float, 2.0),
+    RATE_LIMIT_READ_RESERVE=(float, 0.1),
+    RATE_LIMIT_BACKGROUND_RESERVE=(float, 0.5),
+    LIVE_POLL_INTERVAL=(float, 15.0),
+    LIVE_HEARTBEAT_INTERVAL=(float, 20.0),
+    LIVE_CLIENT_QUEUE_SIZE=(int, 100),
+    LIVE_REPLAY_SIZE=(int, 200),
+    EVENT_STORE_INGEST_ENABLED=(bool, True),
+    EVENT_STORE_INGEST_INTERVAL=(float, 60.0),
+    EVENT_STORE_MAILGUN_EVENTS=(str, 'failed,rejected,bounced,complained'),
+    EVENT_STORE_MAILGUN_BACKFILL=(int, 30),
+    EVENT_STORE_MAILGUN_MAX_PAGES=(int, 50),
+    EVENT_STORE_RETENTION_DAYS=(int, 365),
+    EVENT_STORE_QUERY_MAX_LIMIT=(int, 10000),
+    TIMESERIES_MAX_BUCKETS=(int, 2160),
+    CHART_EVENTS_MAX_EVENTS=(int, 100000),
+    MEMBER_DIRECTORY_ENABLED=(bool, True),
+    MEMBER_DIRECTORY_REFRESH_INTERVAL=(float, 300.0),
+    MEMBER_DIRECTORY_SEARCH_LIMIT=(int, 20),
+    HEALTH_PROBE_ENABLED=(bool, True),
+    HEALTH_PROBE_INTERVAL=(int, 60),
+    HEALTH_PROBE_TIMEOUT=(float, 10.0),
+    HEALTH_DEGRADED_UPTIME=(float, 99.0),
+    HUBSPOT_HEALTH_URI=(str, 'https://status.hubspot.com/api/v2/status.json'),
 )
 
 # Read .env file
@@ -58,16 +145,84 @@ environ.Env.read_env(BASE_DIR / '.env')
 SENTRY_ORGANIZATION_SLUG = env("SENTRY_ORGANIZATION_SLUG")
 SENTRY_PROJECT_ID = env("SENTRY_PROJECT_ID")
 SENTRY_BEARER_AUTH = env("SENTRY_BEARER_AUTH")
-SENTRY_BASE_URI = "https://sentry.io/api/0"
-SENTRY_BEARER_AUTH = env("SENTRY_BEARER_AUTH")
+SENTRY_BASE_URI = env("SENTRY_BASE_URI")
+SENTRY_HEALTH_URI = env("SENTRY_HEALTH_URI")
 SENTRY_HEADERS = {
     "Authorization": f"Bearer {SENTRY_BEARER_AUTH}"
 }
 
+# Projects of the issue, event and alert endpoints (see views/fanout.py): "organization/project"
+# entries (a bare project belongs to SENTRY_ORGANIZATION_SLUG), or the single configured project
+SENTRY_PROJECTS = [
+    {"organization": organization if separator else SENTRY_ORGANIZATION_SLUG, "project": project if separator else organization}
+    for organization, separator, project in (entry.strip().partition("/") for entry in env("SENTRY_PROJECTS") if entry.strip())
+] or [{"organization": SENTRY_ORGANIZATION_SLUG, "project": SENTRY_PROJECT_ID}]
+SENTRY_FANOUT_MAX_WORKERS = env("SENTRY_FANOUT_MAX_WORKERS")
+SENTRY_BATCH_MAX_WORKERS = env("SENTRY_BATCH_MAX_WORKERS")
+SENTRY_BATCH_MAX_ISSUES = env("SENTRY_BATCH_MAX_ISSUES")
+SENTRY_BULK_MUTATE_CHUNK_SIZE = env("SENTRY_BULK_MUTATE_CHUNK_SIZE")
+SENTRY_PAGINATION_MAX_PAGES = env("SENTRY_PAGINATION_MAX_PAGES")
+SENTRY_PAGINATION_MAX_ITEMS = env("SENTRY_PAGINATION_MAX_ITEMS")
+
+# Incremental issue sync (see views/issue_sync.py)
+SENTRY_SYNC_TIME_RANGE = env("SENTRY_SYNC_TIME_RANGE")
+SENTRY_SYNC_MIN_INTERVAL = env("SENTRY_SYNC_MIN_INTERVAL")
+SENTRY_SYNC_RECONCILE_INTERVAL = env("SENTRY_SYNC_RECONCILE_INTERVAL")
+SENTRY_SYNC_TOMBSTONE_TTL = env("SENTRY_SYNC_TOMBSTONE_TTL")
+
+# Alerts feed (see views/alerts.py); Sentry returns at most 100 issues per request
+SENTRY_ALERTS_MAX_ALERTS = env("SENTRY_ALERTS_MAX_ALERTS")
+SENTRY_ALERTS_REFRESH_INTERVAL = env("SENTRY_ALERTS_REFRESH_INTERVAL")
+SENTRY_ALERTS_REBUILD_INTERVAL = env("SENTRY_ALERTS_REBUILD_INTERVAL")
+
 MAILGUN_API_NAME = env("MAILGUN_API_NAME")
 MAILGUN_API_KEY = env("MAILGUN_API_KEY")
-MAILGUN_BASE_URI = "https://api.mailgun.net"
+MAILGUN_BASE_URI = env("MAILGUN_BASE_URI")
 MAILGUN_AUTH = ('api', f"{MAILGUN_API_KEY}")
+MAILGUN_EXPORT_PAGE_SIZE = env("MAILGUN_EXPORT_PAGE_SIZE")
+MAILGUN_EXPORT_MAX_PAGES = env("MAILGUN_EXPORT_MAX_PAGES")
+
+# Upstream HTTP client (see views/upstream.py)
+UPSTREAM_POOL_CONNECTIONS = env("UPSTREAM_POOL_CONNECTIONS")
+UPSTREAM_POOL_MAXSIZE = env("UPSTREAM_POOL_MAXSIZE")
+UPSTREAM_CONNECT_TIMEOUT = env("UPSTREAM_CONNECT_TIMEOUT")
+UPSTREAM_READ_TIMEOUT = env("UPSTREAM_READ_TIMEOUT")
+UPSTREAM_MAX_RETRIES = env("UPSTREAM_MAX_RETRIES")
+UPSTREAM_BACKOFF_FACTOR = env("UPSTREAM_BACKOFF_FACTOR")
+UPSTREAM_ASYNC_MAX_CONNECTIONS = env("UPSTREAM_ASYNC_MAX_CONNECTIONS")
+
+# Server-Sent Events live updates (see views/live.py)
+LIVE_POLL_INTERVAL = env("LIVE_POLL_INTERVAL")
+LIVE_HEARTBEAT_INTERVAL = env("LIVE_HEARTBEAT_INTERVAL")
+LIVE_CLIENT_QUEUE_SIZE = env("LIVE_CLIENT_QUEUE_SIZE")
+LIVE_REPLAY_SIZE = env("LIVE_REPLAY_SIZE")
+
+# Local event store ingest (see views/event_store.py)
+EVENT_STORE_INGEST_ENABLED = env("EVENT_STORE_INGEST_ENABLED")
+EVENT_STORE_INGEST_INTERVAL = env("EVENT_STORE_INGEST_INTERVAL")
+EVENT_STORE_MAILGUN_EVENTS = env("EVENT_STORE_MAILGUN_EVENTS")
+EVENT_STORE_MAILGUN_BACKFILL = env("EVENT_STORE_MAILGUN_BACKFILL")
+EVENT_STORE_MAILGUN_MAX_PAGES = env("EVENT_STORE_MAILGUN_MAX_PAGES")
+EVENT_STORE_RETENTION_DAYS = env("EVENT_STORE_RETENTION_DAYS")
+EVENT_STORE_QUERY_MAX_LIMIT = env("EVENT_STORE_QUERY_MAX_LIMIT")
+
+# Time-bucket rollup queries (see views/timeseries.py); 2160 = 90 days of hourly buckets
+TIMESERIES_MAX_BUCKETS = env("TIMESERIES_MAX_BUCKETS")
+
+# Columnar chart events (see views/chart_events.py)
+CHART_EVENTS_MAX_EVENTS = env("CHART_EVENTS_MAX_EVENTS")
+
+# In-memory Sentry member directory (see views/member_directory.py)
+MEMBER_DIRECTORY_ENABLED = env("MEMBER_DIRECTORY_ENABLED")
+MEMBER_DIRECTORY_REFRESH_INTERVAL = env("MEMBER_DIRECTORY_REFRESH_INTERVAL")
+MEMBER_DIRECTORY_SEARCH_LIMIT = env("MEMBER_DIRECTORY_SEARCH_LIMIT")
+
+# Background integration health probes (see views/health.py)
+HEALTH_PROBE_ENABLED = env("HEALTH_PROBE_ENABLED")
+HEALTH_PROBE_INTERVAL = env("HEALTH_PROBE_INTERVAL")
+HEALTH_PROBE_TIMEOUT = env("HEALTH_PROBE_TIMEOUT")
+HEALTH_DEGRADED_UPTIME = env("HEALTH_DEGRADED_UPTIME")
+HUBSPOT_HEALTH_URI = env("HUBSPOT_HEALTH_URI")
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -92,6 +247,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'corsheaders',
+    'dashboardAPI',
 ]
 
 REST_FRAMEWORK = {
@@ -104,6 +260,11 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    # First, so request timings include every other middleware
+    'dashboardAPI.views.instrumentation.InstrumentationMiddleware',
+    # Compression wraps conditional GET, so ETags are computed on uncompressed bodies
+    'dashboardAPI.views.compression.CompressionMiddleware',
+    'dashboardAPI.views.conditional.ConditionalGetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -117,6 +278,8 @@ MIDDLEWARE = [
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
+# Lets the frontend back off on rate limited (429) responses and see cache statuses
+CORS_EXPOSE_HEADERS = ["Retry-After", "X-Cache", "Server-Timing"]
 
 ROOT_URLCONF = 'dashboardAPI.urls'
 
@@ -136,6 +299,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'dashboardAPI.wsgi.application'
+ASGI_APPLICATION = 'dashboardAPI.asgi.application'
+
+# Serve the async proxy views (views/async_*.py) instead of the sync DRF views.
+# Only enable this when running under an ASGI server such as uvicorn.
+ASYNC_VIEWS = env("ASYNC_VIEWS")
 
 
 # Database
@@ -144,7 +312,7 @@ WSGI_APPLICATION = 'dashboardAPI.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': env("DATABASE_PATH"),
     }
 }
 
@@ -194,5 +362,58 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
     }
 }
+
+# Coalescing of identical concurrent upstream requests (see views/singleflight.py)
+UPSTREAM_SINGLEFLIGHT_ENABLED = env("UPSTREAM_SINGLEFLIGHT_ENABLED")
+
+# JSON encoding and decoding of upstream bodies and responses (see views/codec.py)
+# "orjson" requires the orjson package.
+JSON_CODEC = env("JSON_CODEC")
+
+# Response compression (see views/compression.py)
+# Brotli is used when the brotli package is installed, gzip otherwise.
+RESPONSE_COMPRESSION_ENABLED = env("RESPONSE_COMPRESSION_ENABLED")
+RESPONSE_COMPRESSION_MIN_BYTES = env("RESPONSE_COMPRESSION_MIN_BYTES")
+RESPONSE_COMPRESSION_FLUSH_BYTES = env("RESPONSE_COMPRESSION_FLUSH_BYTES")
+
+# ETag/Last-Modified revalidation of GET responses (see views/conditional.py)
+CONDITIONAL_GET_ENABLED = env("CONDITIONAL_GET_ENABLED")
+CONDITIONAL_GET_TTL = env("CONDITIONAL_GET_TTL")
+
+# Request instrumentation (see views/instrumentation.py and views/metrics.py)
+SERVER_TIMING_ENABLED = env("SERVER_TIMING_ENABLED")
+
+# Vendor rate limit scheduling (see views/rate_limit.py)
+# Reserves are fractions of a vendor's budget that lower priority calls leave untouched.
+RATE_LIMIT_ENABLED = env("RATE_LIMIT_ENABLED")
+RATE_LIMIT_INTERACTIVE_WAIT = env("RATE_LIMIT_INTERACTIVE_WAIT")
+RATE_LIMIT_READ_WAIT = env("RATE_LIMIT_READ_WAIT")
+RATE_LIMIT_READ_RESERVE = env("RATE_LIMIT_READ_RESERVE")
+RATE_LIMIT_BACKGROUND_RESERVE = env("RATE_LIMIT_BACKGROUND_RESERVE")
+
+# Upstream response cache (see views/response_cache.py)
+# Each cached view maps to (ttl, stale) in seconds: responses are served fresh for ttl seconds,
+# then served stale while a background refresh runs for up to stale more seconds.
+UPSTREAM_CACHE_ENABLED = env("UPSTREAM_CACHE_ENABLED")
+UPSTREAM_CACHE_RATE_LIMIT_GRACE = env("UPSTREAM_CACHE_RATE_LIMIT_GRACE")
+UPSTREAM_CACHE_POLICIES = {
+    # Sentry:
+    "get_issues": (30, 300),
+    "get_events": (30, 300),
+    "get_issue_events": (60, 600),
+    "get_organization_members": (300, 3600),
+
+    # Mailgun:
+    "get_queue_status": (15, 60),
+    "get_account_metrics": (120, 600),
+    "get_account_usage_metrics": (120, 600),
+    "get_logs": (30, 300),
+    "get_stat_totals": (120, 600),
+    "get_filtered_grouped_stats": (120, 600),
+    "get_mailing_list_members": (300, 1800),
+}
@@ -0,0 +1,36 @@
+"""
+Test Helpers Module
+
+This module contains helpers shared by the test modules. Upstream responses are mocked the same
+way everywhere, so no test contacts a third-party service.
+
+Usage:
+    from .helpers import upstream_response
+
+    with mock.patch("dashboardAPI.views.helpers.send", return_value=upstream_response({"id": "1"})):
+        response = self.client.get("/api/sentry/issues/1/")
+
+Functions:
+    upstream_response(data, status_code, body, content_type, links) - Mock upstream response
+"""
+
+import json
+from unittest import mock
+
+import requests
+
+def upstream_response(data=None, status_code=200, body=None, content_type="application/json", links=None):
+    '''
+        Returns a mock upstream response whose body is data encoded as JSON (or body, when given).
+        response.json() returns data, and raise_for_status raises HTTPError for 4xx and 5xx codes.
+    '''
+    response = mock.Mock(
+        status_code=status_code,
+        headers={"Content-Type": content_type},
+        content=json.dumps(data).encode() if body is None else body,
+        links=links or {},
+    )
+    response.json.return_value = data
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} Client Error")
+    return response
@@ -0,0 +1,108 @@
+"""
+Alerts Feed Tests Module
+
+This module contains Django test cases for the bounded alerts feed behind /api/sentry/alerts/.
+Sentry is mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_alerts
+
+Test Coverage:
+    - Top issues requested by lastSeen with an upstream limit
+    - Incremental refreshes merged into the bounded feed
+    - Fresh feeds served without calling Sentry; rebuilds after issue updates
+    - limit, since and severity parameters
+    - Previous alerts served when a refresh fails
+    - The async view
+"""
+
+import json
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, Client, SimpleTestCase, override_settings
+
+from ..views import alerts, async_sentry, response_cache
+from .helpers import upstream_response
+
+def issue(issue_id, last_seen, level="error"):
+    return {"id": issue_id, "title": f"Issue {issue_id}", "level": level, "lastSeen": last_seen, "project": {"name": "api"}}
+
+def issue_ids(response):
+    return [alert["originalIssue"]["id"] for alert in response.json()]
+
+class AlertsFeedTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        alerts.feed = alerts.AlertFeed()
+        cache.clear()
+
+    def tearDown(self):
+        alerts.feed = alerts.AlertFeed()
+        cache.clear()
+
+    def get(self, pages, params=None):
+        with mock.patch("dashboardAPI.views.helpers.send", side_effect=[upstream_response(page) for page in pages]) as send:
+            response = self.client.get("/api/sentry/alerts/", params or {})
+        return response, send
+
+    def test_top_issues(self):
+        response, send = self.get([[issue("1", "2025-01-01T10:00:00Z"), issue("2", "2025-01-01T12:00:00Z", "warning")]])
+        self.assertEqual(issue_ids(response), ["2", "1"])
+        self.assertEqual(response.json()[0]["severity"], "Warning")
+        self.assertEqual(send.call_args.kwargs["params"], {"query": "is:unresolved", "sort": "date", "limit": 100, "statsPeriod": ""})
+
+    @override_settings(SENTRY_ALERTS_REFRESH_INTERVAL=0, SENTRY_ALERTS_MAX_ALERTS=2)
+    def test_incremental_refresh(self):
+        self.get([[issue("1", "2025-01-01T10:00:00Z"), issue("2", "2025-01-01T12:00:00.250000Z")]])
+        # Issue 1 was seen again and issue 3 is new; the oldest alert drops out
+        response, send = self.get([[issue("1", "2025-01-01T13:00:00Z"), issue("3", "2025-01-01T12:30:00Z")]])
+        self.assertEqual(send.call_args.kwargs["params"]["query"], "is:unresolved lastSeen:>=2025-01-01T12:00:00")
+        self.assertEqual(send.call_args.kwargs["params"]["limit"], 2)
+        self.assertEqual(issue_ids(response), ["1", "3"])
+
+    def test_fresh_feed_and_rebuild(self):
+        self.get([[issue("1", "2025-01-01T10:00:00Z")]])
+        response, send = self.get([])
+        self.assertEqual((issue_ids(response), send.call_count), (["1"], 0))
+        # An issue update through the dashboard rebuilds the feed from the top issues
+        response_cache.invalidate("update_issue_status")
+        response, send = self.get([[issue("2", "2025-01-01T09:00:00Z")]])
+        self.assertEqual(send.call_args.kwargs["params"]["query"], "is:unresolved")
+        self.assertEqual(issue_ids(response), ["2"])
+
+    def test_parameters(self):
+        self.get([[issue(str(number), f"2025-01-01T{number:02}:00:00Z", "warning" if number % 2 else "error") for number in range(12)]])
+        self.assertEqual(len(self.get([])[0].json()), 10)
+        self.assertEqual(issue_ids(self.get([], {"limit": "3", "severity": "warning"})[0]), ["11", "9", "7"])
+        self.assertEqual(issue_ids(self.get([], {"since": "2025-01-01T09:00:00Z", "severity": "ERROR,warning"})[0]), ["11", "10"])
+        for params in ({"limit": "0"}, {"limit": "ten"}, {"since": "today"}, {"severity": "fatal"}):
+            self.assertEqual(self.get([], params)[0].status_code, 400, params)
+
+    @override_settings(SENTRY_ALERTS_REFRESH_INTERVAL=0)
+    def test_failed_refresh(self):
+        with mock.patch("dashboardAPI.views.helpers.send", side_effect=requests.exceptions.ConnectionError("unreachable")):
+            self.assertEqual(self.client.get("/api/sentry/alerts/").status_code, 400)
+        self.get([[issue("1", "2025-01-01T10:00:00Z")]])
+        with mock.patch("dashboardAPI.views.helpers.send", side_effect=requests.exceptions.ConnectionError("unreachable")):
+            response = self.client.get("/api/sentry/alerts/")
+        self.assertEqual(issue_ids(response), ["1"])
+
+class AsyncAlertsFeedTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        alerts.feed = alerts.AlertFeed()
+        cache.clear()
+
+    def tearDown(self):
+        alerts.feed = alerts.AlertFeed()
+        cache.clear()
+
+    async def test_alerts(self):
+        page = [issue("1", "2025-01-01T10:00:00Z"), issue("2", "2025-01-01T12:00:00Z")]
+        with mock.patch("dashboardAPI.views.helpers.asend", return_value=upstream_response(page)) as asend:
+            response = await async_sentry.get_sentry_alerts(self.factory.get("/api/sentry/alerts/?limit=1"))
+        self.assertEqual([alert["originalIssue"]["id"] for alert in json.loads(response.content)], ["2"])
+        self.assertEqual(asend.call_args.kwargs["params"]["sort"], "date")
@@ -0,0 +1,112 @@
+"""
+Async Views Tests Module
+
+This module contains Django test cases for the async (ASGI) proxy views in views/async_*.py.
+Upstream responses are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_async
+
+Test Coverage:
+    - Parity between the sync and async view modules
+    - Async Sentry list views with pagination
+    - Async batch issue events
+    - Async bulk issue updates, and rejection of issue update bodies that are not JSON objects
+    - Async dashboard snapshot
+    - Async Mailgun views with JSON bodies
+    - Async streaming Mailgun log export
+    - Async Prometheus metrics endpoint
+"""
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, SimpleTestCase
+
+from ..views import async_dashboard, async_integrations, async_mailgun, async_metrics, async_sentry, dashboard, integrations, mailgun, sentry
+from .helpers import upstream_response
+
+class AsyncViewsTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_async_modules_match_sync_modules(self):
+        for sync_module, async_module in ((sentry, async_sentry), (mailgun, async_mailgun), (integrations, async_integrations), (dashboard, async_dashboard)):
+            for name in dir(sync_module):
+                if hasattr(getattr(sync_module, name), "cls"):
+                    self.assertTrue(hasattr(async_module, name), f"{async_module.__name__} is missing {name}")
+
+    async def test_get_issues(self):
+        pages = [upstream_response([{"id": "1"}], links={"next": {"results": "true", "cursor": "0:1:0"}}), upstream_response([{"id": "2"}])]
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=pages) as asend:
+            response = await async_sentry.get_issues(self.factory.get("/api/sentry/issues/?timeRange=7d"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), [{"id": "1"}, {"id": "2"}])
+        self.assertEqual(asend.call_args_list[0].kwargs["params"], {"query": "is:unresolved lastSeen:-7d"})
+
+    async def test_get_batch_issue_events(self):
+        async def asend(method, uri, params=None, **kwargs):
+            return upstream_response([{"uri": uri}])
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=asend):
+            response = await async_sentry.get_batch_issue_events(self.factory.get("/api/sentry/issues/events/batch/?issue_ids=1,2"))
+        data = json.loads(response.content)
+        self.assertEqual(list(data), ["1", "2"])
+        self.assertTrue(data["2"]["events"][0]["uri"].endswith("/issues/2/events/"))
+
+    async def test_bulk_update_issue_status(self):
+        rejected = mock.Mock(status_code=400)
+        with mock.patch("dashboardAPI.views.async_sentry.asend", return_value=rejected), \
+                mock.patch("dashboardAPI.views.helpers.asend", return_value=upstream_response({"id": "1"})) as asend:
+            request = self.factory.put("/api/sentry/issues/bulk/", data={"issue_ids": ["1", "2"], "status": "resolved"}, content_type="application/json")
+            response = await async_sentry.bulk_update_issue_status(request)
+        data = json.loads(response.content)
+        self.assertEqual((data["succeeded"], data["results"]["2"]["mode"]), (2, "single"))
+        self.assertEqual(asend.call_args.kwargs["json"], {"status": "resolved"})
+
+    async def test_update_issue_status_requires_an_object(self):
+        for body in ("[]", "\"resolved\"", "1"):
+            response = await async_sentry.update_issue_status(self.factory.put("/api/sentry/issues/1/", data=body, content_type="application/json"), issue_id="1")
+            self.assertEqual(response.status_code, 400, body)
+
+    async def test_dashboard_snapshot(self):
+        async def asend(method, uri, params=None, **kwargs):
+            return upstream_response([{"id": "1"}] if uri.endswith("/issues/") else [])
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=asend), \
+                mock.patch("dashboardAPI.views.helpers.asend", side_effect=asend):
+            response = await async_dashboard.get_dashboard_snapshot(self.factory.get("/api/dashboard/snapshot/?sections=issues,issueEvents"))
+        data = json.loads(response.content)
+        self.assertEqual(data["sections"]["issueEvents"]["data"], {"1": {"events": [], "error": None}})
+        # ETags and 304s come from ConditionalGetMiddleware, which a direct view call skips
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    async def test_mailgun_put_body(self):
+        with mock.patch("dashboardAPI.views.helpers.asend", return_value=upstream_response({"stats": []})) as asend:
+            request = self.factory.put("/api/mailgun/stats/totals/", data={"event": "accepted", "ignored": 1}, content_type="application/json")
+            response = await async_mailgun.get_stat_totals(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(asend.call_args.kwargs["params"], {"event": "accepted"})
+        invalid = self.factory.put("/api/mailgun/logs/", data="not json", content_type="application/json")
+        self.assertEqual((await async_mailgun.get_logs(invalid)).status_code, 400)
+
+    async def test_mailgun_log_export(self):
+        pages = [
+            upstream_response({"items": [{"id": "1"}], "pagination": {"next": "token-2"}}),
+            upstream_response({"items": [{"id": "2"}], "pagination": {}}),
+        ]
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=pages) as asend:
+            request = self.factory.put("/api/mailgun/logs/export/?stream=csv", data={}, content_type="application/json")
+            response = await async_mailgun.export_logs(request)
+            rows = [chunk async for chunk in response.streaming_content]
+        self.assertEqual([row.decode().split(",")[0] for row in rows], ["id", "1", "2"])
+        self.assertEqual(asend.call_args.kwargs["json"]["pagination"]["token"], "token-2")
+
+    async def test_get_metrics(self):
+        response = await async_metrics.get_metrics(self.factory.get("/api/metrics/"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE dashboard_upstream_duration_seconds histogram", response.content)
@@ -0,0 +1,100 @@
+"""
+Chart Events Tests Module
+
+This module contains Django test cases for the /api/chart/events/ endpoint, which serves the
+events of the local event store in a columnar, dictionary-encoded layout.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_chart_events
+
+Test Coverage:
+    - Delta-encoded timestamps and dictionary-encoded columns, oldest first
+    - Filters and the event limit
+    - Whole-minute default windows, revalidated with If-None-Match
+    - Parameter validation
+"""
+
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import Client, TestCase
+
+from ..views import event_store
+from ..views.chart_events import encode_column
+
+def row(external_id, timestamp, source="sentry", category="TypeError", level="error", issue_id="42"):
+    return {
+        "source": source,
+        "external_id": external_id,
+        "timestamp": datetime.fromisoformat(timestamp),
+        "issue_id": issue_id,
+        "level": level,
+        "category": category,
+        "event_type": "error",
+    }
+
+WINDOW = {"start": "2025-01-01T00:00:00Z", "end": "2025-01-02T00:00:00Z"}
+
+def decode(data):
+    '''
+        Rebuilds (epoch seconds, source, level, category, issueId) rows from a response
+    '''
+    seconds = int(datetime.fromisoformat(data["start"]).timestamp())
+    events = []
+    for index, delta in enumerate(data["timestamps"]):
+        seconds += delta
+        values = [data["dictionaries"][column][data["columns"][column][index]] for column in ("source", "level", "category", "issueId")]
+        events.append((seconds, *values))
+    return events
+
+class ChartEventsTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        event_store.store([
+            row("b", "2025-01-01T10:45:00+00:00", level="warning"),
+            row("a", "2025-01-01T10:15:00+00:00"),
+            row("m1", "2025-01-01T23:30:00+00:00", "mailgun", "Email Bounced", "warning", ""),
+            row("old", "2024-12-31T23:00:00+00:00"),
+        ])
+
+    def test_chart_events(self):
+        data = self.client.get("/api/chart/events/", WINDOW).json()
+        self.assertEqual((data["count"], data["truncated"]), (3, False))
+        self.assertEqual(data["timestamps"], [10 * 3600 + 15 * 60, 30 * 60, 12 * 3600 + 45 * 60])
+        self.assertEqual(data["dictionaries"], {
+            "source": ["sentry", "mailgun"],
+            "level": ["error", "warning"],
+            "category": ["TypeError", "Email Bounced"],
+            "issueId": ["42", None],
+        })
+        self.assertEqual(data["columns"]["level"], [0, 1, 1])
+        self.assertEqual(decode(data)[-1], (int(datetime.fromisoformat("2025-01-01T23:30:00+00:00").timestamp()), "mailgun", "warning", "Email Bounced", None))
+
+    def test_filters_and_limit(self):
+        data = self.client.get("/api/chart/events/", {**WINDOW, "source": "sentry", "level": "error,warning"}).json()
+        self.assertEqual([event[3] for event in decode(data)], ["TypeError", "TypeError"])
+        # The newest events are kept
+        data = self.client.get("/api/chart/events/", {**WINDOW, "limit": "2"}).json()
+        self.assertEqual((data["count"], data["truncated"], [event[1] for event in decode(data)]), (2, True, ["sentry", "mailgun"]))
+        with self.settings(CHART_EVENTS_MAX_EVENTS=1):
+            self.assertEqual(self.client.get("/api/chart/events/", {**WINDOW, "limit": "50"}).json()["count"], 1)
+
+    def test_empty_window(self):
+        data = self.client.get("/api/chart/events/", {"start": "2020-01-01T00:00:00Z", "end": "2020-01-02T00:00:00Z"}).json()
+        self.assertEqual((data["count"], data["timestamps"], data["dictionaries"]["source"]), (0, [], []))
+
+    def test_default_window_revalidates(self):
+        with mock.patch("dashboardAPI.views.timeseries.datetime", wraps=datetime) as clock:
+            clock.now.side_effect = [datetime(2025, 1, 2, 0, 0, 5, 250, tzinfo=timezone.utc), datetime(2025, 1, 2, 0, 0, 50, tzinfo=timezone.utc)]
+            response = self.client.get("/api/chart/events/", {"timeRange": "7d"})
+            revalidated = self.client.get("/api/chart/events/", {"timeRange": "7d"}, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual((response.json()["start"], response.json()["end"]), ("2024-12-26T00:01:00+00:00", "2025-01-02T00:01:00+00:00"))
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_invalid(self):
+        for params in ({"timeRange": "1y"}, {"start": "yesterday"}, {"limit": "many"}):
+            self.assertEqual(self.client.get("/api/chart/events/", params).status_code, 400, params)
+
+    def test_encode_column(self):
+        self.assertEqual(encode_column(["b", "a", "b", ""]), (["b", "a", None], [0, 1, 0, 2]))
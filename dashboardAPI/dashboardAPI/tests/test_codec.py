@@ -0,0 +1,94 @@
+"""
+JSON Codec and Passthrough Tests Module
+
+This module contains Django test cases for the JSON codec and for the passthrough of upstream
+bodies by make_request. Upstream responses are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_codec
+
+Test Coverage:
+    - Upstream bodies sent to the client byte for byte, with their content type
+    - Cached bodies served without decoding, and decoded lazily for views that need data
+    - Paginated views passed through as joined page bodies, or encoded once when projected
+    - Codec selection through JSON_CODEC
+"""
+
+import datetime
+import json
+import pickle
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from ..views import codec
+from ..views.helpers import fetch_cached_json, make_request
+from .helpers import upstream_response
+
+QUEUE_REQUEST = {"uri": "https://api.mailgun.net/v3/domains/stub/sending_queues", "method": "get", "headers": {}}
+ISSUES_REQUEST = {"uri": "https://sentry.io/api/0/projects/org/1/issues/", "method": "get", "headers": {}}
+
+def passthrough_response(body, content_type="application/json; charset=utf-8"):
+    response = upstream_response(body=body, content_type=content_type)
+    response.json.side_effect = AssertionError("passthrough responses must not be decoded")
+    return response
+
+@override_settings(UPSTREAM_CACHE_POLICIES={"get_queue_status": (30, 60), "get_issues": (30, 60)})
+class PassthroughTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_upstream_body_is_passed_through(self):
+        body = b'{"regular": {"is_disabled": false},  "scheduled": {"is_disabled": false}}'
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=passthrough_response(body)):
+            response = make_request(QUEUE_REQUEST, "get_queue_status")
+        self.assertEqual(response.content, body)
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_cached_body_is_served_and_decoded_lazily(self):
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=passthrough_response(b'{"a": 1}')):
+            make_request(QUEUE_REQUEST, "get_queue_status")
+        with mock.patch.object(codec, "loads", wraps=codec.loads) as loads:
+            response = make_request(QUEUE_REQUEST, "get_queue_status")
+            self.assertEqual((response.content, response["X-Cache"]), (b'{"a": 1}', "HIT"))
+            loads.assert_not_called()
+            self.assertEqual(fetch_cached_json(QUEUE_REQUEST, "get_queue_status"), ({"a": 1}, "HIT"))
+
+    def test_paginated_views_are_not_encoded_again(self):
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=passthrough_response(b'[{"id": "1"}]')), \
+                mock.patch("dashboardAPI.views.pagination.send", return_value=passthrough_response(b'[{"id": "1"}]')), \
+                mock.patch.object(codec, "dumps", wraps=codec.dumps) as dumps:
+            first = make_request(ISSUES_REQUEST, "get_issues")
+            second = make_request(ISSUES_REQUEST, "get_issues")
+            projected = make_request(ISSUES_REQUEST, "get_issues", {"id": None})
+        self.assertEqual(first.content, b'[{"id": "1"}]')
+        self.assertEqual(second.content, first.content)
+        # Only a projected list is encoded, once
+        self.assertEqual((json.loads(projected.content), dumps.call_count), ([{"id": "1"}], 1))
+
+    def test_non_json_upstream_body_is_an_error(self):
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=passthrough_response(b"<html>Bad gateway</html>", "text/html")):
+            self.assertEqual(make_request(QUEUE_REQUEST).status_code, 400)
+
+class CodecTest(SimpleTestCase):
+    def test_raw_json_pickles_only_the_body(self):
+        payload = codec.RawJSON.from_data({"id": "1"})
+        restored = pickle.loads(pickle.dumps(payload))
+        self.assertEqual((restored.body, restored.content_type, restored._data), (payload.body, payload.content_type, None))
+        self.assertEqual(restored.data, {"id": "1"})
+
+    def test_dates_are_encoded_like_django(self):
+        value = {"at": datetime.datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)}
+        self.assertEqual(json.loads(codec.dumps(value)), {"at": "2025-01-02T03:04:05.678Z"})
+
+    @override_settings(JSON_CODEC="yaml")
+    def test_unknown_codec(self):
+        with self.assertRaises(ImproperlyConfigured):
+            codec.dumps({})
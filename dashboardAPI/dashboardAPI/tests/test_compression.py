@@ -0,0 +1,107 @@
+"""
+Response Compression Tests Module
+
+This module contains Django test cases for gzip/brotli response compression. Upstream sessions
+are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_compression
+
+Test Coverage:
+    - Accept-Encoding negotiation
+    - Brotli for clients that accept it
+    - Compression of responses above RESPONSE_COMPRESSION_MIN_BYTES only
+    - Compression of streamed responses, flushed every RESPONSE_COMPRESSION_FLUSH_BYTES
+    - Weak ETags on compressed responses
+"""
+
+import gzip
+import json
+from unittest import mock
+
+import brotli
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..views import compression, rate_limit, upstream
+from .helpers import upstream_response
+
+ISSUES_URI = "https://sentry.io/api/0/organizations/org/issues/"
+
+def issues_response(count):
+    return upstream_response([{"id": str(index), "title": f"Issue {index}"} for index in range(count)])
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024, UPSTREAM_CACHE_ENABLED=False)
+class CompressionTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def tearDown(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def get_issues(self, count, path="/api/sentry/issues/", **headers):
+        with mock.patch.object(upstream.get_session(ISSUES_URI), "request", return_value=issues_response(count)):
+            response = self.client.get(path, **headers)
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_large_responses_are_compressed(self):
+        response, body = self.get_issues(200, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertTrue(response["ETag"].startswith("W/"))
+        self.assertEqual(len(json.loads(gzip.decompress(body))), 200)
+        self.assertEqual(response["Content-Length"], str(len(body)))
+
+    def test_brotli(self):
+        response, body = self.get_issues(200, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(len(json.loads(brotli.decompress(body))), 200)
+        response, body = self.get_issues(200, "/api/sentry/issues/?stream=ndjson", HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(len(brotli.decompress(body).splitlines()), 200)
+
+    def test_small_responses_are_not_compressed(self):
+        response, body = self.get_issues(2, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(json.loads(body)), 2)
+
+    def test_identity_when_not_accepted(self):
+        response, _ = self.get_issues(200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response, _ = self.get_issues(200, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streamed_responses_are_compressed(self):
+        response, body = self.get_issues(50, "/api/sentry/issues/?stream=ndjson", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(gzip.decompress(body).splitlines()), 50)
+
+    def stream_chunks(self, flush_bytes):
+        with self.settings(RESPONSE_COMPRESSION_FLUSH_BYTES=flush_bytes), \
+                mock.patch.object(upstream.get_session(ISSUES_URI), "request", return_value=issues_response(500)):
+            response = self.client.get("/api/sentry/issues/?stream=ndjson", HTTP_ACCEPT_ENCODING="gzip")
+            return list(response.streaming_content)
+
+    def test_streamed_chunks_are_flushed_in_batches(self):
+        per_line, batched = self.stream_chunks(1), self.stream_chunks(4096)
+        self.assertEqual(gzip.decompress(b"".join(batched)), gzip.decompress(b"".join(per_line)))
+        self.assertLess(len(b"".join(batched)) * 1.5, len(b"".join(per_line)))
+        # Batches are still flushed while the stream is written, not only at its end
+        self.assertGreater(len(batched), 2)
+
+    @override_settings(RESPONSE_COMPRESSION_ENABLED=False)
+    def test_compression_can_be_disabled(self):
+        response, _ = self.get_issues(200, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_negotiation(self):
+        with mock.patch.object(compression, "_available", ["br", "gzip"]):
+            self.assertEqual(compression.negotiate("gzip, deflate, br"), "br")
+            self.assertEqual(compression.negotiate("br;q=0, gzip;q=0.5"), "gzip")
+            self.assertEqual(compression.negotiate("*"), "br")
+            self.assertIsNone(compression.negotiate("identity"))
+            self.assertIsNone(compression.negotiate(""))
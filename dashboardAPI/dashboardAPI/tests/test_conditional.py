@@ -0,0 +1,71 @@
+"""
+Conditional GET Tests Module
+
+This module contains Django test cases for ETag/Last-Modified tagging of GET responses and 304
+revalidation. Upstream sessions are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_conditional
+
+Test Coverage:
+    - Content-hash ETags, Last-Modified and Cache-Control on GET responses
+    - 304 Not Modified for If-None-Match (strong and weak) and If-Modified-Since
+    - New ETags when the upstream body changes
+    - Non-GET responses left untagged
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..views import rate_limit, upstream
+from .helpers import upstream_response
+
+ISSUES_URI = "https://sentry.io/api/0/organizations/org/issues/"
+
+@override_settings(UPSTREAM_CACHE_ENABLED=False)
+class ConditionalGetTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def tearDown(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def request(self, method, path, upstream_data=None, **kwargs):
+        with mock.patch.object(upstream.get_session(ISSUES_URI), "request", return_value=upstream_response(upstream_data or [{"id": "1"}])):
+            return getattr(self.client, method)(path, **kwargs)
+
+    def test_get_responses_are_tagged(self):
+        response = self.request("get", "/api/sentry/issues/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertTrue(response.has_header("Last-Modified"))
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_unchanged_response_is_not_modified(self):
+        first = self.request("get", "/api/sentry/issues/")
+        revalidated = self.request("get", "/api/sentry/issues/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["ETag"], first["ETag"])
+        self.assertEqual(self.request("get", "/api/sentry/issues/", HTTP_IF_NONE_MATCH="W/" + first["ETag"]).status_code, 304)
+        self.assertEqual(self.request("get", "/api/sentry/issues/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+
+    def test_changed_response_gets_new_etag(self):
+        first = self.request("get", "/api/sentry/issues/")
+        changed = self.request("get", "/api/sentry/issues/", [{"id": "2"}], HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_updates_are_not_tagged(self):
+        response = self.request("put", "/api/sentry/issues/1/", {"id": "1"}, content_type="application/json", data={"status": "resolved"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+
+    @override_settings(CONDITIONAL_GET_ENABLED=False)
+    def test_conditional_get_can_be_disabled(self):
+        self.assertFalse(self.request("get", "/api/sentry/issues/").has_header("ETag"))
@@ -0,0 +1,103 @@
+"""
+Dashboard Snapshot Tests Module
+
+This module contains Django test cases for the aggregated dashboard snapshot endpoint.
+Upstream responses are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_dashboard
+
+Test Coverage:
+    - Every section returned in one document
+    - Partial failure reporting per section
+    - ETag / If-None-Match revalidation, including the integration sections
+    - Query parameter validation
+"""
+
+import json
+from datetime import datetime
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase
+
+def fake_upstream(fail=()):
+    def send(method, uri, params=None, **kwargs):
+        if any(part in uri for part in fail):
+            raise requests.exceptions.ConnectionError(f"{uri} unreachable")
+        response = mock.Mock(links={}, headers={"Content-Type": "application/json"})
+        if uri.endswith("/issues/"):
+            response.json.return_value = [{"id": "1", "title": "Boom", "level": "error", "lastSeen": "2025-01-01T00:00:00Z"}]
+        elif uri.endswith("/events/"):
+            response.json.return_value = [{"eventID": "a"}]
+        elif uri.endswith("/v1/analytics/logs"):
+            response.json.return_value = {"items": [{"event": "failed"}]}
+        else:
+            response.json.return_value = {"stats": []}
+        response.content = json.dumps(response.json.return_value).encode()
+        return response
+    return send
+
+class FrozenClock(datetime):
+    # Seconds within one minute, as seen by consecutive dashboard polls
+    times = []
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.times.pop(0)
+
+class DashboardSnapshotTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_snapshot(self, path="/api/dashboard/snapshot/", fail=(), **headers):
+        send = fake_upstream(fail)
+        with mock.patch("dashboardAPI.views.helpers.send", side_effect=send), \
+                mock.patch("dashboardAPI.views.pagination.send", side_effect=send):
+            return self.client.get(path, headers=headers)
+
+    def test_snapshot_sections(self):
+        response = self.get_snapshot()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data["partial"])
+        sections = data["sections"]
+        self.assertEqual(sections["issues"]["data"], [{"id": "1", "title": "Boom", "level": "error", "lastSeen": "2025-01-01T00:00:00Z"}])
+        self.assertEqual(sections["issueEvents"]["data"], {"1": {"events": [{"eventID": "a"}], "error": None}})
+        self.assertEqual(sections["alerts"]["data"][0]["severity"], "Error")
+        self.assertEqual(sections["mailgunLogs"]["data"], {"items": [{"event": "failed"}]})
+        self.assertEqual(sections["mailgunIntegrations"]["data"][0]["name"], "Mailgun API")
+
+    def test_partial_failure(self):
+        data = self.get_snapshot(fail=("mailgun",)).json()
+        self.assertTrue(data["partial"])
+        self.assertIsNone(data["sections"]["mailgunLogs"]["data"])
+        self.assertIn("unreachable", data["sections"]["mailgunLogs"]["error"])
+        self.assertIsNone(data["sections"]["issues"]["error"])
+
+    def test_etag_revalidation(self):
+        response = self.get_snapshot("/api/dashboard/snapshot/?sections=issues,alerts")
+        self.assertEqual(list(response.json()["sections"]), ["issues", "alerts"])
+        revalidated = self.get_snapshot("/api/dashboard/snapshot/?sections=issues,alerts", If_None_Match=response["ETag"])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b"")
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/api/dashboard/snapshot/?timeRange=2y").status_code, 400)
+        self.assertEqual(self.client.get("/api/dashboard/snapshot/?sections=nope").status_code, 400)
+
+    def test_integration_sections_revalidate(self):
+        path = "/api/dashboard/snapshot/?sections=sentryIntegrations,mailgunIntegrations"
+        FrozenClock.times = [datetime(2025, 1, 1, 12, 0, 5), datetime(2025, 1, 1, 12, 0, 50)]
+        with mock.patch("dashboardAPI.views.integrations.datetime", FrozenClock):
+            response = self.get_snapshot(path)
+            revalidated = self.get_snapshot(path, If_None_Match=response["ETag"])
+        self.assertEqual(response.json()["sections"]["sentryIntegrations"]["data"][1]["lastSuccess"], "2025-01-01 12:00:00")
+        self.assertEqual(revalidated.status_code, 304)
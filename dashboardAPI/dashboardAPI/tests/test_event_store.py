@@ -0,0 +1,78 @@
+"""
+Local Event Store Tests Module
+
+This module contains Django test cases for the local event store: normalization, the ingest
+pipeline and the time-range query endpoint. Upstream responses are mocked, so no third-party
+service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_event_store
+
+Test Coverage:
+    - Sentry event and Mailgun log normalization
+    - Ingest deduplication and Mailgun pagination
+    - Filtered time-range queries
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import Client, TestCase
+
+from ..models import StoredEvent
+from ..views import event_store
+
+issue = {"id": "10", "level": "error", "title": "Boom", "metadata": {"type": "ValueError"}}
+
+def sentry_event(event_id, date):
+    return {"eventID": event_id, "dateCreated": date, "message": f"event {event_id}", "tags": [{"key": "level", "value": "warning"}]}
+
+def mailgun_item(item_id, event, timestamp):
+    return {"id": item_id, "event": event, "@timestamp": timestamp, "recipient": "user@example.com"}
+
+class EventStoreTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        event_store._ingest_state["sync_token"] = None
+
+    def test_normalize(self):
+        sentry = event_store.normalize_sentry_event(sentry_event("a", "2025-01-01T00:00:00Z"), issue)
+        self.assertEqual((sentry["issue_id"], sentry["level"], sentry["category"], sentry["event_type"]), ("10", "warning", "ValueError", "error"))
+        mailgun = event_store.normalize_mailgun_item({"id": "m", "event": "bounced", "timestamp": 1735689600.0})
+        self.assertEqual((mailgun["level"], mailgun["category"], mailgun["timestamp"].year), ("warning", "Email Bounced", 2025))
+
+    def test_ingest(self):
+        # Recent timestamps, so the retention prune at the end of each round keeps them
+        day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+        dates = [(day + timedelta(days=offset)).strftime("%Y-%m-%dT%H:%M:%SZ") for offset in range(3)]
+        delta = {"token": "t", "issues": [issue], "events": {"10": {"events": [sentry_event("a", dates[0]), sentry_event("b", dates[1])], "error": None}}}
+        pages = [
+            {"items": [mailgun_item("m1", "failed", dates[0])], "pagination": {"next": "page-2"}},
+            {"items": [mailgun_item("m2", "bounced", dates[2])], "pagination": {}},
+        ]
+        with mock.patch("dashboardAPI.views.issue_sync.sync", return_value=delta), \
+                mock.patch("dashboardAPI.views.event_store.fetch_json", side_effect=pages + pages) as fetch_json:
+            event_store.ingest()
+            self.assertEqual(fetch_json.call_args.args[0]["json"]["pagination"]["token"], "page-2")
+            # A second, overlapping round stores nothing new
+            event_store.ingest()
+        self.assertEqual(StoredEvent.objects.filter(source="sentry").count(), 2)
+        self.assertEqual(StoredEvent.objects.filter(source="mailgun").count(), 2)
+        self.assertEqual(fetch_json.call_args_list[2].args[0]["json"]["start"], dates[2].replace("Z", ".000Z"))
+
+    def test_query(self):
+        event_store.store([
+            event_store.normalize_sentry_event(sentry_event("a", "2025-01-01T00:00:00Z"), issue),
+            event_store.normalize_sentry_event(sentry_event("b", "2025-02-01T00:00:00Z"), issue),
+            event_store.normalize_mailgun_item(mailgun_item("m1", "failed", "2025-01-15T00:00:00Z")),
+        ])
+        data = self.client.get("/api/store/events/", {"start": "2025-01-01T00:00:00Z", "end": "2025-02-01T00:00:00Z"}).json()
+        self.assertEqual([event["id"] for event in data["events"]], ["m1", "a"])
+        data = self.client.get("/api/store/events/", {"source": "sentry", "issue": "10", "limit": 1}).json()
+        self.assertEqual(data, {"count": 1, "events": [{
+            "id": "b", "source": "sentry", "timestamp": "2025-02-01T00:00:00+00:00", "issueId": "10",
+            "level": "warning", "category": "ValueError", "type": "error", "message": "event b",
+        }]})
+        self.assertEqual(self.client.get("/api/store/events/", {"type": "failed,bounced"}).json()["count"], 1)
+        self.assertEqual(self.client.get("/api/store/events/", {"start": "last week"}).status_code, 400)
@@ -0,0 +1,185 @@
+"""
+Sentry Project Fan-out Tests Module
+
+This module contains Django test cases for serving several Sentry projects (SENTRY_PROJECTS)
+through the issue, event and alert endpoints. Upstream responses are mocked per project URI,
+so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_fanout
+
+Test Coverage:
+    - Project selection with the project parameter
+    - k-way merge of per-project lists by the field of the sort, with per-project caching
+    - Projects queried concurrently
+    - Partial and complete project failures
+    - Truncated project lists marking the merged list
+    - Merged streams
+    - Issue updates routed to the organization of the issue
+    - Alerts of several projects, keeping the alerts of a failed project
+    - Per-project rate limit buckets
+    - The async views
+"""
+
+import json
+import time
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, Client, SimpleTestCase, override_settings
+
+from ..views import alerts, async_sentry, fanout, rate_limit
+from .helpers import upstream_response
+
+PROJECTS = [
+    {"organization": "acme", "project": "api"},
+    {"organization": "acme", "project": "web"},
+    {"organization": "other", "project": "jobs"},
+]
+
+ISSUES = {
+    "acme/api": [[{"id": "1", "lastSeen": "2025-01-01T12:00:00Z", "count": "50"}], [{"id": "2", "lastSeen": "2025-01-01T10:00:00Z", "count": "5"}]],
+    "acme/web": [[{"id": "3", "lastSeen": "2025-01-01T11:00:00Z", "count": "7"}]],
+    "other/jobs": [[{"id": "4", "lastSeen": "2025-01-01T13:00:00.500000Z", "count": "1"}]],
+}
+
+def fake_projects(lists, failing=(), delay=0):
+    '''
+        Returns a side effect for upstream.send serving the pages of lists[organization/project]
+        by the project of the request URI, with Sentry style cursors
+    '''
+    def send(method, uri, params=None, **kwargs):
+        time.sleep(delay)
+        label = "/".join(uri.split("/projects/")[1].split("/")[:2])
+        if label in failing:
+            raise requests.exceptions.ConnectionError(f"{label} is down")
+        pages = lists[label]
+        index = int((params or {}).get("cursor", "0:0:0").split(":")[1])
+        has_next = index + 1 < len(pages)
+        return upstream_response(pages[index], links={"next": {"url": uri, "results": "true" if has_next else "false", "cursor": f"0:{index + 1}:0"}})
+    return send
+
+def ids(items):
+    return [item["id"] for item in items]
+
+@override_settings(SENTRY_PROJECTS=PROJECTS, SENTRY_ORGANIZATION_SLUG="acme")
+class FanoutTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        fanout.issue_organizations.clear()
+        cache.clear()
+
+    def tearDown(self):
+        fanout.issue_organizations.clear()
+        alerts.feed = alerts.AlertFeed()
+        rate_limit.reset()
+        cache.clear()
+
+    def get(self, path, params=None, failing=(), delay=0):
+        send = mock.Mock(side_effect=fake_projects(ISSUES, failing, delay))
+        with mock.patch("dashboardAPI.views.pagination.send", send), mock.patch("dashboardAPI.views.helpers.send", send):
+            response = self.client.get(path, params or {})
+            if response.streaming:
+                response.content_lines = b"".join(response.streaming_content).splitlines()
+        return response, send
+
+    def test_selected_projects(self):
+        self.assertEqual(fanout.selected_projects({}), PROJECTS)
+        self.assertEqual(fanout.selected_projects({"project": "web, other/jobs,web"}), PROJECTS[1:])
+        with self.assertRaises(ValueError):
+            fanout.selected_projects({"project": "jobs"})
+        self.assertEqual(self.client.get("/api/sentry/issues/", {"project": "missing"}).status_code, 400)
+
+    def test_merged_list_is_cached_per_project(self):
+        response, send = self.get("/api/sentry/issues/")
+        self.assertEqual(ids(response.json()), ["4", "1", "3", "2"])
+        self.assertEqual((response["X-Cache"], send.call_count), ("MISS", 4))
+        response, send = self.get("/api/sentry/issues/", {"project": "api,web"})
+        self.assertEqual((ids(response.json()), response["X-Cache"], send.call_count), (["1", "3", "2"], "HIT", 0))
+
+    def test_merge_field_follows_sort(self):
+        # fields= leaves out count, which is still fetched to merge by
+        response, _ = self.get("/api/sentry/issues/", {"sort": "freq", "fields": "id"})
+        self.assertEqual(response.json(), [{"id": "1"}, {"id": "3"}, {"id": "2"}, {"id": "4"}])
+
+    def test_projects_are_queried_concurrently(self):
+        started = time.monotonic()
+        response, send = self.get("/api/sentry/issues/", {"project": "web,other/jobs"}, delay=0.2)
+        self.assertEqual((response.status_code, send.call_count), (200, 2))
+        self.assertLess(time.monotonic() - started, 0.35)
+
+    def test_failed_projects(self):
+        response, _ = self.get("/api/sentry/issues/", failing={"other/jobs"})
+        self.assertEqual((ids(response.json()), response["X-Sentry-Failed-Projects"]), (["1", "3", "2"], "other/jobs"))
+        response, _ = self.get("/api/sentry/events/", failing=set(ISSUES))
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SENTRY_PAGINATION_MAX_PAGES=1)
+    def test_truncated_project_marks_merged_list(self):
+        response, _ = self.get("/api/sentry/issues/")
+        self.assertEqual((ids(response.json()), response["X-Pagination-Truncated"]), (["4", "1", "3"], "true"))
+        response, _ = self.get("/api/sentry/issues/", {"stream": "ndjson", "fields": "id"})
+        self.assertEqual(json.loads(response.content_lines[-1]), {"error": "page cap reached (SENTRY_PAGINATION_MAX_PAGES=1)"})
+
+    def test_merged_stream(self):
+        response, _ = self.get("/api/sentry/issues/", {"stream": "ndjson", "fields": "id"}, failing={"acme/web"})
+        self.assertEqual([json.loads(line) for line in response.content_lines], [{"id": "4"}, {"id": "1"}, {"id": "2"}])
+        self.assertEqual(response["X-Sentry-Failed-Projects"], "acme/web")
+        self.assertEqual(self.get("/api/sentry/issues/", {"stream": "xml"})[0].status_code, 400)
+
+    def test_updates_use_the_organization_of_the_issue(self):
+        self.get("/api/sentry/issues/")
+        upstream = upstream_response({})
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=upstream) as send:
+            self.client.put("/api/sentry/issues/4/", {"status": "resolved"}, content_type="application/json")
+            self.assertIn("/organizations/other/issues/4/", send.call_args.args[1])
+        with mock.patch("dashboardAPI.views.sentry.send", return_value=upstream) as send:
+            self.client.put("/api/sentry/issues/bulk/", {"issue_ids": ["1", "4", "3"], "status": "resolved"}, content_type="application/json")
+        self.assertEqual(
+            sorted((call.args[1], call.kwargs["params"]["id"]) for call in send.call_args_list),
+            [("https://sentry.io/api/0/organizations/acme/issues/", ["1", "3"]), ("https://sentry.io/api/0/organizations/other/issues/", ["4"])],
+        )
+
+    @override_settings(SENTRY_ALERTS_REFRESH_INTERVAL=0)
+    def test_alerts_keep_failed_projects(self):
+        response, send = self.get("/api/sentry/alerts/")
+        self.assertEqual(([alert["originalIssue"]["id"] for alert in response.json()], send.call_count), (["4", "1", "3"], 3))
+        # A rebuild while jobs is down keeps its alert; the next refresh rebuilds again
+        alerts.feed.rebuilt_at = 0
+        response, _ = self.get("/api/sentry/alerts/", failing={"other/jobs"})
+        self.assertEqual([alert["originalIssue"]["id"] for alert in response.json()], ["4", "1", "3"])
+        response, send = self.get("/api/sentry/alerts/")
+        self.assertEqual(send.call_args.kwargs["params"]["query"], "is:unresolved")
+
+    def test_rate_limit_buckets_per_project(self):
+        uri = "https://sentry.io/api/0/projects/{}/issues/"
+        self.assertIsNot(rate_limit.get_bucket("get", uri.format("acme/1")), rate_limit.get_bucket("get", uri.format("acme/2")))
+        self.assertIs(rate_limit.get_bucket("get", uri.format("acme/1")), rate_limit.get_bucket("get", uri.format("acme/1")))
+
+@override_settings(SENTRY_PROJECTS=PROJECTS, SENTRY_ORGANIZATION_SLUG="acme")
+class AsyncFanoutTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def fake_asend(self, failing=()):
+        send = fake_projects(ISSUES, failing)
+        async def asend(method, uri, params=None, **kwargs):
+            return send(method, uri, params)
+        return asend
+
+    async def test_merged_list(self):
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=self.fake_asend({"acme/api"})):
+            response = await async_sentry.get_issues(self.factory.get("/api/sentry/issues/"))
+        self.assertEqual((ids(json.loads(response.content)), response["X-Sentry-Failed-Projects"]), (["4", "3"], "acme/api"))
+
+    async def test_merged_stream(self):
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=self.fake_asend()):
+            response = await async_sentry.get_issues(self.factory.get("/api/sentry/issues/?stream=json&fields=id"))
+            body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(ids(json.loads(body)), ["4", "1", "3", "2"])
@@ -0,0 +1,99 @@
+"""
+Request Instrumentation Tests Module
+
+This module contains Django test cases for the Server-Timing header and the Prometheus
+/api/metrics/ endpoint. Upstream sessions are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_instrumentation
+
+Test Coverage:
+    - Server-Timing header with upstream time per vendor, retries, bytes and cache status
+    - Prometheus exposition of request and upstream histograms
+    - Histogram bucket accounting
+    - Streamed response byte counting
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..views import instrumentation, metrics, rate_limit, upstream
+from .helpers import upstream_response
+
+ISSUES_URI = "https://sentry.io/api/0/organizations/org/issues/"
+
+def retried_response(body, retries=0):
+    response = upstream_response([], body=body)
+    response.raw.retries.history = (None,) * retries
+    return response
+
+@override_settings(UPSTREAM_CACHE_POLICIES={"get_issues": (30, 300)})
+class InstrumentationTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def tearDown(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def get_issues(self):
+        session = upstream.get_session(ISSUES_URI)
+        with mock.patch.object(session, "request", return_value=retried_response(b"[]", retries=1)):
+            # Projected, so the list is encoded and serialize is timed
+            return self.client.get("/api/sentry/issues/?fields=id")
+
+    def test_server_timing_header(self):
+        response = self.get_issues()
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertTrue(timing.startswith("total;dur="))
+        self.assertIn("sentry;dur=", timing)
+        self.assertIn("desc=\"1 calls, 1 retries, 2 bytes\"", timing)
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("cache;desc=\"1 MISS\"", timing)
+        self.assertIn("cache;desc=\"1 HIT\"", self.client.get("/api/sentry/issues/?fields=id")["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_can_be_disabled(self):
+        self.assertFalse(self.get_issues().has_header("Server-Timing"))
+
+    def test_metrics_endpoint(self):
+        self.get_issues()
+        response = self.client.get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE dashboard_request_duration_seconds histogram", body)
+        self.assertIn("dashboard_request_duration_seconds_count{route=\"api/sentry/issues/\",method=\"GET\",status=\"200\"}", body)
+        self.assertIn("dashboard_upstream_duration_seconds_bucket{vendor=\"sentry\",method=\"GET\",status=\"200\",le=\"+Inf\"}", body)
+        self.assertIn("dashboard_cache_lookups_total{view=\"get_issues\",status=\"MISS\"}", body)
+        self.assertIn("dashboard_singleflight_calls_total{group=\"upstream\"}", body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = instrumentation.Histogram("test_seconds", "Test", ("name",), buckets=(0.1, 1.0))
+        instrumentation.registry.remove(histogram)
+        for value in (0.05, 0.5, 5):
+            histogram.observe(("a",), value)
+        samples = {(name, labels.get("le")): value for name, labels, value in histogram.samples()}
+        self.assertEqual(samples[("test_seconds_bucket", "0.1")], 1)
+        self.assertEqual(samples[("test_seconds_bucket", "1.0")], 2)
+        self.assertEqual(samples[("test_seconds_bucket", "+Inf")], 3)
+        self.assertEqual(samples[("test_seconds_count", None)], 3)
+
+    def test_streamed_bytes_are_counted(self):
+        before = dict(instrumentation.response_bytes.values).get(("api/sentry/issues/",), 0)
+        session = upstream.get_session(ISSUES_URI)
+        page = retried_response(b'[{"id": "1"}]')
+        page.json.return_value = [{"id": "1"}]
+        with mock.patch.object(session, "request", return_value=page):
+            response = self.client.get("/api/sentry/issues/?stream=ndjson")
+            body = b"".join(response.streaming_content)
+        self.assertEqual(instrumentation.response_bytes.values[("api/sentry/issues/",)] - before, len(body))
+
+    def test_format_sample_escapes_labels(self):
+        self.assertEqual(metrics.format_sample("m", {"route": "a\"b"}, 1), "m{route=\"a\\\"b\"} 1")
+        self.assertEqual(metrics.format_sample("m", {}, 2), "m 2")
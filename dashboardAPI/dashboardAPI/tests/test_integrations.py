@@ -15,9 +15,17 @@ Usage:
 Test Coverage:
     - Sentry integration status endpoint validation
     - HubSpot integration status endpoint validation
+    - Mailgun integration status endpoint validation
+    - Probe history ring buffer, uptime and response time percentiles
+    - Stale or missing probe windows reported as Pending
 """
 
-from django.test import Client, TestCase
+import time
+from unittest import mock
+
+from django.test import Client, SimpleTestCase, TestCase
+
+from ..views import health
 
 class IntegrationsTest(TestCase):
     def setUp(self):
@@ -30,3 +38,54 @@ class IntegrationsTest(TestCase):
     def test_get_hubspot_integration_status(self):
         response = self.client.get("/api/hubspot/integration-status/")
         self.assertEqual(response.status_code, 200)
+
+    def test_get_mailgun_integration_status(self):
+        response = self.client.get("/api/mailgun/integration-status/")
+        self.assertEqual(response.status_code, 200)
+
+class HealthProbeTest(SimpleTestCase):
+    def setUp(self):
+        self.history = health.ProbeHistory(4)
+        self.patcher = mock.patch.dict(health.histories, {"sentry": self.history})
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_ring_buffer_keeps_newest_samples(self):
+        for index in range(6):
+            self.history.record(index, index * 10, True)
+        self.assertEqual([sample[0] for sample in self.history.samples()], [5, 4, 3, 2])
+        self.assertEqual([sample[0] for sample in self.history.samples(since=4)], [5, 4])
+
+    def test_summarize_windows(self):
+        now = time.time()
+        self.history.record(now - 2 * 60 * 60, 500, False, "timeout")
+        for offset, response_time in ((30, 100), (20, 200), (10, 300)):
+            self.history.record(now - offset, response_time, True)
+        summary = health.summarize("sentry", now)
+        self.assertEqual(summary["windows"]["1h"], {"samples": 3, "uptime": 100.0, "p50": 200, "p95": 300, "p99": 300})
+        self.assertEqual(summary["windows"]["24h"]["uptime"], 75.0)
+        self.assertEqual(summary["latest"], (now - 10, 300, True))
+
+    def test_status_from_history(self):
+        self.assertEqual(self.client.get("/api/sentry/integration-status/").json()[0]["status"], "Pending")
+        with mock.patch.dict(health.probes, {"sentry": mock.Mock(return_value=mock.Mock(status_code=200))}):
+            health.run_probe("sentry")
+        status = self.client.get("/api/sentry/integration-status/").json()[0]
+        self.assertEqual((status["status"], status["uptime"]), ("Healthy", "100.0%"))
+        with mock.patch.dict(health.probes, {"sentry": mock.Mock(side_effect=ConnectionError("refused"))}):
+            health.run_probe("sentry")
+        status = self.client.get("/api/sentry/integration-status/").json()[0]
+        self.assertEqual((status["status"], status["issue"], status["uptime"]), ("Down", "refused", "50.0%"))
+
+    def test_stale_latest_probe(self):
+        self.history.record(time.time() - 2 * 60 * 60, 100, True)
+        status = self.client.get("/api/sentry/integration-status/").json()[0]
+        self.assertEqual((status["status"], status["uptime"]), ("Pending", "100.0%"))
+        self.assertTrue(status["issue"].startswith("No health probe since"))
+        # Only a sample older than the 24h window
+        health.histories["sentry"] = self.history = health.ProbeHistory(4)
+        self.history.record(time.time() - 2 * 24 * 60 * 60, 100, False, "timeout")
+        status = self.client.get("/api/sentry/integration-status/").json()[0]
+        self.assertEqual((status["status"], status["uptime"]), ("Pending", "N/A"))
@@ -0,0 +1,140 @@
+"""
+Incremental Issue Sync Tests Module
+
+This module contains Django test cases for the Sentry delta sync endpoint. Upstream responses
+are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_issue_sync
+
+Test Coverage:
+    - Full sync and sync tokens
+    - Deltas containing only changed issues and their new events
+    - Tombstones for resolved and expired issues, none for issues past a pagination cap
+    - Syncs answered while another caller refreshes the ledger
+    - Incremental lastSeen watermark queries and refresh throttling
+    - Field projection of the synced events
+    - Events of every changed issue beyond the batch cap
+    - Invalid tokens and timestamps
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, override_settings
+
+from ..views import issue_sync, response_cache
+from ..views.pagination import PageItems
+
+def issue(issue_id, last_seen, status="unresolved"):
+    return {"id": issue_id, "lastSeen": last_seen, "status": status}
+
+@override_settings(SENTRY_SYNC_MIN_INTERVAL=0, SENTRY_SYNC_RECONCILE_INTERVAL=3600)
+class IssueSyncTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        self.upstream = []
+        patches = [
+            mock.patch.object(issue_sync, "ledger", issue_sync.IssueLedger()),
+            mock.patch("dashboardAPI.views.fanout.fetch_all_pages", side_effect=lambda request: self.upstream.pop(0)),
+            mock.patch("dashboardAPI.views.issue_sync.fetch_issue_events", side_effect=lambda ids, params, fields=None: {issue_id: {"events": [params], "error": None} for issue_id in ids}),
+        ]
+        self.fetch_all_pages = patches[1].start()
+        for patch in patches[::2]:
+            patch.start()
+        self.addCleanup(mock.patch.stopall)
+
+    def tearDown(self):
+        cache.clear()
+
+    def sync(self, *upstream, **params):
+        self.upstream.extend(upstream)
+        response = self.client.get("/api/sentry/sync/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_then_delta(self):
+        full = self.sync([issue("1", "2025-01-01T00:00:00Z"), issue("2", "2025-01-02T00:00:00Z")])
+        self.assertTrue(full["full"])
+        self.assertEqual([item["id"] for item in full["issues"]], ["1", "2"])
+        self.assertEqual(full["events"]["1"]["events"], [{"statsPeriod": "30d"}])
+
+        delta = self.sync([issue("2", "2025-01-02T00:00:00Z"), issue("3", "2025-01-03T00:00:05.5Z")], token=full["token"])
+        self.assertFalse(delta["full"])
+        self.assertEqual([item["id"] for item in delta["issues"]], ["3"])
+        self.assertEqual(list(delta["events"]), ["3"])
+        self.assertIn("start", delta["events"]["3"]["events"][0])
+        self.assertEqual(self.fetch_all_pages.call_args.args[0]["params"], {"query": "lastSeen:>=2025-01-02T00:00:00"})
+
+        idle = self.sync([], token=delta["token"])
+        self.assertEqual((idle["issues"], idle["tombstones"], idle["events"]), ([], [], {}))
+
+    def test_tombstones(self):
+        full = self.sync([issue("1", "2025-01-01T00:00:00Z"), issue("2", "2025-01-02T00:00:00Z")])
+        delta = self.sync([issue("1", "2025-01-01T00:00:00Z", "resolved")], token=full["token"])
+        self.assertEqual(delta["tombstones"], [{"id": "1", "status": "resolved"}])
+        # An issue update through the API invalidates the namespace and forces a full reconcile
+        response_cache.invalidate("update_issue_status")
+        delta = self.sync([], token=delta["token"])
+        self.assertEqual(delta["tombstones"], [{"id": "2", "status": "removed"}])
+
+    def test_truncated_reconcile_keeps_issues(self):
+        full = self.sync([issue("1", "2025-01-01T00:00:00Z"), issue("2", "2025-01-02T00:00:00Z")])
+        response_cache.invalidate("update_issue_status")
+        listing = PageItems([issue("2", "2025-01-02T00:00:00Z")])
+        listing.truncated = True
+        delta = self.sync(listing, token=full["token"])
+        self.assertEqual(delta["tombstones"], [])
+
+    def test_syncs_are_served_during_a_refresh(self):
+        full = self.sync([issue("1", "2025-01-01T00:00:00Z")])
+        response_cache.invalidate("update_issue_status")
+        started, release = threading.Event(), threading.Event()
+        def slow_reconcile(request):
+            started.set()
+            release.wait(5)
+            return []
+        self.fetch_all_pages.side_effect = slow_reconcile
+        refreshing = threading.Thread(target=self.client.get, args=("/api/sentry/sync/", {"token": full["token"]}))
+        refreshing.start()
+        started.wait(5)
+        began = time.monotonic()
+        delta = self.client.get("/api/sentry/sync/", {"token": full["token"]})
+        elapsed = time.monotonic() - began
+        release.set()
+        refreshing.join()
+        self.assertEqual((delta.status_code, delta.json()["issues"]), (200, []))
+        self.assertLess(elapsed, 1)
+
+    def test_foreign_token_resyncs(self):
+        token = issue_sync.encode_token({"e": "other-process", "s": 5, "t": 0})
+        self.assertTrue(self.sync([issue("1", "2025-01-01T00:00:00Z")], token=token)["full"])
+
+    def test_since(self):
+        delta = self.sync([issue("1", "2025-01-01T00:00:00Z"), issue("2", "2025-01-05T00:00:00Z")], since="2025-01-03T00:00:00Z")
+        self.assertFalse(delta["full"])
+        self.assertEqual([item["id"] for item in delta["issues"]], ["2"])
+
+    @override_settings(SENTRY_SYNC_MIN_INTERVAL=60)
+    def test_refresh_throttled(self):
+        full = self.sync([issue("1", "2025-01-01T00:00:00Z")])
+        self.sync(token=full["token"])
+        self.assertEqual(self.fetch_all_pages.call_count, 1)
+
+    def test_fields(self):
+        self.sync([issue("1", "2025-01-01T00:00:00Z")], fields="id,dateCreated")
+        self.assertEqual(issue_sync.fetch_issue_events.call_args.args[2], {"id": None, "dateCreated": None})
+
+    @override_settings(SENTRY_BATCH_MAX_ISSUES=2)
+    def test_events_of_every_changed_issue(self):
+        full = self.sync([issue(str(number), "2025-01-01T00:00:00Z") for number in range(5)])
+        self.assertEqual(sorted(full["events"]), ["0", "1", "2", "3", "4"])
+        self.assertEqual([len(call.args[0]) for call in issue_sync.fetch_issue_events.call_args_list], [2, 2, 1])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/api/sentry/sync/", {"token": "not-a-token"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/sentry/sync/", {"since": "yesterday"}).status_code, 400)
@@ -0,0 +1,82 @@
+"""
+Live Updates Tests Module
+
+This module contains Django test cases for the Server-Sent Events live update stream.
+Upstream calls are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_live
+
+Test Coverage:
+    - SSE stream format and delivery of broadcast messages
+    - Last-Event-ID replay and slow client handling
+    - Change detection for issues and integration statuses
+"""
+
+import json
+from unittest import mock
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from ..views import live
+
+class LiveUpdatesTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        live._subscribers.clear()
+        live._replay.clear()
+        live._state.update({"sync_token": None, "mailgun_since": None, "integrations": {}})
+        # Keep the poller from calling the upstream APIs
+        patcher = mock.patch.object(live, "poll")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stream(self):
+        response = self.client.get("/api/stream/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = iter(response.streaming_content)
+        self.assertTrue(next(chunks).startswith(b"retry: "))
+        live.broadcast("issues", {"issues": [{"id": "1"}]})
+        message = next(chunks).decode()
+        self.assertIn("event: issues\n", message)
+        self.assertEqual(json.loads(message.split("data: ")[1]), {"issues": [{"id": "1"}]})
+        response.close()
+        self.assertEqual(live._subscribers, set())
+
+    def test_replay_and_slow_clients(self):
+        for index in range(3):
+            live.broadcast("mailgun", {"index": index})
+        subscriber = live.Subscriber()
+        live.subscribe(subscriber, last_event_id=live._next_id - 1)
+        self.assertEqual(subscriber.messages.get_nowait()["data"], {"index": 2})
+        with override_settings(LIVE_CLIENT_QUEUE_SIZE=1):
+            slow = live.Subscriber()
+        live.subscribe(slow)
+        live.broadcast("mailgun", {})
+        live.broadcast("mailgun", {})
+        self.assertTrue(slow.closed)
+        self.assertFalse(subscriber.closed)
+        live.unsubscribe(subscriber)
+        live.unsubscribe(slow)
+
+    def test_poll_issues_broadcasts_deltas(self):
+        deltas = [
+            {"token": "a", "full": True, "issues": [{"id": "1"}], "tombstones": [], "events": {}},
+            {"token": "b", "full": False, "issues": [], "tombstones": [], "events": {}},
+            {"token": "c", "full": False, "issues": [], "tombstones": [{"id": "1", "status": "resolved"}], "events": {}},
+        ]
+        with mock.patch("dashboardAPI.views.issue_sync.sync", side_effect=deltas) as sync, \
+                mock.patch.object(live, "broadcast") as broadcast:
+            for _ in deltas:
+                live.poll_issues()
+        self.assertEqual([call.args[0] for call in sync.call_args_list], [None, "a", "b"])
+        broadcast.assert_called_once_with("issues", {"issues": [], "tombstones": [{"id": "1", "status": "resolved"}], "events": {}})
+
+    def test_poll_integrations_broadcasts_changes(self):
+        statuses = iter([{"status": "Healthy", "issue": None}, {"status": "Healthy", "issue": None}, {"status": "Down", "issue": "timeout"}])
+        with mock.patch.dict(live.live_integrations, {"sentry": lambda: next(statuses)}, clear=True), \
+                mock.patch.object(live, "broadcast") as broadcast:
+            for _ in range(3):
+                live.poll_integrations()
+        broadcast.assert_called_once_with("integrations", [{"status": "Down", "issue": "timeout"}])
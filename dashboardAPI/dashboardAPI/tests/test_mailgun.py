@@ -19,9 +19,18 @@ Test Coverage:
     - Log data access
     - Statistical totals and filtered stats
     - Mailing list member management (commented out - requires list_address parameter)
+    - Streaming log export across pagination tokens, encoded with the configured JSON codec
+      (offline, upstream calls are mocked)
+    - Trailing marker of exports cut short by the page cap
 """
 
-from django.test import Client, TestCase
+import json
+from unittest import mock
+
+import requests
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+
+from ..views import codec
 
 class MailgunTest(TestCase):
     def setUp(self):
@@ -67,3 +76,59 @@ class MailgunTest(TestCase):
     # def test_get_mailing_list_members(self):
         # response = self.client.put("/api/mailgun/mailing-list-members/<str:list_address>/")
         # self.assertEqual(response.status_code, 200)
+
+def logs_page(items, next_token=None):
+    response = mock.Mock(headers={"Content-Type": "application/json"})
+    response.json.return_value = {"items": items, "pagination": {"next": next_token} if next_token else {}}
+    response.content = json.dumps(response.json.return_value).encode()
+    return response
+
+class MailgunExportTest(SimpleTestCase):
+    pages = [
+        logs_page([{"id": "1", "event": "failed", "recipient": "a@example.com", "delivery-status": {"code": 550}}], "token-2"),
+        logs_page([{"id": "2", "event": "bounced", "message": {"headers": {"subject": "Hi, there"}}}]),
+    ]
+
+    def export(self, stream=None, data=None):
+        path = "/api/mailgun/logs/export/" + (f"?stream={stream}" if stream else "")
+        return Client().put(path, data or {"events": "failed,bounced"}, content_type="application/json")
+
+    def test_ndjson_export(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=self.pages) as send, \
+                mock.patch.object(codec, "dumps", wraps=codec.dumps) as dumps:
+            response = self.export()
+            lines = b"".join(response.streaming_content).decode().splitlines()
+        # Lines are written with the configured JSON codec, like every other NDJSON stream
+        self.assertEqual(dumps.call_count, 2)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("mailgun-logs.ndjson", response["Content-Disposition"])
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["1", "2"])
+        self.assertEqual(send.call_args_list[0].kwargs["json"]["pagination"], {"sort": "timestamp:asc", "limit": 100})
+        self.assertEqual(send.call_args_list[1].kwargs["json"]["pagination"]["token"], "token-2")
+        self.assertEqual(send.call_args_list[1].kwargs["json"]["events"], "failed,bounced")
+
+    def test_csv_export(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=self.pages):
+            response = self.export("csv", {"pagination": {"limit": 2}})
+            rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(rows[0].split(",")[:3], ["id", "timestamp", "event"])
+        self.assertTrue(rows[1].startswith("1,,failed,,,a@example.com,,,,,550,"))
+        self.assertIn('"Hi, there"', rows[2])
+
+    def test_export_errors(self):
+        self.assertEqual(self.export("xml").status_code, 400)
+        failing = logs_page([])
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError("401 Client Error")
+        with mock.patch("dashboardAPI.views.pagination.send", return_value=failing):
+            self.assertEqual(self.export().status_code, 400)
+        # Failures after the first page end the stream with an error line
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=[self.pages[0], failing]):
+            lines = b"".join(self.export().streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(lines[-1]), {"error": "401 Client Error"})
+
+    @override_settings(MAILGUN_EXPORT_MAX_PAGES=1)
+    def test_page_cap_marker(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=self.pages) as send:
+            rows = b"".join(self.export("csv").streaming_content).decode().splitlines()
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(rows[-1], "# export stopped: page cap reached (MAILGUN_EXPORT_MAX_PAGES=1)")
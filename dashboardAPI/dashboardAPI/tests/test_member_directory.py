@@ -0,0 +1,165 @@
+"""
+Member Directory Tests Module
+
+This module contains Django test cases for the in-memory Sentry member directory, its prefix
+search endpoint and the assignedTo check of issue updates. Sentry is mocked, so no third-party
+service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_member_directory
+
+Test Coverage:
+    - Lookups by user ID, member ID, email and username
+    - Prefix search over names, emails and usernames
+    - Member list and search served without calling Sentry
+    - Rejection of unknown assignees in single and bulk updates
+    - Refresh through the paginated members endpoint, skipped when a pagination cap cuts it short
+    - One directory per organization, checked against the organization of each issue
+    - The async views
+"""
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, Client, SimpleTestCase, override_settings
+
+from ..views import async_member_directory, async_sentry, fanout, member_directory
+from .helpers import upstream_response
+from .test_pagination import fake_pages
+
+MEMBERS = [
+    {"id": "11", "name": "Bob Stone", "email": "bob@example.com", "user": {"id": "2", "username": "bstone", "email": "bob@example.com"}},
+    {"id": "10", "name": "Alice Smith", "email": "alice@example.com", "user": {"id": "1", "username": "asmith", "email": "alice@example.com"}},
+    {"id": "12", "name": "", "email": "carol@example.com", "user": None},
+]
+
+class MemberDirectoryTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = member_directory.MemberDirectory()
+        self.directory.load(MEMBERS)
+
+    def test_lookup(self):
+        for value in ("user:1", "1", "10", "ALICE@example.com", "asmith"):
+            self.assertEqual(self.directory.lookup(value)["id"], "10", value)
+        self.assertEqual(self.directory.lookup("carol@example.com")["id"], "12")
+        self.assertIsNone(self.directory.lookup("user:10"))
+        self.assertIsNone(self.directory.lookup("dave"))
+
+    def test_search(self):
+        def ids(prefix, limit=10):
+            return [member["id"] for member in self.directory.search(prefix, limit)]
+        self.assertEqual(ids("s"), ["10", "11"])
+        self.assertEqual(ids("alice s"), ["10"])
+        self.assertEqual(ids("BST"), ["11"])
+        self.assertEqual(ids("carol"), ["12"])
+        self.assertEqual(ids("example"), [])
+        # Without a prefix, members are listed by name
+        self.assertEqual(ids("", 2), ["10", "11"])
+
+class MemberViewsTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        member_directory.directory_for().load(MEMBERS)
+        cache.clear()
+
+    def tearDown(self):
+        member_directory.directories.clear()
+        cache.clear()
+
+    def test_served_without_sentry(self):
+        with mock.patch("dashboardAPI.views.helpers.send") as send, mock.patch("dashboardAPI.views.pagination.send") as page_send:
+            search = self.client.get("/api/sentry/members/search/", {"q": "al", "fields": "id,name"})
+            members = self.client.get("/api/sentry/members/")
+        self.assertEqual(search.json(), [{"id": "10", "name": "Alice Smith"}])
+        self.assertEqual([member["id"] for member in members.json()], ["10", "11", "12"])
+        self.assertFalse(send.called or page_send.called)
+
+    def test_search_limit(self):
+        self.assertEqual(len(self.client.get("/api/sentry/members/search/", {"limit": "1"}).json()), 1)
+        with self.settings(MEMBER_DIRECTORY_SEARCH_LIMIT=2):
+            self.assertEqual(len(self.client.get("/api/sentry/members/search/", {"limit": "50"}).json()), 2)
+        for limit in ("0", "all"):
+            self.assertEqual(self.client.get("/api/sentry/members/search/", {"limit": limit}).status_code, 400)
+
+    def test_unknown_assignee(self):
+        with mock.patch("dashboardAPI.views.helpers.send") as send:
+            response = self.client.put("/api/sentry/issues/42/", {"assignedTo": "user:99"}, content_type="application/json")
+            bulk = self.client.put("/api/sentry/issues/bulk/", {"issue_ids": ["42"], "assignedTo": "mallory"}, content_type="application/json")
+        self.assertEqual((response.status_code, bulk.status_code), (400, 400))
+        self.assertIn("Unknown assignee", response.content.decode())
+        send.assert_not_called()
+
+    def test_known_and_unchecked_assignees(self):
+        for data in ({"assignedTo": "user:1"}, {"assignedTo": "bob@example.com"}, {"assignedTo": "team:5"}, {"assignedTo": ""}, {"status": "resolved"}):
+            member_directory.validate_assignee(data, ["42"])
+        # Nothing is rejected before the first refresh
+        member_directory.directories.clear()
+        member_directory.validate_assignee({"assignedTo": "mallory"}, ["42"])
+
+    def test_refresh(self):
+        member_directory.directories.clear()
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages(MEMBERS[:1], MEMBERS[1:])):
+            member_directory.refresh()
+        self.assertTrue(member_directory.directory_for().loaded)
+        self.assertEqual(member_directory.directory_for().lookup("bstone")["id"], "11")
+
+    @override_settings(SENTRY_PAGINATION_MAX_PAGES=1)
+    def test_truncated_refresh_keeps_the_directory(self):
+        member_directory.directories.clear()
+        member_directory.directory_for().load(MEMBERS)
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages(MEMBERS[:1], MEMBERS[1:])):
+            with self.assertRaisesMessage(ValueError, "cut short by a pagination cap"):
+                member_directory.refresh()
+        self.assertEqual(member_directory.directory_for().lookup("asmith")["id"], "10")
+
+OTHER_MEMBERS = [{"id": "20", "name": "Oscar Ortiz", "email": "oscar@other.example", "user": {"id": "9", "username": "oortiz", "email": "oscar@other.example"}}]
+
+@override_settings(SENTRY_ORGANIZATION_SLUG="acme", SENTRY_PROJECTS=[{"organization": "acme", "project": "api"}, {"organization": "other", "project": "jobs"}])
+class OrganizationDirectoriesTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+        members = {"acme": MEMBERS, "other": OTHER_MEMBERS}
+        def send(method, uri, params=None, **kwargs):
+            return fake_pages(members[uri.split("/organizations/")[1].split("/")[0]])(method, uri, params)
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=send):
+            member_directory.refresh()
+        fanout.issue_organizations.update({"4": "other"})
+
+    def tearDown(self):
+        member_directory.directories.clear()
+        fanout.issue_organizations.clear()
+        cache.clear()
+
+    def test_refresh_loads_every_organization(self):
+        self.assertEqual(sorted(member_directory.directories), ["acme", "other"])
+        self.assertEqual(self.client.get("/api/sentry/members/search/", {"q": "o", "organization": "other", "fields": "id"}).json(), [{"id": "20"}])
+        self.assertEqual(self.client.get("/api/sentry/members/", {"organization": "nowhere"}).status_code, 400)
+
+    def test_assignee_checked_against_the_organization_of_the_issue(self):
+        upstream = upstream_response({})
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=upstream) as send:
+            other = self.client.put("/api/sentry/issues/4/", {"assignedTo": "oortiz"}, content_type="application/json")
+            acme = self.client.put("/api/sentry/issues/1/", {"assignedTo": "oortiz"}, content_type="application/json")
+            bulk = self.client.put("/api/sentry/issues/bulk/", {"issue_ids": ["1", "4"], "assignedTo": "oortiz"}, content_type="application/json")
+        self.assertEqual((other.status_code, acme.status_code, bulk.status_code), (200, 400, 400))
+        self.assertIn("/organizations/other/issues/4/", send.call_args.args[1])
+        self.assertIn('organization "acme"', acme.content.decode())
+
+class AsyncMemberViewsTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        member_directory.directory_for().load(MEMBERS)
+
+    def tearDown(self):
+        member_directory.directories.clear()
+
+    async def test_search(self):
+        response = await async_member_directory.get_member_search(self.factory.get("/api/sentry/members/search/?q=bo&fields=id"))
+        self.assertEqual(json.loads(response.content), [{"id": "11"}])
+
+    async def test_unknown_assignee(self):
+        request = self.factory.put("/api/sentry/issues/42/", b'{"assignedTo": "mallory"}', content_type="application/json")
+        self.assertEqual((await async_sentry.update_issue_status(request, issue_id="42")).status_code, 400)
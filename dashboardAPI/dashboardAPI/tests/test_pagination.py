@@ -0,0 +1,115 @@
+"""
+Sentry Pagination Tests Module
+
+This module contains Django test cases for following Sentry Link header cursors and for
+streaming paginated lists. Upstream responses are mocked, so no third-party service is
+contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_pagination
+
+Test Coverage:
+    - Cursor following across pages
+    - Page and item caps, reported by the truncated flag, a header and a final stream item
+    - Buffered views returning every page, joining the upstream page bodies without re-encoding
+    - JSON array and NDJSON streaming
+"""
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, override_settings
+
+from ..views.pagination import fetch_all_pages, truncated
+from .helpers import upstream_response
+
+ISSUES_REQUEST = {"uri": "https://sentry.io/api/0/projects/org/1/issues/", "method": "get", "headers": {}}
+
+def fake_pages(*pages):
+    '''
+        Returns a side effect for upstream.send that serves pages in order, linking each page
+        to the next one with a Sentry style cursor
+    '''
+    def send(method, uri, params=None, **kwargs):
+        index = int((params or {}).get("cursor", "0:0:0").split(":")[1])
+        has_next = index + 1 < len(pages)
+        body = json.dumps(pages[index], separators=(",", ":")).encode()
+        return upstream_response(pages[index], body=body, links={"next": {"url": uri, "results": "true" if has_next else "false", "cursor": f"0:{index + 1}:0"}})
+    return send
+
+@override_settings(SENTRY_PAGINATION_MAX_PAGES=10, SENTRY_PAGINATION_MAX_ITEMS=100)
+class PaginationTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_follows_cursors(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([1, 2], [3], [4, 5])) as send:
+            items = fetch_all_pages(ISSUES_REQUEST)
+        self.assertEqual((items, truncated(items)), ([1, 2, 3, 4, 5], False))
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(send.call_args.kwargs["params"], {"cursor": "0:2:0"})
+
+    @override_settings(SENTRY_PAGINATION_MAX_PAGES=2)
+    def test_page_cap(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([1, 2], [3], [4, 5])):
+            items = fetch_all_pages(ISSUES_REQUEST)
+        self.assertEqual((items, truncated(items)), ([1, 2, 3], True))
+
+    @override_settings(SENTRY_PAGINATION_MAX_ITEMS=3)
+    def test_item_cap(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([1, 2], [3, 4], [5])) as send:
+            items = fetch_all_pages(ISSUES_REQUEST)
+        self.assertEqual((items, truncated(items)), ([1, 2, 3], True))
+        self.assertEqual(send.call_count, 2)
+        # Ending exactly at the cap is not a truncation
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([1, 2], [3])):
+            self.assertFalse(truncated(fetch_all_pages(ISSUES_REQUEST)))
+
+    def test_buffered_view_returns_every_page(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([{"id": "1"}], [{"id": "2"}])):
+            response = self.client.get("/api/sentry/issues/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{"id": "1"}, {"id": "2"}])
+        self.assertFalse(response.has_header("X-Pagination-Truncated"))
+
+    def test_buffered_view_passes_page_bodies_through(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([{"id": "1", "title": "a"}], [], [{"id": "2"}])):
+            response = self.client.get("/api/sentry/issues/")
+        # The upstream bytes are joined as they are, not encoded again with ", " separators
+        self.assertEqual(response.content, b'[{"id":"1","title":"a"},{"id":"2"}]')
+
+    @override_settings(SENTRY_PAGINATION_MAX_PAGES=1)
+    def test_truncated_responses_say_so(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([{"id": "1", "title": "a"}], [{"id": "2"}])):
+            buffered = [self.client.get("/api/sentry/issues/") for _ in range(2)]
+            streamed = self.client.get("/api/sentry/events/?stream=ndjson&fields=id")
+            lines = b"".join(streamed.streaming_content).decode().splitlines()
+        # The flag is cached along with the body
+        self.assertEqual([(response.json(), response["X-Cache"], response["X-Pagination-Truncated"]) for response in buffered], [
+            ([{"id": "1", "title": "a"}], "MISS", "true"),
+            ([{"id": "1", "title": "a"}], "HIT", "true"),
+        ])
+        self.assertEqual([json.loads(line) for line in lines], [{"id": "1"}, {"error": "page cap reached (SENTRY_PAGINATION_MAX_PAGES=1)"}])
+
+    def test_stream_json_array(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([{"id": "1"}], [{"id": "2"}])):
+            response = self.client.get("/api/sentry/events/?stream=json")
+            body = b"".join(response.streaming_content)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(body), [{"id": "1"}, {"id": "2"}])
+
+    def test_stream_ndjson(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([{"id": "1"}, {"id": "2"}], [{"id": "3"}])):
+            response = self.client.get("/api/sentry/members/?stream=ndjson")
+            lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["1", "2", "3"])
+
+    def test_stream_invalid_format(self):
+        response = self.client.get("/api/sentry/issues/?stream=xml")
+        self.assertEqual(response.status_code, 400)
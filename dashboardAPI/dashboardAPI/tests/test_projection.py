@@ -0,0 +1,121 @@
+"""
+Field Projection Tests Module
+
+This module contains Django test cases for the fields= parameter of the Sentry and Mailgun list
+endpoints. Upstream responses are mocked, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_projection
+
+Test Coverage:
+    - Field trees of dotted paths and presets
+    - Projection of buffered, streamed and batch Sentry lists
+    - Projected responses cached apart from full ones
+    - Projection of Mailgun log items
+    - Projection in the async views
+    - Parameter validation
+"""
+
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, Client, SimpleTestCase, override_settings
+
+from ..views import async_mailgun, async_sentry, projection
+from .helpers import upstream_response
+from .test_pagination import fake_pages
+
+EVENT = {
+    "id": "1",
+    "groupID": "42",
+    "dateCreated": "2025-01-01T00:00:00Z",
+    "entries": [{"type": "exception", "data": {"values": ["..."]}}],
+    "contexts": {"os": {"name": "Linux"}},
+    "user": {"id": "7", "email": "a@example.com"},
+}
+
+class FieldTreeTest(SimpleTestCase):
+    def test_field_tree(self):
+        self.assertEqual(projection.field_tree(["id", "metadata.type", "user.name", "user"]), {"id": None, "metadata": {"type": None}, "user": None})
+        self.assertEqual(projection.field_tree(["metadata", "metadata.type"]), {"metadata": None})
+
+    def test_presets_and_fields(self):
+        self.assertEqual(projection.projection({"fields": "chart,user.email"}, "get_events"), {"id": None, "eventID": None, "groupID": None, "dateCreated": None, "user": {"email": None}})
+        self.assertIsNone(projection.projection({}, "get_events"))
+        with self.assertRaises(ValueError):
+            projection.projection({"fields": " , "}, "get_events")
+
+    def test_project(self):
+        tree = projection.field_tree(["id", "user.email", "tags.key"])
+        self.assertEqual(projection.project(EVENT, tree), {"id": "1", "user": {"email": "a@example.com"}})
+        self.assertEqual(projection.project({"tags": [{"key": "level", "value": "error"}], "user": None}, tree), {"tags": [{"key": "level"}], "user": None})
+        self.assertEqual(projection.project_document({"items": [EVENT], "pagination": {}}, tree), {"items": [{"id": "1", "user": {"email": "a@example.com"}}], "pagination": {}})
+
+@override_settings(UPSTREAM_CACHE_POLICIES={"get_events": (30, 60), "get_issue_events": (30, 60), "get_logs": (30, 60)})
+class ProjectedViewsTest(SimpleTestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_buffered_list(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([EVENT], [{**EVENT, "id": "2"}])):
+            response = self.client.get("/api/sentry/events/", {"fields": "chart"})
+        self.assertEqual(response.json(), [
+            {"id": "1", "groupID": "42", "dateCreated": "2025-01-01T00:00:00Z"},
+            {"id": "2", "groupID": "42", "dateCreated": "2025-01-01T00:00:00Z"},
+        ])
+
+    def test_projected_and_full_responses_are_cached_apart(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([EVENT])) as send:
+            self.assertEqual(self.client.get("/api/sentry/events/", {"fields": "id"}).json(), [{"id": "1"}])
+            self.assertEqual(self.client.get("/api/sentry/events/").json(), [EVENT])
+            response = self.client.get("/api/sentry/events/", {"fields": "id"})
+        self.assertEqual((response.json(), response["X-Cache"]), ([{"id": "1"}], "HIT"))
+        self.assertEqual(send.call_count, 2)
+
+    def test_stream(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([EVENT], [{**EVENT, "id": "2"}])):
+            response = self.client.get("/api/sentry/issues/42/events/", {"fields": "id,user.id", "stream": "ndjson"})
+            lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [{"id": "1", "user": {"id": "7"}}, {"id": "2", "user": {"id": "7"}}])
+
+    def test_batch_events(self):
+        with mock.patch("dashboardAPI.views.pagination.send", side_effect=fake_pages([EVENT])):
+            data = self.client.get("/api/sentry/issues/events/batch/", {"issue_ids": "42", "fields": "id"}).json()
+        self.assertEqual(data, {"42": {"events": [{"id": "1"}], "error": None}})
+
+    def test_mailgun_logs(self):
+        logs = {"items": [{"id": "a", "event": "failed", "@timestamp": "2025-01-01T00:00:00Z", "envelope": {"sender": "x"}}], "pagination": {"next": "t"}}
+        with mock.patch("dashboardAPI.views.helpers.send", return_value=upstream_response(logs)):
+            data = self.client.put("/api/mailgun/logs/?fields=chart", {}, content_type="application/json").json()
+        self.assertEqual(data, {"items": [{"id": "a", "@timestamp": "2025-01-01T00:00:00Z", "event": "failed"}], "pagination": {"next": "t"}})
+
+    def test_invalid_fields(self):
+        self.assertEqual(self.client.get("/api/sentry/issues/", {"fields": ","}).status_code, 400)
+
+class AsyncProjectedViewsTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    async def test_stream(self):
+        async def asend(method, uri, params=None, **kwargs):
+            return fake_pages([EVENT], [{**EVENT, "id": "2"}])(method, uri, params)
+        with mock.patch("dashboardAPI.views.pagination.asend", side_effect=asend):
+            response = await async_sentry.get_events(self.factory.get("/api/sentry/events/?fields=id&stream=json"))
+            body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(body), [{"id": "1"}, {"id": "2"}])
+
+    async def test_mailgun_logs(self):
+        logs = {"items": [{"id": "a", "event": "failed", "envelope": {"sender": "x"}}]}
+        with mock.patch("dashboardAPI.views.helpers.asend", return_value=upstream_response(logs)):
+            response = await async_mailgun.get_logs(self.factory.put("/api/mailgun/logs/?fields=id", b"{}", content_type="application/json"))
+        self.assertEqual(json.loads(response.content), {"items": [{"id": "a"}]})
@@ -0,0 +1,148 @@
+"""
+Rate Limit Scheduler Tests Module
+
+This module contains Django test cases for the vendor rate limit scheduler. Upstream responses
+are mocks carrying rate limit headers, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_rate_limit
+
+Test Coverage:
+    - Buckets learned from X-Sentry-Rate-Limit-* and Retry-After headers
+    - Per-endpoint Sentry buckets and per-account Mailgun buckets
+    - Priority reserves and waits (interactive, normal, background)
+    - Cached responses served while rate limited (X-Cache: LIMITED)
+    - 429 responses with Retry-After instead of 400
+"""
+
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..views import rate_limit, response_cache, upstream
+from ..views.codec import RawJSON
+from ..views.helpers import make_request, run_concurrently
+
+ISSUES_URI = "https://sentry.io/api/0/organizations/org/issues/"
+ISSUE_URI = "https://sentry.io/api/0/organizations/org/issues/{}/"
+ISSUES_REQUEST = {"uri": ISSUES_URI, "method": "get", "headers": {}}
+
+def sentry_response(limit, remaining, reset_in=1, status_code=200, retry_after=None):
+    headers = {
+        "X-Sentry-Rate-Limit-Limit": str(limit),
+        "X-Sentry-Rate-Limit-Remaining": str(remaining),
+        "X-Sentry-Rate-Limit-Reset": str(time.time() + reset_in),
+    }
+    if retry_after is not None:
+        headers["Retry-After"] = str(retry_after)
+    return mock.Mock(status_code=status_code, headers=headers)
+
+@override_settings(RATE_LIMIT_READ_RESERVE=0.1, RATE_LIMIT_BACKGROUND_RESERVE=0.5, RATE_LIMIT_READ_WAIT=0, RATE_LIMIT_INTERACTIVE_WAIT=1)
+class RateLimitTest(SimpleTestCase):
+    def setUp(self):
+        rate_limit.reset()
+
+    def tearDown(self):
+        rate_limit.reset()
+
+    def test_unknown_budget_is_not_limited(self):
+        for _ in range(100):
+            self.assertIsNotNone(rate_limit.acquire("get", ISSUES_URI))
+        self.assertIsNone(rate_limit.acquire("get", "https://status.hubspot.com/api/v2/status.json"))
+
+    def test_buckets_are_scoped_per_endpoint(self):
+        self.assertIs(rate_limit.get_bucket("put", ISSUE_URI.format(1)), rate_limit.get_bucket("put", ISSUE_URI.format(2)))
+        self.assertIsNot(rate_limit.get_bucket("get", ISSUES_URI), rate_limit.get_bucket("put", ISSUE_URI.format(1)))
+        self.assertIs(
+            rate_limit.get_bucket("get", "https://api.mailgun.net/v3/domain/stats/total"),
+            rate_limit.get_bucket("post", "https://api.mailgun.net/v1/analytics/logs"),
+        )
+
+    def test_reserves_by_priority(self):
+        rate_limit.observe(rate_limit.get_bucket("get", ISSUES_URI), sentry_response(limit=10, remaining=6, reset_in=60))
+        with rate_limit.priority("background"):
+            # Background calls leave half of the budget untouched
+            rate_limit.acquire("get", ISSUES_URI)
+            with self.assertRaises(rate_limit.RateLimited):
+                rate_limit.acquire("get", ISSUES_URI)
+        for _ in range(4):
+            rate_limit.acquire("get", ISSUES_URI)
+        with self.assertRaises(rate_limit.RateLimited):
+            rate_limit.acquire("get", ISSUES_URI)
+        with rate_limit.priority("interactive"):
+            rate_limit.acquire("get", ISSUES_URI)
+
+    def test_mutations_are_interactive(self):
+        bucket = rate_limit.get_bucket("put", ISSUE_URI.format(1))
+        rate_limit.observe(bucket, sentry_response(limit=10, remaining=1, reset_in=60))
+        with rate_limit.priority("normal"), self.assertRaises(rate_limit.RateLimited):
+            rate_limit.acquire("put", ISSUE_URI.format(1))
+        self.assertIs(rate_limit.acquire("put", ISSUE_URI.format(1)), bucket)
+
+    def test_interactive_calls_wait_for_a_token(self):
+        rate_limit.observe(rate_limit.get_bucket("put", ISSUE_URI.format(1)), sentry_response(limit=10, remaining=0, reset_in=0.2))
+        started = time.monotonic()
+        rate_limit.acquire("put", ISSUE_URI.format(1))
+        self.assertGreater(time.monotonic() - started, 0)
+
+    def test_retry_after_blocks_the_bucket(self):
+        bucket = rate_limit.get_bucket("get", ISSUES_URI)
+        rate_limit.observe(bucket, sentry_response(limit=10, remaining=5, status_code=429, retry_after=30))
+        with self.assertRaises(rate_limit.RateLimited) as raised:
+            rate_limit.acquire("get", ISSUES_URI)
+        self.assertGreater(raised.exception.retry_after, 25)
+        self.assertEqual(bucket.state()["throttled"], 1)
+
+    def test_upstream_send_records_headers(self):
+        session = upstream.get_session(ISSUES_URI)
+        with mock.patch.object(session, "request", return_value=sentry_response(limit=40, remaining=12)):
+            upstream.send("get", ISSUES_URI)
+        state = rate_limit.get_bucket("get", ISSUES_URI).state()
+        self.assertEqual((state["limit"], state["remaining"]), (40, 12))
+
+    def test_priority_reaches_worker_threads(self):
+        with rate_limit.priority("background"):
+            priorities = run_concurrently(lambda _: rate_limit.current_priority("get"), range(3), 3)
+        self.assertEqual([result for result, error in priorities], ["background"] * 3)
+
+@override_settings(RATE_LIMIT_READ_WAIT=0)
+class RateLimitedResponseTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def tearDown(self):
+        cache.clear()
+        rate_limit.reset()
+
+    def exhaust(self):
+        rate_limit.observe(rate_limit.get_bucket("get", ISSUES_URI), sentry_response(limit=10, remaining=0, status_code=429, retry_after=42))
+
+    def test_rate_limit_returns_429(self):
+        self.exhaust()
+        response = make_request(ISSUES_REQUEST)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "42")
+
+    def test_upstream_429_returns_429(self):
+        error = mock.Mock(status_code=429, headers={"Retry-After": "7"})
+        with mock.patch("dashboardAPI.views.helpers.fetch_raw_json", side_effect=Exception("Too Many Requests")) as fetch:
+            fetch.side_effect.response = error
+            response = make_request(ISSUES_REQUEST)
+        self.assertEqual((response.status_code, response["Retry-After"]), (429, "7"))
+
+    @override_settings(UPSTREAM_CACHE_POLICIES={"get_issues": (30, 60)})
+    def test_cached_response_served_while_rate_limited(self):
+        with mock.patch("dashboardAPI.views.helpers.fetch_raw_pages", return_value=RawJSON.from_data([{"id": "1"}])):
+            make_request(ISSUES_REQUEST, "get_issues")
+        # Move past the stale window
+        with mock.patch("dashboardAPI.views.response_cache.time.time", return_value=time.time() + 120):
+            self.exhaust()
+            with mock.patch("dashboardAPI.views.helpers.fetch_raw_pages", side_effect=lambda request: upstream.send("get", ISSUES_URI)):
+                response = make_request(ISSUES_REQUEST, "get_issues")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "LIMITED")
+        self.assertEqual(response_cache.cache_flights.metrics()["in_flight"], 0)
@@ -0,0 +1,110 @@
+"""
+Upstream Response Cache Tests Module
+
+This module contains Django test cases for the response cache placed in front of read-only
+upstream calls. Upstream calls are replaced by local functions, so no third-party service
+is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_response_cache
+
+Test Coverage:
+    - Cache hits, misses and the X-Cache response header
+    - Stale-while-revalidate serving
+    - Coalescing of concurrent identical misses
+    - Invalidation by mutating views, only after a successful issue update
+"""
+
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, override_settings
+
+from ..views import response_cache
+from ..views.codec import RawJSON
+from ..views.helpers import make_request, run_concurrently
+
+ISSUES_REQUEST = {"uri": "https://sentry.io/api/0/projects/org/1/issues/", "method": "get", "headers": {}}
+
+class ResponseCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_miss_then_hit(self):
+        load = mock.Mock(return_value=[{"id": "1"}])
+        self.assertEqual(response_cache.fetch_through("get_issues", ISSUES_REQUEST, load), ([{"id": "1"}], "MISS"))
+        self.assertEqual(response_cache.fetch_through("get_issues", ISSUES_REQUEST, load), ([{"id": "1"}], "HIT"))
+        self.assertEqual(load.call_count, 1)
+
+    def test_key_ignores_credentials(self):
+        load = mock.Mock(return_value=[])
+        response_cache.fetch_through("get_issues", ISSUES_REQUEST, load)
+        other_credentials = dict(ISSUES_REQUEST, headers={"Authorization": "Bearer other"})
+        self.assertEqual(response_cache.fetch_through("get_issues", other_credentials, load)[1], "HIT")
+        other_params = dict(ISSUES_REQUEST, params={"statsPeriod": "24h"})
+        self.assertEqual(response_cache.fetch_through("get_issues", other_params, load)[1], "MISS")
+
+    def test_uncached_view_bypasses_cache(self):
+        load = mock.Mock(return_value={})
+        self.assertEqual(response_cache.fetch_through("update_issue_status", ISSUES_REQUEST, load), ({}, None))
+        self.assertEqual(response_cache.fetch_through(None, ISSUES_REQUEST, load), ({}, None))
+        self.assertEqual(load.call_count, 2)
+
+    @override_settings(UPSTREAM_CACHE_POLICIES={"get_issues": (0, 60)})
+    def test_stale_while_revalidate(self):
+        refreshed = threading.Event()
+        def load():
+            refreshed.set()
+            return ["new"]
+        response_cache.fetch_through("get_issues", ISSUES_REQUEST, lambda: ["old"])
+        self.assertEqual(response_cache.fetch_through("get_issues", ISSUES_REQUEST, load), (["old"], "STALE"))
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(50):
+            if response_cache.fetch_through("get_issues", ISSUES_REQUEST, lambda: ["old"])[0] == ["new"]:
+                break
+            time.sleep(0.01)
+        else:
+            self.fail("stale entry was not refreshed")
+
+    def test_concurrent_misses_are_coalesced(self):
+        calls = []
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return ["issue"]
+        results = run_concurrently(lambda _: response_cache.fetch_through("get_issues", ISSUES_REQUEST, load), range(5), 5)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == (["issue"], "MISS") for result, error in results))
+
+    def test_mutation_invalidates_related_views(self):
+        load = mock.Mock(return_value=[])
+        response_cache.fetch_through("get_issues", ISSUES_REQUEST, load)
+        response_cache.fetch_through("get_organization_members", ISSUES_REQUEST, load)
+        response_cache.invalidate("update_issue_status")
+        self.assertEqual(response_cache.fetch_through("get_issues", ISSUES_REQUEST, load)[1], "MISS")
+        self.assertEqual(response_cache.fetch_through("get_organization_members", ISSUES_REQUEST, load)[1], "HIT")
+
+    def test_issue_update_invalidates_issue_lists(self):
+        load = mock.Mock(return_value=[])
+        def update(status_code):
+            upstream = mock.Mock(status_code=status_code, headers={"Content-Type": "application/json"}, content=b"{}")
+            upstream.raise_for_status.side_effect = None if status_code < 400 else Exception(f"status {status_code}")
+            with mock.patch("dashboardAPI.views.helpers.send", return_value=upstream):
+                Client().put("/api/sentry/issues/42/", {"status": "resolved"}, content_type="application/json")
+            return response_cache.fetch_through("get_issues", ISSUES_REQUEST, load)[1]
+        response_cache.fetch_through("get_issues", ISSUES_REQUEST, load)
+        # A failed update leaves the cached lists alone
+        self.assertEqual(update(500), "HIT")
+        self.assertEqual(update(200), "MISS")
+
+    def test_make_request_sets_cache_header(self):
+        with mock.patch("dashboardAPI.views.helpers.fetch_raw_json", return_value=RawJSON(b'[{"id": "1"}]')):
+            self.assertEqual(make_request(ISSUES_REQUEST, "get_queue_status")["X-Cache"], "MISS")
+            self.assertEqual(make_request(ISSUES_REQUEST, "get_queue_status")["X-Cache"], "HIT")
+            self.assertFalse(make_request(ISSUES_REQUEST).has_header("X-Cache"))
@@ -18,9 +18,22 @@ Test Coverage:
     - Issue-specific event tracking
     - Alert monitoring
     - Dynamic issue ID validation for event fetching
+    - Batched issue event fetching (offline, upstream calls are mocked)
+    - Bulk issue updates with per-issue fallback (offline, upstream calls are mocked)
+    - Rejection of issue update bodies that are not JSON objects
+    - Translation of dashboard query parameters into Sentry parameters
 """
 
-from django.test import Client, TestCase
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import Client, SimpleTestCase, TestCase
+
+from ..views.codec import RawJSON
+from ..views.helpers import translate_sentry_params
+from .helpers import upstream_response
 
 class SentryTest(TestCase):
     def setUp(self):
@@ -45,3 +58,108 @@ class SentryTest(TestCase):
     def test_get_sentry_alerts(self):
         response = self.client.get("/api/sentry/alerts/")
         self.assertEqual(response.status_code, 200)
+
+class SentryBatchEventsTest(TestCase):
+    def setUp(self):
+        self.client = Client(enforce_csrf_checks=True)
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def fake_fetch_json(self, request):
+        if request["uri"].endswith("/issues/"):
+            return RawJSON.from_data([{"id": "1"}, {"id": "2"}])
+        if "/issues/2/" in request["uri"]:
+            raise requests.exceptions.HTTPError("404 Client Error")
+        return RawJSON.from_data([{"id": "event", "uri": request["uri"]}])
+
+    def test_get_batch_issue_events(self):
+        with mock.patch("dashboardAPI.views.helpers.fetch_raw_pages", side_effect=self.fake_fetch_json):
+            response = self.client.get("/api/sentry/issues/events/batch/?issue_ids=1,2&issue_ids=1")
+        self.assertEqual(response.status_code, 200)
+        json = response.json()
+        self.assertEqual(list(json), ["1", "2"])
+        self.assertEqual(len(json["1"]["events"]), 1)
+        self.assertIsNone(json["1"]["error"])
+        self.assertEqual(json["2"]["events"], [])
+        self.assertIn("404 Client Error", json["2"]["error"])
+        # Errors embedded in 200 bodies never carry the Sentry credentials
+        self.assertNotIn("Authorization", json["2"]["error"])
+
+    def test_get_batch_issue_events_defaults_to_issue_list(self):
+        with mock.patch("dashboardAPI.views.helpers.fetch_raw_pages", side_effect=self.fake_fetch_json):
+            response = self.client.get("/api/sentry/issues/events/batch/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()), ["1", "2"])
+
+class SentryBulkUpdateTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def bulk_update(self, data):
+        return self.client.put("/api/sentry/issues/bulk/", data, content_type="application/json")
+
+    def test_bulk_mutate(self):
+        with self.settings(SENTRY_BULK_MUTATE_CHUNK_SIZE=2), \
+                mock.patch("dashboardAPI.views.sentry.send", return_value=upstream_response({"status": "resolved"})) as send:
+            response = self.bulk_update({"issue_ids": ["1", "2", "3", "1"], "status": "resolved", "unknown": True})
+        self.assertEqual(response.json(), {"succeeded": 3, "failed": 0, "results": {
+            issue_id: {"ok": True, "mode": "bulk", "error": None} for issue_id in ("1", "2", "3")
+        }})
+        self.assertEqual(sorted(call.kwargs["params"]["id"] for call in send.call_args_list), [["1", "2"], ["3"]])
+        self.assertEqual(send.call_args.kwargs["json"], {"status": "resolved"})
+
+    def test_rejected_bulk_mutate_falls_back_to_single_updates(self):
+        def single_update(method, uri, **kwargs):
+            return upstream_response(status_code=404) if "/issues/2/" in uri else upstream_response({"id": "1"})
+        with mock.patch("dashboardAPI.views.sentry.send", return_value=upstream_response(status_code=400)), \
+                mock.patch("dashboardAPI.views.helpers.send", side_effect=single_update) as send:
+            response = self.bulk_update({"issue_ids": ["1", "2"], "isBookmarked": True})
+        data = response.json()
+        self.assertEqual((data["succeeded"], data["failed"]), (1, 1))
+        self.assertEqual(data["results"]["1"], {"ok": True, "mode": "single", "error": None})
+        self.assertIn("404 Client Error", data["results"]["2"]["error"])
+        self.assertEqual(send.call_count, 2)
+
+    def test_rate_limited_bulk_mutate_is_not_retried_per_issue(self):
+        with mock.patch("dashboardAPI.views.sentry.send", return_value=upstream_response(status_code=429)), \
+                mock.patch("dashboardAPI.views.helpers.send") as send:
+            data = self.bulk_update({"issue_ids": ["1", "2"], "status": "ignored"}).json()
+        self.assertEqual(data["failed"], 2)
+        self.assertIn("429", data["results"]["1"]["error"])
+        send.assert_not_called()
+
+    def test_invalid_issue_ids(self):
+        for data in ({"status": "resolved"}, {"issue_ids": []}, {"issue_ids": "1,2"}, {"issue_ids": [{"id": 1}]}, ["1", "2"]):
+            self.assertEqual(self.bulk_update(data).status_code, 400, data)
+        with self.settings(SENTRY_BATCH_MAX_ISSUES=1):
+            self.assertEqual(self.bulk_update({"issue_ids": ["1", "2"]}).status_code, 400)
+
+    def test_single_update_requires_an_object(self):
+        for data in (["resolved"], "resolved", 1):
+            self.assertEqual(self.client.put("/api/sentry/issues/1/", data, content_type="application/json").status_code, 400, data)
+
+class SentryQueryParamsTest(SimpleTestCase):
+    def test_issue_params(self):
+        params = translate_sentry_params(QueryDict("timeRange=1d&level=error&sort=freq&stream=json"), "get_issues")
+        self.assertEqual(params, {"query": "is:unresolved level:error lastSeen:-24h", "sort": "freq"})
+
+    def test_issue_status_and_query(self):
+        self.assertEqual(translate_sentry_params(QueryDict("status=all"), "get_issues"), {})
+        self.assertEqual(translate_sentry_params(QueryDict("status=resolved&query=TypeError"), "get_issues"), {"query": "TypeError is:resolved"})
+        self.assertEqual(translate_sentry_params(QueryDict("query=is:ignored"), "get_issues"), {"query": "is:ignored"})
+
+    def test_event_params(self):
+        self.assertEqual(translate_sentry_params(QueryDict("timeRange=7d&level=error"), "get_events"), {"statsPeriod": "7d"})
+        self.assertEqual(translate_sentry_params(QueryDict("timeRange=7d&statsPeriod=1h"), "get_issue_events"), {"statsPeriod": "1h"})
+
+    def test_invalid_time_range(self):
+        with self.assertRaises(ValueError):
+            translate_sentry_params(QueryDict("timeRange=1y"), "get_events")
+        response = Client().get("/api/sentry/events/?timeRange=1y")
+        self.assertEqual(response.status_code, 400)
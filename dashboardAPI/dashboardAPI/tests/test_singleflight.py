@@ -0,0 +1,149 @@
+"""
+Singleflight Tests Module
+
+This module contains Django test cases for the coalescing of identical concurrent upstream
+requests. The upstream client is replaced by mocks, so no third-party service is contacted.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_singleflight
+
+Test Coverage:
+    - Concurrent identical requests share one upstream call and are counted as deduplicated
+    - Requests differing in parameters or body are not coalesced
+    - Errors are shared by every waiting caller
+    - Mutating methods are never coalesced
+    - Async coalescing per event loop
+    - Waiters taking over the call of a cancelled leader
+"""
+
+import asyncio
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ..views import singleflight
+from ..views.helpers import fetch_json, run_concurrently
+from .helpers import upstream_response
+
+ISSUES_URI = "https://sentry.io/api/0/organizations/org/issues/"
+
+def slow_response(data, delay=0.2):
+    def send(*args, **kwargs):
+        time.sleep(delay)
+        return upstream_response(data)
+    return send
+
+class SingleflightTest(SimpleTestCase):
+    def setUp(self):
+        self.group = singleflight.Group("test")
+
+    def tearDown(self):
+        singleflight.groups.pop("test", None)
+
+    def test_concurrent_calls_share_one_load(self):
+        calls = []
+        def load():
+            calls.append(1)
+            time.sleep(0.2)
+            return ["member"]
+        results = run_concurrently(lambda _: self.group.do("members", load), range(5), 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([result for result, error in results], [["member"]] * 5)
+        self.assertEqual(self.group.metrics(), {"calls": 5, "deduplicated": 4, "in_flight": 0})
+
+    def test_errors_are_shared(self):
+        started = threading.Event()
+        def load():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("upstream down")
+        leader = threading.Thread(target=lambda: self.assertRaises(ValueError, self.group.do, "key", load))
+        leader.start()
+        started.wait(5)
+        with self.assertRaises(ValueError):
+            self.group.do("key", mock.Mock(return_value="unused"))
+        leader.join()
+        self.assertEqual(self.group.metrics()["deduplicated"], 1)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        load = mock.Mock(return_value=[])
+        self.group.do("key", load)
+        self.group.do("key", load)
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual(self.group.metrics()["deduplicated"], 0)
+
+    def test_async_calls_share_one_load(self):
+        calls = []
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return ["member"]
+        async def run():
+            return await asyncio.gather(*(self.group.ado("members", load) for _ in range(4)))
+        self.assertEqual(asyncio.run(run()), [["member"]] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.group.metrics()["deduplicated"], 3)
+
+    def test_cancelled_leader_does_not_strand_waiters(self):
+        calls = []
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return ["member"]
+        async def run():
+            leader = asyncio.create_task(self.group.ado("members", load))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(self.group.ado("members", load))
+            await asyncio.sleep(0.01)
+            # As when Django cancels the view task of a disconnected client
+            leader.cancel()
+            return await asyncio.wait_for(waiter, 2), leader
+        result, leader = asyncio.run(run())
+        self.assertEqual((result, leader.cancelled(), len(calls)), (["member"], True, 2))
+        self.assertEqual(self.group.metrics()["in_flight"], 0)
+
+class UpstreamSingleflightTest(SimpleTestCase):
+    def test_identical_requests_reach_upstream_once(self):
+        request = {"method": "get", "uri": ISSUES_URI, "headers": {}, "params": {"query": "is:unresolved"}}
+        with mock.patch("dashboardAPI.views.upstream.send", side_effect=slow_response([{"id": "1"}])) as send:
+            before = singleflight.upstream_flights.metrics()["deduplicated"]
+            results = run_concurrently(lambda _: fetch_json(request), range(4), 4)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual([result for result, error in results], [[{"id": "1"}]] * 4)
+        self.assertEqual(singleflight.upstream_flights.metrics()["deduplicated"] - before, 3)
+
+    def test_different_params_are_not_coalesced(self):
+        requests = [
+            {"method": "get", "uri": ISSUES_URI, "params": {"query": "is:unresolved"}},
+            {"method": "get", "uri": ISSUES_URI, "params": {"query": "is:resolved"}},
+        ]
+        with mock.patch("dashboardAPI.views.upstream.send", side_effect=slow_response([])) as send:
+            run_concurrently(fetch_json, requests, 2)
+        self.assertEqual(send.call_count, 2)
+
+    def test_credentials_are_not_part_of_the_key(self):
+        self.assertEqual(
+            singleflight.request_key("get", ISSUES_URI, {"params": {"a": 1}, "headers": {"Authorization": "Bearer x"}}),
+            singleflight.request_key("GET", ISSUES_URI, {"params": {"a": 1}, "timeout": 5}),
+        )
+
+    def test_mutations_are_not_coalesced(self):
+        request = {"method": "put", "uri": f"{ISSUES_URI}1/", "json": {"status": "resolved"}}
+        with mock.patch("dashboardAPI.views.upstream.send", side_effect=slow_response({})) as send:
+            run_concurrently(lambda _: fetch_json(request), range(3), 3)
+        self.assertEqual(send.call_count, 3)
+
+    @override_settings(UPSTREAM_SINGLEFLIGHT_ENABLED=False)
+    def test_can_be_disabled(self):
+        request = {"method": "get", "uri": ISSUES_URI}
+        with mock.patch("dashboardAPI.views.upstream.send", side_effect=slow_response([])) as send:
+            run_concurrently(lambda _: fetch_json(request), range(3), 3)
+        self.assertEqual(send.call_count, 3)
+
+    def test_metrics_cover_every_group(self):
+        metrics = singleflight.metrics()
+        self.assertIn("upstream", metrics)
+        self.assertIn("response-cache", metrics)
@@ -0,0 +1,79 @@
+"""
+Event Time Series Tests Module
+
+This module contains Django test cases for the EventBucket rollups maintained by the event store
+and the /api/timeseries/ endpoint that serves them.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_timeseries
+
+Test Coverage:
+    - Incremental rollup on insert, deduplication and prune
+    - Dense per-series counts, grouping and filters
+    - Parameter validation
+"""
+
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import Client, TestCase
+
+from ..models import EventBucket
+from ..views import event_store
+
+def row(external_id, timestamp, source="sentry", category="TypeError", level="error", event_type="error"):
+    return {
+        "source": source,
+        "external_id": external_id,
+        "timestamp": datetime.fromisoformat(timestamp),
+        "level": level,
+        "category": category,
+        "event_type": event_type,
+    }
+
+class TimeseriesTest(TestCase):
+    def setUp(self):
+        self.client = Client()
+        event_store.store([
+            row("a", "2025-01-01T10:15:00+00:00"),
+            row("b", "2025-01-01T10:45:00+00:00"),
+            row("c", "2025-01-02T08:00:00+00:00"),
+            row("m1", "2025-01-01T23:30:00+00:00", "mailgun", "Email Bounced", "warning", "bounced"),
+        ])
+
+    def test_rollup(self):
+        self.assertEqual(EventBucket.objects.get(resolution="hour", start=datetime(2025, 1, 1, 10, tzinfo=timezone.utc)).count, 2)
+        self.assertEqual(EventBucket.objects.get(resolution="day", source="sentry", start=datetime(2025, 1, 1, tzinfo=timezone.utc)).count, 2)
+        # Rows already stored are not counted twice
+        self.assertEqual(event_store.store([row("a", "2025-01-01T10:15:00+00:00"), row("d", "2025-01-01T10:50:00+00:00")]), 1)
+        self.assertEqual(EventBucket.objects.get(resolution="hour", start=datetime(2025, 1, 1, 10, tzinfo=timezone.utc)).count, 3)
+        with self.settings(EVENT_STORE_RETENTION_DAYS=1), \
+                mock.patch("dashboardAPI.views.event_store.datetime", wraps=datetime) as clock:
+            clock.now.return_value = datetime(2025, 1, 2, 12, tzinfo=timezone.utc)
+            # a, b and d are older than the cutoff (2025-01-01T12:00)
+            self.assertEqual(event_store.prune(), 3)
+        self.assertEqual(
+            list(EventBucket.objects.filter(resolution="day").order_by("start").values_list("source", "start", "count")),
+            [("mailgun", datetime(2025, 1, 1, tzinfo=timezone.utc), 1), ("sentry", datetime(2025, 1, 2, tzinfo=timezone.utc), 1)],
+        )
+
+    def test_timeseries(self):
+        data = self.client.get("/api/timeseries/", {"start": "2025-01-01T00:00:00Z", "end": "2025-01-03T00:00:00Z"}).json()
+        self.assertEqual(data, {
+            "resolution": "day",
+            "start": "2025-01-01T00:00:00+00:00",
+            "step": 86400,
+            "buckets": 2,
+            "groupBy": ["source", "category"],
+            "series": [
+                {"source": "sentry", "category": "TypeError", "total": 3, "counts": [2, 1]},
+                {"source": "mailgun", "category": "Email Bounced", "total": 1, "counts": [1, 0]},
+            ],
+        })
+        data = self.client.get("/api/timeseries/", {"start": "2025-01-01T10:30:00Z", "end": "2025-01-01T12:00:00Z", "resolution": "hour", "groupBy": "level", "source": "sentry"}).json()
+        self.assertEqual((data["start"], data["series"]), ("2025-01-01T10:00:00+00:00", [{"level": "error", "total": 2, "counts": [2, 0]}]))
+
+    def test_invalid(self):
+        for params in ({"resolution": "minute"}, {"groupBy": "issue"}, {"timeRange": "1y"}, {"start": "yesterday"}, {"timeRange": "90d", "resolution": "hour", "end": "2025-04-01T00:00:01Z"}):
+            self.assertEqual(self.client.get("/api/timeseries/", params).status_code, 400, params)
@@ -0,0 +1,72 @@
+"""
+Upstream HTTP Client Tests Module
+
+This module contains Django test cases for the pooled upstream HTTP client used by all
+proxy views. These tests do not contact any third-party service.
+
+Usage:
+    Run these tests using Django's test runner:
+        python manage.py test dashboardAPI.tests.test_upstream
+
+Test Coverage:
+    - Session reuse per upstream host
+    - Connection pool and retry configuration
+    - Default connect/read timeouts
+    - Async retries waiting for Retry-After
+"""
+
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase, override_settings
+
+from ..views import async_upstream, upstream
+
+class UpstreamClientTest(SimpleTestCase):
+    def setUp(self):
+        upstream.close_sessions()
+
+    def tearDown(self):
+        upstream.close_sessions()
+
+    def test_session_is_shared_per_host(self):
+        first = upstream.get_session("https://sentry.io/api/0/projects/")
+        second = upstream.get_session("https://sentry.io/_health/")
+        other = upstream.get_session("https://api.mailgun.net/v3/stats/total")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    @override_settings(UPSTREAM_POOL_MAXSIZE=7, UPSTREAM_MAX_RETRIES=4)
+    def test_adapter_configuration(self):
+        adapter = upstream.get_session("https://sentry.io/").get_adapter("https://sentry.io/")
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 4)
+        self.assertIn("GET", adapter.max_retries.allowed_methods)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+
+    @override_settings(UPSTREAM_CONNECT_TIMEOUT=1.5, UPSTREAM_READ_TIMEOUT=9)
+    def test_send_applies_default_timeout(self):
+        session = upstream.get_session("https://sentry.io/")
+        with mock.patch.object(session, "request") as request:
+            upstream.send("get", "https://sentry.io/_health/")
+            request.assert_called_once_with("GET", "https://sentry.io/_health/", timeout=(1.5, 9))
+            upstream.send("post", "https://sentry.io/_health/", timeout=2)
+            self.assertEqual(request.call_args.kwargs["timeout"], 2)
+
+@override_settings(UPSTREAM_MAX_RETRIES=2, UPSTREAM_BACKOFF_FACTOR=0.5)
+class AsyncUpstreamClientTest(SimpleTestCase):
+    async def asend(self, *responses):
+        client = mock.Mock(request=mock.AsyncMock(side_effect=responses))
+        with mock.patch.object(async_upstream, "get_client", return_value=client), \
+                mock.patch("dashboardAPI.views.async_upstream.asyncio.sleep") as sleep:
+            response = await async_upstream.asend("get", "https://sentry.io/api/0/projects/")
+        return response, [call.args[0] for call in sleep.call_args_list]
+
+    async def test_retries_wait_for_retry_after(self):
+        unavailable = httpx.Response(503, headers={"Retry-After": "7"})
+        response, delays = await self.asend(unavailable, httpx.Response(502), httpx.Response(200))
+        self.assertEqual((response.status_code, delays), (200, [7, 1.0]))
+
+    async def test_last_attempt_is_returned(self):
+        response, delays = await self.asend(*[httpx.Response(503)] * 3)
+        self.assertEqual((response.status_code, delays), (503, [0.5, 1.0]))
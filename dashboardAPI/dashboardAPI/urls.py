@@ -9,7 +9,16 @@ Usage:
     This file is automatically loaded by Django's URL routing system. All API endpoints
     are prefixed with '/api/' and organized by service type (sentry, mailgun, hubspot).
 
+Setting ASYNC_VIEWS=True routes the same URLs to the async views in views/async_*.py, for use
+under an ASGI server.
+
 API Endpoint Structure:
+    /api/dashboard/*        - Aggregated dashboard documents
+    /api/stream/            - Server-Sent Events live updates
+    /api/store/*            - Queries against the local event store
+    /api/timeseries/        - Per-bucket event counts for charts
+    /api/chart/*            - Normalized chart events in a columnar layout
+    /api/metrics/           - Prometheus metrics of requests, upstream calls and caches
     /api/sentry/*           - Sentry error tracking and monitoring
     /api/hubspot/*          - HubSpot CRM integration status  
     /api/mailgun/*          - Mailgun email service management
@@ -27,30 +36,67 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.urls import path
 
-from .views import sentry
-from .views import integrations
-from .views import mailgun
+if settings.ASYNC_VIEWS:
+    # Async views share routes and responses with the sync views (see views/async_*.py)
+    from .views import async_sentry as sentry
+    from .views import async_integrations as integrations
+    from .views import async_mailgun as mailgun
+    from .views import async_dashboard as dashboard
+    from .views import async_issue_sync as issue_sync
+    from .views import async_live as live
+    from .views import async_event_store as event_store
+    from .views import async_timeseries as timeseries
+    from .views import async_chart_events as chart_events
+    from .views import async_member_directory as member_directory
+    from .views import async_metrics as metrics
+else:
+    from .views import sentry
+    from .views import integrations
+    from .views import mailgun
+    from .views import dashboard
+    from .views import issue_sync
+    from .views import live
+    from .views import event_store
+    from .views import timeseries
+    from .views import chart_events
+    from .views import member_directory
+    from .views import metrics
 
 urlpatterns = [
+    # Dashboard API endpoints
+    path("api/dashboard/snapshot/", dashboard.get_dashboard_snapshot, name="get dashboard snapshot"),
+    path("api/stream/", live.get_stream, name="get live updates"),
+    path("api/store/events/", event_store.get_stored_events, name="get stored events"),
+    path("api/timeseries/", timeseries.get_timeseries, name="get timeseries"),
+    path("api/chart/events/", chart_events.get_chart_events, name="get chart events"),
+    path("api/metrics/", metrics.get_metrics, name="get metrics"),
+
     # Sentry API endpoints
+    path("api/sentry/sync/", issue_sync.get_sentry_sync, name="get sentry sync"),
+    path("api/sentry/issues/events/batch/", sentry.get_batch_issue_events, name="get batch issue events"),
+    path("api/sentry/issues/bulk/", sentry.bulk_update_issue_status, name="bulk update issue status"),
     path("api/sentry/issues/<str:issue_id>/events/", sentry.get_issue_events, name="get issue events"),
     path("api/sentry/issues/<str:issue_id>/", sentry.update_issue_status, name="update issue status"),
     path("api/sentry/issues/", sentry.get_issues, name="get issues"),
     path("api/sentry/events/", sentry.get_events, name="get events"),
     path("api/sentry/alerts/", sentry.get_sentry_alerts, name="get alerts"),
+    path("api/sentry/members/search/", member_directory.get_member_search, name="search organization members"),
     path("api/sentry/members/", sentry.get_organization_members, name="get organization members"),
 
     # Integration API endpoints
     path("api/sentry/integration-status/", integrations.get_sentry_integration_status, name="get sentry integration status"),
     path("api/hubspot/integration-status/", integrations.get_hubspot_integration_status, name="get hubspot integration status"),
+    path("api/mailgun/integration-status/", integrations.get_mailgun_integration_status, name="get mailgun integration status"),
 
     # Mailgun API endpoints
     path("api/mailgun/queue-status/", mailgun.get_queue_status, name="get mailgun whitelist"),
     path("api/mailgun/account-metrics/", mailgun.get_account_metrics, name="get mailgun account metrics"),
     path("api/mailgun/account-usage-metrics/", mailgun.get_account_usage_metrics, name="get mailgun account usage metrics"),
     path("api/mailgun/logs/", mailgun.get_logs, name="get mailgun logs"),
+    path("api/mailgun/logs/export/", mailgun.export_logs, name="export mailgun logs"),
     path("api/mailgun/stats/totals/", mailgun.get_stat_totals, name = "get mailgun stat totals"),
     path("api/mailgun/stats/filter/", mailgun.get_filtered_grouped_stats, name = "get filtered mailgun stats"),
     path("api/mailgun/mailing-list-members/<str:list_address>/", mailgun.get_mailing_list_members, name = "get mailing list members"),
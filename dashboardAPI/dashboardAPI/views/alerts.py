@@ -0,0 +1,248 @@
+"""
+Sentry Alerts Feed Module
+
+This module keeps the alerts of /api/sentry/alerts/ (and the dashboard snapshot) as a bounded,
+pre-rendered list of the most recently seen unresolved issues. Instead of downloading every
+issue and keeping the first ten, the feed asks Sentry for at most SENTRY_ALERTS_MAX_ALERTS
+issues sorted by lastSeen, without stats. Later refreshes only ask for issues seen since the
+newest one in the feed and merge them in, so a refresh is one small query per project; the
+projects of SENTRY_PROJECTS are queried concurrently (see fanout.py).
+
+Usage:
+    GET /api/sentry/alerts/?limit=5&severity=error&since=2025-01-01T00:00:00Z
+
+    In other views:
+        alerts = feed_alerts({"limit": "10"})
+
+Parameters:
+    limit    - Number of alerts returned, newest first (default 10, at most SENTRY_ALERTS_MAX_ALERTS)
+    since    - Only alerts of issues seen after this ISO 8601 timestamp
+    severity - Comma separated severities to keep (error, warning)
+
+Refreshes:
+    A request finds the feed fresh for SENTRY_ALERTS_REFRESH_INTERVAL seconds after a refresh.
+    Stale feeds are refreshed incrementally (lastSeen at or after the newest alert), and rebuilt
+    from the top issues every SENTRY_ALERTS_REBUILD_INTERVAL seconds or after an issue was
+    updated through the dashboard, so resolved issues leave the feed. Concurrent refreshes are
+    coalesced. When a refresh fails the previous alerts are served; when only some projects
+    fail, their previous alerts are kept and the next refresh rebuilds the feed.
+
+Functions:
+    issue_to_alert(issue)       - Alert document of a Sentry issue
+    AlertFeed                   - Bounded list of alerts ordered by lastSeen, newest first
+    refresh() / arefresh()      - Refresh the feed when it is stale
+    feed_alerts(params)         - Refresh when stale and return the selected alerts
+    afeed_alerts(params)        - Async counterpart of feed_alerts
+
+Configuration:
+    SENTRY_ALERTS_MAX_ALERTS        - Capacity of the feed and upstream limit of each refresh
+    SENTRY_ALERTS_REFRESH_INTERVAL  - Seconds a refreshed feed is served without asking Sentry
+    SENTRY_ALERTS_REBUILD_INTERVAL  - Seconds between full rebuilds of the feed
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+from . import fanout, response_cache, sentry
+from .helpers import afetch_json, describe_error, fetch_json
+from .singleflight import Group
+
+# Query parameter value -> rendered severity
+severities = {
+    "error": "Error",
+    "warning": "Warning",
+}
+
+def issue_to_alert(issue):
+    # Determine severity based on issue level
+    severity = "Error" if issue.get('level') == 'error' else "Warning"
+    return {
+        "message": f"Issue detected: {issue.get('title', 'Unknown issue')}",
+        "severity": severity,
+        "time": issue.get('lastSeen', datetime.now().isoformat()),
+        "details": f"Project: {issue.get('project', {}).get('name', 'Unknown')}",
+        "originalIssue": {
+            "id": issue.get('id'),
+            "shortId": issue.get('shortId'),
+            "title": issue.get('title'),
+            "culprit": issue.get('culprit', 'Unknown'),
+            "status": issue.get('status', 'unresolved'),
+            "level": issue.get('level', 'error'),
+            "lastSeen": issue.get('lastSeen'),
+            "permalink": issue.get('permalink', '')
+        }
+    }
+
+def parse_time(value):
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+def last_seen(issue):
+    try:
+        return parse_time(issue["lastSeen"])
+    except (KeyError, TypeError, ValueError):
+        return datetime.now(timezone.utc)
+
+class AlertFeed:
+    '''
+        Pre-rendered alerts keyed by issue ID and ordered by lastSeen (then issue ID), newest
+        first, holding at most SENTRY_ALERTS_MAX_ALERTS alerts. merge() takes the issues of each
+        project, re-renders issues seen again, moving them to the front, and drops the oldest
+        alerts beyond the capacity. Alerts of failed projects survive a rebuild, and the next
+        refresh after a failure is a rebuild, so no issue is skipped past the watermark.
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.ordered = []
+        self.refreshed_at = None
+        self.rebuilt_at = None
+        self.version = None
+
+    @property
+    def loaded(self):
+        return self.rebuilt_at is not None
+
+    def merge(self, project_issues, rebuild=False, version=None, now=None, failed=()):
+        now = now or time.time()
+        with self.lock:
+            entries = dict(self.entries)
+            if rebuild:
+                entries = {issue_id: entry for issue_id, entry in entries.items() if entry[2] in failed}
+            for project, issues in project_issues.items():
+                for issue in issues:
+                    if issue.get("id") is not None:
+                        entries[str(issue["id"])] = (last_seen(issue), issue_to_alert(issue), project)
+            ordered = sorted(entries.items(), key=lambda item: (item[1][0], item[0]), reverse=True)[:settings.SENTRY_ALERTS_MAX_ALERTS]
+            self.entries = dict(ordered)
+            self.ordered = [(seen, alert) for _, (seen, alert, _) in ordered]
+            self.refreshed_at = now
+            if rebuild:
+                self.rebuilt_at = now
+                self.version = version
+            if failed:
+                # Rebuild next time, as the failed projects missed issues before the new watermark
+                self.rebuilt_at = 0
+
+    def watermark(self):
+        with self.lock:
+            return self.ordered[0][0] if self.ordered else None
+
+    def select(self, limit, since=None, severities=None):
+        with self.lock:
+            ordered = self.ordered
+        selected = (alert for seen, alert in ordered if (since is None or seen > since) and (severities is None or alert["severity"] in severities))
+        return [alert for _, alert in zip(range(limit), selected)]
+
+feed = AlertFeed()
+flights = Group("alerts")
+
+def alerts_request(since=None, project=None):
+    '''
+        Request for the newest unresolved issues (seen at or after since), sorted by lastSeen and
+        limited to the feed capacity; statsPeriod="" leaves out the per-issue stats.
+    '''
+    terms = ["is:unresolved"]
+    if since is not None:
+        terms.append(f"lastSeen:>={since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")}")
+    return sentry.issues_request({"query": " ".join(terms), "sort": "date", "limit": settings.SENTRY_ALERTS_MAX_ALERTS, "statsPeriod": ""}, project)
+
+def stale_request(now=None):
+    '''
+        Returns (since, rebuild, version) when the feed needs a refresh, or None while it is
+        fresh. Issue updates through the dashboard bump the sentry-issues cache namespace, which
+        forces a rebuild.
+    '''
+    now = now or time.time()
+    version = response_cache.namespace_version("sentry-issues")
+    if feed.refreshed_at is not None and now - feed.refreshed_at < settings.SENTRY_ALERTS_REFRESH_INTERVAL and version == feed.version:
+        return None
+    rebuild = not feed.loaded or now - feed.rebuilt_at >= settings.SENTRY_ALERTS_REBUILD_INTERVAL or version != feed.version
+    return None if rebuild else feed.watermark(), rebuild, version
+
+def _merge_projects(projects, results, since, rebuild, version):
+    # Merges the projects that answered; raises the first error when none did
+    loaded, failed = {}, []
+    for project, (issues, exception) in zip(projects, results):
+        if exception is None:
+            loaded[fanout.project_label(project)] = issues
+        else:
+            print(f"Alerts refresh of {fanout.project_label(project)} failed: {describe_error(alerts_request(since, project), exception)}")
+            failed.append((project, exception))
+    if not loaded:
+        raise failed[0][1]
+    feed.merge(loaded, rebuild, version, failed={fanout.project_label(project) for project, _ in failed})
+
+def _refresh_failed(exception):
+    # Serve the previous alerts and wait one refresh interval before asking Sentry again
+    if not feed.loaded:
+        raise exception
+    feed.refreshed_at = time.time()
+
+def refresh():
+    stale = stale_request()
+    if stale is None:
+        return
+    since, rebuild, version = stale
+    projects = settings.SENTRY_PROJECTS
+    def load():
+        results = fanout.fan_out(lambda project: fetch_json(alerts_request(since, project)), projects)
+        _merge_projects(projects, results, since, rebuild, version)
+    try:
+        flights.do("refresh", load)
+    except Exception as exception:
+        _refresh_failed(exception)
+
+async def arefresh():
+    stale = stale_request()
+    if stale is None:
+        return
+    since, rebuild, version = stale
+    projects = settings.SENTRY_PROJECTS
+    async def fetch(project):
+        return await afetch_json(alerts_request(since, project))
+    async def load():
+        _merge_projects(projects, await fanout.afan_out(fetch, projects), since, rebuild, version)
+    try:
+        await flights.ado("refresh", load)
+    except Exception as exception:
+        _refresh_failed(exception)
+
+def alert_params(params):
+    '''
+        Returns the (limit, since, severities) of an alerts request. Raises ValueError for
+        malformed values.
+    '''
+    try:
+        limit = int(params.get("limit", 10))
+    except ValueError:
+        raise ValueError(f"Invalid limit \"{params.get("limit")}\"")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    since = None
+    if params.get("since"):
+        try:
+            since = parse_time(params["since"])
+        except ValueError:
+            raise ValueError(f"Invalid since \"{params["since"]}\" (expected an ISO 8601 timestamp)")
+    selected = None
+    if params.get("severity"):
+        names = [name.strip().lower() for name in params["severity"].split(",") if name.strip()]
+        unknown = [name for name in names if name not in severities]
+        if unknown:
+            raise ValueError(f"Invalid severity \"{unknown[0]}\" (only {", ".join(severities)} are allowed)")
+        selected = {severities[name] for name in names}
+    return min(limit, settings.SENTRY_ALERTS_MAX_ALERTS), since, selected
+
+def feed_alerts(params):
+    limit, since, selected = alert_params(params)
+    refresh()
+    return feed.select(limit, since, selected)
+
+async def afeed_alerts(params):
+    limit, since, selected = alert_params(params)
+    await arefresh()
+    return feed.select(limit, since, selected)
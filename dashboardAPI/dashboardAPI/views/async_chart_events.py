@@ -0,0 +1,30 @@
+"""
+Asynchronous Chart Events Module
+
+This module provides the async version of the chart_events.py endpoint for the ASGI execution
+path (settings.ASYNC_VIEWS). The Django ORM is synchronous, so the event query runs in a worker
+thread; parameters and response format are identical to chart_events.py.
+
+Functions:
+    get_chart_events()         - Async endpoint for columnar chart events
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec
+from .chart_events import chart_events
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_chart_events(request, **kwargs):
+    '''
+        Async endpoint to access normalized chart events in a columnar layout
+        See: chart_events.get_chart_events
+    '''
+    try:
+        return codec.json_response(await sync_to_async(chart_events)(request.GET), headers={"Cache-Control": "no-cache"})
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
@@ -0,0 +1,79 @@
+"""
+Asynchronous Dashboard Snapshot View Module
+
+This module provides the async version of dashboard.py for the ASGI execution path
+(settings.ASYNC_VIEWS). Sections are awaited concurrently on the shared async HTTP client;
+parameters, response format and ETag handling are identical to dashboard.py.
+
+Functions:
+    abuild_snapshot(context)     - Fetches the requested sections concurrently
+    get_dashboard_snapshot()     - Async endpoint returning the snapshot with an ETag
+"""
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec
+from .alerts import afeed_alerts
+from .async_sentry import afetch_issue_events
+from .dashboard import snapshot_context, snapshot_document
+from .fanout import afetch_merged_view
+from .helpers import afetch_cached_json, arun_concurrently
+from .integrations import get_mailgun_api_status, get_sentry_api_status, get_sentry_webhooks_status
+from .mailgun import logs_request, stat_totals_request
+from .sentry import issues_request
+
+async def load_issues(context):
+    return await afetch_merged_view(issues_request, context["issue_params"], settings.SENTRY_PROJECTS, "get_issues")
+
+async def load_issue_events(context):
+    issue_ids = [issue["id"] for issue in await load_issues(context)][:settings.SENTRY_BATCH_MAX_ISSUES]
+    return await afetch_issue_events(issue_ids, context["events_params"])
+
+async def load_alerts(context):
+    return await afeed_alerts({})
+
+async def load_mailgun_logs(context):
+    return (await afetch_cached_json(logs_request(context["logs_data"]), "get_logs"))[0]
+
+async def load_mailgun_stats(context):
+    return (await afetch_cached_json(stat_totals_request(context["stats_data"]), "get_stat_totals"))[0]
+
+async def load_sentry_integrations(context):
+    return [get_sentry_api_status(), get_sentry_webhooks_status()]
+
+async def load_mailgun_integrations(context):
+    return [get_mailgun_api_status()]
+
+snapshot_sections = {
+    "issues": load_issues,
+    "issueEvents": load_issue_events,
+    "alerts": load_alerts,
+    "sentryIntegrations": load_sentry_integrations,
+    "mailgunLogs": load_mailgun_logs,
+    "mailgunStats": load_mailgun_stats,
+    "mailgunIntegrations": load_mailgun_integrations,
+}
+
+async def abuild_snapshot(context):
+    results = await arun_concurrently(
+        lambda section: snapshot_sections[section](context),
+        context["sections"],
+        len(context["sections"]),
+    )
+    return snapshot_document(context, results)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_dashboard_snapshot(request, **kwargs):
+    '''
+        Async endpoint to access every dashboard section in one request
+        See: dashboard.get_dashboard_snapshot
+    '''
+    try:
+        context = snapshot_context(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(await abuild_snapshot(context), headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,30 @@
+"""
+Asynchronous Local Event Store Module
+
+This module provides the async version of the event_store.py query endpoint for the ASGI
+execution path (settings.ASYNC_VIEWS). The Django ORM is synchronous, so the query runs in a
+worker thread; parameters and response format are identical to event_store.py.
+
+Functions:
+    get_stored_events()        - Async endpoint for time-range queries
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec
+from .event_store import stored_events
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_stored_events(request, **kwargs):
+    '''
+        Async endpoint to query the local event store by time range
+        See: event_store.get_stored_events
+    '''
+    try:
+        return codec.json_response(await sync_to_async(stored_events)(request.GET))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
@@ -0,0 +1,39 @@
+"""
+Asynchronous Integration Status Views Module
+
+This module provides async versions of the views in integrations.py for the ASGI execution path
+(settings.ASYNC_VIEWS). Statuses are read from the background probe history in health.py, so
+no upstream call is awaited; the response format is identical to integrations.py.
+
+Functions:
+    get_sentry_integration_status()   - Async endpoint for Sentry API and webhook status
+    get_hubspot_integration_status()  - Async endpoint for HubSpot API and webhook status
+    get_mailgun_integration_status()  - Async endpoint for Mailgun API status
+"""
+
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec
+from .integrations import (
+    get_hubspot_api_status,
+    get_hubspot_webhooks_status,
+    get_mailgun_api_status,
+    get_sentry_api_status,
+    get_sentry_webhooks_status,
+)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_sentry_integration_status(request, **kwargs):
+    return codec.json_response([get_sentry_api_status(), get_sentry_webhooks_status()])
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_hubspot_integration_status(request, **kwargs):
+    return codec.json_response([get_hubspot_api_status(), get_hubspot_webhooks_status()])
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_mailgun_integration_status(request, **kwargs):
+    return codec.json_response([get_mailgun_api_status()])
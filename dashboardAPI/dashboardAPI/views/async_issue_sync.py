@@ -0,0 +1,38 @@
+"""
+Asynchronous Incremental Sentry Issue Sync Module
+
+This module provides the async version of issue_sync.py for the ASGI execution path
+(settings.ASYNC_VIEWS). The issue ledger is shared with the sync views and guarded by a thread
+lock, so the sync itself runs in a worker thread; parameters and response format are identical
+to issue_sync.py.
+
+Functions:
+    get_sentry_sync()          - Async endpoint for the delta sync API
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec, projection, rate_limit
+from .helpers import describe_error
+from .issue_sync import sync
+from .sentry import issues_request
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_sentry_sync(request, **kwargs):
+    '''
+        Async endpoint to sync sentry issues and events incrementally
+        See: issue_sync.get_sentry_sync
+    '''
+    try:
+        fields = projection.projection(request.GET, "get_issue_events")
+        return codec.json_response(await sync_to_async(sync, thread_sensitive=False)(request.GET.get("token"), request.GET.get("since"), fields))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    except Exception as exception:
+        error_message = describe_error(issues_request(), exception)
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
@@ -0,0 +1,58 @@
+"""
+Asynchronous Live Updates (Server-Sent Events) Module
+
+This module provides the async version of live.py for the ASGI execution path
+(settings.ASYNC_VIEWS). Connected clients wait on an asyncio queue instead of holding a worker
+thread each, so one process can keep thousands of dashboards connected. They share the
+poller, replay buffer and message format of live.py.
+
+Functions:
+    AsyncSubscriber            - Connected client fed from the poller thread
+    get_stream()               - Async SSE endpoint
+"""
+
+import asyncio
+
+from django.conf import settings
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from .live import Subscriber, event_stream_response, format_message, last_event_id, subscribe, unsubscribe
+
+class AsyncSubscriber(Subscriber):
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.messages = asyncio.Queue(settings.LIVE_CLIENT_QUEUE_SIZE)
+        self.closed = False
+
+    def deliver(self, message):
+        # Called from the poller thread; the queue may only be touched from its event loop
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        try:
+            self.messages.put_nowait(message)
+        except asyncio.QueueFull:
+            self.closed = True
+
+async def _aevents(subscriber):
+    try:
+        yield f"retry: {int(settings.LIVE_POLL_INTERVAL * 1000)}\n\n"
+        while not subscriber.closed:
+            try:
+                yield format_message(await asyncio.wait_for(subscriber.messages.get(), settings.LIVE_HEARTBEAT_INTERVAL))
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        unsubscribe(subscriber)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_stream(request, **kwargs):
+    '''
+        Async endpoint to receive live dashboard updates as Server-Sent Events
+        See: live.get_stream
+    '''
+    subscriber = AsyncSubscriber()
+    subscribe(subscriber, last_event_id(request))
+    return event_stream_response(_aevents(subscriber))
@@ -0,0 +1,139 @@
+"""
+Asynchronous Mailgun Views Module
+
+This module provides async versions of the views in mailgun.py for the ASGI execution path
+(settings.ASYNC_VIEWS). Each view builds the same upstream request as its sync counterpart but
+awaits it on the shared async HTTP client. Routes, parameters and response formats are
+identical to mailgun.py.
+
+Usage:
+    Enabled by setting ASYNC_VIEWS=True and serving dashboardAPI.asgi:application with an ASGI
+    server, e.g. uvicorn dashboardAPI.asgi:application
+
+Functions:
+    get_queue_status()               - Monitor email sending queues
+    get_account_metrics()            - Retrieve detailed analytics
+    get_account_usage_metrics()      - Get usage statistics
+    get_logs()                       - Access delivery and bounce logs
+    export_logs()                    - Stream every page of the delivery and bounce logs
+    get_stat_totals()                - Get statistical summaries
+    get_filtered_grouped_stats()     - Get filtered statistics
+    get_mailing_list_members()       - Manage mailing list memberships
+"""
+
+import json
+
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import projection
+from .helpers import amake_request
+from .pagination import astream_token_pages
+from .mailgun import (
+    account_metrics_request,
+    account_usage_metrics_request,
+    filtered_grouped_stats_request,
+    log_export_format,
+    logs_export_request,
+    logs_request,
+    mailing_list_members_request,
+    queue_status_request,
+    stat_totals_request,
+    with_attachment,
+)
+
+def _json_body(request):
+    data = json.loads(request.body or b"{}")
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    return data
+
+async def _proxy(request, build, view, *args):
+    try:
+        data = _json_body(request)
+    except ValueError as error:
+        return HttpResponseBadRequest(f"Invalid JSON body: {error}")
+    try:
+        fields = projection.projection(request.GET, view) if view in projection.projected_views else None
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return await amake_request(build(*args, data), view, fields)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_queue_status(request, **kwargs):
+    '''
+        Async endpoint to access mailgun messages queue status.
+        See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/messages/get-v3-domains--name--sending-queues
+    '''
+    return await amake_request(queue_status_request(), "get_queue_status")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_account_metrics(request, **kwargs):
+    '''
+        Async endpoint to access mailgun account metrics.
+        See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/metrics/post-v1-analytics-metrics
+    '''
+    return await _proxy(request, account_metrics_request, "get_account_metrics")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_account_usage_metrics(request, **kwargs):
+    '''
+        Async endpoint to access mailgun account usage metrics
+        See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/metrics/post-v1-analytics-usage-metrics
+    '''
+    return await _proxy(request, account_usage_metrics_request, "get_account_usage_metrics")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_logs(request, **kwargs):
+    '''
+        Async endpoint to access mailgun logs
+        See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/logs/post-v1-analytics-logs
+    '''
+    return await _proxy(request, logs_request, "get_logs")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def export_logs(request, **kwargs):
+    '''
+        Async endpoint to export every page of the mailgun logs as a stream
+        See: mailgun.export_logs
+    '''
+    format = request.GET.get("stream", "ndjson")
+    try:
+        data = _json_body(request)
+        content_type, header, format_item = log_export_format(format)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return with_attachment(await astream_token_pages(logs_export_request(data), format_item, content_type, header), format)
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_stat_totals(request, **kwargs):
+    '''
+        Async endpoint to access mailgun stats
+        See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/stats/get-v3-stats-total
+    '''
+    return await _proxy(request, stat_totals_request, "get_stat_totals")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_filtered_grouped_stats(request, **kwargs):
+    '''
+        Async endpoint to access mailgun filtered/grouped stats
+        See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/stats/get-v3-stats-filter
+    '''
+    return await _proxy(request, filtered_grouped_stats_request, "get_filtered_grouped_stats")
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def get_mailing_list_members(request, **kwargs):
+    '''
+        Async endpoint to access mailgun mailing list members
+        See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/mailing-lists/get-lists-string:list_address-members
+    '''
+    return await _proxy(request, mailing_list_members_request, "get_mailing_list_members", kwargs.get("list_address"))
@@ -0,0 +1,31 @@
+"""
+Asynchronous Member Directory Module
+
+This module provides the async version of the member_directory.py search endpoint for the ASGI
+execution path (settings.ASYNC_VIEWS). The directory is held in memory, so searches never wait
+on Sentry; parameters and response format are identical to member_directory.py.
+
+Functions:
+    get_member_search()        - Async endpoint for organization member prefix search
+"""
+
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec, member_directory, projection
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_member_search(request, **kwargs):
+    '''
+        Async endpoint to search organization members by prefix for the assignee picker
+        See: member_directory.get_member_search
+    '''
+    try:
+        prefix, limit = member_directory.search_params(request.GET)
+        organization = member_directory.selected_organization(request.GET)
+        fields = projection.projection(request.GET, "get_organization_members")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(projection.project(member_directory.directory_for(organization).search(prefix, limit), fields), headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,25 @@
+"""
+Asynchronous Prometheus Metrics Endpoint Module
+
+This module provides the async version of the metrics.py endpoint for the ASGI execution path
+(settings.ASYNC_VIEWS). Rendering only reads in-memory counters, so it runs on the event loop;
+the exposition document is identical to metrics.py.
+
+Functions:
+    get_metrics()              - Async endpoint serving the Prometheus exposition document
+"""
+
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from .metrics import CONTENT_TYPE, render
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_metrics(request, **kwargs):
+    '''
+        Async endpoint to scrape request, upstream, cache and rate limit metrics
+        See: metrics.get_metrics
+    '''
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
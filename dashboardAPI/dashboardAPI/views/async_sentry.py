@@ -0,0 +1,223 @@
+"""
+Asynchronous Sentry Views Module
+
+This module provides async versions of the views in sentry.py for the ASGI execution path
+(settings.ASYNC_VIEWS). Each view builds the same upstream request as its sync counterpart but
+awaits it on the shared async HTTP client, so a single process can serve hundreds of concurrent
+in-flight Sentry calls. Routes, parameters and response formats are identical to sentry.py.
+
+Usage:
+    Enabled by setting ASYNC_VIEWS=True and serving dashboardAPI.asgi:application with an ASGI
+    server, e.g. uvicorn dashboardAPI.asgi:application
+
+Functions:
+    afetch_issue_events()      - Fetch the events of many issues concurrently
+    aupdate_issues()           - Apply one update to many issues (bulk mutate, or concurrently)
+    get_batch_issue_events()   - Retrieve events for many issue IDs concurrently
+    get_issue_events()         - Retrieve events for a specific issue ID
+    update_issue_status()      - Update issue properties like status and assignment
+    bulk_update_issue_status() - Update the properties of many issues in one request
+    get_issues()               - List all issues of the selected projects
+    get_events()               - List all events of the selected projects
+    get_sentry_alerts()        - Transform recent issues into alert format
+    get_organization_members() - List organization members for issue assignment
+"""
+
+import json
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import alerts, codec, fanout, member_directory, projection, rate_limit, response_cache
+from .async_upstream import asend
+from .helpers import afetch_cached_json, afetch_json, amake_request, arun_concurrently, describe_error, translate_sentry_params
+from .pagination import astream_pages
+from .sentry import (
+    bulk_chunk_results, bulk_chunks, bulk_issue_ids, bulk_update_document, bulk_update_issues_request, events_request,
+    issue_events_request, issues_request, members_request, single_update_result, update_issue_request,
+)
+
+async def afetch_issue_events(issue_ids, events_params, fields=None):
+    '''
+        Async sentry.fetch_issue_events
+    '''
+    async def fetch_events(issue_id):
+        return (await afetch_cached_json(issue_events_request(issue_id, events_params), "get_issue_events", fields))[0]
+    results = await arun_concurrently(fetch_events, issue_ids, settings.SENTRY_BATCH_MAX_WORKERS)
+    return {
+        issue_id: {
+            "events": events if error is None else [],
+            "error": None if error is None else describe_error(issue_events_request(issue_id, events_params), error),
+        }
+        for issue_id, (events, error) in zip(issue_ids, results)
+    }
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_batch_issue_events(request, **kwargs):
+    '''
+        Async endpoint to access the events of many sentry issues in one request
+        See: sentry.get_batch_issue_events
+    '''
+    try:
+        issue_params = translate_sentry_params(request.GET, "get_issues")
+        events_params = translate_sentry_params(request.GET, "get_issue_events")
+        fields = projection.projection(request.GET, "get_issue_events")
+        projects = fanout.selected_projects(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    issue_ids = [issue_id for value in request.GET.getlist("issue_ids") for issue_id in value.split(",") if issue_id]
+    if not issue_ids:
+        try:
+            issue_ids = [issue["id"] for issue in await fanout.afetch_merged_view(issues_request, issue_params, projects, "get_issues")]
+        except Exception as exception:
+            error_message = describe_error(issues_request(issue_params, projects[0]), exception)
+            print(error_message)
+            return rate_limit.error_response(error_message, exception)
+    issue_ids = list(dict.fromkeys(issue_ids))
+    if len(issue_ids) > settings.SENTRY_BATCH_MAX_ISSUES:
+        return HttpResponseBadRequest(f"At most {settings.SENTRY_BATCH_MAX_ISSUES} issues can be requested at once")
+    return codec.json_response(await afetch_issue_events(issue_ids, events_params, fields))
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_issue_events(request, **kwargs):
+    '''
+        Async endpoint to access sentry issue events
+        See: https://docs.sentry.io/api/events/list-an-issues-events/
+    '''
+    try:
+        params = translate_sentry_params(request.GET, "get_issue_events")
+        fields = projection.projection(request.GET, "get_issue_events")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    if "stream" in request.GET:
+        return await astream_pages(issue_events_request(kwargs.get("issue_id"), params), request.GET["stream"], fields)
+    return await amake_request(issue_events_request(kwargs.get("issue_id"), params), "get_issue_events", fields)
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def update_issue_status(request, **kwargs):
+    '''
+        Async endpoint to update sentry issue status
+        See: https://docs.sentry.io/api/events/update-an-issue/
+    '''
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError as error:
+        return HttpResponseBadRequest(f"Invalid JSON body: {error}")
+    if not isinstance(data, dict):
+        return HttpResponseBadRequest("Expected a JSON object")
+    try:
+        member_directory.validate_assignee(data, [kwargs.get("issue_id")])
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = await amake_request(update_issue_request(kwargs.get("issue_id"), data), "update_issue_status")
+    if response.status_code < 400:
+        response_cache.invalidate("update_issue_status")
+    return response
+
+async def aupdate_issues(issue_ids, data):
+    '''
+        Async sentry.update_issues
+    '''
+    async def send_bulk_update(chunk):
+        request = bulk_update_issues_request(chunk, data)
+        return await asend(request["method"], request["uri"], headers=request["headers"], params=request["params"], json=request["json"])
+    async def update_issue(issue_id):
+        return await afetch_json(update_issue_request(issue_id, data))
+    results, single = {}, []
+    chunks = bulk_chunks(issue_ids)
+    for chunk, (response, exception) in zip(chunks, await arun_concurrently(send_bulk_update, chunks, settings.SENTRY_BATCH_MAX_WORKERS)):
+        chunk_results = bulk_chunk_results(chunk, response, exception)
+        if chunk_results is None:
+            single.extend(chunk)
+        else:
+            results.update(chunk_results)
+    updates = await arun_concurrently(update_issue, single, settings.SENTRY_BATCH_MAX_WORKERS)
+    for issue_id, (_, exception) in zip(single, updates):
+        results[issue_id] = single_update_result(issue_id, data, exception)
+    return bulk_update_document(issue_ids, results)
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+async def bulk_update_issue_status(request, **kwargs):
+    '''
+        Async endpoint to update many sentry issues in one request
+        See: sentry.bulk_update_issue_status
+    '''
+    try:
+        data = json.loads(request.body or b"{}")
+        issue_ids = bulk_issue_ids(data)
+        member_directory.validate_assignee(data, issue_ids)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(await aupdate_issues(issue_ids, data))
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_issues(request, **kwargs):
+    '''
+        Async endpoint to access sentry issues
+        See: https://docs.sentry.io/api/events/list-a-projects-issues/
+    '''
+    try:
+        params = translate_sentry_params(request.GET, "get_issues")
+        fields = projection.projection(request.GET, "get_issues")
+        projects = fanout.selected_projects(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return await fanout.alist_view_response(request.GET, projects, issues_request, "get_issues", params, fields)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_events(request, **kwargs):
+    '''
+        Async endpoint to access sentry events
+        See: https://docs.sentry.io/api/events/list-a-projects-error-events/
+    '''
+    try:
+        params = translate_sentry_params(request.GET, "get_events")
+        fields = projection.projection(request.GET, "get_events")
+        projects = fanout.selected_projects(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return await fanout.alist_view_response(request.GET, projects, events_request, "get_events", params, fields)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_sentry_alerts(request, **kwargs):
+    """
+    Async version of sentry.get_sentry_alerts
+    """
+    try:
+        data = await alerts.afeed_alerts(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    except Exception as exception:
+        error_message = f"Error fetching alerts from Sentry: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    return codec.json_response(data, headers={"Cache-Control": "no-cache"})
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_organization_members(request, **kwargs):
+    """
+    Async endpoint to fetch organization members from Sentry for issue assignment
+    Served from the member directory once it has loaded
+    See: https://docs.sentry.io/api/organizations/list-an-organizations-members/
+    """
+    try:
+        fields = projection.projection(request.GET, "get_organization_members")
+        organization = member_directory.selected_organization(request.GET)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    if "stream" in request.GET:
+        return await astream_pages(members_request(organization), request.GET["stream"], fields)
+    directory = member_directory.directory_for(organization)
+    if directory.loaded:
+        return codec.json_response(projection.project(directory.members, fields), headers={"Cache-Control": "no-cache"})
+    return await amake_request(members_request(organization), "get_organization_members", fields)
@@ -0,0 +1,30 @@
+"""
+Asynchronous Event Time Series Module
+
+This module provides the async version of the timeseries.py endpoint for the ASGI execution
+path (settings.ASYNC_VIEWS). The Django ORM is synchronous, so the rollup query runs in a worker
+thread; parameters and response format are identical to timeseries.py.
+
+Functions:
+    get_timeseries()           - Async endpoint for per-bucket event counts
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from . import codec
+from .timeseries import timeseries
+
+@csrf_exempt
+@require_http_methods(["GET"])
+async def get_timeseries(request, **kwargs):
+    '''
+        Async endpoint to access per-bucket event counts for charts
+        See: timeseries.get_timeseries
+    '''
+    try:
+        return codec.json_response(await sync_to_async(timeseries)(request.GET), headers={"Cache-Control": "no-cache"})
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
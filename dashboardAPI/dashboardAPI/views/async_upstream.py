@@ -0,0 +1,90 @@
+"""
+Asynchronous Upstream HTTP Client Module for DashboardAPI Views
+
+This module is the async counterpart of upstream.py, used by the async views served under ASGI.
+It keeps one shared httpx.AsyncClient per event loop, so a single process can hold hundreds of
+in-flight upstream calls on pooled keep-alive connections without tying up a thread per call.
+Timeouts, retry behaviour and rate limit scheduling follow the synchronous client.
+
+Usage:
+    from .async_upstream import asend
+
+    response = await asend("get", api_endpoint, headers=settings.SENTRY_HEADERS)
+
+Functions:
+    get_client()                   - Returns the shared AsyncClient for the running event loop
+    asend(method, uri, **kwargs)   - Sends a request, retrying idempotent methods with backoff (or
+                                     after the Retry-After of a 503)
+    aclose_client()                - Closes the AsyncClient of the running event loop
+
+Configuration:
+    UPSTREAM_ASYNC_MAX_CONNECTIONS - Maximum number of concurrent upstream connections per loop
+    UPSTREAM_POOL_MAXSIZE          - Maximum number of idle keep-alive connections per loop
+    UPSTREAM_CONNECT_TIMEOUT       - Seconds to wait for a connection to be established
+    UPSTREAM_READ_TIMEOUT          - Seconds to wait for the upstream to send a response
+    UPSTREAM_MAX_RETRIES           - Retry attempts for idempotent methods
+    UPSTREAM_BACKOFF_FACTOR        - Backoff factor between retries (factor * 2 ** (retry - 1) seconds)
+"""
+
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+from urllib3.util.retry import Retry
+
+from . import instrumentation, rate_limit
+from .upstream import IDEMPOTENT_METHODS, RETRY_STATUS_CODES
+
+_clients = weakref.WeakKeyDictionary()
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.UPSTREAM_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.UPSTREAM_POOL_MAXSIZE,
+            ),
+            timeout=httpx.Timeout(settings.UPSTREAM_READ_TIMEOUT, connect=settings.UPSTREAM_CONNECT_TIMEOUT),
+        )
+    return client
+
+async def asend(method, uri, **kwargs):
+    method = method.upper()
+    retries = settings.UPSTREAM_MAX_RETRIES if method in IDEMPOTENT_METHODS else 0
+    if "timeout" in kwargs and isinstance(kwargs["timeout"], tuple):
+        connect, read = kwargs["timeout"]
+        kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+    bucket = await rate_limit.aacquire(method, uri)
+    with instrumentation.upstream_call(method, uri) as call:
+        for attempt in range(retries + 1):
+            call.retries = attempt
+            try:
+                response = await get_client().request(method, uri, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                    call.response = response
+                    rate_limit.observe(bucket, response)
+                    return response
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+                response = None
+            await asyncio.sleep(_retry_delay(response, attempt))
+
+def _retry_delay(response, attempt):
+    '''
+        Seconds to wait before retrying. As in the synchronous client (respect_retry_after_header),
+        the Retry-After of a retried 503 takes precedence over the backoff.
+    '''
+    if response is not None and response.status_code in Retry.RETRY_AFTER_STATUS_CODES:
+        retry_after = rate_limit.parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after
+    return settings.UPSTREAM_BACKOFF_FACTOR * 2 ** attempt
+
+async def aclose_client():
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,122 @@
+"""
+Chart Events Module
+
+This module serves the individual events behind the dashboard charts from the local event store
+(see event_store.py), already normalized to the five fields the charts read: timestamp, source,
+level, category and issue ID. Events are sent in a columnar layout: one array per field instead
+of one object per event, with the string fields dictionary-encoded. A response for tens of
+thousands of events is then a few arrays of small integers, which the browser decodes without
+copying the full Sentry events and Mailgun log entries it would otherwise normalize itself.
+
+Usage:
+    GET /api/chart/events/?timeRange=30d
+    GET /api/chart/events/?timeRange=7d&source=mailgun&level=error,warning
+    GET /api/chart/events/?start=2025-01-01T00:00:00Z&end=2025-02-01T00:00:00Z&limit=5000
+
+Functions:
+    encode_column(values)    - Dictionary encoding of one column
+    chart_events(params)     - Columnar chart events of the requested time window
+    get_chart_events()       - Endpoint returning the chart events with an ETag
+
+Response Format:
+    {
+        "start": "2025-01-01T00:00:00+00:00",
+        "end": "2025-01-31T00:00:00+00:00",
+        "count": 3,
+        "truncated": false,                 # true when more than limit events matched
+        "timestamps": [120, 3600, 0],        # seconds, delta-encoded (see below)
+        "columns": {"source": [0, 0, 1], "level": [0, 1, 0], "category": [0, 0, 1], "issueId": [0, 0, 1]},
+        "dictionaries": {
+            "source": ["sentry", "mailgun"],
+            "level": ["error", "warning"],
+            "category": ["TypeError", "Email Bounced"],
+            "issueId": ["42", null]
+        }
+    }
+    Events are ordered oldest first. The first timestamp is seconds after start and every
+    other one seconds after the previous event. Event i has source
+    dictionaries["source"][columns["source"][i]], and so on for each column; empty values
+    (e.g. the issue ID of Mailgun events) are null.
+
+Configuration:
+    chart_columns             - Dictionary mapping response columns to StoredEvent fields
+    CHART_EVENTS_MAX_EVENTS   - Upper bound for the number of events in one response
+"""
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from ..models import StoredEvent
+from . import codec
+from .event_store import event_filters
+from .timeseries import split, time_window
+
+chart_columns = {
+    "source": "source",
+    "level": "level",
+    "category": "category",
+    "issueId": "issue_id",
+}
+
+def encode_column(values):
+    '''
+        Returns (dictionary, codes) for a column: the distinct values in order of first
+        appearance, and the index of each value in the dictionary.
+    '''
+    dictionary = {}
+    codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    return [value or None for value in dictionary], codes
+
+def chart_events(params):
+    '''
+        Returns the columnar chart events matching params (timeRange or start/end, limit and
+        the event_store filters). Raises ValueError for invalid parameters.
+    '''
+    start, end = time_window(params)
+    try:
+        limit = min(int(params.get("limit", settings.CHART_EVENTS_MAX_EVENTS)), settings.CHART_EVENTS_MAX_EVENTS)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    filters = {f"{field}__in": split(params.get(param)) for param, field in event_filters.items() if params.get(param)}
+    # The newest events are kept when the window holds more than limit
+    rows = list(
+        StoredEvent.objects
+        .filter(timestamp__gte=start, timestamp__lt=end, **filters)
+        .order_by("-timestamp")
+        .values_list("timestamp", *chart_columns.values())[:limit + 1]
+    )
+    truncated = len(rows) > limit
+    rows = rows[:limit][::-1]
+
+    timestamps = []
+    previous = int(start.timestamp())
+    for row in rows:
+        seconds = int(row[0].timestamp())
+        timestamps.append(seconds - previous)
+        previous = seconds
+    columns, dictionaries = {}, {}
+    for index, column in enumerate(chart_columns, start=1):
+        dictionaries[column], columns[column] = encode_column([row[index] for row in rows])
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "count": len(rows),
+        "truncated": truncated,
+        "timestamps": timestamps,
+        "columns": columns,
+        "dictionaries": dictionaries,
+    }
+
+@api_view(["GET"])
+def get_chart_events(request, **kwargs):
+    '''
+        Endpoint to access normalized chart events in a columnar layout
+        Parameters: timeRange or start/end, limit and source, issue, level, type, category
+        filters (comma separated). The default window ends at the next whole minute, so polls
+        within a minute revalidate with If-None-Match.
+    '''
+    try:
+        return codec.json_response(chart_events(request.query_params), headers={"Cache-Control": "no-cache"})
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
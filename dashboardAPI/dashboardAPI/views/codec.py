@@ -0,0 +1,135 @@
+"""
+JSON Codec Module for DashboardAPI Views
+
+This module holds the JSON codec used wherever the views decode upstream bodies or encode
+responses, and RawJSON, an undecoded upstream body that proxy views send to the client as is.
+Most proxied responses need no transformation, so make_request passes the upstream bytes
+through instead of decoding them and encoding them again; bodies are only decoded when a view
+actually needs the data (e.g. the dashboard snapshot or the alerts list), and then only once.
+
+Usage:
+    Encode and decode with the configured codec:
+        body = codec.dumps(data)
+        data = codec.loads(response.content)
+        return codec.json_response(data)
+
+    Pass an upstream body through:
+        payload = codec.RawJSON.from_response(response)
+        return HttpResponse(payload.body, content_type=payload.content_type)
+
+Functions:
+    get_codec()              - Returns the (dumps, loads) pair selected by settings.JSON_CODEC
+    dumps(data)              - Encodes data to JSON bytes (dates, decimals and UUIDs as Django does)
+    loads(body)              - Decodes JSON bytes or text
+    json_response(data, status, headers) - HttpResponse with data encoded by the configured codec
+    RawJSON                  - Undecoded JSON body, decoded lazily on first access to .data
+
+Configuration:
+    json_codecs              - Dictionary mapping codec names to functions building (dumps, loads)
+    JSON_CODEC               - Codec to use: "json" (standard library) or "orjson" (requires the
+                               orjson package, several times faster on large lists)
+"""
+
+import functools
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+CONTENT_TYPE = "application/json"
+
+def _standard_codec():
+    return lambda data: json.dumps(data, cls=DjangoJSONEncoder).encode(), json.loads
+
+def _orjson_codec():
+    import orjson
+    # Dates go through DjangoJSONEncoder so both codecs produce the same values
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    default = DjangoJSONEncoder().default
+    return lambda data: orjson.dumps(data, default=default, option=options), orjson.loads
+
+json_codecs = {
+    "json": _standard_codec,
+    "orjson": _orjson_codec,
+}
+
+@functools.cache
+def _build_codec(name):
+    if name not in json_codecs:
+        raise ImproperlyConfigured(f"Unknown JSON_CODEC \"{name}\" (only {", ".join(json_codecs)} are available)")
+    try:
+        return json_codecs[name]()
+    except ImportError as error:
+        raise ImproperlyConfigured(f"JSON_CODEC \"{name}\" is not installed: {error}") from error
+
+def get_codec():
+    return _build_codec(settings.JSON_CODEC)
+
+def dumps(data):
+    return get_codec()[0](data)
+
+def loads(body):
+    return get_codec()[1](body)
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(dumps(data), content_type=CONTENT_TYPE, status=status, headers=headers)
+
+class RawJSON:
+    '''
+        An encoded JSON body, kept as bytes so it can be cached and sent without being decoded.
+        .data decodes it on first access; only the bytes (and the truncated flag of paginated
+        lists, see pagination.py) are pickled into the cache.
+    '''
+    __slots__ = ("body", "content_type", "truncated", "_data")
+
+    def __init__(self, body, content_type=CONTENT_TYPE, truncated=False):
+        self.body = body
+        self.content_type = content_type
+        self.truncated = truncated
+        self._data = None
+
+    @classmethod
+    def from_response(cls, response):
+        '''
+            Wraps the body of an upstream response, keeping its content type. Bodies that are not
+            JSON are decoded right away, so they fail like response.json() would.
+        '''
+        content_type = response.headers.get("Content-Type") or CONTENT_TYPE
+        payload = cls(response.content, content_type if "json" in content_type else CONTENT_TYPE)
+        if "json" not in content_type:
+            payload._data = loads(payload.body)
+        return payload
+
+    @classmethod
+    def from_data(cls, data):
+        payload = cls(dumps(data))
+        payload._data = data
+        return payload
+
+    @classmethod
+    def from_arrays(cls, bodies, data, truncated=False):
+        '''
+            Joins encoded JSON arrays (e.g. the pages of a paginated list) into one array
+            without decoding them again; data is the decoded list, kept as .data.
+        '''
+        elements = (body.strip()[1:-1].strip() for body in bodies)
+        payload = cls(b"[" + b",".join(element for element in elements if element) + b"]", truncated=truncated)
+        payload._data = data
+        return payload
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = loads(self.body)
+        return self._data
+
+    def __getstate__(self):
+        return self.body, self.content_type, self.truncated
+
+    def __setstate__(self, state):
+        # Entries cached before the truncated flag was added are (body, content type) pairs
+        self.body, self.content_type, *truncated = state
+        self.truncated = bool(truncated and truncated[0])
+        self._data = None
@@ -0,0 +1,156 @@
+"""
+Dashboard Snapshot View Module
+
+This module provides a single endpoint that gathers everything the dashboard needs on load
+(Sentry issues, their events, alerts, Mailgun logs and stats, and integration statuses) on the
+server, concurrently, and returns it as one document. A page refresh then costs one round trip
+from the browser instead of one per section.
+
+Usage:
+    GET /api/dashboard/snapshot/?timeRange=30d
+    GET /api/dashboard/snapshot/?sections=issues,alerts
+
+API Endpoints:
+    GET /api/dashboard/snapshot/ - Consolidated dashboard document
+
+Functions:
+    snapshot_context(data)       - Validates query parameters into the upstream parameters of each section
+    build_snapshot(context)      - Fetches the requested sections concurrently
+    get_dashboard_snapshot()     - Endpoint returning the snapshot with an ETag
+
+Response Format:
+    {
+        "timeRange": "30d",
+        "partial": false,
+        "sections": {
+            "issues": {"data": [...], "error": null},
+            "issueEvents": {"data": {issue_id: {"events": [...], "error": null}}, "error": null},
+            ...
+        }
+    }
+    A failing section carries "data": null and an error message; the other sections are still
+    returned and "partial" is set. Responses carry an ETag, and a request whose If-None-Match
+    matches it gets 304 Not Modified.
+
+Configuration:
+    snapshot_sections - Dictionary mapping section names to the function that loads them
+    mailgun_time_ranges - Dictionary mapping dashboard time ranges to Mailgun date windows
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from . import codec
+from .alerts import feed_alerts
+from .fanout import fetch_merged_view
+from .helpers import fetch_cached_json, run_concurrently, sentry_time_ranges, translate_sentry_params
+from .integrations import get_mailgun_api_status, get_sentry_api_status, get_sentry_webhooks_status
+from .mailgun import logs_request, stat_totals_request
+from .sentry import fetch_issue_events, issues_request
+
+mailgun_time_ranges = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(days=1),
+    "1d": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "14d": timedelta(days=14),
+    "30d": timedelta(days=30),
+    "90d": timedelta(days=90),
+}
+
+def snapshot_context(data):
+    '''
+        Translates the snapshot query parameters into the upstream parameters of each section.
+        Raises ValueError for unknown time ranges or sections.
+    '''
+    time_range = data.get("timeRange", "30d")
+    if time_range not in sentry_time_ranges:
+        raise ValueError(f"Invalid timeRange \"{time_range}\" (only {", ".join(sentry_time_ranges)} are allowed)")
+    sections = [section for value in data.getlist("sections") for section in value.split(",") if section] or list(snapshot_sections)
+    unknown = [section for section in sections if section not in snapshot_sections]
+    if unknown:
+        raise ValueError(f"Unknown sections {", ".join(unknown)} (only {", ".join(snapshot_sections)} are available)")
+    # Whole minutes keep the Mailgun windows (and so their cache keys) stable between refreshes
+    end = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start = end - mailgun_time_ranges[time_range]
+    return {
+        "time_range": time_range,
+        "sections": list(dict.fromkeys(sections)),
+        "issue_params": translate_sentry_params({"timeRange": time_range}, "get_issues"),
+        "events_params": translate_sentry_params({"timeRange": time_range}, "get_issue_events"),
+        "logs_data": {
+            "start": start.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "end": end.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "events": "failed,rejected,bounced,complained",
+            "pagination": {"limit": 100, "sort": "timestamp:desc"},
+        },
+        "stats_data": {
+            "start": start.strftime("%Y-%m-%d"),
+            "end": end.strftime("%Y-%m-%d"),
+            "event": "accepted,delivered,failed,opened,clicked,unsubscribed,complained,stored",
+            "resolution": "hour" if mailgun_time_ranges[time_range] <= timedelta(days=1) else "day",
+        },
+    }
+
+def load_issues(context):
+    return fetch_merged_view(issues_request, context["issue_params"], settings.SENTRY_PROJECTS, "get_issues")
+
+def load_issue_events(context):
+    # Runs alongside load_issues; the response cache coalesces the two identical issue fetches
+    issue_ids = [issue["id"] for issue in load_issues(context)][:settings.SENTRY_BATCH_MAX_ISSUES]
+    return fetch_issue_events(issue_ids, context["events_params"])
+
+def load_alerts(context):
+    return feed_alerts({})
+
+def load_mailgun_logs(context):
+    return fetch_cached_json(logs_request(context["logs_data"]), "get_logs")[0]
+
+def load_mailgun_stats(context):
+    return fetch_cached_json(stat_totals_request(context["stats_data"]), "get_stat_totals")[0]
+
+snapshot_sections = {
+    "issues": load_issues,
+    "issueEvents": load_issue_events,
+    "alerts": load_alerts,
+    "sentryIntegrations": lambda context: [get_sentry_api_status(), get_sentry_webhooks_status()],
+    "mailgunLogs": load_mailgun_logs,
+    "mailgunStats": load_mailgun_stats,
+    "mailgunIntegrations": lambda context: [get_mailgun_api_status()],
+}
+
+def snapshot_document(context, results):
+    sections = {}
+    for section, (data, error) in zip(context["sections"], results):
+        if error is not None:
+            print(f"Error loading dashboard section {section}: {error}")
+        sections[section] = {"data": data, "error": None if error is None else str(error)}
+    return {
+        "timeRange": context["time_range"],
+        "partial": any(section["error"] is not None for section in sections.values()),
+        "sections": sections,
+    }
+
+def build_snapshot(context):
+    results = run_concurrently(
+        lambda section: snapshot_sections[section](context),
+        context["sections"],
+        len(context["sections"]),
+    )
+    return snapshot_document(context, results)
+
+@api_view(["GET"])
+def get_dashboard_snapshot(request, **kwargs):
+    '''
+        Endpoint to access every dashboard section in one request
+        Sections are fetched concurrently; failed sections are reported inline. Supports
+        If-None-Match revalidation against the returned ETag.
+    '''
+    try:
+        context = snapshot_context(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(build_snapshot(context), headers={"Cache-Control": "no-cache"})
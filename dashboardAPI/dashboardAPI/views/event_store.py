@@ -0,0 +1,299 @@
+"""
+Local Event Store Module
+
+This module provides the ingest pipeline and query endpoint of the local event store. Sentry
+events and Mailgun log entries are normalized into StoredEvent rows (models.py) in the
+configured SQLite database. Time-range queries are then answered from indexed local tables
+instead of re-pulling 30 days of history from the vendor APIs. The history is not limited to
+the vendors' query windows: it grows for as long as ingestion runs, up to the retention period.
+
+Usage:
+    A background ingest thread is started once per process by wsgi.py/asgi.py:
+        from .views import event_store
+        event_store.start_ingest()
+
+    Or run one round by hand (e.g. from cron):
+        python manage.py shell -c "from dashboardAPI.views import event_store; event_store.ingest()"
+
+    GET /api/store/events/?source=sentry&start=2025-01-01T00:00:00Z&level=error&limit=500
+
+Ingest Pipeline:
+    - Sentry: events of changed issues from the incremental sync ledger (issue_sync.py); the
+      first round stores the events of every live issue
+    - Mailgun: log entries since the newest stored Mailgun row (or EVENT_STORE_MAILGUN_BACKFILL
+      days back), following the logs API pagination tokens
+    - Rows are deduplicated on (source, external_id), so rounds may safely overlap
+    - New rows are added to the hourly and daily EventBucket rollups in the same transaction,
+      and pruned rows are subtracted, so the rollups always match the stored events
+
+Functions:
+    normalize_sentry_event(event, issue) - StoredEvent fields for a Sentry event of an issue
+    normalize_mailgun_item(item)         - StoredEvent fields for a Mailgun log entry
+    store(rows)                          - Inserts normalized rows, skipping known ones
+    rollup(rows, sign)                   - Adds rows to (or subtracts them from) the EventBucket rollups
+    ingest()                             - Runs one ingest round for every source
+    query_events(params)                 - Filtered, time-ordered StoredEvent queryset
+    serialize_event(event)               - JSON representation of a StoredEvent
+    start_ingest()                       - Starts the background ingest thread (idempotent)
+    get_stored_events()                  - Endpoint for time-range queries
+
+Configuration:
+    mailgun_event_categories        - Dictionary mapping Mailgun events to (category, level)
+    bucket_resolutions              - Dictionary mapping rollup resolutions to their truncation
+    EVENT_STORE_INGEST_ENABLED      - Start the ingest thread with the server process
+    EVENT_STORE_INGEST_INTERVAL     - Seconds between ingest rounds
+    EVENT_STORE_MAILGUN_EVENTS      - Mailgun events that are ingested
+    EVENT_STORE_MAILGUN_BACKFILL    - Days of Mailgun logs fetched when the store is empty
+    EVENT_STORE_MAILGUN_MAX_PAGES   - Pagination cap per Mailgun ingest round
+    EVENT_STORE_RETENTION_DAYS      - Rows older than this are deleted
+    EVENT_STORE_QUERY_MAX_LIMIT     - Upper bound for the limit query parameter
+"""
+
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Max
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from ..models import EventBucket, StoredEvent
+from . import codec, issue_sync, rate_limit
+from .helpers import fetch_json
+from .mailgun import logs_request
+
+# Mirrors the categories the dashboard derives for Mailgun logs (AppState.js)
+mailgun_event_categories = {
+    "failed": ("Delivery Failed", "error"),
+    "rejected": ("Message Rejected", "error"),
+    "bounced": ("Email Bounced", "warning"),
+    "complained": ("Spam Complaint", "warning"),
+    "unsubscribed": ("Unsubscribed", "info"),
+}
+
+def parse_timestamp(value):
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    timestamp = datetime.fromisoformat(value)
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+
+def normalize_sentry_event(event, issue):
+    tags = {tag.get("key"): tag.get("value") for tag in event.get("tags", []) if isinstance(tag, dict)}
+    return {
+        "source": "sentry",
+        "external_id": event.get("eventID") or event["id"],
+        "timestamp": parse_timestamp(event["dateCreated"]),
+        "issue_id": str(issue["id"]),
+        "level": tags.get("level") or issue.get("level", ""),
+        "category": issue.get("metadata", {}).get("type") or issue.get("type", ""),
+        "event_type": event.get("event.type") or event.get("type") or "error",
+        "message": event.get("message") or event.get("title") or issue.get("title", ""),
+        "data": event,
+    }
+
+def normalize_mailgun_item(item):
+    event_type = item.get("event", "")
+    category, level = mailgun_event_categories.get(event_type, (f"{event_type.capitalize()} Error", "info"))
+    return {
+        "source": "mailgun",
+        "external_id": item["id"],
+        "timestamp": parse_timestamp(item.get("@timestamp") or item["timestamp"]),
+        "issue_id": "",
+        "level": level,
+        "category": category,
+        "event_type": event_type,
+        "message": item.get("delivery-status", {}).get("message") or item.get("reason") or f"{event_type} event for {item.get('recipient', 'unknown recipient')}",
+        "data": item,
+    }
+
+# Rollup resolution -> bucket start of a UTC timestamp
+bucket_resolutions = {
+    "hour": lambda timestamp: timestamp.replace(minute=0, second=0, microsecond=0),
+    "day": lambda timestamp: timestamp.replace(hour=0, minute=0, second=0, microsecond=0),
+}
+
+bucket_dimensions = ("source", "level", "category", "event_type")
+
+def rollup(rows, sign=1):
+    '''
+        Adds rows (dictionaries with timestamp and the bucket dimensions) to the EventBucket
+        rollups, or subtracts them with sign=-1. One UPDATE per touched bucket, not per row.
+    '''
+    counts = Counter()
+    for row in rows:
+        timestamp = row["timestamp"].astimezone(timezone.utc)
+        for resolution, truncate in bucket_resolutions.items():
+            counts[(resolution, truncate(timestamp), *(row[dimension] for dimension in bucket_dimensions))] += 1
+    for (resolution, start, *dimensions), count in counts.items():
+        key = {"resolution": resolution, "start": start, **dict(zip(bucket_dimensions, dimensions))}
+        if not EventBucket.objects.filter(**key).update(count=F("count") + sign * count) and sign > 0:
+            EventBucket.objects.create(count=count, **key)
+    if sign < 0:
+        EventBucket.objects.filter(count__lte=0).delete()
+
+def known_ids(source, external_ids):
+    known = set()
+    # Chunked to stay below SQLite's bound parameter limit
+    for offset in range(0, len(external_ids), 500):
+        known.update(StoredEvent.objects.filter(source=source, external_id__in=external_ids[offset:offset + 500]).values_list("external_id", flat=True))
+    return known
+
+def store(rows):
+    '''
+        Inserts normalized rows in one batch, skipping rows already stored, and adds the new rows
+        to the rollups. Returns the number of new rows.
+    '''
+    rows = list({(row["source"], row["external_id"]): row for row in rows}.values())
+    with transaction.atomic():
+        known = {
+            (source, external_id)
+            for source in {row["source"] for row in rows}
+            for external_id in known_ids(source, [row["external_id"] for row in rows if row["source"] == source])
+        }
+        new_rows = [row for row in rows if (row["source"], row["external_id"]) not in known]
+        StoredEvent.objects.bulk_create([StoredEvent(**row) for row in new_rows], ignore_conflicts=True, batch_size=500)
+        rollup(new_rows)
+    return len(new_rows)
+
+_ingest_state = {"sync_token": None}
+
+def ingest_sentry():
+    delta = issue_sync.sync(_ingest_state["sync_token"])
+    _ingest_state["sync_token"] = delta["token"]
+    issues = {issue["id"]: issue for issue in delta["issues"]}
+    rows = []
+    for issue_id, result in delta["events"].items():
+        for event in result["events"]:
+            try:
+                rows.append(normalize_sentry_event(event, issues[issue_id]))
+            except (KeyError, ValueError) as error:
+                print(f"Skipping malformed Sentry event of issue {issue_id}: {error}")
+    return store(rows)
+
+def ingest_mailgun():
+    now = datetime.now(timezone.utc)
+    newest = StoredEvent.objects.filter(source="mailgun").aggregate(newest=Max("timestamp"))["newest"]
+    start = newest or now - timedelta(days=settings.EVENT_STORE_MAILGUN_BACKFILL)
+    pagination = {"limit": 100, "sort": "timestamp:asc"}
+    stored = 0
+    for _ in range(settings.EVENT_STORE_MAILGUN_MAX_PAGES):
+        page = fetch_json(logs_request({
+            "start": start.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
+            "end": now.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z",
+            "events": settings.EVENT_STORE_MAILGUN_EVENTS,
+            "pagination": pagination,
+        }))
+        rows = []
+        for item in page.get("items", []):
+            try:
+                rows.append(normalize_mailgun_item(item))
+            except (KeyError, ValueError) as error:
+                print(f"Skipping malformed Mailgun log entry: {error}")
+        stored += store(rows)
+        next_token = (page.get("pagination") or {}).get("next")
+        if not page.get("items") or not next_token:
+            break
+        pagination = {**pagination, "token": next_token}
+    else:
+        print(f"Mailgun ingest stopped after {settings.EVENT_STORE_MAILGUN_MAX_PAGES} pages; the rest follows next round")
+    return stored
+
+def prune():
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.EVENT_STORE_RETENTION_DAYS)
+    expired = StoredEvent.objects.filter(timestamp__lt=cutoff)
+    with transaction.atomic():
+        rollup(expired.values("timestamp", *bucket_dimensions).iterator(), sign=-1)
+        return expired.delete()[0]
+
+def ingest():
+    '''
+        Runs one ingest round; a failing source is reported and does not stop the others.
+        Returns {source: rows processed}.
+    '''
+    results = {}
+    for source, step in (("sentry", ingest_sentry), ("mailgun", ingest_mailgun), ("pruned", prune)):
+        try:
+            results[source] = step()
+        except Exception as exception:
+            print(f"Event store {source} ingest failed: {exception}")
+            results[source] = None
+    return results
+
+_ingest_thread = None
+
+def _ingest_forever():
+    while True:
+        started = time.monotonic()
+        with rate_limit.priority("background"):
+            ingest()
+        # The thread outlives requests, so it has to release its database connection itself
+        close_old_connections()
+        time.sleep(max(0, settings.EVENT_STORE_INGEST_INTERVAL - (time.monotonic() - started)))
+
+def start_ingest():
+    global _ingest_thread
+    if not settings.EVENT_STORE_INGEST_ENABLED or (_ingest_thread is not None and _ingest_thread.is_alive()):
+        return
+    _ingest_thread = threading.Thread(target=_ingest_forever, name="event-store-ingest", daemon=True)
+    _ingest_thread.start()
+
+# Query parameter -> StoredEvent lookup
+event_filters = {
+    "source": "source",
+    "issue": "issue_id",
+    "level": "level",
+    "type": "event_type",
+    "category": "category",
+}
+
+def query_events(params):
+    '''
+        Returns the StoredEvent queryset matching params (source, issue, level, type, category,
+        start, end), newest first. Raises ValueError for malformed timestamps.
+    '''
+    events = StoredEvent.objects.all()
+    for param, field in event_filters.items():
+        if params.get(param):
+            events = events.filter(**{f"{field}__in": params.get(param).split(",")})
+    try:
+        if params.get("start"):
+            events = events.filter(timestamp__gte=parse_timestamp(params.get("start")))
+        if params.get("end"):
+            events = events.filter(timestamp__lt=parse_timestamp(params.get("end")))
+    except ValueError:
+        raise ValueError("start and end must be ISO 8601 timestamps")
+    return events.order_by("-timestamp")
+
+def serialize_event(event):
+    return {
+        "id": event.external_id,
+        "source": event.source,
+        "timestamp": event.timestamp.isoformat(),
+        "issueId": event.issue_id or None,
+        "level": event.level,
+        "category": event.category,
+        "type": event.event_type,
+        "message": event.message,
+    }
+
+def stored_events(params):
+    try:
+        limit = min(int(params.get("limit", 1000)), settings.EVENT_STORE_QUERY_MAX_LIMIT)
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    events = [serialize_event(event) for event in query_events(params).defer("data")[:limit]]
+    return {"count": len(events), "events": events}
+
+@api_view(["GET"])
+def get_stored_events(request, **kwargs):
+    '''
+        Endpoint to query the local event store by time range
+        Filters: source, issue, level, type, category (comma separated), start, end (ISO 8601), limit
+    '''
+    try:
+        return codec.json_response(stored_events(request.query_params))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
@@ -0,0 +1,347 @@
+"""
+Sentry Project Fan-out Module
+
+This module lets the issue, event and alert endpoints serve several Sentry projects, possibly
+in different organizations (settings.SENTRY_PROJECTS), as one dashboard. Projects are queried
+concurrently, so a request takes about as long as its slowest project rather than the sum of
+all of them, and the per-project lists (which Sentry returns sorted newest first) are combined
+with a k-way merge. Each project's list is cached under its own URI, and each project's
+endpoints have their own rate limit buckets (see rate_limit.endpoint_scope).
+
+Usage:
+    GET /api/sentry/issues/                           - Issues of every configured project
+    GET /api/sentry/events/?project=acme/api,web      - Events of some of them
+
+    project takes comma separated "organization/project" labels; a bare project belongs to
+    SENTRY_ORGANIZATION_SLUG. With a single project, requests are proxied as before.
+
+Merging:
+    Issues are merged by the field of their sort (lastSeen for date, firstSeen for new,
+    count/userCount for freq/user, lastSeen for any other sort) and events by dateCreated.
+    Projects that fail are left out and listed in the X-Sentry-Failed-Projects header; the
+    request only fails when every project does.
+
+Mutations:
+    Issue updates and issue event lists are organization scoped. The organization of an issue
+    is remembered when it passes through a project list; other issues use the default
+    organization (SENTRY_ORGANIZATION_SLUG, or that of the first project).
+
+Functions:
+    selected_projects(params)        - Configured projects, narrowed by the project parameter
+    project_label(project)           - "organization/project" label of a project
+    organization_of(issue_id)        - Organization of an issue seen in a project list
+    merge_field(view, params)        - Field the items of a list view are merged by
+    fan_out(load, projects)          - Calls load(project) for every project concurrently
+    fetch_project_lists(...)         - Fetches the list of every project through the response cache
+    fetch_merged(...)                - Merged items of the projects that succeeded
+    fetch_merged_view(...)           - Merged items of a list view for some projects
+    fetch_all_project_pages(...)     - Every item of every project, failing when any project fails
+    list_view_response(...)          - Response of a Sentry list view over the selected projects
+    afan_out, afetch_project_lists, afetch_merged, afetch_merged_view,
+    afetch_all_project_pages, alist_view_response - Async counterparts used by the ASGI views
+
+Configuration:
+    SENTRY_PROJECTS                  - Projects served by the dashboard
+    SENTRY_FANOUT_MAX_WORKERS        - Projects queried concurrently per request
+"""
+
+import heapq
+import threading
+from datetime import datetime
+
+from django.conf import settings
+
+from . import codec, projection, rate_limit
+from .helpers import (
+    afetch_cached_raw_json, amake_request, arun_concurrently, describe_error, fetch_cached_raw_json, make_request, run_concurrently,
+)
+from .pagination import (
+    PageItems, afetch_all_pages, aiter_items, astream_merged, astream_pages, fetch_all_pages, invalid_format, iter_items, stream_formats,
+    stream_merged, stream_pages, truncated, truncated_header,
+)
+
+# Issue sort -> field the per-project issue lists are ordered by
+issue_merge_fields = {
+    "date": "lastSeen",
+    "new": "firstSeen",
+    "freq": "count",
+    "user": "userCount",
+}
+
+# List view -> field its items are merged by (issues: see issue_merge_fields)
+view_merge_fields = {
+    "get_issues": "lastSeen",
+    "get_events": "dateCreated",
+}
+
+# Upper bound for the issue -> organization entries kept for organization scoped requests
+max_remembered_issues = 100000
+
+issue_organizations = {}
+_organizations_lock = threading.Lock()
+
+def project_label(project):
+    return f"{project["organization"]}/{project["project"]}"
+
+def selected_projects(params):
+    '''
+        Returns the configured projects, or those named by the project parameter. Raises
+        ValueError for projects that are not configured.
+    '''
+    value = params.get("project")
+    if value is None:
+        return list(settings.SENTRY_PROJECTS)
+    configured = {project_label(project): project for project in settings.SENTRY_PROJECTS}
+    selected = {}
+    for name in (name.strip() for name in value.split(",")):
+        if not name:
+            continue
+        label = name if "/" in name else f"{settings.SENTRY_ORGANIZATION_SLUG}/{name}"
+        if label not in configured:
+            raise ValueError(f"Unknown project \"{name}\" (configured: {", ".join(configured)})")
+        selected[label] = configured[label]
+    if not selected:
+        raise ValueError("project must name at least one configured project")
+    return list(selected.values())
+
+def default_organization():
+    return settings.SENTRY_ORGANIZATION_SLUG or settings.SENTRY_PROJECTS[0]["organization"]
+
+def organization_of(issue_id):
+    return issue_organizations.get(str(issue_id)) or default_organization()
+
+def remember_organization(issues, organization):
+    if len({project["organization"] for project in settings.SENTRY_PROJECTS}) < 2:
+        return
+    with _organizations_lock:
+        for issue in issues:
+            if isinstance(issue, dict) and issue.get("id") is not None:
+                issue_organizations[str(issue["id"])] = organization
+        while len(issue_organizations) > max_remembered_issues:
+            del issue_organizations[next(iter(issue_organizations))]
+
+def merge_field(view, params=None):
+    if view == "get_issues":
+        return issue_merge_fields.get((params or {}).get("sort"), "lastSeen")
+    return view_merge_fields[view]
+
+def sort_value(value):
+    '''
+        Sort value of a timestamp or count field: ISO 8601 timestamps become epoch seconds and
+        missing or malformed values sort last.
+    '''
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return float("-inf")
+
+def merge_key(field):
+    return lambda item: sort_value(item.get(field) if isinstance(item, dict) else None)
+
+def merge_tree(fields, field):
+    '''
+        Field tree fetched for a projected merge: fields plus the merge field, which is stripped
+        again after merging.
+    '''
+    if fields is None or field in fields:
+        return fields
+    return {**fields, field: None}
+
+def project_requests(build, params, projects):
+    return [(project, build(params, project)) for project in projects]
+
+def fan_out(load, projects):
+    return run_concurrently(load, projects, settings.SENTRY_FANOUT_MAX_WORKERS)
+
+async def afan_out(load, projects):
+    return await arun_concurrently(load, projects, settings.SENTRY_FANOUT_MAX_WORKERS)
+
+def _project_results(pairs, view, results):
+    project_results = []
+    for (project, request), (result, exception) in zip(pairs, results):
+        payload, cache_status = result if exception is None else (None, None)
+        items = payload.data if payload is not None else None
+        if view == "get_issues" and items:
+            remember_organization(items, project["organization"])
+        project_results.append({
+            "project": project, "request": request, "items": items, "cache": cache_status, "error": exception,
+            "truncated": payload is not None and payload.truncated,
+        })
+    return project_results
+
+def fetch_project_lists(pairs, view, fields=None):
+    '''
+        Fetches the list of every (project, request) pair concurrently through the response
+        cache; returns one {"project", "request", "items", "cache", "error", "truncated"} result
+        per project.
+    '''
+    results = fan_out(lambda pair: fetch_cached_raw_json(pair[1], view, fields), pairs)
+    return _project_results(pairs, view, results)
+
+async def afetch_project_lists(pairs, view, fields=None):
+    async def fetch(pair):
+        return await afetch_cached_raw_json(pair[1], view, fields)
+    return _project_results(pairs, view, await afan_out(fetch, pairs))
+
+def merge_results(results, field):
+    '''
+        k-way merges the lists of the projects that succeeded. Raises the error of the first
+        project when every project failed.
+    '''
+    succeeded = [result["items"] for result in results if result["error"] is None]
+    if not succeeded:
+        raise results[0]["error"]
+    return list(heapq.merge(*succeeded, key=merge_key(field), reverse=True))
+
+def fetch_merged(pairs, view, field, fields=None):
+    results = fetch_project_lists(pairs, view, merge_tree(fields, field))
+    return projection.project(merge_results(results, field), fields), results
+
+async def afetch_merged(pairs, view, field, fields=None):
+    results = await afetch_project_lists(pairs, view, merge_tree(fields, field))
+    return projection.project(merge_results(results, field), fields), results
+
+def fetch_merged_view(build, params, projects, view):
+    '''
+        Merged items of a list view for the given projects, as used by the views that build on
+        the issue list (batch events, dashboard snapshot).
+    '''
+    return fetch_merged(project_requests(build, params, projects), view, merge_field(view, params))[0]
+
+async def afetch_merged_view(build, params, projects, view):
+    return (await afetch_merged(project_requests(build, params, projects), view, merge_field(view, params)))[0]
+
+def fetch_all_project_pages(build, params=None):
+    '''
+        Returns every item of build(params, project) for every configured project, fetched
+        concurrently, as one PageItems list (truncated when any project's list was). Raises when
+        any project fails, so callers never mistake a missing project for an empty one.
+    '''
+    projects = settings.SENTRY_PROJECTS
+    results = fan_out(lambda project: fetch_all_pages(build(params, project)), projects)
+    return _all_items(projects, results)
+
+async def afetch_all_project_pages(build, params=None):
+    projects = settings.SENTRY_PROJECTS
+    async def fetch(project):
+        return await afetch_all_pages(build(params, project))
+    return _all_items(projects, await afan_out(fetch, projects))
+
+def _all_items(projects, results):
+    items = PageItems()
+    for project, (project_items, exception) in zip(projects, results):
+        if exception is not None:
+            raise exception
+        remember_organization(project_items, project["organization"])
+        items.extend(project_items)
+        items.truncated = items.truncated or truncated(project_items)
+    return items
+
+def _with_failures(response, results):
+    failed = [result for result in results if result["error"] is not None]
+    for result in failed:
+        print(describe_error(result["request"], result["error"]))
+    if failed:
+        response["X-Sentry-Failed-Projects"] = ",".join(project_label(result["project"]) for result in failed)
+    return response
+
+def _merged_response(items, results):
+    response = codec.json_response(items)
+    statuses = {result["cache"] for result in results if result["error"] is None} - {None}
+    if statuses:
+        response["X-Cache"] = statuses.pop() if len(statuses) == 1 else "MIXED"
+    if any(result["truncated"] for result in results):
+        response[truncated_header] = "true"
+    return _with_failures(response, results)
+
+def _stream_results(pairs, heads):
+    # Per-project results of the first pages of a merged stream, or None when every project failed
+    if all(exception is not None for _, exception in heads):
+        return None
+    return [{"project": project, "request": request, "error": exception} for (project, request), (_, exception) in zip(pairs, heads)]
+
+def _error_response(request, exception):
+    error_message = describe_error(request, exception)
+    print(error_message)
+    return rate_limit.error_response(error_message, exception)
+
+def _first_item(request):
+    items = iter_items(request)
+    return next(items, None), items
+
+def _chain(first, items):
+    yield first
+    yield from items
+
+def list_view_response(query_params, projects, build, view, params, fields=None):
+    '''
+        Response of a Sentry list view: proxied (or streamed) as before for a single project,
+        otherwise fetched from every project concurrently and merged.
+    '''
+    if len(projects) == 1:
+        if "stream" in query_params:
+            return stream_pages(build(params, projects[0]), query_params["stream"], fields)
+        return make_request(build(params, projects[0]), view, fields)
+    requests = project_requests(build, params, projects)
+    field = merge_field(view, params)
+    if "stream" in query_params:
+        format = query_params["stream"]
+        if format not in stream_formats:
+            return invalid_format(format)
+        # First pages are fetched concurrently; later pages as the merge reaches them
+        heads = fan_out(lambda pair: _first_item(pair[1]), requests)
+        results = _stream_results(requests, heads)
+        if results is None:
+            return _error_response(requests[0][1], heads[0][1])
+        started = [_chain(*head) for head, exception in heads if exception is None and head[0] is not None]
+        return _with_failures(stream_merged(started, format, merge_key(field), fields), results)
+    try:
+        items, results = fetch_merged(requests, view, field, fields)
+    except Exception as exception:
+        return _error_response(requests[0][1], exception)
+    return _merged_response(items, results)
+
+async def _afirst_item(request):
+    items = aiter_items(request)
+    return await anext(items, None), items
+
+async def _achain(first, items):
+    yield first
+    async for item in items:
+        yield item
+
+async def alist_view_response(query_params, projects, build, view, params, fields=None):
+    '''
+        Async list_view_response
+    '''
+    if len(projects) == 1:
+        if "stream" in query_params:
+            return await astream_pages(build(params, projects[0]), query_params["stream"], fields)
+        return await amake_request(build(params, projects[0]), view, fields)
+    requests = project_requests(build, params, projects)
+    field = merge_field(view, params)
+    if "stream" in query_params:
+        format = query_params["stream"]
+        if format not in stream_formats:
+            return invalid_format(format)
+        async def first_item(pair):
+            return await _afirst_item(pair[1])
+        heads = await afan_out(first_item, requests)
+        results = _stream_results(requests, heads)
+        if results is None:
+            return _error_response(requests[0][1], heads[0][1])
+        started = [_achain(*head) for head, exception in heads if exception is None and head[0] is not None]
+        return _with_failures(astream_merged(started, format, merge_key(field), fields), results)
+    try:
+        items, results = await afetch_merged(requests, view, field, fields)
+    except Exception as exception:
+        return _error_response(requests[0][1], exception)
+    return _merged_response(items, results)
@@ -0,0 +1,181 @@
+"""
+Integration Health Probe Module
+
+This module probes each third-party integration (Sentry, Mailgun, HubSpot) from a background
+thread on a fixed interval and records every result in a compact per-integration ring buffer.
+The integration status views read uptime and response time percentiles from that history
+instead of probing the upstream API inside the request.
+
+Usage:
+    The scheduler is started once per process by wsgi.py/asgi.py:
+        from .views import health
+        health.start_scheduler()
+
+    Status views then read the recorded history:
+        summary = health.summarize("sentry")
+        summary["windows"]["24h"]["uptime"]  # e.g. 99.93
+
+Functions:
+    ProbeHistory                - Fixed-size ring buffer of (timestamp, response time, ok) samples
+    run_probe(name)             - Probe one integration and record the result
+    run_probes()                - Probe every integration concurrently
+    summarize(name)             - Latest sample plus uptime and p50/p95/p99 per window
+    start_scheduler()           - Start the background probe thread (idempotent)
+    stop_scheduler()            - Stop the background probe thread
+
+Configuration:
+    HEALTH_PROBE_ENABLED        - Start the scheduler with the server process
+    HEALTH_PROBE_INTERVAL       - Seconds between probe rounds; also sets the ring buffer size
+    HEALTH_PROBE_TIMEOUT        - Read timeout for a single probe in seconds
+    HUBSPOT_HEALTH_URI          - Public endpoint probed for HubSpot availability
+"""
+
+import math
+import threading
+import time
+from array import array
+
+from django.conf import settings
+
+from . import rate_limit
+from .helpers import run_concurrently
+from .mailgun import queue_status_request
+from .upstream import send
+
+# Windows reported by summarize(), in seconds; the largest one sizes the ring buffers
+health_windows = {
+    "1h": 60 * 60,
+    "24h": 24 * 60 * 60,
+    "7d": 7 * 24 * 60 * 60,
+}
+
+class ProbeHistory:
+    '''
+        Ring buffer of probe samples stored in parallel typed arrays (17 bytes per sample), so a
+        week of one-minute probes costs ~170KB per integration.
+    '''
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.response_times = array("d", bytes(8 * capacity))
+        self.ok = bytearray(capacity)
+        self.size = 0
+        self.head = 0
+        self.last_success = None
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    def record(self, timestamp, response_time, ok, error=None):
+        with self.lock:
+            self.timestamps[self.head] = timestamp
+            self.response_times[self.head] = response_time
+            self.ok[self.head] = ok
+            self.head = (self.head + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            if ok:
+                self.last_success = timestamp
+            else:
+                self.last_error = error
+
+    def samples(self, since=0):
+        '''
+            Returns (timestamp, response_time, ok) tuples newer than since, newest first.
+        '''
+        with self.lock:
+            result = []
+            for offset in range(1, self.size + 1):
+                index = (self.head - offset) % self.capacity
+                if self.timestamps[index] < since:
+                    break
+                result.append((self.timestamps[index], self.response_times[index], bool(self.ok[index])))
+            return result
+
+def percentile(ordered, fraction):
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def sentry_probe():
+    return send("get", settings.SENTRY_HEALTH_URI, headers=settings.SENTRY_HEADERS, timeout=probe_timeout())
+
+def mailgun_probe():
+    request = queue_status_request()
+    return send(request["method"], request["uri"], auth=request["auth"], timeout=probe_timeout())
+
+def hubspot_probe():
+    return send("get", settings.HUBSPOT_HEALTH_URI, timeout=probe_timeout())
+
+def probe_timeout():
+    return (settings.UPSTREAM_CONNECT_TIMEOUT, settings.HEALTH_PROBE_TIMEOUT)
+
+probes = {
+    "sentry": sentry_probe,
+    "mailgun": mailgun_probe,
+    "hubspot": hubspot_probe,
+}
+
+histories = {
+    name: ProbeHistory(health_windows["7d"] // settings.HEALTH_PROBE_INTERVAL + 1)
+    for name in probes
+}
+
+def run_probe(name):
+    start_time = time.time()
+    try:
+        response = probes[name]()
+        response_time = (time.time() - start_time) * 1000
+        ok = response.status_code == 200
+        error = None if ok else f"API returned status code {response.status_code}"
+    except Exception as e:
+        response_time = (time.time() - start_time) * 1000
+        ok, error = False, str(e)
+    histories[name].record(start_time, response_time, ok, error)
+    return ok
+
+def run_probes():
+    return run_concurrently(run_probe, list(probes), len(probes))
+
+def summarize(name, now=None):
+    '''
+        Returns the latest sample and, for each window in health_windows, the uptime percentage
+        and p50/p95/p99 response times in milliseconds (None when the window has no samples).
+    '''
+    history = histories[name]
+    now = now or time.time()
+    samples = history.samples(now - max(health_windows.values()))
+    windows = {}
+    for window, seconds in health_windows.items():
+        in_window = [sample for sample in samples if sample[0] >= now - seconds]
+        response_times = sorted(sample[1] for sample in in_window)
+        windows[window] = {
+            "samples": len(in_window),
+            "uptime": round(100 * sum(sample[2] for sample in in_window) / len(in_window), 2) if in_window else None,
+            "p50": round(percentile(response_times, 0.50), 2) if in_window else None,
+            "p95": round(percentile(response_times, 0.95), 2) if in_window else None,
+            "p99": round(percentile(response_times, 0.99), 2) if in_window else None,
+        }
+    return {
+        "latest": samples[0] if samples else None,
+        "last_success": history.last_success,
+        "last_error": history.last_error,
+        "windows": windows,
+    }
+
+_scheduler = None
+_stopped = threading.Event()
+
+def _schedule():
+    while not _stopped.is_set():
+        started = time.monotonic()
+        with rate_limit.priority("background"):
+            run_probes()
+        _stopped.wait(max(0, settings.HEALTH_PROBE_INTERVAL - (time.monotonic() - started)))
+
+def start_scheduler():
+    global _scheduler
+    if not settings.HEALTH_PROBE_ENABLED or (_scheduler is not None and _scheduler.is_alive()):
+        return
+    _stopped.clear()
+    _scheduler = threading.Thread(target=_schedule, name="health-probes", daemon=True)
+    _scheduler.start()
+
+def stop_scheduler():
+    _stopped.set()
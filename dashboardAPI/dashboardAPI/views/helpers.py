@@ -20,17 +20,51 @@ Usage:
 
 Functions:
     filter_request_data(data, view) - Filters request data based on allowed parameters
-    make_request(request) - Makes HTTP requests with standardized error handling
+    translate_sentry_params(data, view) - Filters and translates dashboard query parameters
+                            (timeRange, status, level, ...) into Sentry list parameters
+    describe_error(request, exception) - Formats an upstream error message for a request
+    fetch_raw_json(request) - Makes an upstream request and returns its undecoded body as a
+                            RawJSON (see codec.py); identical concurrent requests share one
+                            upstream call (see singleflight.py)
+    fetch_json(request) - fetch_raw_json, decoded with the configured JSON codec
+    fetch_cached_raw_json(request, view, fields) - fetch_raw_json (or fetch_raw_pages for paginated
+                            views, whose page bodies are joined as they are; fetch_all_pages,
+                            encoded once, when fields is set) through the response cache policy of view,
+                            returning (RawJSON, cache status); fields optionally projects the
+                            items to a field tree (see projection.py)
+    fetch_cached_json(request, view, fields) - fetch_cached_raw_json, decoded, returning (data, cache status)
+    make_request(request, view, fields) - Makes HTTP requests through the pooled upstream client and
+                            response cache with standardized error handling (429 with
+                            Retry-After when rate limited, 400 for other upstream errors).
+                            Upstream bodies are sent to the client as is, without being decoded;
+                            paginated lists stopped by a cap carry X-Pagination-Truncated: true
+    run_concurrently(function, items, max_workers) - Runs function over items with bounded
+                            parallelism, collecting per-item results and errors
+    afetch_raw_json, afetch_json, afetch_cached_raw_json, afetch_cached_json, amake_request,
+    arun_concurrently - Async counterparts
+                            used by the ASGI views
 
 Configuration:
     request_params - Dictionary defining allowed parameters for each API view
+    sentry_time_ranges - Dictionary mapping dashboard time ranges to Sentry stats periods
 """
 
+import asyncio
+import contextvars
+import httpx
 import requests
-from django.http import HttpResponseBadRequest, JsonResponse
+from concurrent.futures import ThreadPoolExecutor
+from django.http import HttpResponse
+from . import instrumentation, projection, rate_limit, response_cache
+from .codec import RawJSON
+from .pagination import afetch_all_pages, afetch_raw_pages, fetch_all_pages, fetch_raw_pages, paginated_views, truncated, truncated_header
+from .singleflight import asend, send
 
 request_params = {
     # Sentry:
+    "get_issues": ("timeRange", "statsPeriod", "status", "level", "query", "sort"),
+    "get_events": ("timeRange", "statsPeriod", "full"),
+    "get_issue_events": ("timeRange", "statsPeriod", "query", "full"),
     "update_issue_status": ("status", "statusDetails", "assignedTo", "hasSeen", "isBookmarked", "isSubscribed", "isPublic"),
 
     # Mailgun:
@@ -42,31 +76,193 @@ request_params = {
     "get_mailing_list_members": ("address", "subscribed", "limit", "skip")
 }
 
+sentry_time_ranges = {
+    "1h": "1h",
+    "24h": "24h",
+    "1d": "24h",
+    "7d": "7d",
+    "14d": "14d",
+    "30d": "30d",
+    "90d": "90d",
+}
+
 def filter_request_data(data, view):
     return {key: value for key, value in data.items() if key in request_params[view]}
 
-def make_request(request):
+def translate_sentry_params(data, view):
+    '''
+        Filters dashboard query parameters for a Sentry list view and translates them into Sentry's
+        own parameters: timeRange becomes statsPeriod (or a lastSeen search term for issues), and
+        status/level are folded into the issue search query. Raises ValueError for unknown values.
+    '''
+    params = filter_request_data(data, view)
+    time_range = params.pop("timeRange", None)
+    if time_range is not None and time_range not in sentry_time_ranges:
+        raise ValueError(f"Invalid timeRange \"{time_range}\" (only {", ".join(sentry_time_ranges)} are allowed)")
+    if view != "get_issues":
+        if time_range is not None:
+            params.setdefault("statsPeriod", sentry_time_ranges[time_range])
+        return params
+    terms = [params.pop("query")] if params.get("query") else []
+    status = params.pop("status", None)
+    if status is None and not any(term.startswith("is:") for term in " ".join(terms).split()):
+        status = "unresolved"
+    if status not in (None, "all"):
+        terms.append(f"is:{status}")
+    level = params.pop("level", None)
+    if level:
+        terms.append(f"level:{level}")
+    if time_range is not None:
+        terms.append(f"lastSeen:-{sentry_time_ranges[time_range]}")
+    if terms:
+        params["query"] = " ".join(terms)
+    return params
+
+# Request keys left out of error messages: they carry the upstream credentials, and the messages
+# reach clients (400 bodies and the per-issue errors of batch, bulk and sync responses)
+redacted_request_keys = ("method", "uri", "headers", "auth")
+
+def describe_error(request, exception):
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in redacted_request_keys}
+    if isinstance(exception, (requests.exceptions.RequestException, httpx.HTTPError)):
+        return f"Request error on {method} request to {uri} with {params}: {exception}"
+    return f"Unexpected error on {method} request to {uri} with {params}: {exception}"
+
+def fetch_raw_json(request):
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in ("method", "uri")}
+    match method:
+        case "get" | "put" | "post":
+            response = send(method, uri, **params)
+        case _:
+            raise Exception("Invalid request type (only \"get\", \"put\", and \"post\" are allowed)")
+    response.raise_for_status()
+    return RawJSON.from_response(response)
+
+def fetch_json(request):
+    return fetch_raw_json(request).data
+
+def encode_pages(items):
+    with instrumentation.timed("serialize"):
+        payload = RawJSON.from_data(items)
+    payload.truncated = truncated(items)
+    return payload
+
+def _project_raw_json(payload, fields):
+    if fields is None:
+        return payload
+    return RawJSON.from_data(projection.project_document(payload.data, fields))
+
+def fetch_cached_raw_json(request, view, fields=None):
+    if view in paginated_views and fields is None:
+        load = lambda: fetch_raw_pages(request)
+    elif view in paginated_views:
+        load = lambda: encode_pages(fetch_all_pages(request, fields))
+    else:
+        load = lambda: _project_raw_json(fetch_raw_json(request), fields)
+    payload, cache_status = response_cache.fetch_through(view, request, load, fields)
+    if cache_status:
+        instrumentation.record_cache(view, cache_status)
+    return payload, cache_status
+
+def fetch_cached_json(request, view, fields=None):
+    payload, cache_status = fetch_cached_raw_json(request, view, fields)
+    return payload.data, cache_status
+
+def raw_json_response(payload, cache_status):
+    response = HttpResponse(payload.body, content_type=payload.content_type)
+    if cache_status:
+        response["X-Cache"] = cache_status
+    if payload.truncated:
+        response[truncated_header] = "true"
+    return response
+
+def make_request(request, view=None, fields=None):
+    try:
+        return raw_json_response(*fetch_cached_raw_json(request, view, fields))
+    except Exception as exception:
+        error_message = describe_error(request, exception)
+        print(error_message)
+        print(getattr(exception, "response", None))
+        return rate_limit.error_response(error_message, exception)
+
+def run_concurrently(function, items, max_workers):
+    '''
+        Calls function on every item using at most max_workers threads and returns a list of
+        (result, exception) tuples in the order of items
+    '''
+    def call(item):
+        try:
+            return function(item), None
+        except Exception as exception:
+            return None, exception
+    items = list(items)
+    if not items:
+        return []
+    # Worker threads inherit the caller's context (e.g. its rate limit priority)
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(lambda item: context.copy().run(call, item), items))
+
+async def afetch_raw_json(request):
     uri = request.get("uri")
     method = request.get("method")
     params = {key: value for key, value in request.items() if key not in ("method", "uri")}
-    response = None
-    error_message = None
+    match method:
+        case "get" | "put" | "post":
+            response = await asend(method, uri, **params)
+        case _:
+            raise Exception("Invalid request type (only \"get\", \"put\", and \"post\" are allowed)")
+    response.raise_for_status()
+    return RawJSON.from_response(response)
+
+async def afetch_json(request):
+    return (await afetch_raw_json(request)).data
+
+async def afetch_cached_raw_json(request, view, fields=None):
+    if view in paginated_views and fields is None:
+        load = lambda: afetch_raw_pages(request)
+    elif view in paginated_views:
+        load = lambda: _aencode_pages(request, fields)
+    else:
+        load = lambda: _afetch_projected_raw_json(request, fields)
+    payload, cache_status = await response_cache.afetch_through(view, request, load, fields)
+    if cache_status:
+        instrumentation.record_cache(view, cache_status)
+    return payload, cache_status
+
+async def _aencode_pages(request, fields):
+    return encode_pages(await afetch_all_pages(request, fields))
+
+async def _afetch_projected_raw_json(request, fields):
+    return _project_raw_json(await afetch_raw_json(request), fields)
+
+async def afetch_cached_json(request, view, fields=None):
+    payload, cache_status = await afetch_cached_raw_json(request, view, fields)
+    return payload.data, cache_status
+
+async def amake_request(request, view=None, fields=None):
     try:
-        match method:
-            case "get":
-                response = requests.get(uri, **params)
-            case "put":
-                response = requests.put(uri, **params)
-            case "post":
-                response = requests.post(uri, **params)
-            case _:
-                raise Exception("Invalid request type (only \"get\", \"put\", and \"post\" are allowed)")
-        response.raise_for_status()
-        return JsonResponse(response.json(), safe=False)
-    except requests.exceptions.RequestException as request_exception:
-        error_message = f"Request error on {method} request to {uri} with {params}: {request_exception}"
+        return raw_json_response(*await afetch_cached_raw_json(request, view, fields))
     except Exception as exception:
-        error_message = f"Unexpected error on {method} request to {uri} with {params}: {exception}"
-    print(error_message)
-    print(response)
-    return HttpResponseBadRequest(error_message)
+        error_message = describe_error(request, exception)
+        print(error_message)
+        print(getattr(exception, "response", None))
+        return rate_limit.error_response(error_message, exception)
+
+async def arun_concurrently(function, items, max_workers):
+    '''
+        Async run_concurrently: awaits function on every item with at most max_workers calls in
+        flight and returns a list of (result, exception) tuples in the order of items
+    '''
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    async def call(item):
+        async with semaphore:
+            try:
+                return await function(item), None
+            except Exception as exception:
+                return None, exception
+    return await asyncio.gather(*(call(item) for item in items))
@@ -0,0 +1,277 @@
+"""
+Request Instrumentation Module for DashboardAPI Views
+
+This module measures where the time of every request goes: total request time, time spent in
+upstream calls per vendor (with their retries and response sizes), serialization, response cache
+lookups and response size. Measurements are kept per request, to be returned in a Server-Timing
+header, and aggregated into process-wide metrics exported by /api/metrics/ (see metrics.py).
+
+Usage:
+    InstrumentationMiddleware is installed in settings.MIDDLEWARE and covers every view.
+
+    Upstream calls are measured by upstream.send and async_upstream.asend:
+        with instrumentation.upstream_call(method, uri) as call:
+            call.response = session.request(method, uri)
+
+    Other phases of a request are measured with timed():
+        with instrumentation.timed("serialize"):
+            response = JsonResponse(data)
+
+    Server-Timing: total;dur=412.3, sentry;dur=398.1;desc="2 calls, 1 retries, 84512 bytes",
+                   serialize;dur=3.2, cache;desc="1 MISS"
+
+    Upstream durations are summed per vendor, so concurrent calls can add up to more than total.
+    For streamed responses, total is the time until the response headers were ready.
+
+Functions:
+    Counter, Histogram           - Process-wide metrics, registered in registry
+    RequestTimings               - Measurements of one request
+    upstream_call(method, uri)   - Context manager measuring one upstream call
+    timed(phase)                 - Context manager measuring a phase of the current request
+    record_cache(view, status)   - Records a response cache lookup
+    InstrumentationMiddleware    - Measures each request and adds the Server-Timing header
+
+Configuration:
+    latency_buckets              - Histogram bucket bounds in seconds
+    SERVER_TIMING_ENABLED        - Adds the Server-Timing header to responses
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from collections import Counter as Tally
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import rate_limit
+
+latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+registry = []
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def inc(self, labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        '''
+            Returns (name, labels, value) tuples in Prometheus exposition order.
+        '''
+        with self.lock:
+            return [(self.name, dict(zip(self.labels, labels)), value) for labels, value in sorted(self.values.items())]
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labels, buckets=latency_buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Label values -> [count per bucket..., total count, sum]
+        self.values = {}
+        self.lock = threading.Lock()
+        registry.append(self)
+
+    def observe(self, labels, value):
+        with self.lock:
+            series = self.values.setdefault(labels, [0] * len(self.buckets) + [0, 0.0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def samples(self):
+        with self.lock:
+            values = [(labels, list(series)) for labels, series in sorted(self.values.items())]
+        samples = []
+        for labels, series in values:
+            named = dict(zip(self.labels, labels))
+            for bound, count in zip(self.buckets, series):
+                samples.append((f"{self.name}_bucket", {**named, "le": str(bound)}, count))
+            samples.append((f"{self.name}_bucket", {**named, "le": "+Inf"}, series[-2]))
+            samples.append((f"{self.name}_sum", named, series[-1]))
+            samples.append((f"{self.name}_count", named, series[-2]))
+        return samples
+
+request_duration = Histogram("dashboard_request_duration_seconds", "Time to produce a response", ("route", "method", "status"))
+response_bytes = Counter("dashboard_response_bytes_total", "Response body bytes sent", ("route",))
+upstream_duration = Histogram("dashboard_upstream_duration_seconds", "Duration of upstream API calls", ("vendor", "method", "status"))
+upstream_bytes = Counter("dashboard_upstream_response_bytes_total", "Response body bytes received from upstream APIs", ("vendor",))
+upstream_retries = Counter("dashboard_upstream_retries_total", "Retries of upstream API calls", ("vendor",))
+phase_duration = Histogram("dashboard_phase_duration_seconds", "Duration of request phases such as serialization", ("phase",))
+cache_lookups = Counter("dashboard_cache_lookups_total", "Response cache lookups by cache status", ("view", "status"))
+
+class RequestTimings:
+    '''
+        Measurements of one request. Shared with the worker threads and tasks the request
+        starts, so every update takes the lock.
+    '''
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.upstream = {}
+        self.phases = {}
+        self.cache = Tally()
+        self.lock = threading.Lock()
+
+    def add_upstream(self, vendor, seconds, retries, size):
+        with self.lock:
+            entry = self.upstream.setdefault(vendor, {"seconds": 0.0, "calls": 0, "retries": 0, "bytes": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+            entry["retries"] += retries
+            entry["bytes"] += size
+
+    def add_phase(self, phase, seconds):
+        with self.lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_cache(self, status):
+        with self.lock:
+            self.cache[status] += 1
+
+    def server_timing(self, total):
+        with self.lock:
+            metrics = [f"total;dur={total * 1000:.1f}"]
+            for vendor, entry in sorted(self.upstream.items()):
+                description = f"{entry['calls']} calls, {entry['retries']} retries, {entry['bytes']} bytes"
+                metrics.append(f"{vendor};dur={entry['seconds'] * 1000:.1f};desc=\"{description}\"")
+            metrics.extend(f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in sorted(self.phases.items()))
+            if self.cache:
+                metrics.append(f"cache;desc=\"{", ".join(f"{count} {status}" for status, count in sorted(self.cache.items()))}\"")
+        return ", ".join(metrics)
+
+_current = contextvars.ContextVar("request_timings", default=None)
+
+class UpstreamCall:
+    def __init__(self):
+        self.response = None
+        self.retries = 0
+
+def response_size(response):
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, bytes) else 0
+
+@contextlib.contextmanager
+def upstream_call(method, uri):
+    '''
+        Measures the upstream call made inside the block. Set call.response (and call.retries
+        when the client retried); calls that raise are recorded with status "error".
+    '''
+    call = UpstreamCall()
+    started = time.perf_counter()
+    try:
+        yield call
+    finally:
+        seconds = time.perf_counter() - started
+        vendor = rate_limit.vendor_of(uri)[0] or urlsplit(uri).hostname or "unknown"
+        status = str(call.response.status_code) if call.response is not None else "error"
+        size = response_size(call.response)
+        upstream_duration.observe((vendor, method.upper(), status), seconds)
+        upstream_bytes.inc((vendor,), size)
+        if call.retries:
+            upstream_retries.inc((vendor,), call.retries)
+        timings = _current.get()
+        if timings is not None:
+            timings.add_upstream(vendor, seconds, call.retries, size)
+
+@contextlib.contextmanager
+def timed(phase):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        phase_duration.observe((phase,), seconds)
+        timings = _current.get()
+        if timings is not None:
+            timings.add_phase(phase, seconds)
+
+def record_cache(view, status):
+    cache_lookups.inc((view, status))
+    timings = _current.get()
+    if timings is not None:
+        timings.add_cache(status)
+
+def request_route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else "unmatched"
+
+def _count_chunks(chunks, route):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        response_bytes.inc((route,), size)
+
+async def _acount_chunks(chunks, route):
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        response_bytes.inc((route,), size)
+
+def finish(request, response, timings):
+    total = time.perf_counter() - timings.started
+    route = request_route(request)
+    request_duration.observe((route, request.method, str(response.status_code)), total)
+    if response.streaming:
+        counter = _acount_chunks if response.is_async else _count_chunks
+        response.streaming_content = counter(response.streaming_content, route)
+    else:
+        response_bytes.inc((route,), len(response.content))
+    if settings.SERVER_TIMING_ENABLED:
+        response["Server-Timing"] = timings.server_timing(total)
+    return response
+
+class InstrumentationMiddleware:
+    '''
+        Measures every request (sync or async) and adds a Server-Timing header to its response.
+    '''
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return finish(request, response, timings)
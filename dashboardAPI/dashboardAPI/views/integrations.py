@@ -1,10 +1,11 @@
 """
 Third-Party Integration Status Views Module
 
-This module provides mock API endpoints for monitoring the health and status of third-party
+This module provides API endpoints for monitoring the health and status of third-party
 service integrations used by the dashboardAPI project. It includes status checking
-for Sentry error monitoring and HubSpot CRM services, including both API connectivity
-and webhook functionality.
+for Sentry error monitoring, Mailgun email and HubSpot CRM services, including both API
+connectivity and webhook functionality. API status is read from the background probe history
+recorded by health.py, so these endpoints never wait on a live probe.
 
 Usage:
     This module provides REST API endpoints for checking integration health status.
@@ -13,64 +14,86 @@ Usage:
 API Endpoints:
     GET /api/sentry/integration-status/  - Check Sentry API and webhook status
     GET /api/hubspot/integration-status/ - Check HubSpot API and webhook status
+    GET /api/mailgun/integration-status/ - Check Mailgun API status
 
 Functions:
-    get_sentry_api_status()       - Check Sentry API connectivity and response time
+    api_status()                  - Build an API status object from the recorded probe history
+    get_sentry_api_status()       - Sentry API connectivity, response time and uptime
     get_sentry_webhooks_status()  - Get Sentry webhook status (assumed healthy)
-    get_hubspot_api_status()      - Check HubSpot API connectivity (mock implementation)
+    get_hubspot_api_status()      - HubSpot API connectivity, response time and uptime
     get_hubspot_webhooks_status() - Get HubSpot webhook status (assumed healthy)
+    get_mailgun_api_status()      - Mailgun API connectivity, response time and uptime
 
 Response Format:
     Each status check returns an array of service objects containing:
     - name: Service name
     - category: Service category (Error Tracking, CRM, etc.)
-    - status: Current status (Healthy, Unhealthy, Degraded)
-    - responseTime: API response time in milliseconds
+    - status: Current status (Healthy, Degraded, Down, or Pending before the first probe)
+    - responseTime: Latest probe response time in milliseconds
     - lastSuccess: Timestamp of last successful check
-    - uptime: Service uptime percentage
+    - uptime: Service uptime percentage over the last 24 hours
     - issue: Error description if service is down
+    - history: Uptime and p50/p95/p99 response times over 1h/24h/7d (API statuses only)
 """
 
-import json
-import requests
 from django.conf import settings
-from django.http import HttpResponse 
 from rest_framework.decorators import api_view
 from datetime import datetime
-from requests.models import Response
+from . import codec, health
 
-def get_sentry_api_status():
-    sentry_api_status = {
-            "name": "Sentry API",
-            "category": "Error Tracking",
-            "status": "Unhealthy",
-            "responseTime": "N/A",
-            "lastSuccess": None,
-            "uptime": "0%",
-            "issue": None
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else None
+
+def assumed_success_timestamp():
+    # Webhooks are not probed, so their last success is the current minute; whole minutes keep
+    # responses embedding it (e.g. the dashboard snapshot) identical between polls, so their
+    # ETags still match
+    return datetime.now().replace(second=0, microsecond=0).strftime("%Y-%m-%d %H:%M:%S")
+
+def api_status(integration, name, category):
+    '''
+        Builds the status object for an integration from its recorded probe history.
+        Healthy/Degraded/Down is decided by the latest probe and the 1h uptime; without a probe
+        in the last hour the status is Pending again, as the latest result is stale.
+    '''
+    summary = health.summarize(integration)
+    api_status = {
+        "name": name,
+        "category": category,
+        "status": "Pending",
+        "responseTime": "N/A",
+        "lastSuccess": format_timestamp(summary["last_success"]),
+        "uptime": "N/A",
+        "issue": "Waiting for the first health probe",
+        "history": summary["windows"],
     }
-    try:
-        start_time = datetime.now()
-        response = requests.get("https://sentry.io/_health/", headers = settings.SENTRY_HEADERS)
-        end_time = datetime.now()
-        response_time = (end_time - start_time).total_seconds() * 1000
-        if response.status_code == 200:
-            sentry_api_status.update({
-                "status": "Healthy",
-                "responseTime": f"{response_time:.2f}ms",
-                "lastSuccess": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "uptime": "99.95%",  # This would need to be calculated over time
-            })
-        else:
-            sentry_api_status.update({
-                "responseTime": f"{response_time:.2f}ms",
-                "issue": f"API returned status code {response.status_code}"
-            })
-    except Exception as e:
-        sentry_api_status.update({
-            "issue": str(e)
+    if summary["latest"] is None:
+        return api_status
+    timestamp, response_time, ok = summary["latest"]
+    uptime = summary["windows"]["24h"]["uptime"]
+    api_status.update({
+        "responseTime": f"{response_time:.2f}ms",
+        "uptime": "N/A" if uptime is None else f"{uptime}%",
+        "issue": None,
+    })
+    if summary["windows"]["1h"]["uptime"] is None:
+        api_status["issue"] = f"No health probe since {format_timestamp(timestamp)}"
+    elif not ok:
+        api_status.update({
+            "status": "Down",
+            "issue": summary["last_error"],
+        })
+    elif summary["windows"]["1h"]["uptime"] < settings.HEALTH_DEGRADED_UPTIME:
+        api_status.update({
+            "status": "Degraded",
+            "issue": f"{summary['windows']['1h']['uptime']}% uptime over the last hour",
         })
-    return sentry_api_status
+    else:
+        api_status["status"] = "Healthy"
+    return api_status
+
+def get_sentry_api_status():
+    return api_status("sentry", "Sentry API", "Error Tracking")
 
 def get_sentry_webhooks_status():
     sentry_webhooks_status = {
@@ -78,7 +101,7 @@ def get_sentry_webhooks_status():
         "category": "Alerting",
         "status": "Healthy",
         "responseTime": "N/A",
-        "lastSuccess": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "lastSuccess": assumed_success_timestamp(),
         "uptime": "100%",
         "issue": None
     }
@@ -86,45 +109,10 @@ def get_sentry_webhooks_status():
 
 @api_view(["GET"])
 def get_sentry_integration_status(request, **kwargs):
-    return HttpResponse(json.dumps([get_sentry_api_status(), get_sentry_webhooks_status()]), content_type="application/json")
+    return codec.json_response([get_sentry_api_status(), get_sentry_webhooks_status()])
 
 def get_hubspot_api_status():
-    hubspot_api_status = {
-        "name": "HubSpot API",
-        "category": "CRM",
-        "status": "Down",
-        "responseTime": "N/A",
-        "lastSuccess": None,
-        "uptime": "0%",
-        "issue": None,
-    }
-    try:
-        # Simulate a health check (using a reliable endpoint for demo)
-        start_time = datetime.now()
-        response = Response()
-        response.status_code = 200
-        end_time = datetime.now()
-        response_time = (end_time - start_time).total_seconds() * 1000
-        
-        if response.status_code == 200:
-            hubspot_api_status.update({
-                "status": "Healthy",
-                "responseTime": f"{response_time:.2f}ms",
-                "lastSuccess": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "uptime": "99.9%",
-            })
-        else:
-            hubspot_api_status.update({
-                "status": "Degraded",
-                "responseTime": f"{response_time:.2f}ms",
-                "uptime": "95%",
-                "issue": f"API returned status code {response.status_code}"
-            })
-    except Exception as e:
-        hubspot_api_status.update({
-            "issue": str(e)
-        })
-    return hubspot_api_status
+    return api_status("hubspot", "HubSpot API", "CRM")
 
 def get_hubspot_webhooks_status():
     hubspot_webhooks_status = {
@@ -132,7 +120,7 @@ def get_hubspot_webhooks_status():
         "category": "Notifications",
         "status": "Healthy",
         "responseTime": "N/A",
-        "lastSuccess": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "lastSuccess": assumed_success_timestamp(),
         "uptime": "100%",
         "issue": None
     }
@@ -141,4 +129,11 @@ def get_hubspot_webhooks_status():
 
 @api_view(["GET"])
 def get_hubspot_integration_status(request, **kwargs):
-    return HttpResponse(json.dumps([get_hubspot_api_status(), get_hubspot_webhooks_status()]), content_type="application/json")
+    return codec.json_response([get_hubspot_api_status(), get_hubspot_webhooks_status()])
+
+def get_mailgun_api_status():
+    return api_status("mailgun", "Mailgun API", "Email Service")
+
+@api_view(["GET"])
+def get_mailgun_integration_status(request, **kwargs):
+    return codec.json_response([get_mailgun_api_status()])
@@ -0,0 +1,233 @@
+"""
+Incremental Sentry Issue Sync Module
+
+This module provides a delta sync API for Sentry issues and their events. The backend keeps a
+ledger of the live (unresolved) issues it has seen, updated from Sentry with
+`lastSeen:>=<watermark>` queries that only return issues which changed since the last refresh.
+Clients pass back the opaque token from their previous sync and receive only the issues and
+events that changed since then, plus tombstones for issues that were resolved, ignored or fell
+out of the time range.
+
+Usage:
+    GET /api/sentry/sync/                  - Full sync; returns every live issue and a token
+    GET /api/sentry/sync/?token=<token>    - Changes since the sync that returned token
+    GET /api/sentry/sync/?since=<ISO 8601> - Changes since a timestamp (no token needed)
+    GET /api/sentry/sync/?fields=list      - Events projected to a preset or field list (see projection.py)
+
+    A client applies "issues" as upserts and "tombstones" as deletions, and merges "events"
+    into its per-issue event lists. When "full" is true the client must replace its state
+    (first sync, expired token, or a token issued by another server process).
+
+Ledger Refresh:
+    - Incremental: at most once per SENTRY_SYNC_MIN_INTERVAL seconds, one Sentry call for the
+      issues whose lastSeen is at or after the watermark (the newest lastSeen in the ledger)
+    - Reconcile: every SENTRY_SYNC_RECONCILE_INTERVAL seconds, and after an issue is updated
+      through this API, the full issue list is fetched to catch status changes and expiries
+      that do not move lastSeen. Issues missing from it are only tombstoned when the list was
+      not cut short by a pagination cap (see pagination.py)
+
+Functions:
+    IssueLedger                - Issue state, tombstones and change sequence numbers
+    encode_token(data)         - Encodes sync state into an opaque token
+    decode_token(token)        - Decodes a token; raises ValueError when it is malformed
+    sync(token, since)         - Refreshes the ledger and returns the delta document
+    get_sentry_sync()          - Endpoint for the delta sync API
+
+Configuration:
+    SENTRY_SYNC_TIME_RANGE          - Time range of issues tracked by the ledger
+    SENTRY_SYNC_MIN_INTERVAL        - Minimum seconds between incremental upstream refreshes
+    SENTRY_SYNC_RECONCILE_INTERVAL  - Seconds between full reconciliations
+    SENTRY_SYNC_TOMBSTONE_TTL       - Seconds tombstones are kept; older tokens get a full sync
+"""
+
+import base64
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from . import codec, projection, rate_limit, response_cache
+from .helpers import describe_error, translate_sentry_params
+from .fanout import fetch_all_project_pages
+from .pagination import truncated
+from .sentry import fetch_issue_events, issues_request
+
+# Issue statuses kept in the ledger; any other status produces a tombstone
+live_statuses = ("unresolved",)
+
+class IssueLedger:
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self.sequence = 0
+        self.issues = {}
+        self.tombstones = {}
+        self.watermark = None
+        self.horizon = time.time()
+        self.refreshed_at = 0
+        self.reconciled_at = 0
+        self.namespace_version = None
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+
+    def apply(self, issues, complete):
+        '''
+            Records changed issues under a new sequence number. With complete, issues missing
+            from the list are tombstoned as "removed".
+        '''
+        self.sequence += 1
+        changed = {"sequence": self.sequence, "at": time.time()}
+        seen = set()
+        for issue in issues:
+            issue_id = issue["id"]
+            seen.add(issue_id)
+            if issue.get("lastSeen") and (self.watermark is None or issue["lastSeen"] > self.watermark):
+                self.watermark = issue["lastSeen"]
+            if issue.get("status", "unresolved") in live_statuses:
+                entry = self.issues.get(issue_id)
+                if entry is None or entry["issue"] != issue:
+                    self.issues[issue_id] = {"issue": issue, **changed}
+                    self.tombstones.pop(issue_id, None)
+            elif issue_id in self.issues or self.tombstones.get(issue_id, {}).get("status") != issue.get("status"):
+                self.issues.pop(issue_id, None)
+                self.tombstones[issue_id] = {"status": issue.get("status"), **changed}
+        if complete:
+            for issue_id in set(self.issues) - seen:
+                del self.issues[issue_id]
+                self.tombstones[issue_id] = {"status": "removed", **changed}
+        self.prune(changed["at"])
+
+    def prune(self, now):
+        expired = [issue_id for issue_id, tombstone in self.tombstones.items() if tombstone["at"] < now - settings.SENTRY_SYNC_TOMBSTONE_TTL]
+        for issue_id in expired:
+            self.horizon = max(self.horizon, self.tombstones.pop(issue_id)["at"])
+
+    def refresh(self):
+        '''
+            Updates the ledger from Sentry. One caller refreshes at a time and fetches outside
+            self.lock, so other syncs are answered from the current state meanwhile instead of
+            queueing behind a slow reconcile (only the first reconcile is waited for).
+        '''
+        if not self.refresh_lock.acquire(blocking=not self.reconciled_at):
+            return
+        try:
+            self._refresh()
+        finally:
+            self.refresh_lock.release()
+
+    def _refresh(self):
+        now = time.time()
+        version = response_cache.namespace_version("sentry-issues")
+        if not self.reconciled_at or version != self.namespace_version or now - self.reconciled_at >= settings.SENTRY_SYNC_RECONCILE_INTERVAL:
+            params = translate_sentry_params({"timeRange": settings.SENTRY_SYNC_TIME_RANGE, "status": "all"}, "get_issues")
+            issues = fetch_all_project_pages(issues_request, params)
+            with self.lock:
+                # Issues past a pagination cap are missing from the list, not removed
+                self.apply(issues, complete=not truncated(issues))
+                self.reconciled_at = self.refreshed_at = now
+                self.namespace_version = version
+        elif now - self.refreshed_at >= settings.SENTRY_SYNC_MIN_INTERVAL:
+            # Sentry search dates have second precision, so >= re-reads the newest issue rather than missing its second
+            query = f"lastSeen:>={self.watermark[:19]}" if self.watermark else f"lastSeen:-{settings.SENTRY_SYNC_TIME_RANGE}"
+            issues = fetch_all_project_pages(issues_request, {"query": query})
+            with self.lock:
+                self.apply(issues, complete=False)
+                self.refreshed_at = now
+
+    def changes(self, sequence=None, since=None):
+        '''
+            Returns (issues, tombstones) changed after sequence, or after the since timestamp.
+            With since, issues are selected by their Sentry lastSeen rather than by when this
+            ledger noticed them.
+        '''
+        def changed(entry):
+            return entry["sequence"] > sequence if sequence is not None else entry["at"] > since
+        def seen_since(entry):
+            return bool(entry["issue"].get("lastSeen")) and datetime.fromisoformat(entry["issue"]["lastSeen"]).timestamp() > since
+        issues = [entry["issue"] for entry in self.issues.values() if (changed if sequence is not None else seen_since)(entry)]
+        tombstones = [{"id": issue_id, "status": entry["status"]} for issue_id, entry in self.tombstones.items() if changed(entry)]
+        return issues, tombstones
+
+ledger = IssueLedger()
+
+def encode_token(data):
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_token(token):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return {"e": str(data["e"]), "s": int(data["s"]), "t": float(data["t"])}
+    except (ValueError, TypeError, KeyError) as error:
+        raise ValueError(f"Invalid sync token: {error}")
+
+def parse_since(since):
+    try:
+        timestamp = datetime.fromisoformat(since)
+    except ValueError:
+        raise ValueError(f"Invalid since \"{since}\" (expected an ISO 8601 timestamp)")
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+def sentry_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+def sync(token=None, since=None, fields=None):
+    '''
+        Refreshes the ledger and returns the changes since token (or since an ISO timestamp).
+        Events are fetched only for the issues in the delta, and only those created after the
+        previous sync; fields optionally projects them (see projection.py).
+    '''
+    state = decode_token(token) if token else None
+    since_time = parse_since(since) if since and not token else None
+    ledger.refresh()
+    with ledger.lock:
+        now = time.time()
+        full = (state is None and since_time is None) or (state is not None and (state["e"] != ledger.epoch or state["t"] < ledger.horizon))
+        if full:
+            issues, tombstones = [entry["issue"] for entry in ledger.issues.values()], []
+        elif state is not None:
+            issues, tombstones = ledger.changes(sequence=state["s"])
+        else:
+            issues, tombstones = ledger.changes(since=since_time)
+        next_token = encode_token({"e": ledger.epoch, "s": ledger.sequence, "t": now})
+    if full:
+        events_params = translate_sentry_params({"timeRange": settings.SENTRY_SYNC_TIME_RANGE}, "get_issue_events")
+    else:
+        # Whole minutes keep the event windows (and so their cache keys) shared between clients
+        start = (state["t"] if state is not None else since_time) // 60 * 60
+        events_params = {"start": sentry_timestamp(start), "end": sentry_timestamp(now // 60 * 60 + 60)}
+    # Events of every changed issue are delivered, SENTRY_BATCH_MAX_ISSUES issues at a time; the
+    # token moves past them, so a skipped issue would never get its events
+    issue_ids = [issue["id"] for issue in issues]
+    events = {}
+    for offset in range(0, len(issue_ids), settings.SENTRY_BATCH_MAX_ISSUES):
+        events.update(fetch_issue_events(issue_ids[offset:offset + settings.SENTRY_BATCH_MAX_ISSUES], events_params, fields))
+    return {
+        "token": next_token,
+        "full": full,
+        "issues": issues,
+        "tombstones": tombstones,
+        "events": events,
+    }
+
+@api_view(["GET"])
+def get_sentry_sync(request, **kwargs):
+    '''
+        Endpoint to sync sentry issues and events incrementally
+        Pass the token of the previous response (or an ISO 8601 since timestamp) to receive only
+        what changed; resolved and ignored issues are returned as tombstones.
+    '''
+    try:
+        fields = projection.projection(request.query_params, "get_issue_events")
+        return codec.json_response(sync(request.query_params.get("token"), request.query_params.get("since"), fields))
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    except Exception as exception:
+        error_message = describe_error(issues_request(), exception)
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
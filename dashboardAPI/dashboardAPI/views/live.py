@@ -0,0 +1,202 @@
+"""
+Live Updates (Server-Sent Events) Module
+
+This module pushes dashboard changes to browsers over Server-Sent Events. A single background
+poller per server process detects changes and broadcasts them to every connected client:
+    - issues: Sentry issue/event deltas from the incremental sync ledger (issue_sync.py)
+    - mailgun: new Mailgun delivery failures since the previous poll
+    - integrations: integration statuses whose status or issue changed (from health.py)
+Upstream load therefore depends on the poll interval, not on the number of open dashboards.
+The poller runs only while at least one client is connected.
+
+Usage:
+    GET /api/stream/
+
+    const source = new EventSource("/api/stream/");
+    source.addEventListener("issues", (message) => apply(JSON.parse(message.data)));
+
+    Each message carries an id; browsers reconnecting with Last-Event-ID are replayed the
+    messages they missed while they are still in the replay buffer.
+
+Functions:
+    Subscriber                 - Connected client receiving broadcast messages
+    subscribe(subscriber)      - Registers a client and starts the poller if needed
+    unsubscribe(subscriber)    - Removes a client
+    broadcast(event, data)     - Sends a message to every connected client
+    poll()                     - Runs one round of change detection
+    format_message(message)    - Serializes a message in the SSE wire format
+    get_stream()               - SSE endpoint
+
+Configuration:
+    LIVE_POLL_INTERVAL         - Seconds between poller rounds
+    LIVE_HEARTBEAT_INTERVAL    - Seconds between keep-alive comments on idle connections
+    LIVE_CLIENT_QUEUE_SIZE     - Messages buffered per client before a slow client is dropped
+    LIVE_REPLAY_SIZE           - Messages kept for Last-Event-ID replay
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view
+
+from . import issue_sync, rate_limit
+from .helpers import fetch_json
+from .integrations import get_hubspot_api_status, get_mailgun_api_status, get_sentry_api_status
+from .mailgun import logs_request
+
+# Integration statuses watched by the poller
+live_integrations = {
+    "sentry": get_sentry_api_status,
+    "mailgun": get_mailgun_api_status,
+    "hubspot": get_hubspot_api_status,
+}
+
+class Subscriber:
+    '''
+        A connected client. Messages are handed over through deliver(), which must never block
+        the poller; a client whose queue is full is closed and has to reconnect.
+    '''
+    def __init__(self):
+        self.messages = queue.Queue(settings.LIVE_CLIENT_QUEUE_SIZE)
+        self.closed = False
+
+    def deliver(self, message):
+        try:
+            self.messages.put_nowait(message)
+        except queue.Full:
+            self.closed = True
+
+_subscribers = set()
+_replay = deque(maxlen=settings.LIVE_REPLAY_SIZE)
+_lock = threading.Lock()
+_next_id = 0
+_polling = False
+_state = {"sync_token": None, "mailgun_since": None, "integrations": {}}
+
+def broadcast(event, data):
+    global _next_id
+    with _lock:
+        _next_id += 1
+        message = {"id": _next_id, "event": event, "data": data}
+        _replay.append(message)
+        subscribers = list(_subscribers)
+    for subscriber in subscribers:
+        subscriber.deliver(message)
+
+def subscribe(subscriber, last_event_id=None):
+    global _polling
+    with _lock:
+        _subscribers.add(subscriber)
+        if last_event_id is not None:
+            for message in _replay:
+                if message["id"] > last_event_id:
+                    subscriber.deliver(message)
+        if not _polling:
+            _polling = True
+            threading.Thread(target=_poll_while_subscribed, name="live-poller", daemon=True).start()
+
+def unsubscribe(subscriber):
+    with _lock:
+        _subscribers.discard(subscriber)
+
+def mailgun_timestamp(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+def poll_issues():
+    delta = issue_sync.sync(_state["sync_token"])
+    first = _state["sync_token"] is None
+    _state["sync_token"] = delta["token"]
+    # The first sync only establishes a baseline; clients load the full state themselves
+    if not first and not delta["full"] and (delta["issues"] or delta["tombstones"]):
+        broadcast("issues", {key: delta[key] for key in ("issues", "tombstones", "events")})
+
+def poll_mailgun():
+    now = datetime.now(timezone.utc)
+    since, _state["mailgun_since"] = _state["mailgun_since"], now
+    if since is None:
+        return
+    logs = fetch_json(logs_request({
+        "start": mailgun_timestamp(since),
+        "end": mailgun_timestamp(now),
+        "events": "failed,rejected,bounced,complained",
+        "pagination": {"limit": 100, "sort": "timestamp:asc"},
+    }))
+    if logs.get("items"):
+        broadcast("mailgun", {"items": logs["items"]})
+
+def poll_integrations():
+    changed = []
+    for name, status in live_integrations.items():
+        current = status()
+        previous = _state["integrations"].get(name)
+        _state["integrations"][name] = current
+        if previous is not None and (previous["status"], previous["issue"]) != (current["status"], current["issue"]):
+            changed.append(current)
+    if changed:
+        broadcast("integrations", changed)
+
+def poll():
+    for check in (poll_issues, poll_mailgun, poll_integrations):
+        try:
+            check()
+        except Exception as exception:
+            print(f"Live update {check.__name__} failed: {exception}")
+
+def _poll_while_subscribed():
+    global _polling
+    while True:
+        with _lock:
+            if not _subscribers:
+                _polling = False
+                # Baselines are stale once nobody is listening; the next poller starts afresh
+                _state.update({"sync_token": None, "mailgun_since": None, "integrations": {}})
+                return
+        started = time.monotonic()
+        with rate_limit.priority("background"):
+            poll()
+        time.sleep(max(0, settings.LIVE_POLL_INTERVAL - (time.monotonic() - started)))
+
+def format_message(message):
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message['data'], cls=DjangoJSONEncoder)}\n\n"
+
+def last_event_id(request):
+    try:
+        return int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        return None
+
+def _events(subscriber):
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield f"retry: {int(settings.LIVE_POLL_INTERVAL * 1000)}\n\n"
+        while not subscriber.closed:
+            try:
+                yield format_message(subscriber.messages.get(timeout=settings.LIVE_HEARTBEAT_INTERVAL))
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+    finally:
+        unsubscribe(subscriber)
+
+def event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop reverse proxies (e.g. nginx) from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+@api_view(["GET"])
+def get_stream(request, **kwargs):
+    '''
+        Endpoint to receive live dashboard updates as Server-Sent Events
+        Events: issues (Sentry deltas), mailgun (new delivery failures), integrations (status changes)
+    '''
+    subscriber = Subscriber()
+    subscribe(subscriber, last_event_id(request))
+    return event_stream_response(_events(subscriber))
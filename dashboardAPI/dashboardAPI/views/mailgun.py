@@ -14,6 +14,7 @@ API Endpoints:
     PUT /api/mailgun/account-metrics/        - Retrieve account analytics metrics
     PUT /api/mailgun/account-usage-metrics/  - Get account usage statistics
     PUT /api/mailgun/logs/                   - Access email delivery logs
+    PUT /api/mailgun/logs/export/            - Stream every page of the delivery logs (NDJSON or CSV)
     PUT /api/mailgun/stats/totals/           - Get statistical totals
     PUT /api/mailgun/stats/filter/           - Get filtered/grouped statistics
     PUT /api/mailgun/mailing-list-members/{list_address}/ - Manage mailing list members
@@ -27,26 +28,165 @@ Functions:
     get_account_metrics()            - Retrieve detailed analytics
     get_account_usage_metrics()      - Get usage statistics
     get_logs()                       - Access delivery and bounce logs
+    export_logs()                    - Stream every page of the delivery and bounce logs
     get_stat_totals()                - Get statistical summaries
     get_filtered_grouped_stats()     - Get filtered statistics
     get_mailing_list_members()       - Manage mailing list memberships
+
+Field Projection:
+    get_logs() and get_mailing_list_members() accept a fields= query parameter (e.g.
+    ?fields=chart, or ?fields=id,event,recipient) that strips the other fields of every item
+    before the response is cached and sent; see projection.py.
+
+Log Export:
+    export_logs() takes the same body as get_logs() and follows Mailgun's pagination tokens on
+    the server, writing each page to the client as it arrives (?stream=ndjson, the default, or
+    ?stream=csv). Memory use does not grow with the size of the export. CSV columns are listed
+    in log_export_columns.
 """
 
+import csv
+
 from rest_framework.decorators import api_view
+from django.http import HttpResponseBadRequest
+from . import codec, projection
 from .helpers import make_request, filter_request_data
+from .pagination import stream_token_pages
 from django.conf import settings
 
+# CSV columns of the log export: header -> path of the value in a Mailgun log item
+log_export_columns = {
+    "id": ("id",),
+    "timestamp": ("@timestamp",),
+    "event": ("event",),
+    "severity": ("severity",),
+    "reason": ("reason",),
+    "recipient": ("recipient",),
+    "recipient_domain": ("recipient-domain",),
+    "sender": ("envelope", "sender"),
+    "subject": ("message", "headers", "subject"),
+    "message_id": ("message", "headers", "message-id"),
+    "delivery_code": ("delivery-status", "code"),
+    "delivery_message": ("delivery-status", "message"),
+}
+
+def queue_status_request():
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v3/domains/{settings.MAILGUN_API_NAME}/sending_queues",
+        "method": "get",
+        "auth": settings.MAILGUN_AUTH,
+    }
+
+def account_metrics_request(data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/metrics",
+        "method": "post",
+        "auth": settings.MAILGUN_AUTH,
+        "json": filter_request_data(data, "get_account_metrics"),
+    }
+
+def account_usage_metrics_request(data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/usage/metrics",
+        "method": "post",
+        "auth": settings.MAILGUN_AUTH,
+        "json": filter_request_data(data, "get_account_usage_metrics"),
+    }
+
+def logs_request(data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/logs",
+        "method": "post",
+        "auth": settings.MAILGUN_AUTH,
+        "json": filter_request_data(data, "get_logs"),
+    }
+
+def logs_export_request(data):
+    request = logs_request(data)
+    pagination = request["json"].get("pagination")
+    request["json"]["pagination"] = {
+        "sort": "timestamp:asc",
+        "limit": settings.MAILGUN_EXPORT_PAGE_SIZE,
+        **(pagination if isinstance(pagination, dict) else {}),
+    }
+    return request
+
+class _Echo:
+    # csv.writer target that hands each formatted row back instead of buffering it
+    def write(self, value):
+        return value
+
+_csv_writer = csv.writer(_Echo())
+
+def log_value(item, path):
+    for key in path:
+        if not isinstance(item, dict):
+            return ""
+        item = item.get(key)
+    return "" if item is None else item
+
+def log_csv_row(item):
+    if set(item) == {"error"}:
+        # Upstream failures after the first page and the page cap end the export with an error item
+        return _csv_writer.writerow([f"# export stopped: {item['error']}"])
+    return _csv_writer.writerow([log_value(item, path) for path in log_export_columns.values()])
+
+def log_ndjson_line(item):
+    return codec.dumps(item) + b"\n"
+
+# Export format -> (content type, header, item formatter)
+log_export_formats = {
+    "ndjson": ("application/x-ndjson", None, log_ndjson_line),
+    "csv": ("text/csv", _csv_writer.writerow(list(log_export_columns)), log_csv_row),
+}
+
+def log_export_format(format):
+    '''
+        Returns (content type, header, item formatter) of an export format; raises ValueError for
+        unknown formats
+    '''
+    if format not in log_export_formats:
+        raise ValueError(f"Invalid stream format \"{format}\" (only {", ".join(log_export_formats)} are allowed)")
+    return log_export_formats[format]
+
+def with_attachment(response, format):
+    if response.status_code == 200:
+        response["Content-Disposition"] = f'attachment; filename="mailgun-logs.{format}"'
+        # Stop reverse proxies (e.g. nginx) from buffering the export
+        response["X-Accel-Buffering"] = "no"
+    return response
+
+def stat_totals_request(data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v3/stats/total",
+        "method": "get",
+        "auth": settings.MAILGUN_AUTH,
+        "params": filter_request_data(data, "get_stat_totals"),
+    }
+
+def filtered_grouped_stats_request(data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v3/stats/filter",
+        "method": "get",
+        "auth": settings.MAILGUN_AUTH,
+        "params": filter_request_data(data, "get_filtered_grouped_stats"),
+    }
+
+def mailing_list_members_request(list_address, data):
+    return {
+        "uri": f"{settings.MAILGUN_BASE_URI}/v3/lists/{list_address}/members/",
+        "method": "get",
+        "auth": settings.MAILGUN_AUTH,
+        "params": filter_request_data(data, "get_mailing_list_members"),
+    }
+
 @api_view(["GET"])
 def get_queue_status(request, **kwargs):
     '''
         Endpoint to access mailgun messages queue status.
         See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/messages/get-v3-domains--name--sending-queues
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v3/domains/{settings.MAILGUN_API_NAME}/sending_queues",
-        "method": "get",
-        "auth": settings.MAILGUN_AUTH,
-    })
+    return make_request(queue_status_request(), "get_queue_status")
 
 @api_view(["PUT"])
 def get_account_metrics(request, **kwargs):
@@ -54,12 +194,7 @@ def get_account_metrics(request, **kwargs):
         Endpoint to access mailgun account metrics.
         See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/metrics/post-v1-analytics-metrics
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/metrics",
-        "method": "post",
-        "auth": settings.MAILGUN_AUTH,
-        "json": filter_request_data(request.data, "get_account_metrics"),
-    })
+    return make_request(account_metrics_request(request.data), "get_account_metrics")
 
 @api_view(["PUT"])
 def get_account_usage_metrics(request, **kwargs):
@@ -67,12 +202,7 @@ def get_account_usage_metrics(request, **kwargs):
         Endpoint to access mailgun account usage metrics
         See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/metrics/post-v1-analytics-usage-metrics
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/usage/metrics",
-        "method": "post",
-        "auth": settings.MAILGUN_AUTH,
-        "json": filter_request_data(request.data, "get_account_usage_metrics"),
-    })
+    return make_request(account_usage_metrics_request(request.data), "get_account_usage_metrics")
 
 @api_view(["PUT"])
 def get_logs(request, **kwargs):
@@ -80,12 +210,25 @@ def get_logs(request, **kwargs):
         Endpoint to access mailgun logs
         See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/logs/post-v1-analytics-logs
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v1/analytics/logs",
-        "method": "post",
-        "auth": settings.MAILGUN_AUTH,
-        "json": filter_request_data(request.data, "get_logs"),
-    })
+    try:
+        fields = projection.projection(request.query_params, "get_logs")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return make_request(logs_request(request.data), "get_logs", fields)
+
+@api_view(["PUT"])
+def export_logs(request, **kwargs):
+    '''
+        Endpoint to export every page of the mailgun logs as a stream
+        Takes the body of get_logs; ?stream=ndjson (default) or ?stream=csv
+        See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/logs/post-v1-analytics-logs
+    '''
+    format = request.query_params.get("stream", "ndjson")
+    try:
+        content_type, header, format_item = log_export_format(format)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return with_attachment(stream_token_pages(logs_export_request(request.data), format_item, content_type, header), format)
 
 @api_view(["PUT"])
 def get_stat_totals(request, **kwargs):
@@ -93,12 +236,7 @@ def get_stat_totals(request, **kwargs):
         Endpoint to access mailgun stats
         See: https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/stats/get-v3-stats-total
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v3/stats/total",
-        "method": "get",
-        "auth": settings.MAILGUN_AUTH,
-        "params": filter_request_data(request.data, "get_stat_totals"),
-    })
+    return make_request(stat_totals_request(request.data), "get_stat_totals")
 
 @api_view(["PUT"])
 def get_filtered_grouped_stats(request, **kwargs):
@@ -106,12 +244,7 @@ def get_filtered_grouped_stats(request, **kwargs):
         Endpoint to access mailgun filtered/grouped stats
         See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/stats/get-v3-stats-filter
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v3/stats/filter",
-        "method": "get",
-        "auth": settings.MAILGUN_AUTH,
-        "params": filter_request_data(request.data, "get_filtered_grouped_stats"),
-    })
+    return make_request(filtered_grouped_stats_request(request.data), "get_filtered_grouped_stats")
 
 @api_view(["PUT"])
 def get_mailing_list_members(request, **kwargs):
@@ -119,9 +252,8 @@ def get_mailing_list_members(request, **kwargs):
         Endpoint to access mailgun mailing list members
         See https://documentation.mailgun.com/docs/mailgun/api-reference/openapi-final/mailing-lists/get-lists-string:list_address-members
     '''
-    return make_request({
-        "uri": f"{settings.MAILGUN_BASE_URI}/v3/lists/{kwargs.get("list_address")}/members/",
-        "method": "get",
-        "auth": settings.MAILGUN_AUTH,
-        "params": filter_request_data(request.data, "get_mailing_lists"),
-    })
+    try:
+        fields = projection.projection(request.query_params, "get_mailing_list_members")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return make_request(mailing_list_members_request(kwargs.get("list_address"), request.data), "get_mailing_list_members", fields)
@@ -0,0 +1,239 @@
+"""
+Sentry Member Directory Module
+
+This module keeps the members of each Sentry organization of SENTRY_PROJECTS in memory, one
+directory per organization, reloaded from a background thread every
+MEMBER_DIRECTORY_REFRESH_INTERVAL seconds and indexed by member ID, user ID, email and
+username. The member list, the assignee picker's prefix search and the assignedTo check of
+issue updates are answered from the directory, so opening an assign menu never waits on Sentry.
+A member list cut short by a pagination cap is not loaded; the directory keeps its previous
+members rather than rejecting the missing ones as unknown assignees.
+
+Usage:
+    The refresh thread is started once per process by wsgi.py/asgi.py:
+        from .views import member_directory
+        member_directory.start_refresh()
+
+    GET /api/sentry/members/search/?q=ali&limit=10&organization=acme
+
+    Lookups:
+        member_directory.directory_for("acme").lookup("alice@example.com")
+        member_directory.validate_assignee({"assignedTo": "user:42"}, ["1234"])
+
+Search:
+    q matches the start of a member's email, username, full name or any word of their name,
+    ignoring case. Results are ordered by name; without q the first members by name are
+    returned. organization selects the directory (default: fanout.default_organization()). Until
+    the first refresh completes a directory is empty, so searches return no members and
+    /api/sentry/members/ is still proxied to Sentry.
+
+Functions:
+    MemberDirectory             - Member list with ID/email/username indexes and a sorted prefix index
+    directory_for(organization) - Directory of an organization
+    fetch_members(organization) - Every member of an organization; raises ValueError when the
+                                  list was cut short by a pagination cap
+    refresh()                   - Reload the directory of every organization from Sentry
+    validate_assignee(data, issue_ids) - Raise ValueError when assignedTo names no member of the
+                                  organization of an issue
+    start_refresh()             - Start the background refresh thread (idempotent)
+    stop_refresh()              - Stop the background refresh thread
+    get_member_search()         - Endpoint for prefix search
+
+Configuration:
+    MEMBER_DIRECTORY_ENABLED          - Start the refresh thread with the server process
+    MEMBER_DIRECTORY_REFRESH_INTERVAL - Seconds between refreshes
+    MEMBER_DIRECTORY_SEARCH_LIMIT     - Maximum number of search results
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from . import codec, fanout, projection, rate_limit, sentry
+from .pagination import fetch_all_pages, truncated
+
+def display_name(member):
+    return member.get("name") or (member.get("user") or {}).get("name") or member.get("email") or ""
+
+def member_keys(member):
+    '''
+        Lowercase search keys of a member: email, username, full name and each word of the name
+    '''
+    user = member.get("user") or {}
+    name = display_name(member).lower()
+    keys = {name, *name.split(), (member.get("email") or "").lower(), (user.get("email") or "").lower(), (user.get("username") or "").lower()}
+    keys.discard("")
+    return keys
+
+class MemberDirectory:
+    '''
+        Organization members sorted by name, with exact-match indexes and a sorted list of
+        (search key, position) pairs for prefix search. load() builds new indexes and swaps them
+        in under the lock, so readers always see one complete snapshot.
+    '''
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.members = []
+        self.by_id = {}
+        self.by_user_id = {}
+        self.by_email = {}
+        self.by_username = {}
+        self.prefixes = []
+        self.refreshed_at = None
+
+    @property
+    def loaded(self):
+        return self.refreshed_at is not None
+
+    def load(self, members, now=None):
+        members = sorted(members, key=lambda member: (display_name(member).lower(), str(member.get("id"))))
+        by_id, by_user_id, by_email, by_username = {}, {}, {}, {}
+        for member in members:
+            user = member.get("user") or {}
+            by_id[str(member.get("id"))] = member
+            if user.get("id") is not None:
+                by_user_id[str(user["id"])] = member
+            for email in (member.get("email"), user.get("email")):
+                if email:
+                    by_email[email.lower()] = member
+            if user.get("username"):
+                by_username[user["username"].lower()] = member
+        prefixes = sorted((key, position) for position, member in enumerate(members) for key in member_keys(member))
+        with self.lock:
+            self.members = members
+            self.by_id, self.by_user_id, self.by_email, self.by_username = by_id, by_user_id, by_email, by_username
+            self.prefixes = prefixes
+            self.refreshed_at = now or time.time()
+
+    def lookup(self, value):
+        '''
+            Returns the member an assignee value refers to, or None. Accepts "user:<user ID>", a
+            user or member ID, an email or a username, as Sentry's assignedTo does.
+        '''
+        value = str(value).strip()
+        kind, separator, identifier = value.partition(":")
+        with self.lock:
+            if separator and kind == "user":
+                return self.by_user_id.get(identifier)
+            return self.by_user_id.get(value) or self.by_id.get(value) or self.by_email.get(value.lower()) or self.by_username.get(value.lower())
+
+    def search(self, prefix, limit):
+        prefix = prefix.strip().lower()
+        with self.lock:
+            members, prefixes = self.members, self.prefixes
+        if not prefix:
+            return members[:limit]
+        positions = set()
+        index = bisect_left(prefixes, (prefix,))
+        while index < len(prefixes) and prefixes[index][0].startswith(prefix):
+            positions.add(prefixes[index][1])
+            index += 1
+        return [members[position] for position in sorted(positions)[:limit]]
+
+directories = {}
+_directories_lock = threading.Lock()
+
+def organizations():
+    return list(dict.fromkeys([fanout.default_organization(), *(project["organization"] for project in settings.SENTRY_PROJECTS)]))
+
+def directory_for(organization=None):
+    with _directories_lock:
+        return directories.setdefault(organization or fanout.default_organization(), MemberDirectory())
+
+def selected_organization(params):
+    '''
+        Returns the organization of a member request. Raises ValueError for organizations that
+        are not configured.
+    '''
+    organization = params.get("organization") or fanout.default_organization()
+    if organization not in organizations():
+        raise ValueError(f"Unknown organization \"{organization}\" (configured: {", ".join(organizations())})")
+    return organization
+
+def fetch_members(organization):
+    members = fetch_all_pages(sentry.members_request(organization))
+    if truncated(members):
+        raise ValueError(f"The member list of \"{organization}\" was cut short by a pagination cap ({len(members)} members)")
+    return members
+
+def refresh():
+    # Organizations are loaded concurrently; one failing organization does not hold back the others
+    names = organizations()
+    results = fanout.fan_out(fetch_members, names)
+    for organization, (members, exception) in zip(names, results):
+        if exception is None:
+            directory_for(organization).load(members)
+    errors = [exception for _, exception in results if exception is not None]
+    if errors:
+        raise errors[0]
+
+def validate_assignee(data, issue_ids):
+    '''
+        Raises ValueError when data assigns issues to a user who is not a member of the
+        organization of one of the issues. Unassigning, team assignments and organizations
+        whose directory has not loaded yet are passed to Sentry unchecked.
+    '''
+    if not isinstance(data, dict) or not data.get("assignedTo"):
+        return
+    assignee = str(data["assignedTo"])
+    if assignee.startswith("team:"):
+        return
+    for organization in dict.fromkeys(fanout.organization_of(issue_id) for issue_id in issue_ids):
+        directory = directory_for(organization)
+        if directory.loaded and directory.lookup(assignee) is None:
+            raise ValueError(f"Unknown assignee \"{assignee}\" (not a member of the Sentry organization \"{organization}\")")
+
+def search_params(params):
+    '''
+        Returns the (prefix, limit) of a search request. Raises ValueError for a malformed limit.
+    '''
+    try:
+        limit = int(params.get("limit", settings.MEMBER_DIRECTORY_SEARCH_LIMIT))
+    except ValueError:
+        raise ValueError(f"Invalid limit \"{params.get("limit")}\"")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return params.get("q", ""), min(limit, settings.MEMBER_DIRECTORY_SEARCH_LIMIT)
+
+_refresher = None
+_stopped = threading.Event()
+
+def _refresh_forever():
+    while not _stopped.is_set():
+        started = time.monotonic()
+        try:
+            with rate_limit.priority("background"):
+                refresh()
+        except Exception as exception:
+            print(f"Member directory refresh failed: {exception}")
+        _stopped.wait(max(0, settings.MEMBER_DIRECTORY_REFRESH_INTERVAL - (time.monotonic() - started)))
+
+def start_refresh():
+    global _refresher
+    if not settings.MEMBER_DIRECTORY_ENABLED or (_refresher is not None and _refresher.is_alive()):
+        return
+    _stopped.clear()
+    _refresher = threading.Thread(target=_refresh_forever, name="member-directory", daemon=True)
+    _refresher.start()
+
+def stop_refresh():
+    _stopped.set()
+
+@api_view(["GET"])
+def get_member_search(request, **kwargs):
+    '''
+        Endpoint to search organization members by prefix for the assignee picker
+        Answered from the member directory without calling Sentry; accepts fields= like
+        /api/sentry/members/.
+    '''
+    try:
+        prefix, limit = search_params(request.query_params)
+        organization = selected_organization(request.query_params)
+        fields = projection.projection(request.query_params, "get_organization_members")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(projection.project(directory_for(organization).search(prefix, limit), fields), headers={"Cache-Control": "no-cache"})
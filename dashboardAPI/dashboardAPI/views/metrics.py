@@ -0,0 +1,81 @@
+"""
+Prometheus Metrics Endpoint Module
+
+This module exports the process-wide metrics collected by instrumentation.py, together with the
+state of the singleflight groups and the vendor rate limit buckets, in the Prometheus text
+exposition format. Each server process keeps its own metrics; scrape every process.
+
+Usage:
+    GET /api/metrics/
+
+    scrape_configs:
+      - job_name: dashboard-api
+        metrics_path: /api/metrics/
+        static_configs:
+          - targets: ["backend:8000"]
+
+Metrics:
+    dashboard_request_duration_seconds       - Histogram of request time by route, method and status
+    dashboard_response_bytes_total           - Response body bytes by route
+    dashboard_upstream_duration_seconds      - Histogram of upstream call time by vendor, method and status
+    dashboard_upstream_response_bytes_total  - Upstream response body bytes by vendor
+    dashboard_upstream_retries_total         - Upstream retries by vendor
+    dashboard_phase_duration_seconds         - Histogram of request phases (e.g. serialize)
+    dashboard_cache_lookups_total            - Response cache lookups by view and X-Cache status
+    dashboard_singleflight_calls_total       - Calls made through each singleflight group
+    dashboard_singleflight_deduplicated_total - Calls served by another caller's in-flight call
+    dashboard_rate_limit_remaining           - Remaining budget of each vendor rate limit bucket
+    dashboard_rate_limit_throttled_total     - Calls refused by each vendor rate limit bucket
+
+Functions:
+    format_sample(name, labels, value) - Formats one sample line
+    collect()                          - Returns every metric family as (name, help, kind, samples)
+    render()                           - Returns the exposition document
+    get_metrics()                      - Endpoint serving the exposition document
+"""
+
+from django.http import HttpResponse
+from rest_framework.decorators import api_view
+
+from . import instrumentation, rate_limit, singleflight
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+
+def format_sample(name, labels, value):
+    rendered = ",".join(f"{key}=\"{escape(label)}\"" for key, label in labels.items())
+    return f"{name}{{{rendered}}} {value}" if labels else f"{name} {value}"
+
+def collect():
+    families = [(metric.name, metric.help, metric.kind, metric.samples()) for metric in instrumentation.registry]
+    groups = singleflight.metrics()
+    families.append(("dashboard_singleflight_calls_total", "Calls made through each singleflight group", "counter",
+                     [("dashboard_singleflight_calls_total", {"group": name}, group["calls"]) for name, group in groups.items()]))
+    families.append(("dashboard_singleflight_deduplicated_total", "Calls served by another caller's in-flight call", "counter",
+                     [("dashboard_singleflight_deduplicated_total", {"group": name}, group["deduplicated"]) for name, group in groups.items()]))
+    buckets = rate_limit.snapshot()
+    families.append(("dashboard_rate_limit_remaining", "Remaining budget of each vendor rate limit bucket", "gauge",
+                     [("dashboard_rate_limit_remaining", {"vendor": bucket["vendor"], "scope": bucket["scope"]}, bucket["remaining"])
+                      for bucket in buckets if bucket["remaining"] is not None]))
+    families.append(("dashboard_rate_limit_throttled_total", "Calls refused by each vendor rate limit bucket", "counter",
+                     [("dashboard_rate_limit_throttled_total", {"vendor": bucket["vendor"], "scope": bucket["scope"]}, bucket["throttled"])
+                      for bucket in buckets]))
+    return families
+
+def render():
+    lines = []
+    for name, help, kind, samples in collect():
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(format_sample(*sample) for sample in samples)
+    return "\n".join(lines) + "\n"
+
+@api_view(["GET"])
+def get_metrics(request, **kwargs):
+    '''
+        Endpoint to scrape request, upstream, cache and rate limit metrics in the Prometheus
+        text format
+    '''
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
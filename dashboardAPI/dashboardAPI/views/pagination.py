@@ -0,0 +1,434 @@
+"""
+Pagination Module for DashboardAPI Views
+
+This module follows the cursors Sentry returns in the Link header of its list endpoints, so
+issue, event and member lists are complete instead of stopping at the first page. It also
+follows the pagination.next tokens of Mailgun's analytics logs, for exports. Pages can
+either be collected into a single list (used by the buffered, cached views) or streamed to the
+client as they arrive, keeping memory bounded and time-to-first-byte independent of the total
+number of pages. Pages are requested through singleflight.send, so identical concurrent page
+requests share one upstream call.
+
+Usage:
+    Buffered (through make_request/fetch_cached_json):
+        Views listed in paginated_views are fetched with fetch_raw_pages automatically (or with
+        fetch_all_pages when the items are projected to a field list).
+
+    Streamed:
+        return stream_pages(issues_request(), "ndjson")
+        return stream_token_pages(logs_request(data), format_item, "text/csv", header)
+
+Streaming Formats:
+    json   - A single JSON array written element by element (application/json)
+    ndjson - One JSON document per line (application/x-ndjson)
+
+    If the upstream fails after streaming has started, a final {"error": "..."} element is
+    written and the stream is closed.
+
+Truncation:
+    Lists stopped by a page or item cap before their end are never passed off as complete.
+    Streams end with an {"error": "... cap reached ..."} element, buffered responses carry an
+    X-Pagination-Truncated: true header, and fetch_all_pages returns a PageItems list whose
+    truncated flag internal callers check before treating the list as complete.
+
+Functions:
+    iter_pages(request)              - Yields pages of a Sentry list endpoint, following cursors
+    fetch_all_pages(request, fields) - Returns every item of a Sentry list endpoint as one PageItems list
+    fetch_raw_pages(request)         - Returns every item of a Sentry list endpoint as one RawJSON array,
+                                       joining the upstream page bodies instead of encoding the items
+    truncated(items)                 - Whether a list from fetch_all_pages was stopped by a cap
+    stream_pages(request, format, fields) - Streams every item of a Sentry list endpoint to the client
+                                       (fields: optional field tree each page is projected to, see
+                                       projection.py)
+    stream_merged(iterators, format, key, fields) - Streams item iterators of several Sentry lists as
+                                       one list, k-way merged by key (see fanout.py)
+    iter_items(request)              - Yields the items of a Sentry list endpoint one by one
+    iter_token_pages(request)        - Yields the item lists of a Mailgun analytics endpoint, following tokens
+    stream_token_pages(request, ...) - Streams every Mailgun item, formatted one by one, to the client
+    aiter_pages, afetch_all_pages, astream_pages - Async counterparts used by the ASGI views
+    afetch_raw_pages                             - Async counterpart of fetch_raw_pages
+    aiter_items, astream_merged                  - Async counterparts of the merged streams
+    aiter_token_pages, astream_token_pages       - Async counterparts of the Mailgun token pagination
+
+Configuration:
+    paginated_views                - Views whose upstream responses are cursor paginated
+    SENTRY_PAGINATION_MAX_PAGES    - Maximum number of pages followed per request
+    SENTRY_PAGINATION_MAX_ITEMS    - Maximum number of items returned per request
+    MAILGUN_EXPORT_MAX_PAGES       - Maximum number of Mailgun pages followed per export
+"""
+
+import heapq
+
+from django.conf import settings
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+
+from . import codec, projection, rate_limit
+from .codec import RawJSON
+from .singleflight import asend, send
+
+paginated_views = (
+    "get_issues",
+    "get_events",
+    "get_issue_events",
+    "get_organization_members",
+)
+
+stream_formats = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+truncated_header = "X-Pagination-Truncated"
+
+class PageItems(list):
+    '''
+        Items of a paginated list; truncated is set when a page or item cap stopped the
+        pagination before the end of the list
+    '''
+    truncated = False
+
+class TruncationMarker(dict):
+    '''
+        The {"error": ...} item ending a list stopped by a cap. Streams write it after the last
+        item; fetch_all_pages drops it and sets PageItems.truncated instead.
+    '''
+
+def truncated(items):
+    return getattr(items, "truncated", False)
+
+def _truncation_page(uri, cap, setting, limit):
+    print(f"Pagination of {uri} stopped at the {cap} cap ({limit})")
+    return [TruncationMarker(error=f"{cap} cap reached ({setting}={limit})")]
+
+def _is_truncation_page(page):
+    return len(page) == 1 and isinstance(page[0], TruncationMarker)
+
+def _project_page(page, fields):
+    return page if _is_truncation_page(page) else projection.project(page, fields)
+
+def _project_item(item, fields):
+    return item if isinstance(item, TruncationMarker) else projection.project(item, fields)
+
+def iter_pages(request):
+    for page, _ in _iter_page_bodies(request):
+        yield page
+
+def _iter_page_bodies(request):
+    '''
+        Yields (page, body) for each page of a Sentry list endpoint, following cursors. body is
+        the JSON array as the upstream sent it, encoded again only for a page cut by the item
+        cap, and None for the truncation page.
+    '''
+    max_pages = settings.SENTRY_PAGINATION_MAX_PAGES
+    max_items = settings.SENTRY_PAGINATION_MAX_ITEMS
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in ("method", "uri", "params")}
+    query = dict(request.get("params") or {})
+    item_count = 0
+    for _ in range(max_pages):
+        response = send(method, uri, params=dict(query), **params)
+        response.raise_for_status()
+        page = codec.loads(response.content)
+        if item_count + len(page) >= max_items:
+            kept = page[:max_items - item_count]
+            yield kept, response.content if len(kept) == len(page) else codec.dumps(kept)
+            if item_count + len(page) > max_items or _next_cursor(response):
+                yield _truncation_page(uri, "item", "SENTRY_PAGINATION_MAX_ITEMS", max_items), None
+            return
+        item_count += len(page)
+        yield page, response.content
+        cursor = _next_cursor(response)
+        if cursor is None:
+            return
+        query["cursor"] = cursor
+    yield _truncation_page(uri, "page", "SENTRY_PAGINATION_MAX_PAGES", max_pages), None
+
+def _next_cursor(response):
+    next_link = response.links.get("next")
+    if next_link is None or next_link.get("results") != "true":
+        return None
+    return next_link.get("cursor")
+
+def fetch_all_pages(request, fields=None):
+    # Each page is projected as it arrives, so only the kept fields of earlier pages are held
+    items = PageItems()
+    for page in iter_pages(request):
+        _collect_page(items, page, fields)
+    return items
+
+def fetch_raw_pages(request):
+    '''
+        Returns every item of a Sentry list endpoint as one RawJSON array made of the upstream
+        page bodies, so the items are not encoded again. Pages are still decoded to count them
+        against the caps; the decoded items are kept as the payload's .data.
+    '''
+    items, bodies = PageItems(), []
+    for page, body in _iter_page_bodies(request):
+        _collect_page(items, page, None)
+        if body is not None:
+            bodies.append(body)
+    return RawJSON.from_arrays(bodies, items, truncated(items))
+
+def _collect_page(items, page, fields):
+    if _is_truncation_page(page):
+        items.truncated = True
+    else:
+        items.extend(projection.project(page, fields))
+
+def invalid_format(format):
+    return HttpResponseBadRequest(f"Invalid stream format \"{format}\" (only {", ".join(stream_formats)} are allowed)")
+
+def stream_pages(request, format, fields=None):
+    if format not in stream_formats:
+        return invalid_format(format)
+    pages = (_project_page(page, fields) for page in iter_pages(request))
+    try:
+        # Fetch the first page eagerly so upstream errors still produce an error status
+        first_page = next(pages, [])
+    except Exception as exception:
+        error_message = f"Request error on {request.get("method")} request to {request.get("uri")}: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    writer = _write_ndjson if format == "ndjson" else _write_json_array
+    return StreamingHttpResponse(writer(_chain_pages(first_page, pages)), content_type=stream_formats[format])
+
+def iter_items(request):
+    for page in iter_pages(request):
+        yield from page
+
+def stream_merged(iterators, format, key, fields=None):
+    '''
+        Streams item iterators, each ordered by key from largest to smallest, as one list merged
+        with a k-way merge. Items are projected after merging, so key sees every field; the
+        next page of a list is only fetched once the merge reaches it.
+    '''
+    if format not in stream_formats:
+        return invalid_format(format)
+    merged = (_project_item(item, fields) for item in heapq.merge(*iterators, key=key, reverse=True))
+    writer = _write_ndjson if format == "ndjson" else _write_json_array
+    return StreamingHttpResponse(writer(_guard(merged)), content_type=stream_formats[format])
+
+def iter_token_pages(request):
+    '''
+        Yields the item lists of a Mailgun analytics endpoint (e.g. logs), following the
+        pagination.next token of each response. Only one page is held in memory at a time. When
+        the page cap cuts the export short, a last {"error": ...} item says so.
+    '''
+    max_pages = settings.MAILGUN_EXPORT_MAX_PAGES
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in ("method", "uri", "json")}
+    body = dict(request.get("json") or {})
+    pagination = dict(body.get("pagination") or {})
+    for _ in range(max_pages):
+        response = send(method, uri, json={**body, "pagination": pagination}, **params)
+        response.raise_for_status()
+        page = codec.loads(response.content)
+        items = page.get("items") or []
+        yield items
+        token = (page.get("pagination") or {}).get("next")
+        if not items or not token:
+            return
+        pagination = {**pagination, "token": token}
+    yield _truncation_page(uri, "page", "MAILGUN_EXPORT_MAX_PAGES", max_pages)
+
+def stream_token_pages(request, format_item, content_type, header=None):
+    '''
+        Streams every item of a Mailgun analytics endpoint as format_item(item) strings, after an
+        optional header. Upstream errors on the first page produce an error status.
+    '''
+    pages = iter_token_pages(request)
+    try:
+        first_page = next(pages, [])
+    except Exception as exception:
+        error_message = f"Request error on {request.get("method")} request to {request.get("uri")}: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    return StreamingHttpResponse(_write_items(header, format_item, _chain_pages(first_page, pages)), content_type=content_type)
+
+async def aiter_pages(request):
+    async for page, _ in _aiter_page_bodies(request):
+        yield page
+
+async def _aiter_page_bodies(request):
+    max_pages = settings.SENTRY_PAGINATION_MAX_PAGES
+    max_items = settings.SENTRY_PAGINATION_MAX_ITEMS
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in ("method", "uri", "params")}
+    query = dict(request.get("params") or {})
+    item_count = 0
+    for _ in range(max_pages):
+        response = await asend(method, uri, params=dict(query), **params)
+        response.raise_for_status()
+        page = codec.loads(response.content)
+        if item_count + len(page) >= max_items:
+            kept = page[:max_items - item_count]
+            yield kept, response.content if len(kept) == len(page) else codec.dumps(kept)
+            if item_count + len(page) > max_items or _next_cursor(response):
+                yield _truncation_page(uri, "item", "SENTRY_PAGINATION_MAX_ITEMS", max_items), None
+            return
+        item_count += len(page)
+        yield page, response.content
+        cursor = _next_cursor(response)
+        if cursor is None:
+            return
+        query["cursor"] = cursor
+    yield _truncation_page(uri, "page", "SENTRY_PAGINATION_MAX_PAGES", max_pages), None
+
+async def afetch_all_pages(request, fields=None):
+    items = PageItems()
+    async for page in aiter_pages(request):
+        _collect_page(items, page, fields)
+    return items
+
+async def afetch_raw_pages(request):
+    items, bodies = PageItems(), []
+    async for page, body in _aiter_page_bodies(request):
+        _collect_page(items, page, None)
+        if body is not None:
+            bodies.append(body)
+    return RawJSON.from_arrays(bodies, items, truncated(items))
+
+async def astream_pages(request, format, fields=None):
+    if format not in stream_formats:
+        return invalid_format(format)
+    pages = (_project_page(page, fields) async for page in aiter_pages(request))
+    try:
+        first_page = await anext(pages, [])
+    except Exception as exception:
+        error_message = f"Request error on {request.get("method")} request to {request.get("uri")}: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    writer = _awrite_ndjson if format == "ndjson" else _awrite_json_array
+    return StreamingHttpResponse(writer(_achain_pages(first_page, pages)), content_type=stream_formats[format])
+
+async def aiter_items(request):
+    async for page in aiter_pages(request):
+        for item in page:
+            yield item
+
+def astream_merged(iterators, format, key, fields=None):
+    if format not in stream_formats:
+        return invalid_format(format)
+    merged = _amerge(iterators, key, fields)
+    writer = _awrite_ndjson if format == "ndjson" else _awrite_json_array
+    return StreamingHttpResponse(writer(_aguard(merged)), content_type=stream_formats[format])
+
+async def aiter_token_pages(request):
+    max_pages = settings.MAILGUN_EXPORT_MAX_PAGES
+    uri = request.get("uri")
+    method = request.get("method")
+    params = {key: value for key, value in request.items() if key not in ("method", "uri", "json")}
+    body = dict(request.get("json") or {})
+    pagination = dict(body.get("pagination") or {})
+    for _ in range(max_pages):
+        response = await asend(method, uri, json={**body, "pagination": pagination}, **params)
+        response.raise_for_status()
+        page = codec.loads(response.content)
+        items = page.get("items") or []
+        yield items
+        token = (page.get("pagination") or {}).get("next")
+        if not items or not token:
+            return
+        pagination = {**pagination, "token": token}
+    yield _truncation_page(uri, "page", "MAILGUN_EXPORT_MAX_PAGES", max_pages)
+
+async def astream_token_pages(request, format_item, content_type, header=None):
+    pages = aiter_token_pages(request)
+    try:
+        first_page = await anext(pages, [])
+    except Exception as exception:
+        error_message = f"Request error on {request.get("method")} request to {request.get("uri")}: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    return StreamingHttpResponse(_awrite_items(header, format_item, _achain_pages(first_page, pages)), content_type=content_type)
+
+def _chain_pages(first_page, pages):
+    yield from first_page
+    try:
+        for page in pages:
+            yield from page
+    except Exception as exception:
+        print(f"Streaming pagination failed: {exception}")
+        yield {"error": str(exception)}
+
+def _guard(items):
+    try:
+        yield from items
+    except Exception as exception:
+        print(f"Streaming pagination failed: {exception}")
+        yield {"error": str(exception)}
+
+def _write_ndjson(items):
+    for item in items:
+        yield codec.dumps(item) + b"\n"
+
+def _write_json_array(items):
+    yield b"["
+    separator = b""
+    for item in items:
+        yield separator + codec.dumps(item)
+        separator = b","
+    yield b"]"
+
+def _write_items(header, format_item, items):
+    if header:
+        yield header
+    for item in items:
+        yield format_item(item)
+
+async def _achain_pages(first_page, pages):
+    for item in first_page:
+        yield item
+    try:
+        async for page in pages:
+            for item in page:
+                yield item
+    except Exception as exception:
+        print(f"Streaming pagination failed: {exception}")
+        yield {"error": str(exception)}
+
+async def _amerge(iterators, key, fields):
+    # heapq.merge cannot await, so the async merge keeps its own heap of (-key, list index, item)
+    heap = []
+    for index, iterator in enumerate(iterators):
+        item = await anext(iterator, None)
+        if item is not None:
+            heap.append((-key(item), index, item))
+    heapq.heapify(heap)
+    while heap:
+        _, index, item = heap[0]
+        yield _project_item(item, fields)
+        following = await anext(iterators[index], None)
+        if following is None:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (-key(following), index, following))
+
+async def _aguard(items):
+    try:
+        async for item in items:
+            yield item
+    except Exception as exception:
+        print(f"Streaming pagination failed: {exception}")
+        yield {"error": str(exception)}
+
+async def _awrite_ndjson(items):
+    async for item in items:
+        yield codec.dumps(item) + b"\n"
+
+async def _awrite_json_array(items):
+    yield b"["
+    separator = b""
+    async for item in items:
+        yield separator + codec.dumps(item)
+        separator = b","
+    yield b"]"
+
+async def _awrite_items(header, format_item, items):
+    if header:
+        yield header
+    async for item in items:
+        yield format_item(item)
@@ -0,0 +1,117 @@
+"""
+Field Projection Module for DashboardAPI Views
+
+This module implements the fields= parameter of the Sentry and Mailgun list endpoints. Sentry
+events carry their full entries, contexts, tags and breadcrumbs, and issues and Mailgun log
+entries are similarly verbose, while the dashboard reads a handful of fields of each. With
+fields=, every other field is stripped on the server: page by page as Sentry pages arrive (so
+the full list is never held, cached or streamed), and before caching for Mailgun lists.
+
+Usage:
+    GET /api/sentry/issues/?fields=list
+    GET /api/sentry/issues/{issue_id}/events/?fields=chart&stream=ndjson
+    GET /api/sentry/events/?fields=id,dateCreated,metadata.type
+    PUT /api/mailgun/logs/?fields=chart
+
+    fields takes a comma separated list of field names and preset names (see field_presets).
+    Nested fields are selected with dotted paths (metadata.type); a path through a list
+    applies to each of its elements (user.name of every member). Fields missing from an item
+    are left out rather than set to null. Projected responses are cached separately from full
+    ones.
+
+Functions:
+    projection(params, view)        - Field tree selected by the fields parameter, or None
+    field_tree(paths)               - Field tree of dotted field paths
+    project(value, tree)            - Copy of an item (or list of items) with only the fields of tree
+    project_document(data, tree)    - Projects the items of a list response (a list, or {"items": [...]})
+
+Configuration:
+    field_presets       - Dictionary mapping item kinds to their named field lists
+    projected_views     - Dictionary mapping views that accept fields= to the kind of their items
+"""
+
+field_presets = {
+    "issue": {
+        "chart": ("id", "level", "type", "metadata.type", "firstSeen", "lastSeen", "count"),
+        "list": (
+            "id", "shortId", "title", "culprit", "level", "status", "type", "metadata.type", "metadata.value",
+            "count", "userCount", "firstSeen", "lastSeen", "permalink", "assignedTo", "platform", "project.slug",
+        ),
+    },
+    "event": {
+        "chart": ("id", "eventID", "groupID", "dateCreated"),
+        "list": ("id", "eventID", "groupID", "dateCreated", "title", "message", "culprit", "location", "platform", "event.type", "tags", "user"),
+    },
+    "member": {
+        "list": ("id", "name", "email", "user.id", "user.name", "user.email", "user.username"),
+    },
+    "log": {
+        "chart": ("id", "@timestamp", "timestamp", "event", "severity"),
+        "list": (
+            "id", "@timestamp", "timestamp", "event", "severity", "reason", "recipient", "recipient-domain",
+            "message.headers.subject", "delivery-status.code", "delivery-status.message", "description",
+        ),
+    },
+    "list member": {
+        "list": ("address", "name", "subscribed", "vars"),
+    },
+}
+
+projected_views = {
+    # Sentry:
+    "get_issues": "issue",
+    "get_events": "event",
+    "get_issue_events": "event",
+    "get_organization_members": "member",
+
+    # Mailgun:
+    "get_logs": "log",
+    "get_mailing_list_members": "list member",
+}
+
+def field_tree(paths):
+    '''
+        Returns the nested dictionary of the dotted paths; None marks a field kept whole, so
+        "metadata" wins over "metadata.type".
+    '''
+    tree = {}
+    for path in paths:
+        *parents, name = path.split(".")
+        node = tree
+        for parent in parents:
+            if node.get(parent, {}) is None:
+                break
+            node = node.setdefault(parent, {})
+        else:
+            node[name] = None
+    return tree
+
+def projection(params, view):
+    '''
+        Returns the field tree of the fields query parameter for view, or None when no
+        projection was requested. Raises ValueError for an empty field list.
+    '''
+    value = params.get("fields")
+    if value is None:
+        return None
+    presets = field_presets[projected_views[view]]
+    paths = [path for name in value.split(",") if name.strip() for path in presets.get(name.strip(), (name.strip(),))]
+    if not paths:
+        raise ValueError(f"fields must list field names or presets ({", ".join(presets)})")
+    return field_tree(paths)
+
+def project(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+def project_document(data, tree):
+    if tree is None:
+        return data
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        return {**data, "items": project(data["items"], tree)}
+    return project(data, tree)
@@ -0,0 +1,300 @@
+"""
+Upstream Rate Limit Scheduler Module
+
+This module keeps a token bucket per vendor rate limit and schedules every upstream call against
+it, so a burst of dashboard traffic cannot spend the whole Sentry or Mailgun budget. Buckets
+are learned from response headers: X-Sentry-Rate-Limit-Limit/Remaining/Reset (one bucket per
+Sentry endpoint and project), X-RateLimit-Limit/Remaining/Reset (one bucket per Mailgun account) and
+Retry-After on 429 responses, which blocks the bucket until the given time. Until a vendor has
+reported its limits, calls are not held back.
+
+Calls are scheduled by priority:
+    - interactive: mutations such as update_issue_status; may spend the whole budget and wait
+      up to RATE_LIMIT_INTERACTIVE_WAIT seconds for a token
+    - normal: reads made for a client request; leave RATE_LIMIT_READ_RESERVE of the budget to
+      interactive calls and wait up to RATE_LIMIT_READ_WAIT seconds
+    - background: health probes, ingest, live polling and cache refreshes; leave
+      RATE_LIMIT_BACKGROUND_RESERVE of the budget to the others and never wait
+A call that cannot get a token in time raises RateLimited. The response cache then serves the
+last cached response (X-Cache: LIMITED), and otherwise the client receives 429 Too Many Requests
+with a Retry-After header instead of a generic 400.
+
+Usage:
+    upstream.send and async_upstream.asend schedule every call:
+        bucket = rate_limit.acquire(method, uri)          # or await rate_limit.aacquire(...)
+        response = session.request(method, uri)
+        rate_limit.observe(bucket, response)
+
+    Background work marks its calls:
+        with rate_limit.priority("background"):
+            run_probes()
+
+Functions:
+    TokenBucket                  - Budget of one vendor rate limit, refilled until its reset time
+    RateLimited                  - Raised when a call cannot get a token in time
+    priority(name)               - Context manager setting the priority of the calls made inside it
+    vendor_of(uri)               - Vendor (and its base URI) of an upstream URI
+    acquire(method, uri)         - Waits for a token of the bucket of uri; returns the bucket
+    aacquire(method, uri)        - Async acquire
+    observe(bucket, response)    - Updates a bucket from the headers of an upstream response
+    retry_after(exception)       - Seconds to wait when exception is a rate limit, else None
+    error_response(message, exception) - 429 with Retry-After for rate limits, else 400
+    snapshot()                   - State of every known bucket
+
+Configuration:
+    rate_limit_vendors           - Dictionary mapping vendors to their base URI, bucket scope and headers
+    rate_limit_priorities        - Dictionary mapping priorities to their budget reserve and wait
+    RATE_LIMIT_ENABLED           - Turns scheduling on or off (headers are still recorded)
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import math
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest
+
+rate_limit_vendors = {
+    "sentry": {
+        "base_uri": lambda: settings.SENTRY_BASE_URI,
+        # Sentry limits each API endpoint separately
+        "scope": "endpoint",
+        "headers": ("X-Sentry-Rate-Limit-Limit", "X-Sentry-Rate-Limit-Remaining", "X-Sentry-Rate-Limit-Reset"),
+    },
+    "mailgun": {
+        "base_uri": lambda: settings.MAILGUN_BASE_URI,
+        "scope": "vendor",
+        "headers": ("X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"),
+    },
+}
+
+# (reserve, wait): the fraction of the budget a call must leave untouched, and the seconds it may wait for a token
+rate_limit_priorities = {
+    "interactive": lambda: (0.0, settings.RATE_LIMIT_INTERACTIVE_WAIT),
+    "normal": lambda: (settings.RATE_LIMIT_READ_RESERVE, settings.RATE_LIMIT_READ_WAIT),
+    "background": lambda: (settings.RATE_LIMIT_BACKGROUND_RESERVE, 0),
+}
+
+mutating_methods = ("PUT", "PATCH", "DELETE")
+
+_priority = contextvars.ContextVar("rate_limit_priority", default=None)
+
+class RateLimited(Exception):
+    def __init__(self, bucket, retry_after):
+        self.bucket = bucket
+        self.retry_after = retry_after
+        super().__init__(f"{bucket.vendor.capitalize()} rate limit budget exhausted for {bucket.scope} (retry in {math.ceil(retry_after)}s)")
+
+class TokenBucket:
+    '''
+        Budget of one vendor rate limit. The vendor reports the remaining calls and when the
+        window resets; tokens refill at the rate that makes the bucket full at that time.
+    '''
+    def __init__(self, vendor, scope):
+        self.vendor = vendor
+        self.scope = scope
+        self.capacity = None
+        self.tokens = None
+        self.rate = 0
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.capacity is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, reserve):
+        '''
+            Takes a token unless that would leave less than reserve of the capacity. Returns 0
+            on success, otherwise the seconds until a token is expected.
+        '''
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.capacity is None:
+                return 0
+            floor = reserve * self.capacity
+            if self.tokens - 1 >= floor:
+                self.tokens -= 1
+                return 0
+            return (floor + 1 - self.tokens) / self.rate if self.rate else math.inf
+
+    def update(self, limit=None, remaining=None, reset=None, retry_after=None):
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None:
+                self.capacity = max(limit, 1)
+                self.tokens = self.capacity if self.tokens is None else min(self.tokens, self.capacity)
+            if remaining is not None and self.capacity is not None:
+                self.tokens = min(remaining, self.capacity)
+            if reset is not None and self.capacity is not None:
+                self.rate = (self.capacity - self.tokens) / max(reset - time.time(), 1e-3) or self.capacity
+            elif self.capacity is not None and not self.rate:
+                self.rate = self.capacity
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+                if self.capacity is not None:
+                    self.tokens = 0
+
+    def state(self):
+        with self.lock:
+            self._refill(time.monotonic())
+            return {
+                "vendor": self.vendor,
+                "scope": self.scope,
+                "limit": self.capacity,
+                "remaining": None if self.tokens is None else math.floor(self.tokens),
+                "blocked_for": round(max(0, self.blocked_until - time.monotonic()), 3),
+                "throttled": self.throttled,
+            }
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+@contextlib.contextmanager
+def priority(name):
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority(method):
+    explicit = _priority.get()
+    if explicit is not None:
+        return explicit
+    return "interactive" if method.upper() in mutating_methods else "normal"
+
+def endpoint_scope(method, path):
+    # Numeric path segments (issue IDs) share the bucket of their endpoint, but each project keeps
+    # its own buckets, so one busy project cannot use up the budget of the others (see fanout.py)
+    project, rest = re.match(r"(/projects/[^/]+/[^/]+)?(.*)", path).groups()
+    return f"{method.upper()} {project or ""}{re.sub(r"/\d+(?=/|$)", "/{id}", rest)}"
+
+def vendor_of(uri):
+    '''
+        Returns (vendor, base URI) of the vendor API uri belongs to, or (None, None).
+    '''
+    for vendor, config in rate_limit_vendors.items():
+        base_uri = config["base_uri"]().rstrip("/")
+        if uri == base_uri or uri.startswith(base_uri + "/"):
+            return vendor, base_uri
+    return None, None
+
+def get_bucket(method, uri):
+    vendor, base_uri = vendor_of(uri)
+    if vendor is None:
+        return None
+    scope = endpoint_scope(method, uri[len(base_uri):]) if rate_limit_vendors[vendor]["scope"] == "endpoint" else "*"
+    key = (vendor, scope)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(key, TokenBucket(vendor, scope))
+    return bucket
+
+def _schedule(method, uri):
+    '''
+        Yields the seconds to sleep before each new attempt at a token and returns the bucket
+        (None for URIs of no known vendor). Raises RateLimited when the wait would exceed the
+        allowance of the call's priority.
+    '''
+    bucket = get_bucket(method, uri)
+    if bucket is None or not settings.RATE_LIMIT_ENABLED:
+        return bucket
+    reserve, max_wait = rate_limit_priorities[current_priority(method)]()
+    waited = 0
+    while True:
+        wait = bucket.take(reserve)
+        if not wait:
+            return bucket
+        if waited + wait > max_wait:
+            with bucket.lock:
+                bucket.throttled += 1
+            raise RateLimited(bucket, wait)
+        waited += wait
+        yield wait
+
+def acquire(method, uri):
+    schedule = _schedule(method, uri)
+    try:
+        while True:
+            time.sleep(next(schedule))
+    except StopIteration as done:
+        return done.value
+
+async def aacquire(method, uri):
+    schedule = _schedule(method, uri)
+    try:
+        while True:
+            await asyncio.sleep(next(schedule))
+    except StopIteration as done:
+        return done.value
+
+def _number(value):
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def parse_retry_after(value):
+    '''
+        Returns the seconds of a Retry-After header (delay seconds or an HTTP date), or None.
+    '''
+    seconds = _number(value)
+    if seconds is not None:
+        return max(seconds, 0)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+def observe(bucket, response):
+    if bucket is None:
+        return
+    limit, remaining, reset = (_number(response.headers.get(name)) for name in rate_limit_vendors[bucket.vendor]["headers"])
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if response.status_code == 429 and retry_after is None:
+        retry_after = max(reset - time.time(), 1) if reset is not None else 1
+    bucket.update(limit, remaining, reset, retry_after)
+
+def retry_after(exception):
+    if isinstance(exception, RateLimited):
+        return exception.retry_after
+    response = getattr(exception, "response", None)
+    if response is not None and getattr(response, "status_code", None) == 429:
+        seconds = parse_retry_after(response.headers.get("Retry-After"))
+        return 1 if seconds is None else seconds
+    return None
+
+def error_response(error_message, exception):
+    '''
+        Returns 429 Too Many Requests with a Retry-After header when exception comes from a rate
+        limit, and 400 Bad Request (the response of every other upstream error) otherwise.
+    '''
+    seconds = retry_after(exception)
+    if seconds is None:
+        return HttpResponseBadRequest(error_message)
+    response = HttpResponse(error_message, status=429)
+    response["Retry-After"] = str(max(1, math.ceil(seconds)))
+    return response
+
+def snapshot():
+    with _buckets_lock:
+        buckets = list(_buckets.values())
+    return [bucket.state() for bucket in buckets]
+
+def reset():
+    with _buckets_lock:
+        _buckets.clear()
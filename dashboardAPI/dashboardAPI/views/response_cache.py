@@ -0,0 +1,168 @@
+"""
+Upstream Response Cache Module for DashboardAPI Views
+
+This module provides the response cache placed in front of read-only upstream calls made via
+make_request. Responses are stored in Django's configured cache (settings.CACHES) under a key
+built from the upstream URI and the filtered request parameters, so several dashboards asking
+for the same data share one upstream call.
+
+Cache Behaviour:
+    - Fresh: entries younger than the view's TTL are served directly (X-Cache: HIT)
+    - Stale: entries past their TTL but inside the stale window are served immediately while
+      a single background refresh is started (X-Cache: STALE)
+    - Miss: the upstream is called; concurrent identical misses wait on one upstream call
+      instead of each making their own (X-Cache: MISS), via singleflight.py
+    - Rate limited: when the upstream call is refused by the rate limit scheduler (or answered
+      with 429), the last cached response is served even past its stale window, for up to
+      UPSTREAM_CACHE_RATE_LIMIT_GRACE more seconds (X-Cache: LIMITED)
+    - Invalidation: mutating views bump the version of the namespaces they affect, which
+      orphans every cached key in those namespaces
+
+Usage:
+    data, cache_status = fetch_through("get_issues", request, lambda: fetch_json(request))
+
+Functions:
+    fetch_through(view, request, load, fields) - Returns (data, cache status) for a view's upstream request;
+                                          responses projected to fields (see projection.py) are
+                                          cached apart from full ones
+    afetch_through(view, request, load, fields) - Async fetch_through for the ASGI views (load is a coroutine
+                                          function and coalescing happens per event loop)
+    invalidate(view)                   - Invalidates the namespaces affected by a mutating view
+    namespace_version(namespace)       - Current invalidation version of a namespace
+
+Configuration:
+    cache_namespaces             - Dictionary mapping cached views to their invalidation namespace
+    invalidations                - Dictionary mapping mutating views to the namespaces they invalidate
+    UPSTREAM_CACHE_ENABLED       - Turns the response cache on or off
+    UPSTREAM_CACHE_POLICIES      - (ttl, stale) seconds for each cached view
+    UPSTREAM_CACHE_RATE_LIMIT_GRACE - Seconds entries are kept past their stale window for rate limited requests
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import rate_limit, singleflight
+
+cache_namespaces = {
+    # Sentry:
+    "get_issues": "sentry-issues",
+    "get_events": "sentry-events",
+    "get_issue_events": "sentry-issues",
+    "get_organization_members": "sentry-members",
+
+    # Mailgun:
+    "get_queue_status": "mailgun",
+    "get_account_metrics": "mailgun",
+    "get_account_usage_metrics": "mailgun",
+    "get_logs": "mailgun",
+    "get_stat_totals": "mailgun",
+    "get_filtered_grouped_stats": "mailgun",
+    "get_mailing_list_members": "mailgun-lists",
+}
+
+invalidations = {
+    "update_issue_status": ("sentry-issues",),
+}
+
+cache_flights = singleflight.Group("response-cache")
+_background_tasks = set()
+
+def _version_key(namespace):
+    return f"upstream-version:{namespace}"
+
+def _cache_key(view, request, fields=None):
+    namespace = cache_namespaces[view]
+    version = namespace_version(namespace)
+    # Credentials (headers/auth) are deliberately left out of the key
+    identity = {key: request.get(key) for key in ("method", "uri", "params", "json")}
+    if fields is not None:
+        identity["fields"] = fields
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+    return f"upstream:{namespace}:{version}:{digest}"
+
+def _store(key, data, ttl, stale):
+    now = time.time()
+    entry = {"data": data, "fresh_until": now + ttl, "stale_until": now + ttl + stale}
+    # Entries outlive their stale window so they can still be served while the upstream is rate limited
+    caches["default"].set(key, entry, ttl + stale + settings.UPSTREAM_CACHE_RATE_LIMIT_GRACE)
+    return data
+
+def _fallback(entry, exception):
+    if entry is None or rate_limit.retry_after(exception) is None:
+        raise exception
+    return entry["data"], "LIMITED"
+
+def _refresh(key, load, ttl, stale):
+    try:
+        with rate_limit.priority("background"):
+            cache_flights.do(key, lambda: _store(key, load(), ttl, stale))
+    except Exception as exception:
+        print(f"Background refresh of {key} failed: {exception}")
+
+def fetch_through(view, request, load, fields=None):
+    policy = settings.UPSTREAM_CACHE_POLICIES.get(view)
+    if not settings.UPSTREAM_CACHE_ENABLED or policy is None or view not in cache_namespaces:
+        return load(), None
+    ttl, stale = policy
+    key = _cache_key(view, request, fields)
+    entry = caches["default"].get(key)
+    if entry is not None and entry["stale_until"] > time.time():
+        if entry["fresh_until"] > time.time():
+            return entry["data"], "HIT"
+        if not cache_flights.in_flight(key):
+            threading.Thread(target=_refresh, args=(key, load, ttl, stale), daemon=True).start()
+        return entry["data"], "STALE"
+    try:
+        return cache_flights.do(key, lambda: _store(key, load(), ttl, stale)), "MISS"
+    except Exception as exception:
+        return _fallback(entry, exception)
+
+async def _arefresh(key, load, ttl, stale):
+    async def refresh():
+        return _store(key, await load(), ttl, stale)
+    try:
+        with rate_limit.priority("background"):
+            await cache_flights.ado(key, refresh)
+    except Exception as exception:
+        print(f"Background refresh of {key} failed: {exception}")
+
+async def afetch_through(view, request, load, fields=None):
+    policy = settings.UPSTREAM_CACHE_POLICIES.get(view)
+    if not settings.UPSTREAM_CACHE_ENABLED or policy is None or view not in cache_namespaces:
+        return await load(), None
+    ttl, stale = policy
+    key = _cache_key(view, request, fields)
+    entry = caches["default"].get(key)
+    if entry is not None and entry["stale_until"] > time.time():
+        if entry["fresh_until"] > time.time():
+            return entry["data"], "HIT"
+        if not cache_flights.ain_flight(key):
+            task = asyncio.get_running_loop().create_task(_arefresh(key, load, ttl, stale))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return entry["data"], "STALE"
+    async def miss():
+        return _store(key, await load(), ttl, stale)
+    try:
+        return await cache_flights.ado(key, miss), "MISS"
+    except Exception as exception:
+        return _fallback(entry, exception)
+
+def namespace_version(namespace):
+    return caches["default"].get(_version_key(namespace), 0)
+
+def invalidate(view):
+    cache = caches["default"]
+    for namespace in invalidations.get(view, ()):
+        key = _version_key(namespace)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
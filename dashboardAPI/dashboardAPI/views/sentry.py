@@ -10,49 +10,264 @@ Usage:
     All requests use authentication headers configured in Django settings.
 
 API Endpoints:
+    GET /api/sentry/issues/events/batch/       - Get events for many issues in one request
+    PUT /api/sentry/issues/bulk/               - Apply one update to many issues
     GET /api/sentry/issues/{issue_id}/events/  - Get events for a specific issue
     PUT /api/sentry/issues/{issue_id}/         - Update issue status and properties
-    GET /api/sentry/issues/                    - List all project issues
-    GET /api/sentry/events/                    - List all project events
-    GET /api/sentry/alerts/                    - Get recent alerts (transformed from issues)
+    GET /api/sentry/issues/                    - List the issues of every configured project
+    GET /api/sentry/events/                    - List the events of every configured project
+    GET /api/sentry/alerts/                    - Get recent alerts (transformed from issues, see alerts.py)
     GET /api/sentry/members/                   - List organization members for assignment
+    GET /api/sentry/members/search/?q=         - Search organization members by prefix (see member_directory.py)
 
 Authentication:
     All endpoints use SENTRY_BEARER_AUTH token configured in settings (from environment variables).
-    Organization slug and project ID are also configured via environment variables.
+    Organization slug and project ID are also configured via environment variables; SENTRY_PROJECTS
+    lists several projects (possibly of several organizations) for one dashboard.
 
 Functions:
+    fetch_issue_events()       - Fetch the events of many issues concurrently
+    update_issues()            - Apply one update to many issues (bulk mutate, or concurrently)
+    get_batch_issue_events()   - Retrieve events for many issue IDs concurrently
     get_issue_events()         - Retrieve events for a specific issue ID
     update_issue_status()      - Update issue properties like status and assignment
-    get_issues()               - List all issues for the project
-    get_events()               - List all events for the project
+    bulk_update_issue_status() - Update the properties of many issues in one request
+    get_issues()               - List all issues of the selected projects
+    get_events()               - List all events of the selected projects
     get_sentry_alerts()        - Transform recent issues into alert format
     get_organization_members() - List organization members for issue assignment
 
+Query Parameters:
+    The issue and event list endpoints accept timeRange (1h, 24h/1d, 7d, 14d, 30d, 90d),
+    statsPeriod and full; issues additionally accept status, level, query and sort. These are
+    whitelisted in helpers.request_params and translated into Sentry's statsPeriod/query
+    parameters so results are narrowed upstream rather than in the browser.
+
+Bulk Updates:
+    PUT /api/sentry/issues/bulk/ takes {"issue_ids": [...], <update>} where the update uses the
+    same whitelist as the single issue endpoint. Issues are updated with Sentry's bulk mutate API
+    in chunks of SENTRY_BULK_MUTATE_CHUNK_SIZE; a chunk Sentry rejects (or whose issues it cannot
+    find) is retried as concurrent per-issue updates, so every issue gets its own result.
+
+Projects:
+    The issue, event and alert endpoints query every project of SENTRY_PROJECTS concurrently and
+    merge the per-project lists by timestamp; project= narrows them to some projects. Issue
+    updates go to the organization of the issue. See fanout.py.
+
+Field Projection:
+    The list endpoints (including the batch events endpoint) accept fields=, a comma separated
+    list of field names (dotted for nested fields) and presets such as chart and list. Other
+    fields are stripped page by page on the server; see projection.py.
+
+Assignment:
+    Organization members are served from the member directory of each organization
+    (member_directory.py; organization= selects one) once it has loaded, and assignedTo in issue
+    updates is checked against the directory of the issue's organization without calling
+    Sentry; an unknown assignee is rejected with 400.
+
+Pagination:
+    List endpoints follow Sentry's Link header cursors up to the configured page/item caps.
+    Pass ?stream=json or ?stream=ndjson to stream items to the client as pages arrive
+    instead of buffering (and caching) the whole list.
+
 Data Transformation:
     get_sentry_alerts() converts Sentry issues into a standardized alert format
-    with severity levels and detailed information for dashboard display.
+    with severity levels and detailed information for dashboard display. Alerts are kept in a
+    bounded feed of the most recently seen issues and accept limit, since and severity
+    (see alerts.py).
 """
 
 from rest_framework.decorators import api_view
-from .helpers import make_request, filter_request_data
-import json
-import requests
-from django.http import HttpResponse, HttpResponseBadRequest
-from datetime import datetime
+from .helpers import make_request, filter_request_data, translate_sentry_params, fetch_cached_json, fetch_json, describe_error, run_concurrently
+from .pagination import stream_pages
+from . import alerts, codec, fanout, member_directory, projection, rate_limit, response_cache
+from .upstream import send
+from django.http import HttpResponseBadRequest
 from django.conf import settings
 
+def issue_events_request(issue_id, params=None):
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{fanout.organization_of(issue_id)}/issues/{issue_id}/events/",
+        "method": "get",
+        "headers": settings.SENTRY_HEADERS,
+        "params": params or {},
+    }
+
+def update_issue_request(issue_id, data):
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{fanout.organization_of(issue_id)}/issues/{issue_id}/",
+        "method": "put",
+        "headers": settings.SENTRY_HEADERS,
+        "json": filter_request_data(data, "update_issue_status"),
+    }
+
+def bulk_update_issues_request(issue_ids, data):
+    # bulk_chunks only groups issues of one organization
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{fanout.organization_of(issue_ids[0])}/issues/",
+        "method": "put",
+        "headers": settings.SENTRY_HEADERS,
+        "params": {"id": list(issue_ids)},
+        "json": filter_request_data(data, "update_issue_status"),
+    }
+
+def issues_request(params=None, project=None):
+    project = project or settings.SENTRY_PROJECTS[0]
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/projects/{project["organization"]}/{project["project"]}/issues/",
+        "method": "get",
+        "headers": settings.SENTRY_HEADERS,
+        "params": params or {},
+    }
+
+def events_request(params=None, project=None):
+    project = project or settings.SENTRY_PROJECTS[0]
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/projects/{project["organization"]}/{project["project"]}/events/",
+        "method": "get",
+        "headers": settings.SENTRY_HEADERS,
+        "params": params or {},
+    }
+
+def members_request(organization=None):
+    return {
+        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{organization or fanout.default_organization()}/members/",
+        "method": "get",
+        "headers": settings.SENTRY_HEADERS,
+    }
+
+def fetch_issue_events(issue_ids, events_params, fields=None):
+    '''
+        Fetches the events of each issue concurrently, optionally projected to the field tree
+        fields; returns {issue_id: {"events", "error"}}.
+    '''
+    results = run_concurrently(
+        lambda issue_id: fetch_cached_json(issue_events_request(issue_id, events_params), "get_issue_events", fields)[0],
+        issue_ids,
+        settings.SENTRY_BATCH_MAX_WORKERS,
+    )
+    return {
+        issue_id: {
+            "events": events if error is None else [],
+            "error": None if error is None else describe_error(issue_events_request(issue_id, events_params), error),
+        }
+        for issue_id, (events, error) in zip(issue_ids, results)
+    }
+
+def bulk_issue_ids(data):
+    '''
+        Returns the deduplicated issue IDs of a bulk update body. Raises ValueError when they are
+        missing, malformed or too many, or when data is not a JSON object.
+    '''
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object with issue_ids")
+    issue_ids = data.get("issue_ids")
+    if not isinstance(issue_ids, list) or not issue_ids or not all(isinstance(issue_id, (str, int)) for issue_id in issue_ids):
+        raise ValueError("issue_ids must be a non-empty list of issue IDs")
+    issue_ids = list(dict.fromkeys(str(issue_id) for issue_id in issue_ids))
+    if len(issue_ids) > settings.SENTRY_BATCH_MAX_ISSUES:
+        raise ValueError(f"At most {settings.SENTRY_BATCH_MAX_ISSUES} issues can be updated at once")
+    return issue_ids
+
+def bulk_chunks(issue_ids):
+    '''
+        Splits issue_ids into bulk mutate chunks of one organization each
+    '''
+    size = settings.SENTRY_BULK_MUTATE_CHUNK_SIZE
+    organizations = {}
+    for issue_id in issue_ids:
+        organizations.setdefault(fanout.organization_of(issue_id), []).append(issue_id)
+    return [ids[offset:offset + size] for ids in organizations.values() for offset in range(0, len(ids), size)]
+
+def bulk_chunk_results(issue_ids, response, exception):
+    '''
+        Per-issue results of one bulk mutate call, or None when Sentry rejected it (4xx other than
+        429) or matched none of the issues (204), so the issues are retried one by one
+    '''
+    if exception is None and response.status_code == 200:
+        return {issue_id: {"ok": True, "mode": "bulk", "error": None} for issue_id in issue_ids}
+    if exception is None and (response.status_code == 204 or (400 <= response.status_code < 500 and response.status_code != 429)):
+        return None
+    error = str(exception) if exception is not None else f"Sentry bulk update returned status code {response.status_code}"
+    return {issue_id: {"ok": False, "mode": "bulk", "error": error} for issue_id in issue_ids}
+
+def single_update_result(issue_id, data, exception):
+    if exception is None:
+        return {"ok": True, "mode": "single", "error": None}
+    return {"ok": False, "mode": "single", "error": describe_error(update_issue_request(issue_id, data), exception)}
+
+def bulk_update_document(issue_ids, results):
+    if any(result["ok"] for result in results.values()):
+        response_cache.invalidate("update_issue_status")
+    ordered = {issue_id: results[issue_id] for issue_id in issue_ids}
+    succeeded = sum(result["ok"] for result in ordered.values())
+    return {"succeeded": succeeded, "failed": len(ordered) - succeeded, "results": ordered}
+
+def send_bulk_update(issue_ids, data):
+    request = bulk_update_issues_request(issue_ids, data)
+    return send(request["method"], request["uri"], headers=request["headers"], params=request["params"], json=request["json"])
+
+def update_issues(issue_ids, data):
+    '''
+        Applies one update to many issues and returns {"succeeded", "failed", "results": {issue_id:
+        {"ok", "mode", "error"}}}. Bulk mutate chunks are sent concurrently; issues of rejected
+        chunks are then updated concurrently one by one.
+    '''
+    results, single = {}, []
+    chunks = bulk_chunks(issue_ids)
+    for chunk, (response, exception) in zip(chunks, run_concurrently(lambda chunk: send_bulk_update(chunk, data), chunks, settings.SENTRY_BATCH_MAX_WORKERS)):
+        chunk_results = bulk_chunk_results(chunk, response, exception)
+        if chunk_results is None:
+            single.extend(chunk)
+        else:
+            results.update(chunk_results)
+    updates = run_concurrently(lambda issue_id: fetch_json(update_issue_request(issue_id, data)), single, settings.SENTRY_BATCH_MAX_WORKERS)
+    for issue_id, (_, exception) in zip(single, updates):
+        results[issue_id] = single_update_result(issue_id, data, exception)
+    return bulk_update_document(issue_ids, results)
+
+@api_view(["GET"])
+def get_batch_issue_events(request, **kwargs):
+    '''
+        Endpoint to access the events of many sentry issues in one request
+        Takes issue IDs as a comma separated (or repeated) issue_ids query parameter. Without it,
+        the events of every issue in the current (merged) issue list are returned. Events are fetched
+        concurrently and keyed by issue ID, with per-issue errors reported inline.
+    '''
+    try:
+        issue_params = translate_sentry_params(request.query_params, "get_issues")
+        events_params = translate_sentry_params(request.query_params, "get_issue_events")
+        fields = projection.projection(request.query_params, "get_issue_events")
+        projects = fanout.selected_projects(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    issue_ids = [issue_id for value in request.query_params.getlist("issue_ids") for issue_id in value.split(",") if issue_id]
+    if not issue_ids:
+        try:
+            issue_ids = [issue["id"] for issue in fanout.fetch_merged_view(issues_request, issue_params, projects, "get_issues")]
+        except Exception as exception:
+            error_message = describe_error(issues_request(issue_params, projects[0]), exception)
+            print(error_message)
+            return rate_limit.error_response(error_message, exception)
+    issue_ids = list(dict.fromkeys(issue_ids))
+    if len(issue_ids) > settings.SENTRY_BATCH_MAX_ISSUES:
+        return HttpResponseBadRequest(f"At most {settings.SENTRY_BATCH_MAX_ISSUES} issues can be requested at once")
+    return codec.json_response(fetch_issue_events(issue_ids, events_params, fields))
+
 @api_view(["GET"])
 def get_issue_events(request, **kwargs):
     '''
         Endpoint to access sentry issue events
         See: https://docs.sentry.io/api/events/list-an-issues-events/
     '''
-    return make_request({
-        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{settings.SENTRY_ORGANIZATION_SLUG}/issues/{kwargs.get("issue_id")}/events/",
-        "method": "get",
-        "headers": settings.SENTRY_HEADERS,
-    })
+    try:
+        params = translate_sentry_params(request.query_params, "get_issue_events")
+        fields = projection.projection(request.query_params, "get_issue_events")
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    if "stream" in request.query_params:
+        return stream_pages(issue_events_request(kwargs.get("issue_id"), params), request.query_params["stream"], fields)
+    return make_request(issue_events_request(kwargs.get("issue_id"), params), "get_issue_events", fields)
 
 @api_view(["PUT"])
 def update_issue_status(request, **kwargs):
@@ -60,12 +275,30 @@ def update_issue_status(request, **kwargs):
         Endpoint to update sentry issue status
         See: https://docs.sentry.io/api/events/update-an-issue/
     '''
-    return make_request({
-        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{settings.SENTRY_ORGANIZATION_SLUG}/issues/{kwargs.get("issue_id")}/",
-        "method": "put",
-        "headers": settings.SENTRY_HEADERS,
-        "json": filter_request_data(request.data, "update_issue_status"),
-    })
+    if not isinstance(request.data, dict):
+        return HttpResponseBadRequest("Expected a JSON object")
+    try:
+        member_directory.validate_assignee(request.data, [kwargs.get("issue_id")])
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    response = make_request(update_issue_request(kwargs.get("issue_id"), request.data), "update_issue_status")
+    if response.status_code < 400:
+        response_cache.invalidate("update_issue_status")
+    return response
+
+@api_view(["PUT"])
+def bulk_update_issue_status(request, **kwargs):
+    '''
+        Endpoint to update many sentry issues in one request
+        Takes {"issue_ids": [...]} plus the fields of update_issue_status; returns per-issue results
+        See: https://docs.sentry.io/api/events/bulk-mutate-an-organizations-issues/
+    '''
+    try:
+        issue_ids = bulk_issue_ids(request.data)
+        member_directory.validate_assignee(request.data, issue_ids)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return codec.json_response(update_issues(issue_ids, request.data))
 
 @api_view(["GET"])
 def get_issues(request, **kwargs):
@@ -73,11 +306,13 @@ def get_issues(request, **kwargs):
         Endpoint to access sentry issues
         See: https://docs.sentry.io/api/events/list-a-projects-issues/
     '''
-    return make_request({
-        "uri": f"{settings.SENTRY_BASE_URI}/projects/{settings.SENTRY_ORGANIZATION_SLUG}/{settings.SENTRY_PROJECT_ID}/issues/",
-        "method": "get",
-        "headers": settings.SENTRY_HEADERS,
-    })
+    try:
+        params = translate_sentry_params(request.query_params, "get_issues")
+        fields = projection.projection(request.query_params, "get_issues")
+        projects = fanout.selected_projects(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return fanout.list_view_response(request.query_params, projects, issues_request, "get_issues", params, fields)
 
 @api_view(["GET"])
 def get_events(request, **kwargs):
@@ -85,67 +320,45 @@ def get_events(request, **kwargs):
         Endpoint to access sentry events
         See: https://docs.sentry.io/api/events/list-a-projects-error-events/
     '''
-    return make_request({
-        "uri": f"{settings.SENTRY_BASE_URI}/projects/{settings.SENTRY_ORGANIZATION_SLUG}/{settings.SENTRY_PROJECT_ID}/events/",
-        "method": "get",
-        "headers": settings.SENTRY_HEADERS,
-    })
+    try:
+        params = translate_sentry_params(request.query_params, "get_events")
+        fields = projection.projection(request.query_params, "get_events")
+        projects = fanout.selected_projects(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    return fanout.list_view_response(request.query_params, projects, events_request, "get_events", params, fields)
 
 @api_view(["GET"])
 def get_sentry_alerts(request, **kwargs):
     """
-    Fetch recent alerts from Sentry by transforming recent issues into alert format
+    Fetch recent alerts from Sentry by transforming recently seen issues into alert format
+    Served from the bounded alerts feed, refreshed with one small query when stale (see alerts.py)
     """
     try:
-        # Get recent issues from Sentry
-        issues_uri = f"{settings.SENTRY_BASE_URI}/projects/{settings.SENTRY_ORGANIZATION_SLUG}/{settings.SENTRY_PROJECT_ID}/issues/"
-        response = requests.get(issues_uri, headers=settings.SENTRY_HEADERS, params={'statsPeriod': '24h'})
-        response.raise_for_status()
-        
-        issues = response.json()
-        alerts = []
-        # Transform recent issues into alerts format
-        for issue in issues[:10]:  # Limit to 10 most recent
-            # Determine severity based on issue level
-            severity = "Error" if issue.get('level') == 'error' else "Warning"
-            
-            # Create alert object
-            alert = {
-                "message": f"Issue detected: {issue.get('title', 'Unknown issue')}",
-                "severity": severity,
-                "time": issue.get('lastSeen', datetime.now().isoformat()),
-                "details": f"Project: {issue.get('project', {}).get('name', 'Unknown')}",
-                "originalIssue": {
-                    "id": issue.get('id'),
-                    "shortId": issue.get('shortId'),
-                    "title": issue.get('title'),
-                    "culprit": issue.get('culprit', 'Unknown'),
-                    "status": issue.get('status', 'unresolved'),
-                    "level": issue.get('level', 'error'),
-                    "lastSeen": issue.get('lastSeen'),
-                    "permalink": issue.get('permalink', '')
-                }
-            }
-            alerts.append(alert)
-        
-        return HttpResponse(json.dumps(alerts), content_type="application/json")
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching alerts from Sentry: {e}")
-        return HttpResponseBadRequest(f"Error fetching alerts from Sentry: {e}")
-        
-    except Exception as error:
-        print(f"An unexpected error occurred in get_sentry_alerts: {error}")
-        return HttpResponseBadRequest(f"An unexpected error occurred: {error}")
+        data = alerts.feed_alerts(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    except Exception as exception:
+        error_message = f"Error fetching alerts from Sentry: {exception}"
+        print(error_message)
+        return rate_limit.error_response(error_message, exception)
+    return codec.json_response(data, headers={"Cache-Control": "no-cache"})
 
 @api_view(["GET"])
 def get_organization_members(request, **kwargs):
     """
     Fetch organization members from Sentry for issue assignment
+    Served from the member directory once it has loaded
     See: https://docs.sentry.io/api/organizations/list-an-organizations-members/
     """
-    return make_request({
-        "uri": f"{settings.SENTRY_BASE_URI}/organizations/{settings.SENTRY_ORGANIZATION_SLUG}/members/",
-        "method": "get",
-        "headers": settings.SENTRY_HEADERS,
-    })
+    try:
+        fields = projection.projection(request.query_params, "get_organization_members")
+        organization = member_directory.selected_organization(request.query_params)
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
+    if "stream" in request.query_params:
+        return stream_pages(members_request(organization), request.query_params["stream"], fields)
+    directory = member_directory.directory_for(organization)
+    if directory.loaded:
+        return codec.json_response(projection.project(directory.members, fields), headers={"Cache-Control": "no-cache"})
+    return make_request(members_request(organization), "get_organization_members", fields)
@@ -0,0 +1,171 @@
+"""
+Singleflight Module for DashboardAPI Views
+
+This module deduplicates concurrent identical work. Callers that ask a Group for a key while an
+earlier call for the same key is still running wait for that call and share its result (or its
+error) instead of starting their own. Nothing is kept once the call completes; caching is the job
+of response_cache.py, which uses a Group to coalesce its own cache misses and refreshes.
+
+The upstream group sits in the upstream call path of helpers.fetch_json and the pagination
+helpers: identical upstream requests (same method, URI, query parameters and body) issued at the
+same time, e.g. by several dashboards refreshing at once or by two components of one page loading
+the organization members, reach the upstream API once.
+
+Usage:
+    from . import singleflight
+
+    response = singleflight.send("get", api_endpoint, headers=settings.SENTRY_HEADERS)
+    response = await singleflight.asend("get", api_endpoint, headers=settings.SENTRY_HEADERS)
+
+    flights = singleflight.Group("my-work")
+    result = flights.do(key, lambda: expensive(key))
+
+Functions:
+    Group(name)                  - Set of in-flight calls with deduplication counters
+    Group.do(key, load)          - Runs load, or waits for the in-flight call of key
+    Group.ado(key, load)         - Async do (load is a coroutine function); coalesces per event loop,
+                                   and a waiter takes over the call when its leader is cancelled
+    send(method, uri, **kwargs)  - upstream.send through the upstream group
+    asend(method, uri, **kwargs) - async_upstream.asend through the upstream group
+    request_key(method, uri, kwargs) - Key of an upstream request (credentials are not part of it)
+    metrics()                    - Calls, deduplicated calls and in-flight keys of every group
+
+Configuration:
+    singleflight_methods         - HTTP methods whose upstream requests are coalesced
+    UPSTREAM_SINGLEFLIGHT_ENABLED - Turns coalescing of upstream requests on or off
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import weakref
+
+from django.conf import settings
+
+from . import async_upstream, upstream
+
+# Mailgun's analytics queries (logs, metrics) are POSTs; Sentry mutations are PUTs and always reach the upstream
+singleflight_methods = ("get", "post")
+
+# Request arguments that identify an upstream request; headers, auth and timeouts do not
+request_identity = ("params", "json", "data")
+
+groups = {}
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+def _retrieve_exception(future):
+    # Marks failures as retrieved so an error with no waiters is not reported as unhandled
+    if not future.cancelled():
+        future.exception()
+
+class Group:
+    '''
+        In-flight calls by key, shared between threads (do) or between tasks of one event loop
+        (ado). Counts every call and the calls that were served by another caller's flight.
+    '''
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.deduplicated = 0
+        self._flights = {}
+        self._async_flights = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        groups[name] = self
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._flights
+
+    def ain_flight(self, key):
+        return key in self._async_flights.get(asyncio.get_running_loop(), {})
+
+    def do(self, key, load):
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.deduplicated += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = load()
+            return flight.result
+        except BaseException as exception:
+            flight.error = exception
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def ado(self, key, load):
+        loop = asyncio.get_running_loop()
+        flights = self._async_flights.setdefault(loop, {})
+        with self._lock:
+            self.calls += 1
+            if key in flights:
+                self.deduplicated += 1
+        while key in flights:
+            future = flights[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled (e.g. its client disconnected): take over its call
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        future = flights[key] = loop.create_future()
+        future.add_done_callback(_retrieve_exception)
+        try:
+            result = await load()
+            future.set_result(result)
+            return result
+        except Exception as exception:
+            future.set_exception(exception)
+            raise
+        finally:
+            del flights[key]
+            if not future.done():
+                future.cancel()
+
+    def metrics(self):
+        with self._lock:
+            in_flight = len(self._flights) + sum(len(flights) for flights in self._async_flights.values())
+            return {"calls": self.calls, "deduplicated": self.deduplicated, "in_flight": in_flight}
+
+upstream_flights = Group("upstream")
+
+def request_key(method, uri, kwargs):
+    identity = {"method": method.lower(), "uri": uri, **{key: kwargs.get(key) for key in request_identity}}
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+def coalesced(method, kwargs):
+    return settings.UPSTREAM_SINGLEFLIGHT_ENABLED and method.lower() in singleflight_methods and not kwargs.get("stream")
+
+def send(method, uri, **kwargs):
+    '''
+        Sends an upstream request; identical concurrent requests share one response, whose body
+        is already read (responses are not streamed), so every caller can decode it.
+    '''
+    if not coalesced(method, kwargs):
+        return upstream.send(method, uri, **kwargs)
+    return upstream_flights.do(request_key(method, uri, kwargs), lambda: upstream.send(method, uri, **kwargs))
+
+async def asend(method, uri, **kwargs):
+    if not coalesced(method, kwargs):
+        return await async_upstream.asend(method, uri, **kwargs)
+    return await upstream_flights.ado(request_key(method, uri, kwargs), lambda: async_upstream.asend(method, uri, **kwargs))
+
+def metrics():
+    return {name: group.metrics() for name, group in groups.items()}
@@ -0,0 +1,149 @@
+"""
+Event Time Series Module
+
+This module serves chart data from the EventBucket rollups that the event store ingest
+maintains (see event_store.py). Counts are read per hour or per day and grouped by any of
+source, level, category and event type. A response therefore stays a few KB however many events
+were stored, and the browser no longer has to download and bucket raw events itself.
+
+Usage:
+    GET /api/timeseries/?timeRange=30d&resolution=day
+    GET /api/timeseries/?timeRange=1d&resolution=hour&source=mailgun&groupBy=type
+    GET /api/timeseries/?start=2025-01-01T00:00:00Z&end=2025-02-01T00:00:00Z&level=error
+
+Functions:
+    time_window(params)         - Start and end of the timeRange or start/end parameters
+    timeseries_context(params)  - Validates query parameters into the bucket query
+    timeseries(params)          - Dense per-series counts for the requested buckets
+    get_timeseries()            - Endpoint returning the series with an ETag
+
+Response Format:
+    {
+        "resolution": "day",
+        "start": "2025-01-01T00:00:00+00:00",   # start of the first bucket
+        "step": 86400,                          # bucket width in seconds
+        "buckets": 30,
+        "groupBy": ["source", "category"],
+        "series": [
+            {"source": "sentry", "category": "TypeError", "total": 12, "counts": [0, 3, ...]},
+            ...
+        ]
+    }
+    counts[i] covers [start + i * step, start + (i + 1) * step). Series are ordered by total,
+    largest first.
+
+Configuration:
+    timeseries_resolutions  - Dictionary mapping resolutions to their bucket width
+    timeseries_groups       - Dictionary mapping groupBy/filter parameters to EventBucket fields
+    TIMESERIES_MAX_BUCKETS  - Upper bound for the number of buckets in one response
+"""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.db.models import Sum
+from django.http import HttpResponseBadRequest
+from rest_framework.decorators import api_view
+
+from ..models import EventBucket
+from . import codec
+from .dashboard import mailgun_time_ranges
+from .event_store import bucket_resolutions, parse_timestamp
+
+timeseries_resolutions = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+timeseries_groups = {
+    "source": "source",
+    "level": "level",
+    "category": "category",
+    "type": "event_type",
+}
+
+def split(value):
+    return [item for item in value.split(",") if item] if value else []
+
+def time_window(params):
+    '''
+        Returns the (start, end) datetimes of the timeRange or start/end query parameters.
+        Raises ValueError for unknown time ranges or malformed timestamps.
+    '''
+    time_range = params.get("timeRange", "30d")
+    if time_range not in mailgun_time_ranges:
+        raise ValueError(f"Invalid timeRange \"{time_range}\" (only {", ".join(mailgun_time_ranges)} are allowed)")
+    # Without an end, the window ends at the next whole minute: responses stay identical (and
+    # revalidate with their ETag) between polls, and no event of the current minute is left out
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+    try:
+        end = parse_timestamp(params.get("end")) if params.get("end") else now
+        start = parse_timestamp(params.get("start")) if params.get("start") else end - mailgun_time_ranges[time_range]
+    except ValueError:
+        raise ValueError("start and end must be ISO 8601 timestamps")
+    return start, end
+
+def timeseries_context(params):
+    '''
+        Translates the query parameters into the bucket range, grouping and filters.
+        Raises ValueError for unknown values, malformed timestamps or too many buckets.
+    '''
+    resolution = params.get("resolution", "day")
+    if resolution not in timeseries_resolutions:
+        raise ValueError(f"Invalid resolution \"{resolution}\" (only {", ".join(timeseries_resolutions)} are allowed)")
+    group_by = split(params.get("groupBy", "source,category"))
+    unknown = [group for group in group_by if group not in timeseries_groups]
+    if unknown:
+        raise ValueError(f"Unknown groupBy {", ".join(unknown)} (only {", ".join(timeseries_groups)} are available)")
+    start, end = time_window(params)
+    first = bucket_resolutions[resolution](start.astimezone(timezone.utc))
+    step = timeseries_resolutions[resolution]
+    buckets = max(0, math.ceil((end - first) / step))
+    if buckets > settings.TIMESERIES_MAX_BUCKETS:
+        raise ValueError(f"{buckets} {resolution} buckets requested (at most {settings.TIMESERIES_MAX_BUCKETS}); use a coarser resolution or a shorter range")
+    return {
+        "resolution": resolution,
+        "start": first,
+        "end": end,
+        "step": step,
+        "buckets": buckets,
+        "group_by": list(dict.fromkeys(group_by)),
+        "filters": {f"{field}__in": split(params.get(param)) for param, field in timeseries_groups.items() if params.get(param)},
+    }
+
+def timeseries(params):
+    context = timeseries_context(params)
+    fields = [timeseries_groups[group] for group in context["group_by"]]
+    rows = (
+        EventBucket.objects
+        .filter(resolution=context["resolution"], start__gte=context["start"], start__lt=context["end"], **context["filters"])
+        .values("start", *fields)
+        .annotate(total=Sum("count"))
+    )
+    series = {}
+    for row in rows:
+        key = tuple(row[field] for field in fields)
+        entry = series.setdefault(key, {**dict(zip(context["group_by"], key)), "total": 0, "counts": [0] * context["buckets"]})
+        entry["counts"][(row["start"] - context["start"]) // context["step"]] += row["total"]
+        entry["total"] += row["total"]
+    return {
+        "resolution": context["resolution"],
+        "start": context["start"].isoformat(),
+        "step": int(context["step"].total_seconds()),
+        "buckets": context["buckets"],
+        "groupBy": context["group_by"],
+        "series": sorted(series.values(), key=lambda entry: -entry["total"]),
+    }
+
+@api_view(["GET"])
+def get_timeseries(request, **kwargs):
+    '''
+        Endpoint to access per-bucket event counts for charts
+        Parameters: timeRange or start/end, resolution (hour, day), groupBy and source, level,
+        category, type filters (comma separated). Supports If-None-Match revalidation.
+    '''
+    try:
+        return codec.json_response(timeseries(request.query_params), headers={"Cache-Control": "no-cache"})
+    except ValueError as error:
+        return HttpResponseBadRequest(str(error))
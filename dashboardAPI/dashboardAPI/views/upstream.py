@@ -0,0 +1,97 @@
+"""
+Upstream HTTP Client Module for DashboardAPI Views
+
+This module provides the shared HTTP client used by every view that proxies requests to a
+third-party API (Sentry, Mailgun, HubSpot). Each upstream host gets its own pooled, keep-alive
+session so repeated calls reuse open TCP/TLS connections instead of paying a new handshake
+per request. Every request is sent with connect/read timeouts, and idempotent methods are
+retried with exponential backoff on connection errors and gateway failures. Calls to Sentry and
+Mailgun are scheduled against their rate limit budgets (see rate_limit.py).
+
+Usage:
+    Use send() anywhere a view would otherwise call requests.get/put/post directly.
+
+    Example:
+        from .upstream import send
+
+        response = send("get", api_endpoint, headers=settings.SENTRY_HEADERS)
+
+Functions:
+    get_session(uri)             - Returns the pooled session for the host of uri
+    send(method, uri, **kwargs)  - Sends a request through the pooled session for uri
+    close_sessions()             - Closes all pooled sessions (used by tests and shutdown)
+
+Configuration:
+    UPSTREAM_POOL_CONNECTIONS - Number of connection pools cached per session
+    UPSTREAM_POOL_MAXSIZE     - Maximum number of connections kept alive per host
+    UPSTREAM_CONNECT_TIMEOUT  - Seconds to wait for a connection to be established
+    UPSTREAM_READ_TIMEOUT     - Seconds to wait for the upstream to send a response
+    UPSTREAM_MAX_RETRIES      - Retry attempts for idempotent methods
+    UPSTREAM_BACKOFF_FACTOR   - Backoff factor between retries (factor * 2 ** (retry - 1) seconds)
+"""
+
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import instrumentation, rate_limit
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = (502, 503, 504)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _build_session():
+    retry = Retry(
+        total=settings.UPSTREAM_MAX_RETRIES,
+        backoff_factor=settings.UPSTREAM_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=IDEMPOTENT_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.UPSTREAM_POOL_CONNECTIONS,
+        pool_maxsize=settings.UPSTREAM_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session(uri):
+    parts = urlsplit(uri)
+    key = (parts.scheme, parts.netloc)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _build_session()
+    return session
+
+def retry_count(response):
+    # urllib3 records the retries made for a response in its Retry history
+    history = getattr(getattr(response.raw, "retries", None), "history", None)
+    return len(history) if isinstance(history, tuple) else 0
+
+def send(method, uri, **kwargs):
+    kwargs.setdefault("timeout", (settings.UPSTREAM_CONNECT_TIMEOUT, settings.UPSTREAM_READ_TIMEOUT))
+    bucket = rate_limit.acquire(method, uri)
+    with instrumentation.upstream_call(method, uri) as call:
+        call.response = response = get_session(uri).request(method.upper(), uri, **kwargs)
+        call.retries = retry_count(response)
+    rate_limit.observe(bucket, response)
+    return response
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
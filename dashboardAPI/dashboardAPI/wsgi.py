@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dashboardAPI.settings')
 
 application = get_wsgi_application()
+
+# Probe integration health and ingest events into the local store in the background
+from .views import event_store, health, member_directory
+health.start_scheduler()
+event_store.start_ingest()
+member_directory.start_refresh()